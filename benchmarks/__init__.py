@@ -0,0 +1,26 @@
+"""
+Micro benchmarks for pycommons-base. The benchmarks are not collected by pytest and are meant
+to be run as modules, e.g. `python -m benchmarks.stream_pipeline`. `python -m benchmarks.suite`
+(`poe bench`) runs the suite of the hot paths and checks it against the stored baseline.
+"""
+import timeit
+from typing import Callable, Any
+
+
+def per_element_ns(fn: Callable[[], Any], n_elements: int, repeat: int = 5) -> float:
+    """
+    Run `fn` `repeat` times and return the best observed time per element in nanoseconds.
+
+    Args:
+        fn: The benchmark body. Must process `n_elements` elements on each call.
+        n_elements: Number of elements processed by a single call of `fn`
+        repeat: Number of times the measurement is repeated
+
+    Returns:
+        Best time per element in nanoseconds
+    """
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1e9 / n_elements
+
+
+def report(name: str, value: float, unit: str = "ns/element") -> None:
+    print(f"{name:<48} {value:>12.2f} {unit}")
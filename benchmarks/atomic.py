@@ -0,0 +1,91 @@
+"""
+Cost of the operations of `AtomicInteger` compared with the previous implementation, that held
+a reentrant lock in every call including the reads, and had no `compare_and_set`.
+
+Run with `python -m benchmarks.atomic [n_operations]`.
+"""
+import sys
+
+from benchmarks import per_element_ns, report
+from pycommons.base.atomic import AtomicInteger
+from pycommons.base.container import IntegerContainer
+from pycommons.base.synchronized import RLockSynchronized, synchronized
+
+
+class _RLockAtomicInteger(IntegerContainer, RLockSynchronized):  # pylint: disable=R0901
+    """
+    The previous `AtomicInteger`: every method holds the reentrant lock, the compound methods
+    acquire it again in `get` and `set`
+    """
+
+    def __init__(self, value: int = 0):
+        super().__init__(value)
+        RLockSynchronized.__init__(self)
+
+    @synchronized
+    def get(self) -> int:
+        return super().get()
+
+    @synchronized
+    def set(self, t: int) -> None:  # type: ignore
+        super().set(t)
+
+    @synchronized
+    def set_and_get(self, t: int) -> int:  # type: ignore
+        return super().set_and_get(t)  # type: ignore
+
+    @synchronized
+    def add_and_get(self, val: int) -> int:
+        return super().add_and_get(val)
+
+    @synchronized
+    def increment_and_get(self) -> int:
+        return super().increment_and_get()
+
+    @synchronized
+    def __lt__(self, other: int) -> bool:
+        return super().__lt__(other)
+
+
+def _cas_increment(integer: AtomicInteger) -> None:
+    while True:
+        current = integer.get()
+        if integer.compare_and_set(current, current + 1):
+            return
+
+
+def _locked_read_modify_write(integer: _RLockAtomicInteger) -> None:
+    # Without compare_and_set, a conditional update holds the lock around a get and a set
+    with integer._sync_lock():  # pylint: disable=W0212
+        integer.set(integer.get() + 1)
+
+
+def main(n: int = 1_000_000) -> None:
+    before, after = _RLockAtomicInteger(), AtomicInteger()
+    r = range(n)
+    for name, fn_before, fn_after in (
+        ("get", lambda: [before.get() for _ in r], lambda: [after.get() for _ in r]),
+        ("__lt__", lambda: [before < 0 for _ in r], lambda: [after < 0 for _ in r]),
+        ("set", lambda: [before.set(1) for _ in r], lambda: [after.set(1) for _ in r]),
+        (
+            "increment_and_get",
+            lambda: [before.increment_and_get() for _ in r],
+            lambda: [after.increment_and_get() for _ in r],
+        ),
+        (
+            "conditional update",
+            lambda: [_locked_read_modify_write(before) for _ in r],
+            lambda: [_cas_increment(after) for _ in r],
+        ),
+    ):
+        report(f"{name}: RLock on every call", per_element_ns(fn_before, n), "ns/op")
+        report(f"{name}: AtomicInteger", per_element_ns(fn_after, n), "ns/op")
+    report(
+        "update_and_get: AtomicInteger",
+        per_element_ns(lambda: [after.update_and_get(lambda v: v + 1) for _ in r], n),
+        "ns/op",
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""
+Memory per counter and cost of the updates of a list of `AtomicInteger` compared with an
+`AtomicIntegerArray`, and of objects holding an `AtomicInteger` compared with objects updated
+by an `AtomicFieldUpdater`.
+
+Run with `python -m benchmarks.atomic_array [n_counters]`.
+"""
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks import per_element_ns, report
+from pycommons.base.atomic import AtomicFieldUpdater, AtomicInteger, AtomicIntegerArray
+
+
+class _Shard:
+    __slots__ = ("hits",)
+
+    def __init__(self, hits: Any) -> None:
+        self.hits = hits
+
+
+def _bytes_per_counter(create: Callable[[], Any], n: int) -> float:
+    tracemalloc.start()
+    counters = create()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del counters
+    return size / n
+
+
+def main(n: int = 1_000_000) -> None:
+    report(
+        "memory: list of AtomicInteger",
+        _bytes_per_counter(lambda: [AtomicInteger() for _ in range(n)], n),
+        "B/counter",
+    )
+    report(
+        "memory: AtomicIntegerArray",
+        _bytes_per_counter(lambda: AtomicIntegerArray(n), n),
+        "B/counter",
+    )
+    report(
+        "memory: objects holding an AtomicInteger",
+        _bytes_per_counter(lambda: [_Shard(AtomicInteger()) for _ in range(n)], n),
+        "B/counter",
+    )
+    report(
+        "memory: objects updated by an AtomicFieldUpdater",
+        _bytes_per_counter(lambda: [_Shard(0) for _ in range(n)], n),
+        "B/counter",
+    )
+
+    integers, array = [AtomicInteger() for _ in range(n)], AtomicIntegerArray(n)
+    shards = [_Shard(0) for _ in range(n)]
+    hits = AtomicFieldUpdater[int]("hits")
+    r = range(n)
+    report(
+        "add_and_get: list of AtomicInteger",
+        per_element_ns(lambda: [integers[i].add_and_get(1) for i in r], n),
+        "ns/op",
+    )
+    report(
+        "add_and_get: AtomicIntegerArray",
+        per_element_ns(lambda: [array.add_and_get(i, 1) for i in r], n),
+        "ns/op",
+    )
+    report(
+        "add_and_get: AtomicFieldUpdater",
+        per_element_ns(lambda: [hits.add_and_get(shards[i], 1) for i in r], n),
+        "ns/op",
+    )
+    report(
+        "get: list of AtomicInteger",
+        per_element_ns(lambda: [integers[i].get() for i in r], n),
+        "ns/op",
+    )
+    report("get: AtomicIntegerArray", per_element_ns(lambda: [array.get(i) for i in r], n), "ns/op")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
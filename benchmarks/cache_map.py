@@ -0,0 +1,78 @@
+"""
+Hit rate and throughput of the `CacheMap` implementations on Zipfian workloads, compared
+with `functools.lru_cache` of the same size. Every request is a `compute_if_absent` (or a
+call of the `lru_cache` decorated function) of a key drawn from a Zipf distribution.
+
+Run with `python -m benchmarks.cache_map [n_requests] [cache_size] [n_keys]`.
+"""
+import functools
+import itertools
+import random
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+from benchmarks import report
+from pycommons.base.maps import (
+    CacheMap,
+    LFUCacheMap,
+    LRUCacheMap,
+    SynchronizedCacheMap,
+    TTLCacheMap,
+)
+
+
+def zipf_keys(n_requests: int, n_keys: int, s: float, seed: int = 42) -> List[int]:
+    weights = [1 / rank**s for rank in range(1, n_keys + 1)]
+    return random.Random(seed).choices(
+        range(n_keys), cum_weights=list(itertools.accumulate(weights)), k=n_requests
+    )
+
+
+def _load(k: int) -> int:
+    return k
+
+
+def run_lru_cache(keys: List[int], size: int) -> Tuple[float, float]:
+    cached = functools.lru_cache(maxsize=size)(_load)
+    start = time.perf_counter()
+    for k in keys:
+        cached(k)
+    elapsed = time.perf_counter() - start
+    info = cached.cache_info()
+    return info.hits / (info.hits + info.misses), len(keys) / elapsed
+
+
+def run_cache_map(cache: Any, keys: List[int]) -> Tuple[float, float]:
+    compute_if_absent = cache.compute_if_absent
+    start = time.perf_counter()
+    for k in keys:
+        compute_if_absent(k, _load)
+    elapsed = time.perf_counter() - start
+    return cache.stats.hit_rate(), len(keys) / elapsed
+
+
+def main(n_requests: int = 1_000_000, size: int = 1_000, n_keys: int = 100_000) -> None:
+    caches: List[Tuple[str, Callable[[], CacheMap[int, int]]]] = [
+        ("LRUCacheMap", lambda: LRUCacheMap(maximum_size=size)),
+        ("LFUCacheMap", lambda: LFUCacheMap(maximum_size=size)),
+        ("TTLCacheMap", lambda: TTLCacheMap(expire_after_write=3600, maximum_size=size)),
+    ]
+    for s in (0.8, 1.0, 1.2):
+        keys = zipf_keys(n_requests, n_keys, s)
+        hit_rate, throughput = run_lru_cache(keys, size)
+        report(f"zipf {s}: functools.lru_cache hit rate", hit_rate * 100, "%")
+        report(f"zipf {s}: functools.lru_cache", throughput, "ops/s")
+        for name, factory in caches:
+            hit_rate, throughput = run_cache_map(factory(), keys)
+            report(f"zipf {s}: {name} hit rate", hit_rate * 100, "%")
+            report(f"zipf {s}: {name}", throughput, "ops/s")
+        hit_rate, throughput = run_cache_map(
+            SynchronizedCacheMap(LRUCacheMap(maximum_size=size)), keys
+        )
+        report(f"zipf {s}: SynchronizedCacheMap(LRU) hit rate", hit_rate * 100, "%")
+        report(f"zipf {s}: SynchronizedCacheMap(LRU)", throughput, "ops/s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,86 @@
+"""
+Per-element cost of the `Collectors` compared with the hand-written loops they replace,
+`for_each` with a closure and a plain `for` loop.
+
+Run with `python -m benchmarks.collectors [n_elements]`.
+"""
+import sys
+from typing import Any, Dict, List
+
+from benchmarks import per_element_ns, report
+from pycommons.base.function import Consumer
+from pycommons.base.streams import Collectors, Streams
+
+
+def _for_each_grouping(n: int) -> Dict[int, List[int]]:
+    groups: Dict[int, List[int]] = {}
+    Streams.flat(range(n)).for_each(Consumer.of(lambda t: groups.setdefault(t % 10, []).append(t)))
+    return groups
+
+
+def _loop_grouping(n: int) -> Dict[int, List[int]]:
+    groups: Dict[int, List[int]] = {}
+    for t in range(n):
+        groups.setdefault(t % 10, []).append(t)
+    return groups
+
+
+def _for_each_sum(n: int) -> int:
+    total = [0]
+
+    def _add(t: int) -> None:
+        total[0] += t
+
+    Streams.flat(range(n)).for_each(Consumer.of(_add))
+    return total[0]
+
+
+def _loop_sum(n: int) -> int:
+    total = 0
+    for t in range(n):
+        total += t
+    return total
+
+
+def _loop_list(n: int) -> List[Any]:
+    result = []
+    for t in range(n):
+        result.append(t)
+    return result
+
+
+def main(n: int = 1_000_000) -> None:
+    report("grouping_by: for_each closure", per_element_ns(lambda: _for_each_grouping(n), n))
+    report("grouping_by: for loop", per_element_ns(lambda: _loop_grouping(n), n))
+    report(
+        "grouping_by: Collectors.grouping_by",
+        per_element_ns(
+            lambda: Streams.flat(range(n)).collect(Collectors.grouping_by(lambda t: t % 10)), n
+        ),
+    )
+
+    report("summing: for_each closure", per_element_ns(lambda: _for_each_sum(n), n))
+    report("summing: for loop", per_element_ns(lambda: _loop_sum(n), n))
+    report(
+        "summing: Collectors.summing",
+        per_element_ns(lambda: Streams.flat(range(n)).collect(Collectors.summing()), n),
+    )
+
+    report("to_list: for loop", per_element_ns(lambda: _loop_list(n), n))
+    report(
+        "to_list: Collectors.to_list",
+        per_element_ns(lambda: Streams.flat(range(n)).collect(Collectors.to_list()), n),
+    )
+
+    report(
+        "counting: Collectors.counting",
+        per_element_ns(lambda: Streams.flat(range(n)).collect(Collectors.counting()), n),
+    )
+    report(
+        "joining: Collectors.joining",
+        per_element_ns(lambda: Streams.flat(range(n)).collect(Collectors.joining(",")), n),
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
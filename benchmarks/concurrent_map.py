@@ -0,0 +1,87 @@
+"""
+Throughput of `ConcurrentMap` under contention compared with a `Map` whose operations are
+all serialized by a single `RLock`, with 8 to 32 threads running a read-mostly mix of
+`get`, `compute_if_absent` and `merge` over a shared key space.
+
+Run with `python -m benchmarks.concurrent_map [n_ops_per_thread]`.
+"""
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from benchmarks import report
+from pycommons.base.function.function import BiFunctionType, FunctionType
+from pycommons.base.maps import ConcurrentMap, Map
+from pycommons.base.synchronized import RLockSynchronized, synchronized
+
+_N_KEYS = 1024
+
+
+class _LockedMap(RLockSynchronized, Map[Any, Any]):  # type: ignore
+    """
+    A `Map` guarded by a single global lock
+    """
+
+    def __init__(self) -> None:
+        RLockSynchronized.__init__(self)
+        Map.__init__(self)
+
+    @synchronized
+    def get(self, k: Any, default: Any = None) -> Any:
+        return self.data.get(k, default)
+
+    @synchronized
+    def compute_if_absent(self, k: Any, function: FunctionType[Any, Any]) -> Any:
+        return super().compute_if_absent(k, function)
+
+    @synchronized
+    def merge(self, k: Any, v: Any, function: BiFunctionType[Any, Any, Optional[Any]]) -> Any:
+        return super().merge(k, v, function)
+
+
+def _worker(_map: Any, n_ops: int, seed: int) -> Callable[[], None]:
+    def _add(a: int, b: int) -> int:
+        return a + b
+
+    def _run() -> None:
+        key = seed
+        for i in range(n_ops):
+            key = (key * 31 + 7) % _N_KEYS
+            op = i % 10
+            if op < 7:
+                _map.get(key)
+            elif op < 9:
+                _map.compute_if_absent(key, str)
+            else:
+                _map.merge(key + _N_KEYS, 1, _add)
+
+    return _run
+
+
+def ops_per_second(_map: Any, n_threads: int, n_ops: int) -> float:
+    threads = [threading.Thread(target=_worker(_map, n_ops, seed)) for seed in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return n_threads * n_ops / (time.perf_counter() - start)
+
+
+def main(n_ops: int = 100_000) -> None:
+    for n_threads in (8, 16, 32):
+        report(
+            f"{n_threads} threads: single RLock Map",
+            ops_per_second(_LockedMap(), n_threads, n_ops),
+            "ops/s",
+        )
+        report(
+            f"{n_threads} threads: ConcurrentMap",
+            ops_per_second(ConcurrentMap(), n_threads, n_ops),
+            "ops/s",
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
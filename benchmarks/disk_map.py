@@ -0,0 +1,62 @@
+"""
+Random lookups and sequential scans of a `DiskMap` larger than its cache of values.
+
+Run with `python -m benchmarks.disk_map [n_keys] [n_lookups] [directory]`. The default of 10M
+keys writes about 400 MB in a temporary directory.
+"""
+import random
+import sys
+import tempfile
+import time
+from typing import Iterator, Optional, Tuple
+
+from benchmarks import per_element_ns, report
+from pycommons.base.maps import DiskMap
+
+_BATCH = 100_000
+
+
+def _batches(n: int) -> Iterator[dict]:  # type: ignore
+    for start in range(0, n, _BATCH):
+        yield {f"key{i}": (i, f"value{i}") for i in range(start, min(n, start + _BATCH))}
+
+
+def _load(path: str, n: int) -> Tuple[float, int]:
+    start = time.perf_counter()
+    with DiskMap(path, cache_size=0) as disk_map:
+        for batch in _batches(n):
+            disk_map.put_all(batch)
+        disk_map.flush()
+        return (time.perf_counter() - start) * 1e9 / n, disk_map.disk_size()
+
+
+def main(n: int = 10_000_000, n_lookups: int = 100_000, directory: Optional[str] = None) -> None:
+    with tempfile.TemporaryDirectory(dir=directory) as path:
+        load_ns, disk_size = _load(path, n)
+        report("put_all (batches of 100k)", load_ns)
+        report("log size", disk_size / n, "B/key")
+
+        rnd = random.Random(42)
+        keys = [f"key{rnd.randrange(n)}" for _ in range(n_lookups)]
+        hot_keys = [f"key{rnd.randrange(1000)}" for _ in range(n_lookups)]
+        with DiskMap(path, cache_size=0) as disk_map:
+            report(
+                "random get, no cache",
+                per_element_ns(lambda: [disk_map.get(k) for k in keys], n_lookups, 3),
+                "ns/lookup",
+            )
+        with DiskMap(path, cache_size=10_000) as disk_map:
+            report(
+                "hot get, 1k keys, cache of 10k",
+                per_element_ns(lambda: [disk_map.get(k) for k in hot_keys], n_lookups, 3),
+                "ns/lookup",
+            )
+            start = time.perf_counter()
+            count = disk_map.stream().count()
+            elapsed = time.perf_counter() - start
+            report("stream scan", count / elapsed / 1e6, "M entries/s")
+            report("stream scan", disk_size / elapsed / 2**20, "MiB/s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]), *sys.argv[3:])  # type: ignore
@@ -0,0 +1,62 @@
+"""
+Cost of `contains_value` on a `Map` (linear scan) compared with the value indexed `BiMap`
+and `IndexedMap`, the overhead of maintaining the index on `put`, and the memory used by
+the index.
+
+Run with `python -m benchmarks.indexed_map [n_entries]`.
+"""
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from benchmarks import per_element_ns, report
+from pycommons.base.maps import BiMap, IndexedMap, Map
+
+
+def _fill(factory: Callable[[], Map[int, Any]], n: int, distinct_values: int) -> Map[int, Any]:
+    _map = factory()
+    for k in range(n):
+        _map.put(k, k % distinct_values)
+    return _map
+
+
+def _bytes_per_entry(factory: Callable[[], Map[int, Any]], n: int, distinct_values: int) -> float:
+    tracemalloc.start()
+    _map = _fill(factory, n, distinct_values)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del _map
+    return size / n
+
+
+def main(n: int = 100_000) -> None:
+    factories: Dict[str, Callable[[], Map[int, Any]]] = {
+        "Map": Map,
+        "BiMap": BiMap,
+        "IndexedMap": IndexedMap,
+    }
+    for name, factory in factories.items():
+        report(f"put: {name}", per_element_ns(lambda: _fill(factory, n, n), n), "ns/op")
+
+    n_lookups = 1_000
+    for name, factory in factories.items():
+        _map = _fill(factory, n, n)
+        lookups = range(n - n_lookups, n)
+        report(
+            f"contains_value: {name}",
+            per_element_ns(lambda: [_map.contains_value(v) for v in lookups], n_lookups, 3),
+            "ns/op",
+        )
+
+    for name, factory in factories.items():
+        report(f"memory, unique values: {name}", _bytes_per_entry(factory, n, n), "bytes/entry")
+    for name in ("Map", "IndexedMap"):
+        report(
+            f"memory, 100 distinct values: {name}",
+            _bytes_per_entry(factories[name], n, 100),
+            "bytes/entry",
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
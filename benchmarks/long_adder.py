@@ -0,0 +1,52 @@
+"""
+Throughput of the increments of a counter shared by 2 to 64 threads, `AtomicInteger` compared
+with `LongAdder`.
+
+Run with `python -m benchmarks.long_adder [n_increments]`.
+"""
+import sys
+import threading
+import time
+from typing import Callable
+
+from benchmarks import report
+from pycommons.base.atomic import AtomicInteger, LongAdder
+
+
+def _throughput(increment: Callable[[], None], n_threads: int, n: int) -> float:
+    per_thread = n // n_threads
+    barrier = threading.Barrier(n_threads + 1)
+
+    def work() -> None:
+        barrier.wait()
+        for _ in range(per_thread):
+            increment()
+
+    threads = [threading.Thread(target=work) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return per_thread * n_threads / (time.perf_counter() - start) / 1e6
+
+
+def main(n: int = 1_000_000) -> None:
+    for n_threads in (2, 4, 8, 16, 32, 64):
+        atomic, adder = AtomicInteger(), LongAdder()
+        report(
+            f"{n_threads} threads: AtomicInteger.increment",
+            _throughput(atomic.increment, n_threads, n),
+            "M ops/s",
+        )
+        report(
+            f"{n_threads} threads: LongAdder.increment",
+            _throughput(adder.increment, n_threads, n),
+            "M ops/s",
+        )
+        assert atomic.get() == adder.sum() == n // n_threads * n_threads
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
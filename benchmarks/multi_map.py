@@ -0,0 +1,64 @@
+"""
+Grouping and counting with `Map` idioms compared with the bulk operations of `MultiMap` and
+`CounterMap`.
+
+Run with `python -m benchmarks.multi_map [n_elements] [n_keys]`.
+"""
+import random
+import sys
+from typing import Any, List, Tuple
+
+from benchmarks import per_element_ns, report
+from pycommons.base.maps import CounterMap, Map, MultiMap
+
+
+def _group_with_map(pairs: List[Tuple[int, int]]) -> Map[int, Any]:
+    _map: Map[int, Any] = Map()
+    for k, v in pairs:
+        _map.compute_if_absent(k, lambda _: []).append(v)
+    return _map
+
+
+def _group_with_multi_map(pairs: List[Tuple[int, int]]) -> MultiMap[int, int]:
+    multi_map: MultiMap[int, int] = MultiMap()
+    multi_map.put_all_from(pairs)
+    return multi_map
+
+
+def _count_with_map(keys: List[int]) -> Map[int, int]:
+    _map: Map[int, int] = Map()
+    for k in keys:
+        _map.put(k, _map.get(k, 0) + 1)
+    return _map
+
+
+def _count_with_counter_map(keys: List[int]) -> CounterMap[int]:
+    counter: CounterMap[int] = CounterMap()
+    counter.increment_all(keys)
+    return counter
+
+
+def main(n: int = 1_000_000, n_keys: int = 1_000) -> None:
+    rnd = random.Random(42)
+    keys = [rnd.randrange(n_keys) for _ in range(n)]
+    pairs = [(k, i) for i, k in enumerate(keys)]
+
+    report(
+        "group: Map.compute_if_absent().append", per_element_ns(lambda: _group_with_map(pairs), n)
+    )
+    report("group: MultiMap.put_all_from", per_element_ns(lambda: _group_with_multi_map(pairs), n))
+    report("count: Map.put(k, get(k, 0) + 1)", per_element_ns(lambda: _count_with_map(keys), n))
+    report(
+        "count: CounterMap.increment_all", per_element_ns(lambda: _count_with_counter_map(keys), n)
+    )
+
+    counter = _count_with_counter_map(keys)
+    report(
+        "most_common(10)",
+        per_element_ns(lambda: counter.most_common(10), n_keys),
+        "ns/key",
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
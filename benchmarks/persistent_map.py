@@ -0,0 +1,70 @@
+"""
+Cost of taking an isolated snapshot of a map and updating it: `Map.copy()` followed by a
+`put`, compared with a `put` on a `PersistentMap`, which returns a new version sharing its
+structure with the previous one. Also reports the lookups and the bulk loads.
+
+Run with `python -m benchmarks.persistent_map`.
+"""
+import sys
+from typing import Dict
+
+from benchmarks import per_element_ns, report
+from pycommons.base.maps import Map, PersistentMap
+
+
+def main(*sizes: int) -> None:
+    for n in sizes or (10, 1_000, 1_000_000):
+        data: Dict[int, int] = {k: k for k in range(n)}
+        _map: Map[int, int] = Map(data)
+        persistent_map: PersistentMap[int, int] = PersistentMap(data)
+        n_snapshots = max(10, min(10_000, 10_000_000 // n))
+
+        report(
+            f"snapshot + put, {n} keys: Map.copy",
+            per_element_ns(
+                lambda: [_map.copy().put(-1, i) for i in range(n_snapshots)], n_snapshots, 3
+            ),
+            "ns/op",
+        )
+        report(
+            f"snapshot + put, {n} keys: PersistentMap",
+            per_element_ns(
+                lambda: [persistent_map.put(-1, i) for i in range(n_snapshots)], n_snapshots, 3
+            ),
+            "ns/op",
+        )
+
+        lookups = list(range(0, n, max(1, n // 1000)))
+        report(
+            f"get, {n} keys: Map",
+            per_element_ns(lambda: [_map.get(k) for k in lookups], len(lookups)),
+            "ns/op",
+        )
+        report(
+            f"get, {n} keys: PersistentMap",
+            per_element_ns(lambda: [persistent_map.get(k) for k in lookups], len(lookups)),
+            "ns/op",
+        )
+
+        if n <= 1_000:
+            continue
+
+        def _put_one_by_one() -> None:
+            built: PersistentMap[int, int] = PersistentMap()
+            for k in range(n):
+                built = built.put(k, k)
+
+        report(
+            f"bulk load, {n} keys: PersistentMap.put",
+            per_element_ns(_put_one_by_one, n, 1),
+            "ns/entry",
+        )
+        report(
+            f"bulk load, {n} keys: PersistentMap (transient)",
+            per_element_ns(lambda: PersistentMap(data), n, 1),
+            "ns/entry",
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
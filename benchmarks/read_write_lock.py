@@ -0,0 +1,133 @@
+"""
+Throughput of 16 threads calling the methods of a shared object, 90% reads and 10% writes,
+synchronized with a lock, a reentrant lock, and a read-write lock with writer preference, in
+the fair mode and with optimistic reads. The reads either look up a dict, holding the GIL, or
+hash a 16 KiB payload with `hashlib`, which releases the GIL.
+
+Run with `python -m benchmarks.read_write_lock [n_operations]`.
+"""
+import hashlib
+import sys
+import threading
+import time
+from typing import Any, Callable, Tuple
+
+from benchmarks import report
+from pycommons.base.synchronized import (
+    LockSynchronized,
+    ReadWriteLockSynchronized,
+    RLockSynchronized,
+    optimistic_read_synchronized,
+    read_synchronized,
+    synchronized,
+    write_synchronized,
+)
+
+_N_THREADS = 16
+_PAYLOAD = bytes(16 * 1024)
+
+
+def _lookup(table: Any) -> Any:
+    return table.entries.get(7)
+
+
+def _hash(table: Any) -> Any:
+    return hashlib.sha256(table.payload).digest()
+
+
+class _Table:
+    def __init__(self, read: Callable[[Any], Any]) -> None:
+        self.entries = {i: i for i in range(100)}
+        self.payload = _PAYLOAD
+        self._read = read
+
+    def _write(self) -> None:
+        self.entries[7] = self.entries[7] + 1
+
+
+class _Locked(_Table, LockSynchronized):
+    def __init__(self, read: Callable[[Any], Any]) -> None:
+        _Table.__init__(self, read)
+        LockSynchronized.__init__(self)
+
+    @synchronized
+    def read(self) -> Any:
+        return self._read(self)
+
+    @synchronized
+    def write(self) -> None:
+        self._write()
+
+
+class _RLocked(_Table, RLockSynchronized):
+    def __init__(self, read: Callable[[Any], Any]) -> None:
+        _Table.__init__(self, read)
+        RLockSynchronized.__init__(self)
+
+    @synchronized
+    def read(self) -> Any:
+        return self._read(self)
+
+    @synchronized
+    def write(self) -> None:
+        self._write()
+
+
+class _ReadWriteLocked(_Table, ReadWriteLockSynchronized):
+    def __init__(self, read: Callable[[Any], Any], fair: bool = False) -> None:
+        _Table.__init__(self, read)
+        ReadWriteLockSynchronized.__init__(self, fair)
+
+    @read_synchronized
+    def read(self) -> Any:
+        return self._read(self)
+
+    @write_synchronized
+    def write(self) -> None:
+        self._write()
+
+
+class _OptimisticReadWriteLocked(_ReadWriteLocked):
+    @optimistic_read_synchronized
+    def read(self) -> Any:
+        return self._read(self)
+
+
+def _throughput(table: Any, n: int) -> float:
+    per_thread = n // _N_THREADS
+    barrier = threading.Barrier(_N_THREADS + 1)
+
+    def work() -> None:
+        read, write = table.read, table.write
+        barrier.wait()
+        for i in range(per_thread):
+            if i % 10 == 0:
+                write()
+            else:
+                read()
+
+    threads = [threading.Thread(target=work) for _ in range(_N_THREADS)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return per_thread * _N_THREADS / (time.perf_counter() - start) / 1e3
+
+
+def main(n: int = 320_000) -> None:
+    variants: Tuple[Tuple[str, Callable[[Callable[[Any], Any]], Any]], ...] = (
+        ("Lock", _Locked),
+        ("RLock", _RLocked),
+        ("ReadWriteLock", _ReadWriteLocked),
+        ("ReadWriteLock fair", lambda read: _ReadWriteLocked(read, fair=True)),
+        ("ReadWriteLock optimistic reads", _OptimisticReadWriteLocked),
+    )
+    for workload, read, n_ops in (("dict lookup", _lookup, n), ("sha256 16 KiB", _hash, n // 10)):
+        for name, table in variants:
+            report(f"{workload}: {name}", _throughput(table(read), n_ops), "K ops/s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
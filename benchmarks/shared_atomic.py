@@ -0,0 +1,84 @@
+"""
+Cost of the increments and the reads of a counter shared by processes, `multiprocessing.Value`
+compared with `SharedAtomicInteger`, unbatched and batched by 100, in one process and in 4
+processes incrementing the counter concurrently.
+
+Run with `python -m benchmarks.shared_atomic [n_increments]`.
+"""
+import multiprocessing
+import sys
+import time
+from typing import Any
+
+from benchmarks import per_element_ns, report
+from pycommons.base.atomic import SharedAtomicInteger
+
+
+def _work(kind: str, counter: Any, n: int) -> None:
+    if kind == "multiprocessing.Value":
+        for _ in range(n):
+            with counter.get_lock():
+                counter.value += 1
+    elif kind == "SharedAtomicInteger":
+        increment = counter.increment
+        for _ in range(n):
+            increment()
+    else:
+        with counter.batch(100) as batch:
+            increment = batch.increment
+            for _ in range(n):
+                increment()
+
+
+def _throughput(kind: str, counter: Any, n_processes: int, n: int) -> float:
+    context = multiprocessing.get_context("fork")
+    per_process = n // n_processes
+    processes = [
+        context.Process(target=_work, args=(kind, counter, per_process)) for _ in range(n_processes)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return per_process * n_processes / (time.perf_counter() - start) / 1e6
+
+
+def main(n: int = 1_000_000) -> None:
+    value = multiprocessing.Value("q", 0)
+    counter = SharedAtomicInteger.create()
+    try:
+        for kind, shared in (
+            ("multiprocessing.Value", value),
+            ("SharedAtomicInteger", counter),
+            ("SharedAtomicInteger batch(100)", counter),
+        ):
+            report(f"increment: {kind}", per_element_ns(lambda: _work(kind, shared, n), n), "ns/op")
+        r = range(n)
+        report(
+            "get: multiprocessing.Value",
+            per_element_ns(lambda: [value.value for _ in r], n),
+            "ns/op",
+        )
+        report(
+            "get: SharedAtomicInteger",
+            per_element_ns(lambda: [counter.get() for _ in r], n),
+            "ns/op",
+        )
+
+        for kind, shared in (
+            ("multiprocessing.Value", value),
+            ("SharedAtomicInteger", counter),
+            ("SharedAtomicInteger batch(100)", counter),
+        ):
+            with value.get_lock():
+                value.value = 0
+            counter.set(0)
+            report(f"4 processes: {kind}", _throughput(kind, shared, 4, n), "M ops/s")
+            assert (value.value if shared is value else counter.get()) == n // 4 * 4
+    finally:
+        counter.unlink()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,76 @@
+"""
+Lookups in a `Map` copied to every worker of a process pool compared with a `SharedMap`
+attached by name: lookup latency, memory held per process and cost of starting a task.
+
+Run with `python -m benchmarks.shared_map [n_entries] [n_tasks]`.
+"""
+import pickle
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Mapping
+
+from benchmarks import per_element_ns, report
+from pycommons.base.maps import Map, SharedMap
+
+
+def _lookup(_map: Mapping[str, Any], k: str) -> Any:
+    return _map.get(k)
+
+
+def _allocated(build: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        obj = build()
+        size = tracemalloc.get_traced_memory()[0]
+        del obj
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def _submit_all(executor: ProcessPoolExecutor, _map: Mapping[str, Any], n_tasks: int) -> float:
+    start = time.perf_counter()
+    for future in [executor.submit(_lookup, _map, "key1") for _ in range(n_tasks)]:
+        future.result()
+    return (time.perf_counter() - start) / n_tasks * 1e6
+
+
+def main(n: int = 100_000, n_tasks: int = 200) -> None:
+    data = {f"key{i}": {"id": i, "name": f"name{i}"} for i in range(n)}
+    keys = [f"key{i}" for i in range(0, n, 7)]
+    _map: Map[str, Any] = Map(data)
+
+    with SharedMap.create(data) as shared_map:
+        report(
+            "get: Map",
+            per_element_ns(lambda: [_map.get(k) for k in keys], len(keys)),
+            "ns/lookup",
+        )
+        report(
+            "get: SharedMap",
+            per_element_ns(lambda: [shared_map.get(k) for k in keys], len(keys)),
+            "ns/lookup",
+        )
+
+        report(
+            "memory: Map per process",
+            _allocated(lambda: Map(pickle.loads(pickle.dumps(data)))) / n,
+            "B/entry",
+        )
+        report("memory: SharedMap table, once", shared_map.table_size() / n, "B/entry")
+        report("task payload: Map", len(pickle.dumps(_map)), "B")
+        report("task payload: SharedMap", len(pickle.dumps(shared_map)), "B")
+
+        with ProcessPoolExecutor(2) as executor:
+            _submit_all(executor, {}, 10)
+            report("task: Map argument", _submit_all(executor, _map, n_tasks), "us/task")
+            report(
+                "task: SharedMap argument", _submit_all(executor, shared_map, n_tasks), "us/task"
+            )
+        shared_map.unlink()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,83 @@
+"""
+Range queries on a `SortedMap` compared with sorting the `key_set` of a `Map` on every query,
+as well as the cost of keeping the keys sorted on `put`, of bulk loading and of the
+comparators.
+
+Run with `python -m benchmarks.sorted_map [n_entries]`.
+"""
+import random
+import sys
+from typing import Dict, List
+
+from benchmarks import per_element_ns, report
+from pycommons.base.function.comparator import Comparator
+from pycommons.base.maps import Map, SortedMap
+
+
+def _range_by_sorting(_map: Map[int, int], low: int, high: int) -> List[int]:
+    return [k for k in sorted(_map.key_set()) if low <= k < high]
+
+
+def _range_by_sorted_map(sorted_map: SortedMap[int, int], low: int, high: int) -> List[int]:
+    return [entry.key for entry in sorted_map.stream(low, high).iterator()]
+
+
+def main(n: int = 100_000) -> None:
+    keys = list(range(n))
+    shuffled = keys.copy()
+    random.Random(42).shuffle(shuffled)
+    sorted_input: Dict[int, int] = {k: k for k in keys}
+    random_input: Dict[int, int] = {k: k for k in shuffled}
+
+    def _put(target: Map[int, int]) -> None:
+        for k in shuffled:
+            target.put(k, k)
+
+    report("put, random order: Map", per_element_ns(lambda: _put(Map()), n), "ns/op")
+    report("put, random order: SortedMap", per_element_ns(lambda: _put(SortedMap()), n), "ns/op")
+    report("bulk load, sorted: Map", per_element_ns(lambda: Map(sorted_input), n), "ns/entry")
+    report(
+        "bulk load, sorted: SortedMap",
+        per_element_ns(lambda: SortedMap(sorted_input), n),
+        "ns/entry",
+    )
+    report(
+        "bulk load, random: SortedMap",
+        per_element_ns(lambda: SortedMap(random_input), n),
+        "ns/entry",
+    )
+
+    _map: Map[int, int] = Map(random_input)
+    sorted_map: SortedMap[int, int] = SortedMap(random_input)
+    n_queries = 20
+    lows = [random.Random(i).randrange(n - 100) for i in range(n_queries)]
+    report(
+        "range of 100 keys: sorted(Map.key_set())",
+        per_element_ns(lambda: [_range_by_sorting(_map, lo, lo + 100) for lo in lows], n_queries),
+        "ns/query",
+    )
+    report(
+        "range of 100 keys: SortedMap.stream",
+        per_element_ns(
+            lambda: [_range_by_sorted_map(sorted_map, lo, lo + 100) for lo in lows], n_queries
+        ),
+        "ns/query",
+    )
+
+    comparators = {
+        "natural": None,
+        "Comparator.comparing": Comparator.comparing(lambda k: k),
+        "Comparator.comparing reversed": Comparator.comparing(lambda k: k).reversed(),
+        "Comparator.of": Comparator.of(lambda a, b: a - b),
+    }
+    for name, comparator in comparators.items():
+        compared: SortedMap[int, int] = SortedMap(random_input, comparator=comparator)
+        report(
+            f"floor_key: {name}",
+            per_element_ns(lambda: [compared.floor_key(k) for k in shuffled], n),
+            "ns/op",
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
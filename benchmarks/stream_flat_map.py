@@ -0,0 +1,60 @@
+"""
+Regression benchmark for `IteratorStream.flat_map` with a large number of inner streams.
+Reports the per-element cost and the peak memory of the lazy `flat_map`, and the per-element
+cost of the previous implementation (nested `chain` calls) on a smaller input, since its
+cost grows with the number of inner streams.
+
+Run with `python -m benchmarks.stream_flat_map [n_inner_streams]`.
+"""
+import sys
+import tracemalloc
+from typing import Any
+
+from benchmarks import per_element_ns, report
+from pycommons.base.function import Function
+from pycommons.base.streams import Streams, Stream, IteratorStream
+
+_INNER = Function.of(lambda t: Streams.of_two(t, t))
+
+
+def _chained_flat_map(stream: Stream[Any]) -> Stream[Any]:
+    chained: Stream[Any] = IteratorStream(iter(()))
+    for _t in stream.iterator():
+        chained = chained.chain(_INNER.apply(_t))
+    return chained
+
+
+def _peak_memory_kib(n: int) -> float:
+    tracemalloc.start()
+    Streams.flat(range(n)).flat_map(_INNER).count()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main(n: int = 1_000_000, n_chained: int = 2_000) -> None:
+    report(
+        f"lazy flat_map count ({n} inner streams)",
+        per_element_ns(lambda: Streams.flat(range(n)).flat_map(_INNER).count(), 2 * n, repeat=3),
+    )
+    report(
+        f"lazy flat_map find_first ({n} inner streams)",
+        per_element_ns(
+            lambda: Streams.flat(range(n)).flat_map(_INNER).find_first(lambda t: t == n - 1),
+            2 * n,
+            repeat=3,
+        ),
+    )
+    report(f"lazy flat_map peak memory ({n} inner streams)", _peak_memory_kib(n), "KiB")
+    report(
+        f"chained flat_map count ({n_chained} inner streams)",
+        per_element_ns(
+            lambda: _chained_flat_map(Streams.flat(range(n_chained))).count(),
+            2 * n_chained,
+            repeat=3,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
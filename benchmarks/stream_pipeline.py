@@ -0,0 +1,103 @@
+"""
+Per-element overhead of a multi stage `IteratorStream` pipeline compared with the
+generator-per-stage implementation that preceded the fused pipeline engine.
+
+Run with `python -m benchmarks.stream_pipeline [n_elements]`.
+"""
+import sys
+from typing import Iterator, Any, Callable
+
+from benchmarks import per_element_ns, report
+from pycommons.base.container import BooleanContainer, IntegerContainer
+from pycommons.base.function import Function, Predicate, Consumer
+from pycommons.base.streams import Streams
+
+
+class _GeneratorStream:
+    """
+    Reference implementation that wraps every stage in a generator and runs the terminal
+    operations through `Consumer`/container closures, as `IteratorStream` used to.
+    """
+
+    def __init__(self, iterator: Iterator[Any]):
+        self._iterator = iterator
+
+    def filter(self, predicate: Predicate[Any]) -> "_GeneratorStream":
+        def _filter() -> Iterator[Any]:
+            for _t in self._iterator:
+                if predicate(_t):
+                    yield _t
+
+        return _GeneratorStream(_filter())
+
+    def map(self, mapper: Function[Any, Any]) -> "_GeneratorStream":
+        def _map() -> Iterator[Any]:
+            for _t in self._iterator:
+                yield mapper.apply(_t)
+
+        return _GeneratorStream(_map())
+
+    def for_each(self, consumer: Consumer[Any], break_on_accept: Any = None) -> None:
+        for _t in self._iterator:
+            consumer.accept(_t)
+            if break_on_accept is not None and break_on_accept.test(_t):
+                break
+
+    def count(self) -> int:
+        stream_count = IntegerContainer()
+        self.for_each(Consumer.of(lambda t: stream_count.increment()))
+        return stream_count.get()
+
+    def any_match(self, predicate: Predicate[Any]) -> bool:
+        _match = BooleanContainer.with_false()
+
+        def _matcher(t: Any) -> None:
+            if predicate.test(t):
+                _match.true()
+
+        self.for_each(Consumer.of(_matcher), break_on_accept=Predicate.of(lambda t: _match.get()))
+        return _match.get()
+
+
+def _pipeline(stream: Any) -> Any:
+    return (
+        stream.map(Function.of(lambda t: t + 1))
+        .filter(Predicate.of(lambda t: t % 7 != 0))
+        .map(Function.of(lambda t: t * 2))
+        .filter(Predicate.of(lambda t: t % 3 != 0))
+        .map(Function.of(lambda t: t - 1))
+        .filter(Predicate.of(lambda t: t > 0))
+    )
+
+
+def _bench(name: str, run: Callable[[], Any], n: int) -> None:
+    report(name, per_element_ns(run, n))
+
+
+def main(n: int = 1_000_000) -> None:
+    never = Predicate.of(lambda t: t < 0)
+
+    _bench(
+        "generator pipeline count (6 stages)",
+        lambda: _pipeline(_GeneratorStream(iter(range(n)))).count(),
+        n,
+    )
+    _bench(
+        "fused pipeline count (6 stages)",
+        lambda: _pipeline(Streams.flat(range(n))).count(),
+        n,
+    )
+    _bench(
+        "generator pipeline any_match (no match)",
+        lambda: _pipeline(_GeneratorStream(iter(range(n)))).any_match(never),
+        n,
+    )
+    _bench(
+        "fused pipeline any_match (no match)",
+        lambda: _pipeline(Streams.flat(range(n))).any_match(never),
+        n,
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,275 @@
+"""
+Benchmark suite of the hot paths of pycommons-base: the per-element cost of the stream
+operations, the overhead of `@synchronized` and `@read_synchronized`,
+`Map.stream()`/`entry_set()`, `AtomicInteger`, `Char` and the latency of `ThreadContext.get`.
+
+The results are written as JSON and compared with a stored baseline. The run fails when a
+benchmark is slower than its baseline by more than the regression threshold.
+
+Run with `poe bench` or
+`python -m benchmarks.suite [--output FILE] [--baseline FILE] [--threshold 0.25] [-k NAME]`.
+Use `--update-baseline` to store the results of the run as the new baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks import per_element_ns, report
+from pycommons.base.atomic import AtomicInteger
+from pycommons.base.char import Char
+from pycommons.base.function import Function, Predicate
+from pycommons.base.maps import Map
+from pycommons.base.streams import Collectors, Streams
+from pycommons.base.synchronized import (
+    LockSynchronized,
+    ReadWriteLockSynchronized,
+    RLockSynchronized,
+    optimistic_read_synchronized,
+    read_synchronized,
+    synchronized,
+)
+from pycommons.base.threading import ThreadContext
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+Benchmark = Tuple[str, Callable[[], Any], int]
+"""
+The name of a benchmark, its body and the number of operations performed by a single call
+"""
+
+
+class _Plain:
+    def __init__(self) -> None:
+        self.value = 0
+
+    def increment(self) -> None:
+        self.value += 1
+
+
+class _Locked(LockSynchronized):
+    def __init__(self) -> None:
+        super().__init__()
+        self.value = 0
+
+    @synchronized
+    def increment(self) -> None:
+        self.value += 1
+
+
+class _RLocked(RLockSynchronized):
+    def __init__(self) -> None:
+        super().__init__()
+        self.value = 0
+
+    @synchronized
+    def increment(self) -> None:
+        self.value += 1
+
+
+class _ReadWriteLocked(ReadWriteLockSynchronized):
+    def __init__(self) -> None:
+        super().__init__()
+        self.value = 0
+
+    @read_synchronized
+    def get(self) -> int:
+        return self.value
+
+    @optimistic_read_synchronized
+    def get_optimistic(self) -> int:
+        return self.value
+
+
+def _repeat(method: Callable[[], Any], n: int) -> Callable[[], None]:
+    def _run() -> None:
+        for _ in range(n):
+            method()
+
+    return _run
+
+
+def stream_benchmarks(n: int) -> List[Benchmark]:
+    is_even = Predicate.of(lambda t: t % 2 == 0)
+    square = Function.of(lambda t: t * t)
+    return [
+        ("stream.count", lambda: Streams.flat(iter(range(n))).count(), n),
+        ("stream.filter", lambda: Streams.flat(range(n)).filter(is_even).count(), n),
+        ("stream.map", lambda: Streams.flat(range(n)).map(square).count(), n),
+        (
+            "stream.flat_map",
+            lambda: Streams.flat(range(n // 10)).flat_map(lambda t: Streams.of(*range(10))).count(),
+            n,
+        ),
+        ("stream.limit", lambda: Streams.flat(iter(range(n))).limit(n // 2).count(), n // 2),
+        ("stream.skip", lambda: Streams.flat(iter(range(n))).skip(n // 2).count(), n),
+        ("stream.batch", lambda: Streams.flat(range(n)).batch(64).count(), n),
+        ("stream.sorted", lambda: Streams.flat(range(n, 0, -1)).sorted().count(), n),
+        ("stream.distinct", lambda: Streams.flat(range(n)).map(square).distinct().count(), n),
+        ("stream.top_k", lambda: Streams.flat(range(n)).top_k(10).count(), n),
+        ("stream.for_each", lambda: Streams.flat(range(n)).for_each(lambda t: None), n),
+        ("stream.any_match", lambda: Streams.flat(range(n)).any_match(lambda t: t < 0), n),
+        ("stream.reduce", lambda: Streams.flat(range(n)).reduce(0, lambda a, b: a + b), n),
+        ("stream.collect.to_list", lambda: Streams.flat(range(n)).collect(Collectors.to_list()), n),
+        (
+            "stream.collect.grouping_by",
+            lambda: Streams.flat(range(n)).collect(Collectors.grouping_by(lambda t: t % 10)),
+            n,
+        ),
+    ]
+
+
+def synchronized_benchmarks(n: int) -> List[Benchmark]:
+    atomic = AtomicInteger()
+    read_write_locked = _ReadWriteLocked()
+    return [
+        ("synchronized.none", _repeat(_Plain().increment, n), n),
+        ("synchronized.lock", _repeat(_Locked().increment, n), n),
+        ("synchronized.rlock", _repeat(_RLocked().increment, n), n),
+        ("synchronized.read", _repeat(read_write_locked.get, n), n),
+        ("synchronized.optimistic_read", _repeat(read_write_locked.get_optimistic, n), n),
+        ("atomic_integer.increment", _repeat(atomic.increment, n), n),
+        ("atomic_integer.get", _repeat(atomic.get, n), n),
+        ("atomic_integer.compare_and_set", _repeat(lambda: atomic.compare_and_set(0, 0), n), n),
+    ]
+
+
+def map_benchmarks(n: int) -> List[Benchmark]:
+    _map: Map[int, int] = Map({i: i for i in range(n)})
+    return [
+        ("map.stream", lambda: _map.stream().count(), n),
+        ("map.entry_set", _map.entry_set, n),
+        ("map.key_set", _map.key_set, n),
+        ("map.get", _repeat(lambda: _map.get(n // 2), n), n),
+    ]
+
+
+def thread_context_benchmarks(n: int) -> List[Benchmark]:
+    ThreadContext.put("request_id", "abc")
+    return [
+        ("thread_context.get", _repeat(lambda: ThreadContext.get("request_id"), n), n),
+        ("thread_context.get_missing", _repeat(lambda: ThreadContext.get("missing"), n), n),
+    ]
+
+
+def char_benchmarks(n: int) -> List[Benchmark]:
+    return [
+        ("char.new", _repeat(lambda: Char("a"), n), n),
+        ("char.isupper", _repeat(Char("a").isupper, n), n),
+    ]
+
+
+def benchmarks(n: int) -> List[Benchmark]:
+    return (
+        stream_benchmarks(n)
+        + synchronized_benchmarks(n)
+        + map_benchmarks(n)
+        + thread_context_benchmarks(n)
+        + char_benchmarks(n)
+    )
+
+
+def run(n: int, repeat: int, pattern: Optional[str] = None) -> Dict[str, float]:
+    """
+    Run the benchmarks
+
+    Args:
+        n: Number of elements (or operations) of a single run
+        repeat: Number of runs of which the best time is kept
+        pattern: Run only the benchmarks whose name contains the pattern
+
+    Returns:
+        The time per operation in nanoseconds of every benchmark
+    """
+    results: Dict[str, float] = {}
+    for name, fn, n_ops in benchmarks(n):
+        if pattern is not None and pattern not in name:
+            continue
+        results[name] = per_element_ns(fn, n_ops, repeat)
+        report(name, results[name], "ns/op")
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> List[Tuple[str, float]]:
+    """
+    Compare the results with the baseline
+
+    Args:
+        results: Time per operation of the current run
+        baseline: Time per operation of the baseline
+        threshold: Maximum accepted slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        The names and the slowdown ratio of the benchmarks that exceed the threshold
+    """
+    regressions = []
+    for name, value in results.items():
+        if name in baseline and value > baseline[name] * (1 + threshold):
+            regressions.append((name, value / baseline[name]))
+    return regressions
+
+
+def _load(path: str) -> Dict[str, float]:
+    with open(path, encoding="utf-8") as baseline_file:
+        data: Dict[str, Any] = json.load(baseline_file)
+    return {name: result["value"] for name, result in data["results"].items()}
+
+
+def _dump(path: str, results: Dict[str, float], n: int) -> None:
+    data = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "n": n,
+        "results": {
+            name: {"value": round(value, 2), "unit": "ns/op"} for name, value in results.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as output_file:
+        json.dump(data, output_file, indent=2, sort_keys=True)
+        output_file.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000, help="elements per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks matching the pattern")
+    parser.add_argument("--output", help="write the results as JSON to the file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="maximum accepted slowdown over the baseline, e.g. 0.25 for 25%%",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="store the results as the baseline"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.n, args.repeat, args.pattern)
+    if args.output:
+        _dump(args.output, results, args.n)
+    if args.update_baseline:
+        _dump(args.baseline, results, args.n)
+        return 0
+
+    try:
+        baseline = _load(args.baseline)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.2f}x the baseline (threshold {1 + args.threshold}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,19 @@
 from .atomic import Atomic
 from .boolean import AtomicBoolean
 from .integer import AtomicInteger
+from .adder import LongAdder
+from .array import AtomicFieldUpdater, AtomicIntegerArray, AtomicReferenceArray
+from .shared import SharedAtomicBoolean, SharedAtomicInteger, SharedIntegerBatch
 
-__all__ = ["Atomic", "AtomicBoolean", "AtomicInteger"]
+__all__ = [
+    "Atomic",
+    "AtomicBoolean",
+    "AtomicInteger",
+    "LongAdder",
+    "AtomicIntegerArray",
+    "AtomicReferenceArray",
+    "AtomicFieldUpdater",
+    "SharedAtomicInteger",
+    "SharedAtomicBoolean",
+    "SharedIntegerBatch",
+]
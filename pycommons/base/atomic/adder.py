@@ -0,0 +1,189 @@
+import threading
+import weakref
+from typing import Set
+
+from pycommons.base.function import Supplier
+
+
+class _Cell:
+    """
+    The count of a thread. Only the thread writes `value`, and only the resets write `reset`,
+    the value of the cell at the last reset.
+    """
+
+    __slots__ = ("value", "reset")
+
+    def __init__(self) -> None:
+        self.value = 0
+        self.reset = 0
+
+
+class _Owner:
+    """
+    Held by the thread local storage of the thread of a cell, and released when the thread
+    exits
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+def _fold(adder_ref: "weakref.ref[LongAdder]", cell: _Cell) -> None:
+    """
+    Add the count of the cell of a thread that exited to the base of the adder, and drop the
+    cell
+    """
+    adder = adder_ref()
+    if adder is not None:
+        with adder._lock:  # pylint: disable=W0212
+            adder._base += cell.value - cell.reset  # pylint: disable=W0212
+            adder._cells.discard(cell)  # pylint: disable=W0212
+
+
+class LongAdder(Supplier[int]):
+    """
+    A counter for the sums updated by many threads, such as the metrics of a server. Every
+    thread adds to a cell of its own, so the updates do not take a lock and the threads do not
+    wait for each other; [`sum`][pycommons.base.atomic.LongAdder.sum] adds the cells up. An
+    [`AtomicInteger`][pycommons.base.atomic.AtomicInteger] takes a single lock on every update,
+    and is preferable when the value is read as often as it is updated, or when the updates
+    need the updated value.
+
+    The count of a thread that exits is added to the base of the adder and its cell is
+    dropped, so the adders updated by short-lived threads do not accumulate cells. The sum is
+    not an atomic snapshot: the updates made while it is computed may or may not be counted.
+    Provides the read methods of the
+    [`IntegerContainer`][pycommons.base.container.IntegerContainer].
+
+    Examples:
+        ```python
+        from concurrent.futures import ThreadPoolExecutor
+        from pycommons.base.atomic import LongAdder
+
+        requests = LongAdder()
+        with ThreadPoolExecutor(8) as executor:
+            for _ in range(1000):
+                executor.submit(requests.increment)
+
+        requests.sum()
+        # 1000
+        ```
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/atomic/LongAdder.html
+    """
+
+    def __init__(self, value: int = 0):
+        """
+        Args:
+            value: The initial value, zero by default
+        """
+        self._local = threading.local()
+        self._cells: Set[_Cell] = set()
+        self._base = value
+        self._lock = threading.Lock()
+
+    def _new_cell(self) -> _Cell:
+        cell = _Cell()
+        owner = _Owner()
+        with self._lock:
+            self._cells.add(cell)
+        weakref.finalize(owner, _fold, weakref.ref(self), cell)
+        self._local.owner = owner
+        self._local.cell = cell
+        return cell
+
+    def add(self, val: int) -> None:
+        """
+        Add a value to the counter
+
+        Args:
+            val: Value to be added
+        """
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        cell.value += val
+
+    def increment(self) -> None:
+        """
+        Increment the counter by one
+        """
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        cell.value += 1
+
+    def decrement(self) -> None:
+        """
+        Decrement the counter by one
+        """
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        cell.value -= 1
+
+    def sum(self) -> int:
+        """
+        Returns:
+            The sum of the values added to the counter since its creation or its last reset
+        """
+        # The lock excludes the folds of the cells of the threads that exit
+        with self._lock:
+            total = self._base
+            for cell in self._cells:
+                total += cell.value - cell.reset
+            return total
+
+    def reset(self) -> None:
+        """
+        Reset the counter to zero. The updates concurrent with the reset are counted either
+        before or after it, none of them is lost.
+        """
+        with self._lock:
+            self._base = 0
+            for cell in self._cells:
+                cell.reset = cell.value
+
+    def sum_then_reset(self) -> int:
+        """
+        Reset the counter to zero and return its value before the reset. The updates
+        concurrent with the reset are counted either in the value returned or after the
+        reset, none of them is lost.
+
+        Returns:
+            The sum of the counter before the reset
+        """
+        with self._lock:
+            total, self._base = self._base, 0
+            for cell in self._cells:
+                value = cell.value
+                total += value - cell.reset
+                cell.reset = value
+            return total
+
+    def get(self) -> int:
+        return self.sum()
+
+    def __int__(self) -> int:
+        return self.sum()
+
+    def __le__(self, other: int) -> bool:
+        return self.sum() <= other
+
+    def __lt__(self, other: int) -> bool:
+        return self.sum() < other
+
+    def __ge__(self, other: int) -> bool:
+        return self.sum() >= other
+
+    def __gt__(self, other: int) -> bool:
+        return self.sum() > other
+
+    def __eq__(self, other: object) -> bool:
+        return self.sum() == other
+
+    def __repr__(self) -> str:
+        return f"LongAdder({self.sum()})"
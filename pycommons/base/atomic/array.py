@@ -0,0 +1,365 @@
+import threading
+from array import array
+from typing import TypeVar, Generic, Any, Iterable, List, MutableSequence, Optional, Union
+
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
+
+_T = TypeVar("_T")
+_U = TypeVar("_U")
+
+_STRIPES = 16
+
+
+class _AtomicArray(Generic[_T]):
+    """
+    Base class of the atomic arrays. The writes of an index hold one of `stripes` locks,
+    chosen by the index, so the writes of different indexes rarely wait for each other and the
+    array does not hold a lock per element. The reads do not take a lock.
+    """
+
+    def __init__(self, values: MutableSequence[Any], stripes: int):
+        if stripes < 1:
+            raise ValueError("stripes must be a positive integer")
+        n_locks = 1
+        while n_locks < stripes:
+            n_locks *= 2
+        self._values = values
+        self._locks = [threading.Lock() for _ in range(n_locks)]
+        self._mask = n_locks - 1
+
+    def _lock(self, i: int) -> Any:
+        if i < 0:
+            i += len(self._values)
+        return self._locks[i & self._mask]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def length(self) -> int:
+        return len(self._values)
+
+    def get(self, i: int) -> _T:
+        """
+        Args:
+            i: Index
+
+        Returns:
+            The value at the index
+        """
+        return self._values[i]  # type: ignore
+
+    def set(self, i: int, t: _T) -> None:
+        """
+        Set the value at an index
+
+        Args:
+            i: Index
+            t: The new value
+        """
+        with self._lock(i):
+            self._values[i] = t
+
+    def get_and_set(self, i: int, t: _T) -> _T:
+        """
+        Set the value at an index and return the previous value
+
+        Args:
+            i: Index
+            t: The new value
+
+        Returns:
+            The previous value
+        """
+        with self._lock(i):
+            old_value = self._values[i]
+            self._values[i] = t
+            return old_value  # type: ignore
+
+    def _matches(self, value: Any, expected: Any) -> bool:
+        return value is expected
+
+    def compare_and_set(self, i: int, expected: _T, t: _T) -> bool:
+        """
+        Set the value at an index if it is the expected value
+
+        Args:
+            i: Index
+            expected: The value expected at the index
+            t: The new value
+
+        Returns:
+            True if the value was set, False if the index held another value
+        """
+        with self._lock(i):
+            if not self._matches(self._values[i], expected):
+                return False
+            self._values[i] = t
+            return True
+
+    def update_and_get(self, i: int, function: FunctionType[_T, _T]) -> _T:
+        """
+        Atomically replace the value at an index with the result of a function applied to it.
+        The function is called without the lock and applied again if the index was written
+        meanwhile, it should not have side effects.
+
+        Args:
+            i: Index
+            function: Function that returns the new value from the current value
+
+        Returns:
+            The new value
+        """
+        _function = function.apply if isinstance(function, Function) else function
+        lock, values = self._lock(i), self._values
+        while True:
+            current = values[i]
+            updated = _function(current)
+            with lock:
+                if self._matches(values[i], current):
+                    values[i] = updated
+                    return updated
+
+    def accumulate_and_get(self, i: int, x: _U, function: BiFunctionType[_T, _U, _T]) -> _T:
+        """
+        Atomically replace the value at an index with the result of a function applied to it
+        and to `x`. The function may be applied several times, it should not have side effects.
+
+        Args:
+            i: Index
+            x: The second argument of the function
+            function: Function that returns the new value from the current value and `x`
+
+        Returns:
+            The new value
+        """
+        _function = function.apply if isinstance(function, BiFunction) else function
+        return self.update_and_get(i, lambda current: _function(current, x))
+
+    def snapshot(self) -> List[_T]:
+        """
+        Returns:
+            A list of the values of the array
+        """
+        return list(self._values)
+
+    def __iter__(self) -> Any:
+        return iter(self.snapshot())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.snapshot()})"
+
+
+class AtomicIntegerArray(_AtomicArray[int]):
+    """
+    An array of 64-bit signed integers that are updated atomically, stored in an `array('q')`:
+    an element takes 8 bytes instead of the objects and the lock of an
+    [`AtomicInteger`][pycommons.base.atomic.AtomicInteger]. The writes hold one of `stripes`
+    locks, the reads do not take a lock. A write of a value out of the 64-bit range raises
+    `OverflowError`.
+
+    Examples:
+        ```python
+        from pycommons.base.atomic import AtomicIntegerArray
+
+        histogram = AtomicIntegerArray(10)
+        histogram.increment_and_get(3)
+        histogram.add_and_get(3, 5)
+        # 6
+        histogram.compare_and_set(3, 6, 0)
+        # True
+        ```
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/atomic/AtomicIntegerArray.html
+    """
+
+    def __init__(self, values: Union[int, Iterable[int]], stripes: int = _STRIPES):
+        """
+        Args:
+            values: The length of the array, initialized with zeros, or the initial values
+            stripes: Number of locks shared by the indexes, rounded up to a power of two
+        """
+        super().__init__(
+            array("q", bytes(8 * values)) if isinstance(values, int) else array("q", values),
+            stripes,
+        )
+
+    def _matches(self, value: Any, expected: Any) -> bool:
+        # The integers read from an array are new objects, they are compared by value
+        return bool(value == expected)
+
+    def add_and_get(self, i: int, delta: int) -> int:
+        """
+        Add a value to the value at an index and return the result
+
+        Args:
+            i: Index
+            delta: Value to be added
+
+        Returns:
+            The value after the addition
+        """
+        values = self._values
+        with self._locks[i & self._mask] if i >= 0 else self._lock(i):
+            value = values[i] + delta
+            values[i] = value
+            return value  # type: ignore
+
+    def get_and_add(self, i: int, delta: int) -> int:
+        """
+        Add a value to the value at an index and return the previous value
+
+        Args:
+            i: Index
+            delta: Value to be added
+
+        Returns:
+            The value before the addition
+        """
+        values = self._values
+        with self._locks[i & self._mask] if i >= 0 else self._lock(i):
+            old_value = values[i]
+            values[i] = old_value + delta
+            return old_value  # type: ignore
+
+    def increment_and_get(self, i: int) -> int:
+        return self.add_and_get(i, 1)
+
+    def decrement_and_get(self, i: int) -> int:
+        return self.add_and_get(i, -1)
+
+    def snapshot(self) -> List[int]:
+        return self._values.tolist()  # type: ignore
+
+
+class AtomicReferenceArray(_AtomicArray[Optional[_T]]):
+    """
+    An array of references that are updated atomically, stored in a list. The writes hold
+    one of `stripes` locks, the reads do not take a lock.
+    [`compare_and_set`][pycommons.base.atomic.AtomicReferenceArray.compare_and_set] compares
+    the references by identity.
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/atomic/AtomicReferenceArray.html
+    """
+
+    def __init__(self, values: Union[int, Iterable[Optional[_T]]], stripes: int = _STRIPES):
+        """
+        Args:
+            values: The length of the array, initialized with None, or the initial values
+            stripes: Number of locks shared by the indexes, rounded up to a power of two
+        """
+        super().__init__([None] * values if isinstance(values, int) else list(values), stripes)
+
+
+class AtomicFieldUpdater(Generic[_T]):
+    """
+    Updates an attribute of many objects atomically, with `stripes` locks shared by all the
+    objects and chosen by the identity of the object, so that the objects do not need a lock
+    or an [`Atomic`][pycommons.base.atomic.Atomic] each. The reads do not take a lock.
+    [`compare_and_set`][pycommons.base.atomic.AtomicFieldUpdater.compare_and_set] compares
+    the values by equality. The attribute must only be written through the updater.
+
+    Examples:
+        ```python
+        from pycommons.base.atomic import AtomicFieldUpdater
+
+        class Shard:
+            __slots__ = ("hits",)
+
+            def __init__(self):
+                self.hits = 0
+
+        hits = AtomicFieldUpdater("hits")
+        shard = Shard()
+        hits.add_and_get(shard, 2)
+        # 2
+        ```
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/atomic/AtomicIntegerFieldUpdater.html
+    """
+
+    def __init__(self, name: str, stripes: int = _STRIPES):
+        """
+        Args:
+            name: Name of the attribute
+            stripes: Number of locks shared by the objects, rounded up to a power of two
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be a positive integer")
+        n_locks = 1
+        while n_locks < stripes:
+            n_locks *= 2
+        self._name = name
+        self._locks = [threading.Lock() for _ in range(n_locks)]
+        self._mask = n_locks - 1
+
+    def _lock(self, obj: Any) -> Any:
+        # The low bits of the identities are the same for all the objects, due to alignment
+        return self._locks[(id(obj) >> 4) & self._mask]
+
+    def get(self, obj: Any) -> _T:
+        return getattr(obj, self._name)  # type: ignore
+
+    def set(self, obj: Any, t: _T) -> None:
+        with self._lock(obj):
+            setattr(obj, self._name, t)
+
+    def get_and_set(self, obj: Any, t: _T) -> _T:
+        with self._lock(obj):
+            old_value = getattr(obj, self._name)
+            setattr(obj, self._name, t)
+            return old_value  # type: ignore
+
+    def compare_and_set(self, obj: Any, expected: _T, t: _T) -> bool:
+        """
+        Set the attribute of an object if it is equal to the expected value
+
+        Args:
+            obj: The object
+            expected: The value expected
+            t: The new value
+
+        Returns:
+            True if the value was set, False if the attribute held another value
+        """
+        with self._lock(obj):
+            if getattr(obj, self._name) != expected:
+                return False
+            setattr(obj, self._name, t)
+            return True
+
+    def add_and_get(self, obj: Any, delta: Any) -> _T:
+        """
+        Add a value to the attribute of an object and return the result
+
+        Args:
+            obj: The object
+            delta: Value to be added
+
+        Returns:
+            The value after the addition
+        """
+        with self._lock(obj):
+            value = getattr(obj, self._name) + delta
+            setattr(obj, self._name, value)
+            return value  # type: ignore
+
+    def update_and_get(self, obj: Any, function: FunctionType[_T, _T]) -> _T:
+        """
+        Atomically replace the attribute of an object with the result of a function applied
+        to it. The function is called with the lock held, it must not use the updater.
+
+        Args:
+            obj: The object
+            function: Function that returns the new value from the current value
+
+        Returns:
+            The new value
+        """
+        _function = function.apply if isinstance(function, Function) else function
+        with self._lock(obj):
+            value = _function(getattr(obj, self._name))
+            setattr(obj, self._name, value)
+            return value
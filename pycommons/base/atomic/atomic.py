@@ -1,21 +1,27 @@
-from typing import TypeVar, Generic, Optional
+from typing import TypeVar, Generic, Optional, Tuple
 
 from pycommons.base.container import Container
-from pycommons.base.synchronized import RLockSynchronized, synchronized
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
+from pycommons.base.synchronized import LockSynchronized
 
 _T = TypeVar("_T")
+_U = TypeVar("_U")
 
 
-class Atomic(Container[_T], RLockSynchronized, Generic[_T]):
+class Atomic(Container[_T], LockSynchronized, Generic[_T]):
     """
     Atomic mutable container, that holds a value in the object
-    and only allows synchronized read and write.
+    and only allows atomic read and write.
     This implementation is thread-safe and can be used across multiple threads.
     If the container is used only on a single thread, consider
     using the [Container][pycommons.base.container], and it's derived classes.
 
-    The object is held on a re-entrant lock during reads and writes
-    and is unlocked after the operation is complete.
+    The writes hold a lock and are atomic with respect to each other. The reads do not take
+    the lock: reading the reference held by the container is atomic, so a read returns the
+    value of the last completed write.
+    [`compare_and_set`][pycommons.base.atomic.Atomic.compare_and_set] writes a value only if
+    the container still holds the expected one, and the `update` and `accumulate` methods
+    retry it until the value they computed is written.
 
     References:
         https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/atomic/AtomicReference.html
@@ -23,20 +29,116 @@ class Atomic(Container[_T], RLockSynchronized, Generic[_T]):
 
     def __init__(self, t: Optional[_T] = None):
         super().__init__(t)
-        RLockSynchronized.__init__(self)
+        LockSynchronized.__init__(self)
 
-    @synchronized
-    def get(self) -> Optional[_T]:
-        return super().get()
+    def set(self, t: Optional[_T]) -> None:
+        with self._lock:
+            self._object = t
 
-    @synchronized
-    def set(self, t: _T) -> None:
-        super().set(t)
-
-    @synchronized
     def set_and_get(self, t: Optional[_T]) -> Optional[_T]:
-        return super().set_and_get(t)
+        with self._lock:
+            self._object = t
+            return t
 
-    @synchronized
     def get_and_set(self, t: Optional[_T]) -> Optional[_T]:
-        return super().get_and_set(t)
+        with self._lock:
+            old_object = self._object
+            self._object = t
+            return old_object
+
+    def compare_and_set(self, expected: Optional[_T], t: Optional[_T]) -> bool:
+        """
+        Set the value of the container if it is the expected object. The objects are compared
+        by identity, like the references of `AtomicReference`.
+
+        Args:
+            expected: The object the container is expected to hold
+            t: The new value
+
+        Returns:
+            True if the value was set, False if the container held another object
+        """
+        with self._lock:
+            if self._object is not expected:
+                return False
+            self._object = t
+            return True
+
+    def _update(
+        self, function: FunctionType[Optional[_T], Optional[_T]]
+    ) -> Tuple[Optional[_T], Optional[_T]]:
+        """
+        Apply a function to the current value until its result is written, and return the
+        previous and the new value. The function is called without the lock, so it is applied
+        again when another thread wrote the container meanwhile.
+        """
+        _function = function.apply if isinstance(function, Function) else function
+        while True:
+            current = self._object
+            updated = _function(current)
+            with self._lock:
+                if self._object is current:
+                    self._object = updated
+                    return current, updated
+
+    def update_and_get(self, function: FunctionType[Optional[_T], Optional[_T]]) -> Optional[_T]:
+        """
+        Atomically replace the value with the result of a function applied to it. The function
+        may be applied several times when the container is written concurrently, it should
+        not have side effects.
+
+        Args:
+            function: Function that returns the new value from the current value
+
+        Returns:
+            The new value
+        """
+        return self._update(function)[1]
+
+    def get_and_update(self, function: FunctionType[Optional[_T], Optional[_T]]) -> Optional[_T]:
+        """
+        Same as [`update_and_get`][pycommons.base.atomic.Atomic.update_and_get], but returns
+        the previous value.
+
+        Args:
+            function: Function that returns the new value from the current value
+
+        Returns:
+            The previous value
+        """
+        return self._update(function)[0]
+
+    def accumulate_and_get(
+        self, x: _U, function: BiFunctionType[Optional[_T], _U, Optional[_T]]
+    ) -> Optional[_T]:
+        """
+        Atomically replace the value with the result of a function applied to it and to `x`.
+        The function may be applied several times when the container is written concurrently,
+        it should not have side effects.
+
+        Args:
+            x: The second argument of the function
+            function: Function that returns the new value from the current value and `x`
+
+        Returns:
+            The new value
+        """
+        _function = function.apply if isinstance(function, BiFunction) else function
+        return self._update(lambda current: _function(current, x))[1]
+
+    def get_and_accumulate(
+        self, x: _U, function: BiFunctionType[Optional[_T], _U, Optional[_T]]
+    ) -> Optional[_T]:
+        """
+        Same as [`accumulate_and_get`][pycommons.base.atomic.Atomic.accumulate_and_get], but
+        returns the previous value.
+
+        Args:
+            x: The second argument of the function
+            function: Function that returns the new value from the current value and `x`
+
+        Returns:
+            The previous value
+        """
+        _function = function.apply if isinstance(function, BiFunction) else function
+        return self._update(lambda current: _function(current, x))[0]
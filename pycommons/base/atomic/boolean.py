@@ -2,30 +2,38 @@ from __future__ import annotations
 
 from pycommons.base.atomic.atomic import Atomic
 from pycommons.base.container.boolean import BooleanContainer
-from pycommons.base.synchronized import synchronized
 
 
 class AtomicBoolean(BooleanContainer, Atomic[bool]):  # pylint: disable=R0901
     """
     Atomic Boolean Container that allows atomic update of the container value.
-    The object is synchronized for read and write operations so that only one read/write
-    happens at a time. This is ensured using re-entrant locks. Provides
-    all the functionalities provided by the
+    The writes hold the lock of the container so that only one write happens at a time, the
+    reads do not take it. Provides all the functionalities provided by the
     [BooleanContainer][pycommons.base.container.BooleanContainer]
 
     """
 
-    @synchronized
-    def true(self) -> bool:
-        return super().true()
-
-    @synchronized
-    def false(self) -> bool:
-        return super().false()
-
-    @synchronized
     def compliment(self) -> bool:
-        return super().compliment()
+        with self._lock:
+            self._object = not self._object
+            return self._object
+
+    def compare_and_set(self, expected: bool, t: bool) -> bool:  # type: ignore
+        """
+        Set the value of the container if it is equal to the expected value
+
+        Args:
+            expected: The value the container is expected to hold
+            t: The new value
+
+        Returns:
+            True if the value was set, False if the container held another value
+        """
+        with self._lock:
+            if self._object != expected:
+                return False
+            self._object = t
+            return True
 
     @classmethod
     def with_true(cls) -> AtomicBoolean:
@@ -35,6 +43,5 @@ class AtomicBoolean(BooleanContainer, Atomic[bool]):  # pylint: disable=R0901
     def with_false(cls) -> AtomicBoolean:
         return cls(False)
 
-    @synchronized
     def get(self) -> bool:
-        return super().get()
+        return self._object  # type: ignore
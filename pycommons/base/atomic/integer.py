@@ -1,69 +1,48 @@
 from pycommons.base.atomic.atomic import Atomic
-from pycommons.base.synchronized import synchronized
 from pycommons.base.container import IntegerContainer
 
 
 class AtomicInteger(IntegerContainer, Atomic[int]):  # pylint: disable=R0901
-    @synchronized
+    """
+    Atomic Integer Container that allows atomic update of the container value. The additions
+    hold the lock of the container once, the increments and the subtractions are additions.
+    The reads and the comparisons do not take the lock.
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/atomic/AtomicInteger.html
+    """
+
     def add(self, val: int) -> None:
-        return super().add(val)
+        with self._lock:
+            self._object += val  # type: ignore
 
-    @synchronized
     def add_and_get(self, val: int) -> int:
-        return super().add_and_get(val)
+        with self._lock:
+            self._object += val  # type: ignore
+            return self._object
 
-    @synchronized
     def get_and_add(self, val: int) -> int:
-        return super().get_and_add(val)
-
-    @synchronized
-    def increment(self) -> None:
-        return super().increment()
-
-    @synchronized
-    def increment_and_get(self) -> int:
-        return super().increment_and_get()
-
-    @synchronized
-    def get_and_increment(self) -> int:
-        return super().get_and_increment()
-
-    @synchronized
-    def subtract(self, val: int) -> None:
-        return super().subtract(val)
-
-    @synchronized
-    def subtract_and_get(self, val: int) -> int:
-        return super().subtract_and_get(val)
+        with self._lock:
+            old_value = self._object
+            self._object = old_value + val  # type: ignore
+            return old_value  # type: ignore
+
+    def compare_and_set(self, expected: int, t: int) -> bool:  # type: ignore
+        """
+        Set the value of the container if it is equal to the expected value
+
+        Args:
+            expected: The value the container is expected to hold
+            t: The new value
+
+        Returns:
+            True if the value was set, False if the container held another value
+        """
+        with self._lock:
+            if self._object != expected:
+                return False
+            self._object = t
+            return True
 
-    @synchronized
-    def get_and_subtract(self, val: int) -> int:
-        return super().get_and_subtract(val)
-
-    @synchronized
     def get(self) -> int:
-        return super().get()
-
-    @synchronized
-    def __int__(self) -> int:
-        return super().__int__()
-
-    @synchronized
-    def __le__(self, other: int) -> bool:
-        return super().__le__(other)
-
-    @synchronized
-    def __lt__(self, other: int) -> bool:
-        return super().__lt__(other)
-
-    @synchronized
-    def __ge__(self, other: int) -> bool:
-        return super().__ge__(other)
-
-    @synchronized
-    def __gt__(self, other: int) -> bool:
-        return super().__gt__(other)
-
-    @synchronized
-    def __eq__(self, other: object) -> bool:
-        return super().__eq__(other)
+        return self._object  # type: ignore
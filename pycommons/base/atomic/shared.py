@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import os
+import secrets
+import struct
+import threading
+import weakref
+from multiprocessing import shared_memory
+from typing import TypeVar, Any, Optional, Tuple, Type
+
+from pycommons.base.container import BooleanContainer, IntegerContainer
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.maps.shared import _open, _tracker_id, _untrack
+
+if os.name == "posix":
+    import fcntl
+
+    import _posixshmem  # type: ignore
+
+_S = TypeVar("_S", bound="_SharedValue")
+
+_BLOCK = struct.Struct("<qQ")
+"""
+Shared memory block of a value: the value, and the resource tracker of the creator
+"""
+
+
+class _ProcessLock:
+    """
+    Excludes the threads of the process with a lock, and the other processes with an exclusive
+    `flock` on the file descriptor of the block. The locks of `flock` belong to the open file,
+    which a forked process shares with its parent, so the file is opened again after a fork.
+    """
+
+    __slots__ = ("_lock", "fd", "_owned")
+
+    def __init__(self, fd: int):
+        self._lock = threading.Lock()
+        self.fd = fd
+        self._owned = False
+
+    def reopen(self, path: str) -> None:
+        """
+        Open the file again, in a forked process. The lock of the threads is replaced, the
+        thread that held it in the parent does not exist in the child.
+        """
+        self._lock = threading.Lock()
+        self.fd = _posixshmem.shm_open(path, os.O_RDWR, mode=0o600)
+        self._owned = True
+
+    def close(self) -> None:
+        """
+        Close the file if it was opened again, the file of the block is closed with the block
+        """
+        if self._owned:
+            self._owned = False
+            os.close(self.fd)
+
+    def __enter__(self) -> None:
+        self._lock.acquire()
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def __exit__(self, *args: Any) -> None:
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+
+class _SharedValue:
+    """
+    A 64-bit integer in a shared memory block. The writes hold a `_ProcessLock`, the reads do
+    not take it: an aligned 8 bytes load of the value is atomic.
+    """
+
+    # The values are not hashable, they compare by value
+    _instances: "weakref.WeakValueDictionary[int, _SharedValue]" = weakref.WeakValueDictionary()
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        if os.name != "posix":
+            raise NotImplementedError("The shared atomics require a POSIX system")
+        self._shm = shm
+        self._owner = owner
+        # The block is tracked only by the resource tracker of the creator, which destroys it
+        # if the creator exits without unlinking it
+        self._track = owner or _BLOCK.unpack_from(shm.buf, 0)[1] == _tracker_id()
+        if not self._track:
+            _untrack(shm)
+        self._view = shm.buf.cast("q")
+        self._lock = _ProcessLock(shm._fd)  # type: ignore
+        # The view must be released before the block is closed, also when the value is not
+        # closed explicitly, such as the copies unpickled by the workers of a pool
+        self._finalizer = weakref.finalize(
+            self, _release, self._view, self._lock, shm, os.getpid() if owner else 0
+        )
+        _SharedValue._instances[id(self)] = self
+
+    @staticmethod
+    def _create_block(value: int, name: Optional[str]) -> shared_memory.SharedMemory:
+        shm = _open(name or f"pcsa_{os.getpid()}_{secrets.token_hex(4)}", _BLOCK.size)
+        _BLOCK.pack_into(shm.buf, 0, value, _tracker_id())
+        return shm
+
+    @classmethod
+    def attach(cls: Type[_S], name: str) -> _S:
+        """
+        Attach a shared atomic created by another process
+
+        Args:
+            name: Name of the atomic
+
+        Returns:
+            The shared atomic
+        """
+        return cls(_open(name), False)
+
+    @property
+    def name(self) -> str:
+        return str(self._shm.name)
+
+    def _reopen(self) -> None:
+        self._lock.reopen("/" + self.name)
+
+    def __contains__(self, item: object) -> bool:
+        return bool(self._view[0] == item)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        return type(self).attach, (self.name,)
+
+    def __enter__(self: _S) -> _S:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Detach the atomic from the current process. The atomic must not be used after being
+        closed. An atomic that is garbage collected is closed, and unlinked if the current
+        process created it.
+        """
+        _SharedValue._instances.pop(id(self), None)
+        finalizer = self._finalizer.detach()
+        if finalizer is not None:
+            view, lock, shm, _ = finalizer[2]
+            _release(view, lock, shm, 0)
+
+    def unlink(self) -> None:
+        """
+        Destroy the shared memory block of the atomic and close the atomic. The processes that
+        attached the atomic can use it until they close it.
+
+        Raises:
+            IllegalStateException: if the current process did not create the atomic
+        """
+        if not self._owner:
+            raise IllegalStateException("Only the process that created the atomic can unlink it")
+        self._shm.unlink()
+        self.close()
+
+
+def _release(
+    view: memoryview, lock: _ProcessLock, shm: shared_memory.SharedMemory, creator: int
+) -> None:
+    """
+    Close a shared value, and unlink its block if it is released by the process that created
+    it. The processes forked by the creator inherit the value but do not unlink it.
+    """
+    view.release()
+    lock.close()
+    shm.close()
+    if creator == os.getpid():
+        shm.unlink()
+
+
+def _reopen_after_fork() -> None:
+    for value in list(_SharedValue._instances.values()):  # pylint: disable=W0212
+        value._reopen()  # pylint: disable=W0212
+
+
+if os.name == "posix":
+    os.register_at_fork(after_in_child=_reopen_after_fork)
+
+
+class SharedIntegerBatch:
+    """
+    Accumulates the additions to a
+    [`SharedAtomicInteger`][pycommons.base.atomic.SharedAtomicInteger] in the current process,
+    and adds them to the shared value once their sum reaches the size of the batch, so that one
+    cross-process lock is taken for `size` increments. The additions
+    pending in the batch are not seen by the other processes until they are flushed; the batch
+    is flushed when it is used as a context manager and exits. A batch can be used by several
+    threads.
+    """
+
+    def __init__(self, integer: SharedAtomicInteger, size: int):
+        """
+        Args:
+            integer: The shared integer the additions are flushed to
+            size: Absolute value of the sum of the pending additions that triggers a flush
+        """
+        if size < 1:
+            raise ValueError("size must be a positive integer")
+        self._integer = integer
+        self._size = size
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def add(self, val: int) -> None:
+        """
+        Add a value to the batch, and flush the batch if its sum reached the size
+
+        Args:
+            val: Value to be added
+        """
+        with self._lock:
+            pending = self._pending + val
+            if -self._size < pending < self._size:
+                self._pending = pending
+                return
+            self._pending = 0
+            self._integer.add(pending)
+
+    def increment(self) -> None:
+        with self._lock:
+            pending = self._pending + 1
+            if pending < self._size:
+                self._pending = pending
+                return
+            self._pending = 0
+            self._integer.add(pending)
+
+    def decrement(self) -> None:
+        self.add(-1)
+
+    def pending(self) -> int:
+        """
+        Returns:
+            The sum of the additions not flushed yet
+        """
+        return self._pending
+
+    def flush(self) -> int:
+        """
+        Add the pending additions to the shared integer
+
+        Returns:
+            The value of the shared integer after the flush
+        """
+        with self._lock:
+            pending, self._pending = self._pending, 0
+            return self._integer.add_and_get(pending)
+
+    def __enter__(self) -> SharedIntegerBatch:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.flush()
+
+
+class SharedAtomicInteger(_SharedValue, IntegerContainer):  # pylint: disable=R0901
+    """
+    An [`AtomicInteger`][pycommons.base.atomic.AtomicInteger] shared by processes, such as the
+    workers of a pre-fork server or of a `ProcessPoolExecutor`. The value is a signed 64-bit
+    integer in a `multiprocessing.shared_memory` block; a write of a value out of this range
+    raises `ValueError`. The writes hold a lock of the process and an exclusive `flock` on the
+    block, the reads do not take a lock.
+
+    A process creates the integer with
+    [`SharedAtomicInteger.create`][pycommons.base.atomic.SharedAtomicInteger.create], the
+    forked processes inherit it, and the other processes
+    [`attach`][pycommons.base.atomic.SharedAtomicInteger.attach] it by name. It is pickled as
+    its name, so it can be passed to the tasks of a `ProcessPoolExecutor`. The creator must
+    [`unlink`][pycommons.base.atomic.SharedAtomicInteger.unlink] it when it is not used
+    anymore; the integer is unlinked if the creator drops it without closing it. The copies
+    that are dropped in the other processes are closed.
+
+    Every write costs two system calls. A counter that is updated much more often than it is
+    read can [`batch`][pycommons.base.atomic.SharedAtomicInteger.batch] the increments of
+    each process.
+
+    Examples:
+        ```python
+        from concurrent.futures import ProcessPoolExecutor
+        from pycommons.base.atomic import SharedAtomicInteger
+
+        def work(counter):
+            with counter.batch(100) as batch:
+                for _ in range(1000):
+                    batch.increment()
+
+        with SharedAtomicInteger.create() as counter:
+            with ProcessPoolExecutor(4) as executor:
+                for _ in range(4):
+                    executor.submit(work, counter)
+            counter.get()
+            # 4000
+            counter.unlink()
+        ```
+    """
+
+    @classmethod
+    def create(cls, value: int = 0, name: Optional[str] = None) -> SharedAtomicInteger:
+        """
+        Create a shared integer
+
+        Args:
+            value: The initial value, zero by default
+            name: Name of the integer, used by the other processes to attach it. A unique name
+                is generated if None.
+
+        Returns:
+            The shared integer, owned by the current process
+        """
+        return cls(cls._create_block(value, name), True)
+
+    def get(self) -> int:
+        return self._view[0]
+
+    def set(self, t: int) -> None:  # type: ignore
+        with self._lock:
+            self._view[0] = t
+
+    def set_and_get(self, t: int) -> int:  # type: ignore
+        with self._lock:
+            self._view[0] = t
+            return t
+
+    def get_and_set(self, t: int) -> int:  # type: ignore
+        with self._lock:
+            old_value = self._view[0]
+            self._view[0] = t
+            return old_value
+
+    def add(self, val: int) -> None:
+        with self._lock:
+            self._view[0] += val
+
+    def add_and_get(self, val: int) -> int:
+        view = self._view
+        with self._lock:
+            value = view[0] + val
+            view[0] = value
+            return value
+
+    def get_and_add(self, val: int) -> int:
+        view = self._view
+        with self._lock:
+            old_value = view[0]
+            view[0] = old_value + val
+            return old_value
+
+    def compare_and_set(self, expected: int, t: int) -> bool:
+        """
+        Set the value if it is equal to the expected value
+
+        Args:
+            expected: The value the integer is expected to hold
+            t: The new value
+
+        Returns:
+            True if the value was set, False if the integer held another value
+        """
+        view = self._view
+        with self._lock:
+            if view[0] != expected:
+                return False
+            view[0] = t
+            return True
+
+    def batch(self, size: int = 100) -> SharedIntegerBatch:
+        """
+        Create a batch of additions to the integer for the current process
+
+        Args:
+            size: Absolute value of the sum of the pending additions that triggers a flush
+
+        Returns:
+            The batch
+        """
+        return SharedIntegerBatch(self, size)
+
+    def __repr__(self) -> str:
+        return f"SharedAtomicInteger({self.get()})"
+
+
+class SharedAtomicBoolean(_SharedValue, BooleanContainer):  # pylint: disable=R0901
+    """
+    An [`AtomicBoolean`][pycommons.base.atomic.AtomicBoolean] shared by processes, such as a
+    stop flag of the workers of a pool. It is created, attached, pickled and unlinked like a
+    [`SharedAtomicInteger`][pycommons.base.atomic.SharedAtomicInteger].
+    """
+
+    @classmethod
+    def create(cls, flag: bool = False, name: Optional[str] = None) -> SharedAtomicBoolean:
+        """
+        Create a shared boolean
+
+        Args:
+            flag: The initial value, False by default
+            name: Name of the boolean, used by the other processes to attach it. A unique name
+                is generated if None.
+
+        Returns:
+            The shared boolean, owned by the current process
+        """
+        return cls(cls._create_block(int(flag), name), True)
+
+    @classmethod
+    def with_true(cls) -> SharedAtomicBoolean:
+        return cls.create(True)
+
+    @classmethod
+    def with_false(cls) -> SharedAtomicBoolean:
+        return cls.create(False)
+
+    def get(self) -> bool:
+        return bool(self._view[0])
+
+    def set(self, t: bool) -> None:  # type: ignore
+        with self._lock:
+            self._view[0] = int(t)
+
+    def set_and_get(self, t: bool) -> bool:  # type: ignore
+        with self._lock:
+            self._view[0] = int(t)
+            return t
+
+    def get_and_set(self, t: bool) -> bool:  # type: ignore
+        with self._lock:
+            old_value = bool(self._view[0])
+            self._view[0] = int(t)
+            return old_value
+
+    def compliment(self) -> bool:
+        with self._lock:
+            value = not self._view[0]
+            self._view[0] = int(value)
+            return value
+
+    def compare_and_set(self, expected: bool, t: bool) -> bool:
+        """
+        Set the value if it is equal to the expected value
+
+        Args:
+            expected: The value the boolean is expected to hold
+            t: The new value
+
+        Returns:
+            True if the value was set, False if the boolean held another value
+        """
+        with self._lock:
+            if bool(self._view[0]) != expected:
+                return False
+            self._view[0] = int(t)
+            return True
+
+    def __repr__(self) -> str:
+        return f"SharedAtomicBoolean({self.get()})"
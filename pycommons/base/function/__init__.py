@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from .consumer import Consumer, BiConsumer
-from .function import Function
+from .function import Function, BiFunction
 from .predicate import Predicate, BiPredicate, PredicateType, PredicateCallableType
 from .runnable import Runnable, RunnableType, RunnableCallableType
 from .supplier import Supplier, SupplierType, SupplierCallableType
@@ -10,6 +10,7 @@ __all__ = [
     "BiConsumer",
     "Consumer",
     "Function",
+    "BiFunction",
     "Predicate",
     "PredicateType",
     "PredicateCallableType",
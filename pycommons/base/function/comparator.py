@@ -16,6 +16,22 @@ class Comparator(Generic[_T, _U]):
 
         return BasicComparator()
 
+    @classmethod
+    def comparing(cls, key_extractor: Callable[[_T], Any]) -> Comparator[_T, _T]:
+        """
+        Returns a comparator that compares the natural order of the keys extracted from the
+        objects. Sorting with such a comparator uses the key directly instead of calling
+        [`compare_to`][pycommons.base.function.comparator.Comparator.compare_to]
+        for every comparison.
+
+        Args:
+            key_extractor: Callable that extracts the sort key from an object
+
+        Returns:
+            A key based comparator
+        """
+        return KeyComparator(key_extractor)
+
     @abstractmethod
     def compare_to(self, t: _T, u: _U) -> int:
         ...
@@ -36,13 +52,22 @@ class NaturalOrderComparator(Comparator[_T, _U]):
         return 1
 
 
+class KeyComparator(Comparator[_T, _T]):
+    def __init__(self, key: Callable[[_T], Any]):
+        self.key = key
+
+    def compare_to(self, t: _T, u: _T) -> int:
+        _t, _u = self.key(t), self.key(u)
+        if _t < _u:
+            return -1
+        if _t == _u:
+            return 0
+        return 1
+
+
 class ReverseOrderComparator(Comparator[_T, _U]):
     def __init__(self, comparator: Comparator[_T, _U]):
         self.comparator = comparator
 
     def compare_to(self, t: _T, u: _U) -> int:
-        if t < u:  # type: ignore
-            return 1
-        if t == u:
-            return 0
-        return -1
+        return self.comparator.compare_to(u, t)  # type: ignore
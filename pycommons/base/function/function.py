@@ -5,6 +5,7 @@ from typing import TypeVar, Generic, Callable, Any, Union
 
 _T = TypeVar("_T")
 _U = TypeVar("_U")
+_R = TypeVar("_R")
 
 
 class Function(Generic[_T, _U]):
@@ -38,3 +39,36 @@ The generic function object that can be passed to the
 Has the references to both Function and the type of lambdas
 that can defined for it to be called a function lambda.
 """
+
+
+class BiFunction(Generic[_T, _U, _R]):
+    @classmethod
+    def of(cls, function: BiFunctionType[_T, _U, _R]) -> BiFunction[_T, _U, _R]:
+        class BasicBiFunction(BiFunction[_T, _U, _R]):
+            def apply(self, t: _T, u: _U) -> _R:
+                return function(t, u)
+
+        if isinstance(function, BiFunction):
+            return function
+        return BasicBiFunction()
+
+    @abstractmethod
+    def apply(self, t: _T, u: _U) -> _R:
+        pass
+
+    def __call__(self, t: _T, u: _U, *args: Any, **kwargs: Any) -> _R:
+        return self.apply(t, u)
+
+
+BiFunctionCallableType = Callable[[_T, _U], _R]
+"""
+A callable function that adheres the signature of a BiFunction
+"""
+
+BiFunctionType = Union[BiFunction[_T, _U, _R], BiFunctionCallableType[_T, _U, _R]]
+"""
+The generic bi-function object that can be passed to the
+[`BiFunction.of`][pycommons.base.function.BiFunction.of].
+Has the references to both BiFunction and the type of lambdas
+that can defined for it to be called a bi-function lambda.
+"""
@@ -1,3 +1,37 @@
 from .maps import Map
+from .concurrent import ConcurrentMap
+from .cache import (
+    CacheMap,
+    CacheStats,
+    LRUCacheMap,
+    LFUCacheMap,
+    TTLCacheMap,
+    SynchronizedCacheMap,
+)
+from .indexed import BiMap, IndexedMap
+from .sorted import SortedMap
+from .persistent import PersistentMap, TransientMap
+from .multi import MultiMap
+from .counter import CounterMap
+from .shared import SharedMap
+from .disk import DiskMap
 
-__all__ = ["Map"]
+__all__ = [
+    "Map",
+    "ConcurrentMap",
+    "CacheMap",
+    "CacheStats",
+    "LRUCacheMap",
+    "LFUCacheMap",
+    "TTLCacheMap",
+    "SynchronizedCacheMap",
+    "BiMap",
+    "IndexedMap",
+    "SortedMap",
+    "PersistentMap",
+    "TransientMap",
+    "MultiMap",
+    "CounterMap",
+    "SharedMap",
+    "DiskMap",
+]
@@ -0,0 +1,784 @@
+import collections
+import threading
+import time
+import typing
+import weakref
+from abc import abstractmethod
+from typing import TypeVar, Any, Dict, Optional, Set, Iterator, Callable, List, KeysView, Tuple
+
+from pycommons.base.function import BiConsumer
+from pycommons.base.function.consumer import BiConsumerType, ConsumerType
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
+from pycommons.base.maps.maps import Map
+from pycommons.base.streams import Stream
+from pycommons.base.synchronized import RLockSynchronized, synchronized
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_MISSING: Any = object()
+_MASK_64 = (1 << 64) - 1
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+class CacheStats:
+    """
+    Hit, miss and eviction counters of a [`CacheMap`][pycommons.base.maps.CacheMap]. The
+    lookups of `get`, `[]` and `compute_if_absent` are recorded as hits or misses; the
+    entries removed by the size, weight or expiry policies are recorded as evictions.
+    """
+
+    __slots__ = ("hits", "misses", "evictions", "eviction_weight")
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.eviction_weight: int = 0
+
+    def request_count(self) -> int:
+        return self.hits + self.misses
+
+    def hit_rate(self) -> float:
+        """
+        Returns:
+            The ratio of the lookups that were hits, 1.0 if there was no lookup
+        """
+        requests = self.request_count()
+        return 1.0 if requests == 0 else self.hits / requests
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions}, eviction_weight={self.eviction_weight})"
+        )
+
+
+class CacheMap(Map[_K, _V]):
+    """
+    Base class of the bounded [`Map`][pycommons.base.maps.Map] implementations used as caches.
+    The entries are evicted by a policy implemented by the subclasses when the number of
+    entries exceeds `maximum_size`, or when the total weight of the entries computed by the
+    `weigher` exceeds `maximum_weight`. Every evicted entry is passed to the
+    `eviction_listener`. The entries removed explicitly are not.
+
+    The `get`, `put`, `remove` and `contains_key` operations are O(1). The lookups are
+    recorded in [`stats`][pycommons.base.maps.CacheStats]. `contains_key` is not a lookup: it
+    neither records a hit nor changes the eviction order.
+
+    The cache maps are not thread safe, wrap them in a
+    [`SynchronizedCacheMap`][pycommons.base.maps.SynchronizedCacheMap] to share them
+    between threads.
+    """
+
+    def __init__(
+        self,
+        maximum_size: Optional[int] = None,
+        maximum_weight: Optional[int] = None,
+        weigher: Optional[BiFunctionType[_K, _V, int]] = None,
+        eviction_listener: Optional[BiConsumerType[_K, _V]] = None,
+    ):
+        """
+        Args:
+            maximum_size: Maximum number of entries, unbounded if None
+            maximum_weight: Maximum total weight of the entries, unbounded if None
+            weigher: Callable that returns the weight of an entry from its key and value.
+                Required if `maximum_weight` is set.
+            eviction_listener: Callable called with the key and the value of every evicted
+                entry
+        """
+        if maximum_size is not None and maximum_size < 1:
+            raise ValueError("maximum_size must be a positive integer")
+        if maximum_weight is not None and maximum_weight < 0:
+            raise ValueError("maximum_weight cannot be negative")
+        if (maximum_weight is None) != (weigher is None):
+            raise ValueError("maximum_weight and weigher must be set together")
+
+        super().__init__()
+        self.stats: CacheStats = CacheStats()
+        self._maximum_size = maximum_size
+        self._maximum_weight = maximum_weight
+        self._weigher: Optional[BiFunction[_K, _V, int]] = (
+            None if weigher is None else BiFunction.of(weigher)
+        )
+        self._eviction_listener: Optional[BiConsumer[_K, _V]] = (
+            None if eviction_listener is None else BiConsumer.of(eviction_listener)
+        )
+        self._weights: Dict[_K, int] = {}
+        self._weight = 0
+
+    @abstractmethod
+    def _victim(self) -> _K:
+        """
+        Select the next entry to evict. Called only when the map is not empty.
+        """
+
+    def _on_hit(self, k: _K) -> None:
+        """
+        Called when a lookup finds the key
+        """
+
+    def _on_miss(self, k: _K) -> None:
+        """
+        Called when a lookup does not find the key
+        """
+
+    def _on_write(self, k: _K) -> None:
+        """
+        Called after the value of the key is inserted or updated
+        """
+
+    def _on_remove(self, k: _K) -> None:
+        """
+        Called after the key is removed
+        """
+
+    def _is_expired(self, k: _K) -> bool:  # pylint: disable=W0613
+        return False
+
+    def clean_up(self) -> None:
+        """
+        Perform the pending maintenance, e.g. the removal of the expired entries
+        """
+
+    def weight(self) -> int:
+        """
+        Returns:
+            The total weight of the entries, 0 if the map has no weigher
+        """
+        return self._weight
+
+    def _lookup(self, k: _K, record: bool = True) -> Any:
+        _v = self.data.get(k, _MISSING)
+        if _v is not _MISSING and self._is_expired(k):
+            self._evict(k)
+            _v = _MISSING
+        if not record:
+            return _v
+        if _v is _MISSING:
+            self.stats.misses += 1
+            self._on_miss(k)
+        else:
+            self.stats.hits += 1
+            self._on_hit(k)
+        return _v
+
+    def _store(self, k: _K, v: _V) -> None:
+        self.data[k] = v
+        if self._weigher is not None:
+            _weight = self._weigher.apply(k, v)
+            self._weight += _weight - self._weights.get(k, 0)
+            self._weights[k] = _weight
+        self._on_write(k)
+        while self.data and self._is_over_capacity():
+            self._evict(self._victim())
+
+    def _discard(self, k: _K) -> Any:
+        _v = self.data.pop(k, _MISSING)
+        if _v is not _MISSING:
+            self._weight -= self._weights.pop(k, 0)
+            self._on_remove(k)
+        return _v
+
+    def _evict(self, k: _K) -> None:
+        _weight = self._weights.get(k, 0)
+        _v = self._discard(k)
+        self.stats.evictions += 1
+        self.stats.eviction_weight += _weight
+        if self._eviction_listener is not None:
+            self._eviction_listener.accept(k, _v)
+
+    def _is_over_capacity(self) -> bool:
+        return (self._maximum_size is not None and len(self.data) > self._maximum_size) or (
+            self._maximum_weight is not None and self._weight > self._maximum_weight
+        )
+
+    def __getitem__(self, k: _K) -> _V:
+        _v = self._lookup(k)
+        if _v is _MISSING:
+            raise KeyError(k)
+        return typing.cast(_V, _v)
+
+    def __setitem__(self, k: _K, v: _V) -> None:
+        self._store(k, v)
+
+    def __delitem__(self, k: _K) -> None:
+        if self._discard(k) is _MISSING:
+            raise KeyError(k)
+
+    def __contains__(self, k: object) -> bool:
+        return self.contains_key(typing.cast(_K, k))
+
+    def __len__(self) -> int:
+        self.clean_up()
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[_K]:
+        self.clean_up()
+        return iter(self.data)
+
+    def get(self, key: _K, default: Optional[_V] = None) -> Optional[_V]:  # type: ignore
+        _v = self._lookup(key)
+        return default if _v is _MISSING else typing.cast(_V, _v)
+
+    def copy(self) -> Map[_K, _V]:  # type: ignore
+        """
+        Returns:
+            A `Map` with a snapshot of the entries of the cache
+        """
+        self.clean_up()
+        return Map(self.data.copy())
+
+    def clear(self) -> None:
+        for k in list(self.data):
+            self._discard(k)
+
+    def put(self, k: _K, v: _V) -> _V:
+        self._store(k, v)
+        return v
+
+    def put_if_absent(self, k: _K, v: _V) -> _V:
+        _v = self._lookup(k, record=False)
+        if _v is _MISSING:
+            self._store(k, v)
+            return v
+        return typing.cast(_V, _v)
+
+    def compute_if_absent(self, k: _K, function: FunctionType[_K, _V]) -> _V:
+        """
+        Return the cached value of the key, or compute it, cache it and return it on a miss.
+        The lookup is recorded as a hit or a miss.
+
+        Args:
+            k: key
+            function: the callable that generates the value
+
+        Returns:
+            the cached value if present, the computed value otherwise
+        """
+        _v = self._lookup(k)
+        if _v is _MISSING:
+            _v = (function.apply if isinstance(function, Function) else function)(k)
+            self._store(k, _v)
+        return typing.cast(_V, _v)
+
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, _V, Optional[_V]]
+    ) -> Optional[_V]:
+        _v = self._lookup(k, record=False)
+        if _v is _MISSING:
+            return None
+        _v = (function.apply if isinstance(function, BiFunction) else function)(k, _v)
+        if _v is None:
+            self._discard(k)
+        else:
+            self._store(k, _v)
+        return typing.cast(Optional[_V], _v)
+
+    def merge(self, k: _K, v: _V, function: BiFunctionType[_V, _V, Optional[_V]]) -> Optional[_V]:
+        _v = self._lookup(k, record=False)
+        if _v is not _MISSING:
+            _v = (function.apply if isinstance(function, BiFunction) else function)(_v, v)
+            if _v is None:
+                self._discard(k)
+                return None
+        else:
+            _v = v
+        self._store(k, _v)
+        return typing.cast(_V, _v)
+
+    def size(self) -> int:
+        return len(self)
+
+    def contains_key(self, k: _K) -> bool:
+        return k in self.data and not self._is_expired(k)
+
+    def contains_value(self, v: _V) -> bool:
+        self.clean_up()
+        return super().contains_value(v)
+
+    def remove(self, k: _K) -> Optional[_V]:
+        _v = self._discard(k)
+        return None if _v is _MISSING else typing.cast(_V, _v)
+
+    def put_all(self, m: Dict[_K, _V]) -> None:
+        for k, v in m.items():
+            self._store(k, v)
+
+    def key_set(self) -> Set[_K]:
+        self.clean_up()
+        return super().key_set()
+
+    def keys_view(self) -> KeysView[_K]:
+        self.clean_up()
+        return super().keys_view()
+
+    def entry_set(self) -> Set["Map.Entry"]:
+        self.clean_up()
+        return super().entry_set()
+
+    def entries_view(self) -> "Map.EntriesView":
+        self.clean_up()
+        return super().entries_view()
+
+    def for_each(self, bi_consumer: BiConsumerType[_K, _V]) -> None:
+        self.clean_up()
+        super().for_each(bi_consumer)
+
+    def for_each_entry(self, consumer: ConsumerType["Map.Entry"]) -> None:
+        self.clean_up()
+        super().for_each_entry(consumer)
+
+    def replace_old_value(self, k: _K, old_value: _V, new_value: _V) -> bool:
+        _v = self._lookup(k, record=False)
+        if (None if _v is _MISSING else _v) == old_value:
+            self._store(k, new_value)
+            return True
+        return False
+
+    def replace(self, k: _K, v: _V) -> Optional[_V]:
+        _v = self._lookup(k, record=False)
+        if _v is _MISSING:
+            return None
+        self._store(k, v)
+        return typing.cast(_V, _v)
+
+    def stream(self) -> Stream["Map.Entry"]:
+        self.clean_up()
+        return super().stream()
+
+
+class LRUCacheMap(CacheMap[_K, _V]):
+    """
+    A [`CacheMap`][pycommons.base.maps.CacheMap] that evicts the least recently used entry.
+    The lookups and the writes move the entry to the most recently used end of an
+    `OrderedDict`, the eviction removes the entry at the other end.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import LRUCacheMap
+
+        cache = LRUCacheMap(maximum_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        cache.key_set()
+        # {'a', 'c'}
+        ```
+    """
+
+    data: "collections.OrderedDict[_K, _V]"
+
+    def __init__(
+        self,
+        maximum_size: Optional[int] = None,
+        maximum_weight: Optional[int] = None,
+        weigher: Optional[BiFunctionType[_K, _V, int]] = None,
+        eviction_listener: Optional[BiConsumerType[_K, _V]] = None,
+    ):
+        super().__init__(maximum_size, maximum_weight, weigher, eviction_listener)
+        self.data = collections.OrderedDict()
+
+    def _victim(self) -> _K:
+        return next(iter(self.data))
+
+    def _on_hit(self, k: _K) -> None:
+        self.data.move_to_end(k)
+
+    def _on_write(self, k: _K) -> None:
+        self.data.move_to_end(k)
+
+
+class _FrequencySketch:
+    """
+    Count-min sketch of 4 rows of saturating counters (up to 15) that estimates how often a
+    key was seen. Each row has 4 counters per entry of the cache to limit the collisions.
+    The counters are halved after `10 * capacity` increments so that the estimates favor
+    the recent history.
+    """
+
+    __slots__ = ("_rows", "_mask", "_additions", "_sample_size")
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < 4 * capacity:
+            width <<= 1
+        self._rows: List[bytearray] = [bytearray(width) for _ in range(4)]
+        self._mask = width - 1
+        self._additions = 0
+        self._sample_size = 10 * capacity
+
+    def _hashes(self, k: Any) -> Tuple[int, int]:
+        h = hash(k) * 0x9E3779B97F4A7C15 & _MASK_64
+        h ^= h >> 32
+        return h & 0xFFFFFFFF, (h >> 16) | 1
+
+    def increment(self, k: Any) -> None:
+        index, step = self._hashes(k)
+        mask = self._mask
+        for row in self._rows:
+            if row[index & mask] < 15:
+                row[index & mask] += 1
+            index += step
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._rows = [row.translate(_HALVE) for row in self._rows]
+            self._additions //= 2
+
+    def frequency(self, k: Any) -> int:
+        index, step = self._hashes(k)
+        mask = self._mask
+        frequency = 15
+        for row in self._rows:
+            count = row[index & mask]
+            if count < frequency:
+                frequency = count
+            index += step
+        return frequency
+
+
+class LFUCacheMap(CacheMap[_K, _V]):
+    """
+    A [`CacheMap`][pycommons.base.maps.CacheMap] with a W-TinyLFU style policy, that keeps
+    the frequently used entries of skewed workloads where an LRU would let one-hit wonders
+    push them out.
+
+    The new entries are admitted in a small LRU window. When the map is full, the least
+    recently used entry of the window competes with the least recently used entry of the
+    main LRU region: the one seen less often, according to a count-min frequency sketch of
+    the recent lookups (including the misses), is evicted.
+
+    References:
+        https://arxiv.org/abs/1512.00727
+    """
+
+    def __init__(
+        self,
+        maximum_size: Optional[int] = None,
+        maximum_weight: Optional[int] = None,
+        weigher: Optional[BiFunctionType[_K, _V, int]] = None,
+        eviction_listener: Optional[BiConsumerType[_K, _V]] = None,
+        window_ratio: float = 0.01,
+    ):
+        """
+        Args:
+            maximum_size: Maximum number of entries, unbounded if None
+            maximum_weight: Maximum total weight of the entries, unbounded if None
+            weigher: Callable that returns the weight of an entry from its key and value
+            eviction_listener: Callable called with the key and the value of every evicted
+                entry
+            window_ratio: Share of `maximum_size` used by the admission window
+        """
+        if not 0 < window_ratio < 1:
+            raise ValueError("window_ratio must be between 0 and 1")
+        super().__init__(maximum_size, maximum_weight, weigher, eviction_listener)
+        capacity = 1024 if maximum_size is None else maximum_size
+        self._window_size = max(1, int(capacity * window_ratio))
+        self._window: "collections.OrderedDict[_K, None]" = collections.OrderedDict()
+        self._main: "collections.OrderedDict[_K, None]" = collections.OrderedDict()
+        self._sketch = _FrequencySketch(capacity)
+
+    def _victim(self) -> _K:
+        if not self._main:
+            return next(iter(self._window))
+        victim = next(iter(self._main))
+        if len(self._window) <= self._window_size:
+            return victim
+        candidate = next(iter(self._window))
+        if self._sketch.frequency(candidate) > self._sketch.frequency(victim):
+            del self._window[candidate]
+            self._main[candidate] = None
+            return victim
+        return candidate
+
+    def _on_hit(self, k: _K) -> None:
+        self._sketch.increment(k)
+        if k in self._main:
+            self._main.move_to_end(k)
+        else:
+            self._window.move_to_end(k)
+
+    def _on_miss(self, k: _K) -> None:
+        self._sketch.increment(k)
+
+    def _on_write(self, k: _K) -> None:
+        if k in self._main:
+            self._main.move_to_end(k)
+            return
+        self._window[k] = None
+        self._window.move_to_end(k)
+        while len(self._window) > self._window_size and not self._is_full():
+            self._main[self._window.popitem(last=False)[0]] = None
+
+    def _on_remove(self, k: _K) -> None:
+        if self._window.pop(k, _MISSING) is _MISSING:
+            del self._main[k]
+
+    def _is_full(self) -> bool:
+        return (self._maximum_size is not None and len(self.data) >= self._maximum_size) or (
+            self._maximum_weight is not None and self._weight >= self._maximum_weight
+        )
+
+
+class TTLCacheMap(CacheMap[_K, _V]):
+    """
+    A [`CacheMap`][pycommons.base.maps.CacheMap] whose entries expire after a fixed duration
+    since they were written. The expired entries are never returned: they are evicted
+    lazily when they are looked up, and from the oldest entry every time an entry is
+    written or [`clean_up`][pycommons.base.maps.TTLCacheMap.clean_up] is called, which
+    costs O(1) per expired entry since the entries are kept in their write order. When the
+    map exceeds its size or weight, the oldest written entry is evicted.
+
+    A cache that is mostly read, or idle, keeps the memory of its expired entries until the
+    next write. The map is not thread safe and does not start a thread: to also evict the
+    expired entries periodically, wrap it in a
+    [`SynchronizedCacheMap`][pycommons.base.maps.SynchronizedCacheMap] with a
+    `clean_up_interval`.
+    """
+
+    data: "collections.OrderedDict[_K, _V]"
+
+    def __init__(
+        self,
+        expire_after_write: float,
+        maximum_size: Optional[int] = None,
+        maximum_weight: Optional[int] = None,
+        weigher: Optional[BiFunctionType[_K, _V, int]] = None,
+        eviction_listener: Optional[BiConsumerType[_K, _V]] = None,
+        ticker: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            expire_after_write: Duration in seconds after which an entry expires
+            maximum_size: Maximum number of entries, unbounded if None
+            maximum_weight: Maximum total weight of the entries, unbounded if None
+            weigher: Callable that returns the weight of an entry from its key and value
+            eviction_listener: Callable called with the key and the value of every evicted
+                entry
+            ticker: Clock returning the current time in seconds
+        """
+        if expire_after_write <= 0:
+            raise ValueError("expire_after_write must be positive")
+        super().__init__(maximum_size, maximum_weight, weigher, eviction_listener)
+        self.data = collections.OrderedDict()
+        self._expire_after_write = expire_after_write
+        self._ticker = ticker
+        self._expires_at: Dict[_K, float] = {}
+
+    def _victim(self) -> _K:
+        return next(iter(self.data))
+
+    def _is_expired(self, k: _K) -> bool:
+        return self._expires_at[k] <= self._ticker()
+
+    def _on_write(self, k: _K) -> None:
+        now = self._ticker()
+        self._expires_at[k] = now + self._expire_after_write
+        self.data.move_to_end(k)
+        self._expire(now)
+
+    def _on_remove(self, k: _K) -> None:
+        del self._expires_at[k]
+
+    def _expire(self, now: float) -> None:
+        expires_at = self._expires_at
+        while self.data:
+            k = next(iter(self.data))
+            if expires_at[k] > now:
+                return
+            self._evict(k)
+
+    def clean_up(self) -> None:
+        """
+        Evict the expired entries
+        """
+        self._expire(self._ticker())
+
+
+def _clean_up_periodically(
+    ref: "weakref.ReferenceType[SynchronizedCacheMap[Any, Any]]",
+    closed: threading.Event,
+    interval: float,
+) -> None:
+    # Only a weak reference is held between two clean ups, so that the map can be collected
+    while not closed.wait(interval):
+        cache = ref()
+        if cache is None:
+            return
+        cache.clean_up()
+        del cache
+
+
+class SynchronizedCacheMap(RLockSynchronized, Map[_K, _V]):
+    """
+    A thread safe view of a [`CacheMap`][pycommons.base.maps.CacheMap]. Every operation
+    holds a reentrant lock, including `compute_if_absent` while the value is computed, so
+    a key is computed once even when several threads miss it at the same time. The
+    iterations run over a snapshot taken under the lock.
+
+    With a `clean_up_interval`, a daemon thread calls
+    [`clean_up`][pycommons.base.maps.CacheMap.clean_up] under the lock periodically, so that
+    the expired entries of a [`TTLCacheMap`][pycommons.base.maps.TTLCacheMap] are evicted even
+    when the cache is not written. The thread stops when the map is closed or garbage
+    collected.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import LRUCacheMap, SynchronizedCacheMap, TTLCacheMap
+
+        cache = SynchronizedCacheMap(LRUCacheMap(maximum_size=1000))
+        sessions = SynchronizedCacheMap(TTLCacheMap(expire_after_write=600), clean_up_interval=60)
+        ```
+    """
+
+    def __init__(self, cache: CacheMap[_K, _V], clean_up_interval: Optional[float] = None):
+        """
+        Args:
+            cache: The cache to synchronize
+            clean_up_interval: Interval in seconds between two periodic clean ups, no periodic
+                clean up if None
+        """
+        RLockSynchronized.__init__(self)
+        Map.__init__(self)
+        self._cache = cache
+        self.data = cache.data
+        self._closed = threading.Event()
+        if clean_up_interval is not None:
+            if clean_up_interval <= 0:
+                raise ValueError("clean_up_interval must be positive")
+            threading.Thread(
+                target=_clean_up_periodically,
+                args=(weakref.ref(self), self._closed, clean_up_interval),
+                name="cache-clean-up",
+                daemon=True,
+            ).start()
+            weakref.finalize(self, self._closed.set)
+
+    def close(self) -> None:
+        """
+        Stop the periodic clean up. The map can still be used.
+        """
+        self._closed.set()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    @synchronized
+    def _snapshot(self) -> Dict[_K, _V]:
+        self._cache.clean_up()
+        return dict(self._cache.data)
+
+    @synchronized
+    def __getitem__(self, k: _K) -> _V:
+        return self._cache[k]
+
+    @synchronized
+    def __setitem__(self, k: _K, v: _V) -> None:
+        self._cache[k] = v
+
+    @synchronized
+    def __delitem__(self, k: _K) -> None:
+        del self._cache[k]
+
+    @synchronized
+    def __contains__(self, k: object) -> bool:
+        return k in self._cache
+
+    @synchronized
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(self._snapshot())
+
+    @synchronized
+    def get(self, key: _K, default: Optional[_V] = None) -> Optional[_V]:
+        return self._cache.get(key, default)
+
+    def copy(self) -> Map[_K, _V]:  # type: ignore
+        return Map(self._snapshot())
+
+    @synchronized
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @synchronized
+    def clean_up(self) -> None:
+        self._cache.clean_up()
+
+    @synchronized
+    def weight(self) -> int:
+        return self._cache.weight()
+
+    @synchronized
+    def put(self, k: _K, v: _V) -> _V:
+        return self._cache.put(k, v)
+
+    @synchronized
+    def put_if_absent(self, k: _K, v: _V) -> _V:
+        return self._cache.put_if_absent(k, v)
+
+    @synchronized
+    def compute_if_absent(self, k: _K, function: FunctionType[_K, _V]) -> _V:
+        return self._cache.compute_if_absent(k, function)
+
+    @synchronized
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, _V, Optional[_V]]
+    ) -> Optional[_V]:
+        return self._cache.compute_if_present(k, function)
+
+    @synchronized
+    def merge(self, k: _K, v: _V, function: BiFunctionType[_V, _V, Optional[_V]]) -> Optional[_V]:
+        return self._cache.merge(k, v, function)
+
+    @synchronized
+    def size(self) -> int:
+        return self._cache.size()
+
+    @synchronized
+    def contains_key(self, k: _K) -> bool:
+        return self._cache.contains_key(k)
+
+    @synchronized
+    def contains_value(self, v: _V) -> bool:
+        return self._cache.contains_value(v)
+
+    @synchronized
+    def remove(self, k: _K) -> Optional[_V]:
+        return self._cache.remove(k)
+
+    @synchronized
+    def put_all(self, m: Dict[_K, _V]) -> None:
+        self._cache.put_all(m)
+
+    def key_set(self) -> Set[_K]:
+        return set(self._snapshot())
+
+    def keys_view(self) -> KeysView[_K]:
+        return typing.cast(KeysView[_K], self._snapshot().keys())
+
+    def entry_set(self) -> Set["Map.Entry"]:
+        return Map(self._snapshot()).entry_set()
+
+    def entries_view(self) -> "Map.EntriesView":
+        return Map.EntriesView(self._snapshot())
+
+    def for_each(self, bi_consumer: BiConsumerType[_K, _V]) -> None:
+        Map(self._snapshot()).for_each(bi_consumer)
+
+    def for_each_entry(self, consumer: ConsumerType["Map.Entry"]) -> None:
+        Map(self._snapshot()).for_each_entry(consumer)
+
+    @synchronized
+    def replace_old_value(self, k: _K, old_value: _V, new_value: _V) -> bool:
+        return self._cache.replace_old_value(k, old_value, new_value)
+
+    @synchronized
+    def replace(self, k: _K, v: _V) -> Optional[_V]:
+        return self._cache.replace(k, v)
+
+    def stream(self) -> Stream["Map.Entry"]:
+        return Map(self._snapshot()).stream()
@@ -0,0 +1,227 @@
+import collections.abc
+import itertools
+import threading
+import typing
+from concurrent.futures import Future
+from threading import RLock
+from typing import TypeVar, Any, Dict, Optional, Set, Tuple, Iterator, Mapping
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.function import BiConsumer
+from pycommons.base.function.consumer import BiConsumerType
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType
+from pycommons.base.maps.maps import Map
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_MISSING: Any = object()
+
+
+class ConcurrentMap(Map[_K, _V]):
+    """
+    A thread safe [`Map`][pycommons.base.maps.Map] whose check-then-act operations
+    (`put_if_absent`, `compute_if_absent`, `compute_if_present`, `merge`, `replace_old_value`,
+    `replace` and `remove`) are atomic per key. Similar to the ConcurrentHashMap of Java.
+
+    The writers lock one of `concurrency_level` striped locks selected by the hash of the key,
+    so that writers of different keys rarely wait for each other. The locks are reentrant:
+    a function passed to a compute operation can update the map, but must not wait for
+    another thread that updates a key of the same stripe.
+
+    The readers (`get`, `contains_key`, `size`, ...) do not take a lock, they rely on the
+    atomicity of the single operations of the underlying `dict`. The iterations, including the
+    ones of `keys_view`, `entries_view` and `stream`, run over a snapshot of the map taken
+    when they start, and never fail because of a concurrent modification.
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/ConcurrentHashMap.html
+    """
+
+    def __init__(
+        self, m: Optional[Mapping[_K, _V]] = None, concurrency_level: int = 16, **kwargs: _V
+    ):
+        """
+        Args:
+            m: Initial mappings of the map
+            concurrency_level: Number of striped locks
+            **kwargs: Initial mappings of the map
+        """
+        if concurrency_level < 1:
+            raise ValueError("concurrency_level must be a positive integer")
+        self._locks: Tuple[RLock, ...] = tuple(RLock() for _ in range(concurrency_level))
+        self._in_flight: Dict[_K, Tuple[int, "Future[_V]"]] = {}
+        super().__init__(m, **kwargs)
+
+    def _lock(self, k: _K) -> RLock:
+        return self._locks[hash(k) % len(self._locks)]
+
+    def _snapshot(self) -> Dict[_K, _V]:
+        return self.data.copy()
+
+    def __getitem__(self, k: _K) -> _V:
+        return self.data[k]
+
+    def __setitem__(self, k: _K, v: _V) -> None:
+        with self._lock(k):
+            self.data[k] = v
+
+    def __delitem__(self, k: _K) -> None:
+        with self._lock(k):
+            del self.data[k]
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(list(self.data))
+
+    def get(self, key: _K, default: Optional[_V] = None) -> Optional[_V]:  # type: ignore
+        return self.data.get(key, default)
+
+    def keys(self) -> typing.KeysView[_K]:
+        return self._snapshot().keys()
+
+    def values(self) -> typing.ValuesView[_V]:
+        return self._snapshot().values()
+
+    def items(self) -> typing.ItemsView[_K, _V]:
+        return self._snapshot().items()
+
+    def copy(self) -> "ConcurrentMap[_K, _V]":
+        return type(self)(self._snapshot(), concurrency_level=len(self._locks))
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    def pop(self, key: _K, default: Any = _MISSING) -> Any:
+        with self._lock(key):
+            if default is _MISSING:
+                return self.data.pop(key)
+            return self.data.pop(key, default)
+
+    def setdefault(self, key: _K, default: Optional[_V] = None) -> _V:
+        return self.put_if_absent(key, default)  # type: ignore
+
+    def put(self, k: _K, v: _V) -> _V:
+        with self._lock(k):
+            self.data[k] = v
+        return v
+
+    def put_if_absent(self, k: _K, v: _V) -> _V:
+        _v = self.data.get(k, _MISSING)
+        if _v is not _MISSING:
+            return _v
+        with self._lock(k):
+            return self.data.setdefault(k, v)
+
+    def compute_if_absent(self, k: _K, function: FunctionType[_K, _V]) -> _V:
+        """
+        Add a key value pair by calling a function that returns the value based on the key
+        passed, only when the key is not present. A hit is a single lock free lookup.
+
+        The computation is single flight: when several threads miss the same key, the first
+        one calls the function and the others wait for its result, or its exception. The
+        function runs without holding the stripe lock, so a slow computation does not
+        block the writers of the other keys.
+
+        Args:
+            k: key
+            function: the callable that generates the value
+
+        Returns:
+            the current value if present, the computed value otherwise
+
+        Raises:
+            IllegalStateException: if the function computes the same key recursively
+        """
+        try:
+            return self.data[k]
+        except KeyError:
+            pass
+
+        with self._lock(k):
+            _v = self.data.get(k, _MISSING)
+            if _v is not _MISSING:
+                return _v
+            in_flight = self._in_flight.get(k)
+            if in_flight is None:
+                in_flight = self._in_flight[k] = (threading.get_ident(), Future())
+                owner = True
+            elif in_flight[0] == threading.get_ident():
+                raise IllegalStateException(f"Recursive computation of the key {k!r}")
+            else:
+                owner = False
+
+        if not owner:
+            return in_flight[1].result()
+
+        try:
+            _v = Function.of(function).apply(k)
+        except BaseException as exc:
+            with self._lock(k):
+                del self._in_flight[k]
+            in_flight[1].set_exception(exc)
+            raise
+        with self._lock(k):
+            _v = self.data.setdefault(k, _v)
+            del self._in_flight[k]
+        in_flight[1].set_result(_v)
+        return _v
+
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, _V, Optional[_V]]
+    ) -> Optional[_V]:
+        if k not in self.data:
+            return None
+        with self._lock(k):
+            return super().compute_if_present(k, function)
+
+    def merge(self, k: _K, v: _V, function: BiFunctionType[_V, _V, Optional[_V]]) -> Optional[_V]:
+        with self._lock(k):
+            return super().merge(k, v, function)
+
+    def remove(self, k: _K) -> Optional[_V]:
+        with self._lock(k):
+            return self.data.pop(k, None)
+
+    def put_all(self, m: Dict[_K, _V]) -> None:
+        for k, v in m.items():
+            self.put(k, v)
+
+    def replace_old_value(self, k: _K, old_value: _V, new_value: _V) -> bool:
+        with self._lock(k):
+            if self.data.get(k) == old_value:
+                self.data[k] = new_value
+                return True
+            return False
+
+    def replace(self, k: _K, v: _V) -> Optional[_V]:
+        with self._lock(k):
+            _old_value = self.data.get(k, _MISSING)
+            if _old_value is _MISSING:
+                return None
+            self.data[k] = v
+            return _old_value
+
+    def key_set(self) -> Set[_K]:
+        return set(self.keys())
+
+    def for_each(self, bi_consumer: BiConsumerType[_K, _V]) -> None:
+        _consumer: BiConsumer[_K, _V] = BiConsumer.of(bi_consumer)
+        for k, v in self.items():
+            _consumer.accept(k, v)
+
+    def keys_view(self) -> typing.KeysView[_K]:
+        return collections.abc.KeysView(self)
+
+    def entries_view(self) -> "Map.EntriesView":
+        return _ConcurrentEntriesView(self.data)
+
+
+class _ConcurrentEntriesView(Map.EntriesView):
+    """
+    Entries view whose iterations run over a snapshot of the map
+    """
+
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator["Map.Entry"]:
+        return itertools.starmap(Map.Entry, self._data.copy().items())
@@ -0,0 +1,129 @@
+import collections
+import typing
+from typing import (
+    TypeVar,
+    Any,
+    Callable,
+    Counter,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pycommons.base.function.function import FunctionType, Function
+from pycommons.base.maps.maps import Map
+from pycommons.base.streams import Stream, IteratorStream
+
+_K = TypeVar("_K")
+
+_dict_update: Callable[[Dict[Any, Any], Mapping[Any, Any]], None] = dict.update
+
+
+class CounterMap(Map[_K, int]):
+    """
+    A [`Map`][pycommons.base.maps.Map] that counts its keys, backed by a
+    `collections.Counter`. [`increment_all`][pycommons.base.maps.CounterMap.increment_all]
+    counts an iterable in the C loop of `Counter.update` instead of calling
+    `put(k, get(k, 0) + 1)` per element, and
+    [`most_common`][pycommons.base.maps.CounterMap.most_common] selects the highest counts
+    without sorting all the keys.
+
+    `get` returns None for a missing key, as the other maps do, and
+    [`count`][pycommons.base.maps.CounterMap.count] returns 0.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import CounterMap
+
+        words = CounterMap("the cat and the hat".split())
+        words.most_common(1)
+        # [('the', 2)]
+        ```
+    """
+
+    data: Counter[_K]
+
+    def __init__(self, iterable: Optional[Union[Iterable[_K], Mapping[_K, int]]] = None):
+        """
+        Args:
+            iterable: Keys to be counted, or a mapping of the keys to their counts
+        """
+        super().__init__()
+        self.data = collections.Counter(iterable)
+
+    def increment(self, k: _K, delta: int = 1) -> int:
+        """
+        Add a delta to the count of a key, 0 if the key is not present
+
+        Args:
+            k: key
+            delta: value to be added to the count
+
+        Returns:
+            The new count of the key
+        """
+        count = self.data[k] = self.data[k] + delta
+        return count
+
+    def increment_all(self, iterable: Union[Iterable[_K], Mapping[_K, int]]) -> None:
+        """
+        Count all the keys of an iterable, or add the counts of a mapping
+
+        Args:
+            iterable: Keys to be counted, or a mapping of the keys to the counts to be added
+        """
+        self.data.update(iterable)
+
+    def count(self, k: _K) -> int:
+        """
+        Returns the count of a key, 0 if the key is not present
+        """
+        return self.data[k]
+
+    def total(self) -> int:
+        """
+        Returns the sum of the counts
+        """
+        return sum(self.data.values())
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[_K, int]]:
+        """
+        Returns the keys with the highest counts, with their counts, from the highest to the
+        lowest. The keys with equal counts are ordered by their first insertion.
+
+        Args:
+            n: Number of keys to be returned, all the keys if None
+
+        Returns:
+            List of key count pairs
+        """
+        return self.data.most_common(n)
+
+    def most_common_stream(self, n: Optional[int] = None) -> Stream["Map.Entry"]:
+        """
+        Create a stream of the entries with the highest counts, from the highest to the lowest
+
+        Args:
+            n: Number of entries, all the entries if None
+
+        Returns:
+            Stream of entries
+        """
+        return IteratorStream(Map.Entry(k, count) for k, count in self.data.most_common(n))
+
+    def compute_if_absent(self, k: _K, function: FunctionType[_K, int]) -> int:
+        if k in self.data:
+            return self.data[k]
+        _v = self.data[k] = (function.apply if isinstance(function, Function) else function)(k)
+        return _v
+
+    def put_all(self, m: Dict[_K, int]) -> None:
+        # Counter.update adds the counts, put_all replaces them
+        _dict_update(self.data, m)
+
+    def copy(self) -> "CounterMap[_K]":
+        return CounterMap(typing.cast(Mapping[_K, int], self.data))
@@ -0,0 +1,919 @@
+import itertools
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar, Any, Iterator, List, Mapping, MutableMapping, Optional, Set, Tuple
+
+from pycommons.base.concurrent.executor import Executors
+from pycommons.base.function import BiConsumer
+from pycommons.base.function.consumer import BiConsumerType
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
+from pycommons.base.maps.cache import CacheStats, LRUCacheMap
+from pycommons.base.maps.maps import Map
+from pycommons.base.maps.shared import _dumps_key
+from pycommons.base.streams import Stream, IteratorStream
+from pycommons.base.synchronized import RLockSynchronized, synchronized
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_VERSION = 2
+"""
+Version of the files. The keys of the logs of version 1 were pickled with the memo of the
+pickler, they are pickled again when the log is opened.
+"""
+_PROTOCOL = 4
+_LOG_MAGIC = b"PCDL"
+_LOG_HEADER = struct.Struct("<4sIQ")
+"""
+Header of the log: magic, version and generation, incremented by every compaction
+"""
+_RECORD = struct.Struct("<II")
+"""
+Header of a record, followed by the serialized key and value: key length and value length, or
+`_TOMBSTONE` for a removed key
+"""
+_INDEX_MAGIC = b"PCDI"
+_INDEX_HEADER = struct.Struct("<4sIQQQQQQ")
+"""
+Header of the index: magic, version, generation of the log, number of keys, number of slots,
+number of used slots, end of the indexed log and number of bytes of the log that are garbage
+"""
+_SLOT = struct.Struct("<IIQ")
+"""
+Slot of the index: hash of the key, size of the record and offset of the record + 1, 0 for an
+empty slot and `_DELETED` for the slot of a removed key
+"""
+_TOMBSTONE = 0xFFFFFFFF
+_DELETED = 0xFFFFFFFFFFFFFFFF
+_MIN_CAPACITY = 1024
+_FLUSH_SIZE = 1 << 20
+_SCAN_CHUNK = 4096
+_LOG_FILE = "data.log"
+_INDEX_FILE = "index"
+_COMPACTION_SUFFIX = ".compaction"
+_RESIZE_SUFFIX = ".resize"
+
+_MISSING: Any = object()
+
+
+def _dumps(obj: Any) -> bytes:
+    return pickle.dumps(obj, _PROTOCOL)
+
+
+def _capacity(size: int) -> int:
+    capacity = _MIN_CAPACITY
+    while capacity < 4 * size:
+        capacity *= 2
+    return capacity
+
+
+def _map_file(path: str, size: int = 0) -> mmap.mmap:
+    """
+    Memory map a file, read only if the size is 0, else resized to `size` bytes and writable
+    """
+    if not size:
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+        f.truncate(size)
+        return mmap.mmap(f.fileno(), size)
+
+
+class _Segment:  # pylint: disable=R0902
+    """
+    An append only log and the open addressing hash index of its live records. The log is
+    read through a memory map, and the records appended since the last flush from the
+    pending buffer. The attributes mirror the fields of the headers of the files.
+    """
+
+    def __init__(self, log_path: str, index_path: str, generation: int):
+        self.log_path = log_path
+        self.index_path = index_path
+        self.generation = generation
+        self.version = _VERSION
+        self.log = open(log_path, "ab")  # pylint: disable=R1732
+        self.flushed = self.log.tell()
+        self.pending = bytearray()
+        self.log_map = _map_file(log_path)
+        self.index: mmap.mmap
+        self.capacity = self.mask = 0
+        self.size = self.used = self.garbage = 0
+
+    @classmethod
+    def create(cls, log_path: str, index_path: str, generation: int, capacity: int) -> "_Segment":
+        with open(log_path, "wb") as f:
+            f.write(_LOG_HEADER.pack(_LOG_MAGIC, _VERSION, generation))
+        segment = cls(log_path, index_path, generation)
+        segment.map_index(index_path, capacity)
+        return segment
+
+    @classmethod
+    def open(cls, log_path: str, index_path: str) -> "_Segment":
+        """
+        Open a log and its index. The index is rebuilt from the log if it is missing or does
+        not match the log, and the records appended after the indexed end of the log are
+        indexed. A record truncated by a crash is removed. The log keeps its version until it
+        is rewritten.
+        """
+        with open(log_path, "rb") as f:
+            header = f.read(_LOG_HEADER.size)
+        if len(header) < _LOG_HEADER.size or header[:4] != _LOG_MAGIC:
+            raise ValueError(f"{log_path} is not a DiskMap log")
+        _, version, generation = _LOG_HEADER.unpack(header)
+        if version > _VERSION:
+            raise ValueError(f"{log_path} has the unsupported version {version}")
+        segment = cls(log_path, index_path, generation)
+        segment.version = version
+        end = _LOG_HEADER.size
+        try:
+            segment.index = _map_file(index_path, os.path.getsize(index_path))
+            (
+                magic,
+                version,
+                index_generation,
+                segment.size,
+                segment.capacity,
+                segment.used,
+                end,
+                segment.garbage,
+            ) = _INDEX_HEADER.unpack_from(segment.index, 0)
+            segment.mask = segment.capacity - 1
+            if (
+                (magic, version, index_generation) != (_INDEX_MAGIC, _VERSION, generation)
+                or end > segment.flushed
+                or segment.capacity < _MIN_CAPACITY
+                or segment.capacity & segment.mask
+                or len(segment.index) != _INDEX_HEADER.size + segment.capacity * _SLOT.size
+            ):
+                raise ValueError(index_path)
+        except (OSError, ValueError, struct.error):
+            segment.size = segment.used = segment.garbage = 0
+            segment.map_index(index_path, _MIN_CAPACITY)
+            end = _LOG_HEADER.size
+        for offset, key, value, size in segment.records(end, segment.flushed):
+            segment.index_record(key, zlib.crc32(key), offset, size, value is None)
+            end = offset + size
+        if end < segment.flushed:
+            segment.log.truncate(end)
+            segment.flushed = end
+            segment.remap()
+        segment.write_header()
+        return segment
+
+    @property
+    def end(self) -> int:
+        return self.flushed + len(self.pending)
+
+    def map_index(self, path: str, capacity: int) -> None:
+        self.index = _map_file(path, _INDEX_HEADER.size + capacity * _SLOT.size)
+        self.index[_INDEX_HEADER.size :] = bytes(capacity * _SLOT.size)
+        self.capacity, self.mask, self.used = capacity, capacity - 1, self.size
+        self.write_header()
+
+    def write_header(self) -> None:
+        _INDEX_HEADER.pack_into(
+            self.index,
+            0,
+            _INDEX_MAGIC,
+            _VERSION,
+            self.generation,
+            self.size,
+            self.capacity,
+            self.used,
+            self.end,
+            self.garbage,
+        )
+
+    def flush_pending(self) -> None:
+        if self.pending:
+            self.log.write(self.pending)
+            self.log.flush()
+            self.flushed += len(self.pending)
+            self.pending = bytearray()
+
+    def remap(self) -> None:
+        # The previous map is not closed, the streams in progress keep reading it
+        self.log_map = _map_file(self.log_path)
+
+    def read(self, offset: int, size: int) -> bytes:
+        if offset >= self.flushed:
+            offset -= self.flushed
+            return bytes(self.pending[offset : offset + size])
+        if offset + size > len(self.log_map):
+            self.remap()
+        return self.log_map[offset : offset + size]
+
+    def records(self, start: int, end: int) -> Iterator[Tuple[int, bytes, Optional[bytes], int]]:
+        """
+        Returns the offset, key, value and size of the records between two offsets, the value
+        is None for the removed keys. The iteration stops at a truncated record.
+        """
+        if end > self.flushed:
+            self.flush_pending()
+        if end > len(self.log_map):
+            self.remap()
+        log = self.log_map
+        offset = start
+        while offset + _RECORD.size <= end:
+            key_size, value_size = _RECORD.unpack_from(log, offset)
+            start = offset + _RECORD.size
+            value_start = start + key_size
+            value_end = value_start if value_size == _TOMBSTONE else value_start + value_size
+            if value_end > end:
+                return
+            value = None if value_size == _TOMBSTONE else log[value_start:value_end]
+            yield offset, log[start:value_start], value, value_end - offset
+            offset = value_end
+
+    def lookup(self, key: bytes, h: int) -> Tuple[int, bytes]:
+        """
+        Returns the slot and the record of a key. If the key is absent, returns -1 - the slot
+        where the key is inserted and an empty record.
+        """
+        index, mask = self.index, self.mask
+        i = h & mask
+        free = -1
+        while True:
+            slot_hash, size, offset = _SLOT.unpack_from(index, _INDEX_HEADER.size + i * _SLOT.size)
+            if not offset:
+                return -1 - (i if free < 0 else free), b""
+            if offset == _DELETED:
+                if free < 0:
+                    free = i
+            elif slot_hash == h:
+                # The size of the record is in the slot, the record is read at once
+                record = self.read(offset - 1, size)
+                if _RECORD.unpack_from(record)[0] == len(key) and record.startswith(
+                    key, _RECORD.size
+                ):
+                    return i, record
+            i = (i + 1) & mask
+
+    def find(self, key: bytes, h: int) -> int:
+        """
+        Returns the slot of a key, or -1 - the slot where the key is inserted if it is absent
+        """
+        return self.lookup(key, h)[0]
+
+    def live_records(self, start: int, end: int) -> Tuple[List[Tuple[bytes, bytes]], int]:
+        """
+        Returns the keys and values of the live records of a chunk of the log from an offset,
+        and the offset of the next chunk. A record is live if the slot of its key has its
+        offset.
+        """
+        if end > self.flushed:
+            self.flush_pending()
+        if end > len(self.log_map):
+            self.remap()
+        log, index, mask = self.log_map, self.index, self.mask
+        unpack_record, unpack_slot, crc32 = _RECORD.unpack_from, _SLOT.unpack_from, zlib.crc32
+        records = []
+        offset = start
+        for _ in range(_SCAN_CHUNK):
+            if offset >= end:
+                break
+            key_size, value_size = unpack_record(log, offset)
+            key_start = offset + _RECORD.size
+            value_start = key_start + key_size
+            if value_size == _TOMBSTONE:
+                offset = value_start
+                continue
+            key = log[key_start:value_start]
+            i = crc32(key) & mask
+            while True:
+                slot_offset = unpack_slot(index, _INDEX_HEADER.size + i * _SLOT.size)[2]
+                if slot_offset == offset + 1:
+                    records.append((key, log[value_start : value_start + value_size]))
+                    break
+                if not slot_offset:
+                    break
+                i = (i + 1) & mask
+            offset = value_start + value_size
+        return records, offset
+
+    def index_record(
+        self, key: bytes, h: int, offset: int, size: int, tombstone: bool, i: Optional[int] = None
+    ) -> None:
+        """
+        Index a record of the log, given the slot of its key if it was looked up already
+        """
+        if i is None:
+            i = self.find(key, h)
+        if i >= 0:
+            position = _INDEX_HEADER.size + i * _SLOT.size
+            self.garbage += _SLOT.unpack_from(self.index, position)[1]
+            if tombstone:
+                _SLOT.pack_into(self.index, position, h, 0, _DELETED)
+                self.size -= 1
+                self.garbage += size
+            else:
+                _SLOT.pack_into(self.index, position, h, size, offset + 1)
+        elif tombstone:
+            self.garbage += size
+        else:
+            if 2 * (self.used + 1) > self.capacity:
+                self.resize()
+                i = self.find(key, h)
+            position = _INDEX_HEADER.size + (-1 - i) * _SLOT.size
+            # A deleted slot is reused, an empty slot becomes used
+            self.used += not _SLOT.unpack_from(self.index, position)[2]
+            _SLOT.pack_into(self.index, position, h, size, offset + 1)
+            self.size += 1
+
+    def resize(self) -> None:
+        """
+        Rebuild the index without the deleted slots, in a new file that replaces the index
+        """
+        slots = [
+            slot
+            for slot in _SLOT.iter_unpack(self.index[_INDEX_HEADER.size :])
+            if slot[2] and slot[2] != _DELETED
+        ]
+        path = self.index_path + _RESIZE_SUFFIX
+        old_index = self.index
+        self.map_index(path, _capacity(self.size + 1))
+        index, mask = self.index, self.mask
+        for slot in slots:
+            i = slot[0] & mask
+            while _SLOT.unpack_from(index, _INDEX_HEADER.size + i * _SLOT.size)[2]:
+                i = (i + 1) & mask
+            _SLOT.pack_into(index, _INDEX_HEADER.size + i * _SLOT.size, *slot)
+        old_index.close()
+        os.replace(path, self.index_path)
+
+    def put(self, key: bytes, h: int, value: Optional[bytes], i: int) -> None:
+        """
+        Append a record to the log and index it, given the slot of its key. A removed key is
+        appended as a tombstone.
+        """
+        if value is None:
+            if i < 0:
+                return
+            record = _RECORD.pack(len(key), _TOMBSTONE) + key
+        else:
+            record = b"".join((_RECORD.pack(len(key), len(value)), key, value))
+        offset = self.flushed + len(self.pending)
+        self.pending += record
+        self.index_record(key, h, offset, len(record), value is None, i)
+        if len(self.pending) >= _FLUSH_SIZE:
+            self.flush_pending()
+
+    def flush(self) -> None:
+        self.flush_pending()
+        os.fsync(self.log.fileno())
+        self.write_header()
+        self.index.flush()
+
+    def release(self) -> None:
+        """
+        Close the log file once the segment is not written anymore. The maps stay open for
+        the streams in progress.
+        """
+        self.flush_pending()
+        self.remap()
+        self.log.close()
+
+    def close(self) -> None:
+        self.flush_pending()
+        self.write_header()
+        self.log.close()
+        self.index.close()
+        self.log_map.close()
+
+
+class DiskMap(RLockSynchronized, MutableMapping[_K, _V]):
+    """
+    A map stored on disk, for the maps too large to be held in memory. The entries are
+    appended to a log file, and an open addressing hash index file maps the keys to their
+    latest record. Both files are read through `mmap`, so only the pages of the log that are
+    used are loaded in memory.
+
+    The keys and the values are pickled. Two keys are the same key when they are pickled to
+    the same bytes, which holds for the equal keys of the types `str`, `bytes`, `int` and the
+    tuples of them, but not for instance for `1` and `1.0`, both in the map and in its cache.
+    The keys are pickled without the memo of the pickler, they must not contain reference
+    cycles.
+
+    The writes are buffered and appended sequentially to the log, call
+    [`flush`][pycommons.base.maps.DiskMap.flush] to write them to the disk. The map reopened
+    from the same directory has the entries written before the map was closed or flushed.
+    A put or a remove appends a record, and the records of the keys that were put again or
+    removed become garbage. [`compact`][pycommons.base.maps.DiskMap.compact] rewrites the
+    live records in a new log in a background thread, and is started automatically when the
+    garbage exceeds `compaction_ratio` of the log.
+
+    The most recently read values are kept in an [`LRUCacheMap`][pycommons.base.maps.LRUCacheMap]
+    of `cache_size` entries. The cached values are shared by the callers of `get` and must not
+    be modified.
+
+    A `DiskMap` is thread safe. [`stream`][pycommons.base.maps.DiskMap.stream] scans the log
+    sequentially and is weakly consistent: it returns the entries put before it was created
+    that are not removed when it reaches them, and may or may not return the entries put
+    since.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import DiskMap
+
+        with DiskMap("/var/data/lookup", cache_size=100_000) as disk_map:
+            disk_map.put_all({"a": 1, "b": 2})
+            disk_map.get("b")
+            # 2
+        ```
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = 10_000,
+        compaction_ratio: Optional[float] = 0.5,
+        compaction_threshold: int = 1 << 26,
+    ):
+        """
+        Args:
+            path: Directory of the map files, created if it does not exist
+            cache_size: Maximum number of values cached in memory, 0 to disable the cache
+            compaction_ratio: Ratio of the log that is garbage above which the log is
+                compacted in the background, None to disable the automatic compaction
+            compaction_threshold: Minimum number of bytes of garbage before the log is
+                compacted automatically
+        """
+        super().__init__()
+        os.makedirs(path, exist_ok=True)
+        log_path = os.path.join(path, _LOG_FILE)
+        index_path = os.path.join(path, _INDEX_FILE)
+        # Files left by a compaction or a resize of the index that did not complete
+        for file_path in (
+            log_path + _COMPACTION_SUFFIX,
+            index_path + _COMPACTION_SUFFIX,
+            index_path + _RESIZE_SUFFIX,
+        ):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        self._segment = (
+            _Segment.open(log_path, index_path)
+            if os.path.exists(log_path)
+            else _Segment.create(log_path, index_path, 0, _MIN_CAPACITY)
+        )
+        if self._segment.version != _VERSION:
+            self._segment = self._upgrade(self._segment)
+        self._cache: Optional[LRUCacheMap[Any, Any]] = (
+            LRUCacheMap(maximum_size=cache_size) if cache_size else None
+        )
+        self._compaction_ratio = compaction_ratio
+        self._compaction_threshold = compaction_threshold
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._compaction: "Optional[Future[None]]" = None
+
+    @staticmethod
+    def _upgrade(old: _Segment) -> _Segment:
+        """
+        Rewrite a log of a previous version in a new log, with the keys pickled again. The old
+        log is kept if the rewrite does not complete.
+        """
+        new = _Segment.create(
+            old.log_path + _COMPACTION_SUFFIX,
+            old.index_path + _COMPACTION_SUFFIX,
+            old.generation + 1,
+            _capacity(old.size),
+        )
+        for _, key, value, _ in old.records(_LOG_HEADER.size, old.end):
+            key = _dumps_key(pickle.loads(key))
+            h = zlib.crc32(key)
+            new.put(key, h, value, new.find(key, h))
+        new.flush()
+        old.close()
+        os.replace(new.log_path, old.log_path)
+        os.replace(new.index_path, old.index_path)
+        new.log_path, new.index_path = old.log_path, old.index_path
+        return new
+
+    def _lookup(self, k: _K) -> Any:
+        # The cache is keyed by the pickled keys, the keys that are the same key on the disk
+        key = _dumps_key(k)
+        if self._cache is not None:
+            _v = self._cache.get(key, _MISSING)
+            if _v is not _MISSING:
+                return _v
+        segment = self._segment
+        i, record = segment.lookup(key, zlib.crc32(key))
+        if i < 0:
+            return _MISSING
+        _v = pickle.loads(memoryview(record)[_RECORD.size + len(key) :])
+        if self._cache is not None:
+            self._cache.put(key, _v)
+        return _v
+
+    def _write(self, k: _K, value: Optional[bytes]) -> None:
+        key = _dumps_key(k)
+        h = zlib.crc32(key)
+        self._segment.put(key, h, value, self._segment.find(key, h))
+        if self._cache is not None:
+            self._cache.remove(key)
+
+    def _written(self) -> None:
+        segment = self._segment
+        segment.write_header()
+        if (
+            self._compaction_ratio is not None
+            and segment.garbage >= self._compaction_threshold
+            and segment.garbage > self._compaction_ratio * segment.end
+            and (self._compaction is None or self._compaction.done())
+        ):
+            self.compact()
+
+    @synchronized
+    def __getitem__(self, k: _K) -> _V:
+        _v = self._lookup(k)
+        if _v is _MISSING:
+            raise KeyError(k)
+        return _v  # type: ignore
+
+    @synchronized
+    def __setitem__(self, k: _K, v: _V) -> None:
+        self._write(k, _dumps(v))
+        self._written()
+
+    @synchronized
+    def __delitem__(self, k: _K) -> None:
+        if k not in self:
+            raise KeyError(k)
+        self._write(k, None)
+        self._written()
+
+    @synchronized
+    def __contains__(self, k: object) -> bool:
+        key = _dumps_key(k)
+        if self._cache is not None and self._cache.contains_key(key):
+            return True
+        return self._segment.find(key, zlib.crc32(key)) >= 0
+
+    @synchronized
+    def __len__(self) -> int:
+        return self._segment.size
+
+    def __iter__(self) -> Iterator[_K]:
+        return (pickle.loads(key) for key, _ in self._scan())
+
+    def __enter__(self) -> "DiskMap[_K, _V]":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _scan(self) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Yields the live records of the log, a chunk at a time. The scan continues on the log it
+        started on if the map is compacted meanwhile.
+        """
+        with self._lock:
+            segment = self._segment
+        offset = _LOG_HEADER.size
+        while True:
+            with self._lock:
+                end = segment.end
+                records, offset = segment.live_records(offset, end)
+            yield from records
+            if offset >= end:
+                return
+
+    @synchronized
+    def get(self, key: _K, default: Any = None) -> Any:
+        _v = self._lookup(key)
+        return default if _v is _MISSING else _v
+
+    @synchronized
+    def put(self, k: _K, v: _V) -> _V:
+        """
+        Add a key value pair to the map
+
+        Args:
+            k: Key
+            v: Value
+
+        Returns:
+            The value
+        """
+        self[k] = v
+        return v
+
+    @synchronized
+    def put_all(self, m: Mapping[_K, _V]) -> None:
+        """
+        Put all the key value pairs of a mapping in the map. The records are appended to the
+        log in a single sequential write per megabyte.
+
+        Args:
+            m: mapping
+        """
+        segment, cache = self._segment, self._cache
+        for k, v in m.items():
+            key = _dumps_key(k)
+            h = zlib.crc32(key)
+            segment.put(key, h, pickle.dumps(v, _PROTOCOL), segment.find(key, h))
+            if cache:
+                cache.remove(key)
+        self._written()
+
+    @synchronized
+    def remove(self, k: _K) -> Optional[_V]:
+        """
+        Removes a key from the map if it is present and returns the removed value
+
+        Args:
+            k: key to be removed from map
+
+        Returns:
+            Value if the key is present. None, if the value is None or the map doesn't
+            contain the key.
+        """
+        _v = self._lookup(k)
+        if _v is _MISSING:
+            return None
+        self._write(k, None)
+        self._written()
+        return _v  # type: ignore
+
+    @synchronized
+    def put_if_absent(self, k: _K, v: _V) -> _V:
+        """
+        Add a key value pair to the map only when the key is not present
+
+        Args:
+            k: Key
+            v: Value
+
+        Returns:
+            The current value if present, the value put otherwise
+        """
+        _v = self._lookup(k)
+        if _v is not _MISSING:
+            return _v  # type: ignore
+        self._write(k, _dumps(v))
+        self._written()
+        return v
+
+    @synchronized
+    def compute_if_absent(self, k: _K, function: FunctionType[_K, _V]) -> _V:
+        """
+        Add a key value pair by calling a function that returns the value based on the key
+        passed. The function is only called when the key is not present, with the map locked.
+
+        Args:
+            k: key
+            function: the callable that generates the value
+
+        Returns:
+            the current value if present, the computed value otherwise
+        """
+        _v = self._lookup(k)
+        if _v is not _MISSING:
+            return _v  # type: ignore
+        _v = Function.of(function).apply(k)
+        self._write(k, _dumps(_v))
+        self._written()
+        return _v  # type: ignore
+
+    @synchronized
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, _V, Optional[_V]]
+    ) -> Optional[_V]:
+        """
+        Compute a new value for a key that is present in the map, from the key and its current
+        value. The key is removed if the function returns None.
+
+        Args:
+            k: key
+            function: the callable that generates the new value from the key and the old value
+
+        Returns:
+            the new value, None if the key is not present or was removed
+        """
+        _v = self._lookup(k)
+        if _v is _MISSING:
+            return None
+        _v = BiFunction.of(function).apply(k, _v)
+        self._write(k, None if _v is None else _dumps(_v))
+        self._written()
+        return _v  # type: ignore
+
+    @synchronized
+    def merge(self, k: _K, v: _V, function: BiFunctionType[_V, _V, Optional[_V]]) -> Optional[_V]:
+        """
+        Put the value if the key is not present. Otherwise, replace the value of the key with
+        the result of the function called with the old and the given value. The key is removed
+        if the function returns None.
+
+        Args:
+            k: key
+            v: value to be put or merged with the old value
+            function: the callable that merges the old value and the given value
+
+        Returns:
+            the new value, None if the key was removed
+        """
+        _v = self._lookup(k)
+        _v = v if _v is _MISSING else BiFunction.of(function).apply(_v, v)
+        self._write(k, None if _v is None else _dumps(_v))
+        self._written()
+        return _v  # type: ignore
+
+    @synchronized
+    def replace_old_value(self, k: _K, old_value: _V, new_value: _V) -> bool:
+        """
+        Replaces the value of a key only if the current value is equal to `old_value`
+
+        Args:
+            k: key
+            old_value: Old value
+            new_value: New value to be put in the map
+
+        Returns:
+            True if the value is replaced, False otherwise
+        """
+        _v = self._lookup(k)
+        if _v is _MISSING or _v != old_value:
+            return False
+        self._write(k, _dumps(new_value))
+        self._written()
+        return True
+
+    @synchronized
+    def replace(self, k: _K, v: _V) -> Optional[_V]:
+        """
+        Replace the value of a key if the key is present
+
+        Args:
+            k: key
+            v: value
+
+        Returns:
+            The old value if replaced, None otherwise
+        """
+        _v = self._lookup(k)
+        if _v is _MISSING:
+            return None
+        self._write(k, _dumps(v))
+        self._written()
+        return _v  # type: ignore
+
+    def contains_key(self, k: _K) -> bool:
+        return k in self
+
+    def contains_value(self, v: _V) -> bool:
+        """
+        Returns True if a value is present in the map. The log is scanned like in
+        [`stream`][pycommons.base.maps.DiskMap.stream].
+
+        Args:
+            v: value
+
+        Returns:
+            True if a value is present in the map, False otherwise
+        """
+        return any(pickle.loads(value) == v for _, value in self._scan())
+
+    def key_set(self) -> Set[_K]:
+        """
+        Returns a set of the keys in the map, read from the log
+
+        Returns:
+            Set of keys
+        """
+        return set(self)
+
+    def entry_set(self) -> Set["Map.Entry"]:
+        """
+        Returns a set of the `Map.Entry` in the map, read from the log
+
+        Returns:
+            Set of map entries
+        """
+        return set(self._entries())
+
+    def size(self) -> int:
+        return len(self)
+
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+    def for_each(self, bi_consumer: BiConsumerType[_K, _V]) -> None:
+        """
+        Runs a bi-consumer callable on each key value pairs in the map, in the order of the log
+
+        Args:
+            bi_consumer: Callable that consumes 2 args, key and value
+        """
+        _consumer: BiConsumer[_K, _V] = BiConsumer.of(bi_consumer)
+        for key, value in self._scan():
+            _consumer.accept(pickle.loads(key), pickle.loads(value))
+
+    def stream(self) -> Stream["Map.Entry"]:
+        """
+        Create a stream of the map entries, that scans the log sequentially. The entries are
+        read from the disk while the stream is consumed.
+
+        Returns:
+            Stream of entries
+        """
+        return IteratorStream(self._entries())
+
+    def _entries(self) -> Iterator["Map.Entry"]:
+        return itertools.starmap(
+            Map.Entry, ((pickle.loads(key), pickle.loads(value)) for key, value in self._scan())
+        )
+
+    @synchronized
+    def disk_size(self) -> int:
+        """
+        Returns the size in bytes of the log
+        """
+        return self._segment.end
+
+    @synchronized
+    def garbage_size(self) -> int:
+        """
+        Returns the number of bytes of the log taken by the records that are not live anymore
+        """
+        return self._segment.garbage
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        """
+        Returns the statistics of the cache of values, None if the cache is disabled
+        """
+        return None if self._cache is None else self._cache.stats
+
+    @synchronized
+    def flush(self) -> None:
+        """
+        Write the buffered records to the disk
+        """
+        self._segment.flush()
+
+    @synchronized
+    def compact(self) -> "Future[None]":
+        """
+        Rewrite the live records in a new log in a background thread, unless a compaction is
+        in progress. The map is locked while the chunks of the log are checked against the
+        index, and at the end while the records written meanwhile are appended to the new log
+        and the new log replaces the old one.
+
+        Returns:
+            The future of the compaction
+        """
+        if self._compaction is None or self._compaction.done():
+            if self._executor is None:
+                self._executor = Executors.new_single_thread_executor(
+                    thread_name_prefix="DiskMap-compaction"
+                )
+            self._compaction = self._executor.submit(self._compact)
+        return self._compaction
+
+    def _compact(self) -> None:
+        with self._lock:
+            old = self._segment
+            end = old.end
+            new = _Segment.create(
+                old.log_path + _COMPACTION_SUFFIX,
+                old.index_path + _COMPACTION_SUFFIX,
+                old.generation + 1,
+                _capacity(old.size),
+            )
+        try:
+            offset = _LOG_HEADER.size
+            while offset < end:
+                with self._lock:
+                    records, offset = old.live_records(offset, end)
+                for key, value in records:
+                    h = zlib.crc32(key)
+                    new.put(key, h, value, new.find(key, h))
+            with self._lock:
+                for _, key, _value, _ in old.records(end, old.end):
+                    h = zlib.crc32(key)
+                    new.put(key, h, _value, new.find(key, h))
+                new.flush()
+                old.release()
+                os.replace(new.log_path, old.log_path)
+                os.replace(new.index_path, old.index_path)
+                new.log_path, new.index_path = old.log_path, old.index_path
+                self._segment = new
+        except BaseException:
+            new.close()
+            for path in (new.log_path, new.index_path):
+                if path.endswith(_COMPACTION_SUFFIX) and os.path.exists(path):
+                    os.remove(path)
+            raise
+
+    def close(self) -> None:
+        """
+        Wait for the compaction in progress, write the buffered records and close the files.
+        The map must not be used after being closed.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+        with self._lock:
+            self._segment.close()
@@ -0,0 +1,295 @@
+import typing
+from abc import abstractmethod
+from typing import TypeVar, Any, Dict, Optional, Set, Mapping
+
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
+from pycommons.base.maps.maps import Map
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_MISSING: Any = object()
+
+
+class _ValueIndexedMap(Map[_K, _V]):
+    """
+    Base class of the maps that maintain an index of their values. Every write goes through
+    `_store` and `_discard`, which keep the index consistent with the map.
+    """
+
+    def __init__(self, m: Optional[Mapping[_K, _V]] = None, **kwargs: _V):
+        self._init_index()
+        super().__init__(m, **kwargs)
+
+    @abstractmethod
+    def _init_index(self) -> None:
+        ...
+
+    @abstractmethod
+    def _index(self, k: _K, v: _V) -> None:
+        ...
+
+    @abstractmethod
+    def _unindex(self, k: _K, v: _V) -> None:
+        ...
+
+    def _check(self, k: _K, v: _V) -> None:
+        """
+        Validate a write before the map is modified
+        """
+
+    @abstractmethod
+    def contains_value(self, v: _V) -> bool:
+        ...
+
+    @abstractmethod
+    def keys_for_value(self, v: _V) -> Set[_K]:
+        """
+        Returns the keys mapped to a value in O(1), without scanning the map.
+
+        Args:
+            v: value
+
+        Returns:
+            The set of keys whose value is `v`
+        """
+
+    def _store(self, k: _K, v: _V) -> None:
+        self._check(k, v)
+        _old_value = self.data.get(k, _MISSING)
+        if _old_value is not _MISSING:
+            self._unindex(k, _old_value)
+        self.data[k] = v
+        self._index(k, v)
+
+    def _discard(self, k: _K) -> Any:
+        _v = self.data.pop(k, _MISSING)
+        if _v is not _MISSING:
+            self._unindex(k, _v)
+        return _v
+
+    def __setitem__(self, k: _K, v: _V) -> None:
+        self._store(k, v)
+
+    def __delitem__(self, k: _K) -> None:
+        if self._discard(k) is _MISSING:
+            raise KeyError(k)
+
+    def copy(self) -> "_ValueIndexedMap[_K, _V]":
+        return type(self)(self.data)
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._init_index()
+
+    def put(self, k: _K, v: _V) -> _V:
+        self._store(k, v)
+        return v
+
+    def put_if_absent(self, k: _K, v: _V) -> _V:
+        _v: Any = self.data.get(k, _MISSING)
+        if _v is _MISSING:
+            self._store(k, v)
+            return v
+        return typing.cast(_V, _v)
+
+    def compute_if_absent(self, k: _K, function: FunctionType[_K, _V]) -> _V:
+        _v: Any = self.data.get(k, _MISSING)
+        if _v is _MISSING:
+            _v = (function.apply if isinstance(function, Function) else function)(k)
+            self._store(k, _v)
+        return typing.cast(_V, _v)
+
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, _V, Optional[_V]]
+    ) -> Optional[_V]:
+        _v: Any = self.data.get(k, _MISSING)
+        if _v is _MISSING:
+            return None
+        _v = (function.apply if isinstance(function, BiFunction) else function)(k, _v)
+        if _v is None:
+            self._discard(k)
+        else:
+            self._store(k, _v)
+        return typing.cast(Optional[_V], _v)
+
+    def merge(self, k: _K, v: _V, function: BiFunctionType[_V, _V, Optional[_V]]) -> Optional[_V]:
+        _v: Any = self.data.get(k, _MISSING)
+        if _v is not _MISSING:
+            _v = (function.apply if isinstance(function, BiFunction) else function)(_v, v)
+            if _v is None:
+                self._discard(k)
+                return None
+        else:
+            _v = v
+        self._store(k, _v)
+        return typing.cast(_V, _v)
+
+    def remove(self, k: _K) -> Optional[_V]:
+        _v = self._discard(k)
+        return None if _v is _MISSING else typing.cast(_V, _v)
+
+    def put_all(self, m: Dict[_K, _V]) -> None:
+        for k, v in m.items():
+            self._store(k, v)
+
+    def replace_old_value(self, k: _K, old_value: _V, new_value: _V) -> bool:
+        if self.data.get(k) == old_value:
+            self._store(k, new_value)
+            return True
+        return False
+
+    def replace(self, k: _K, v: _V) -> Optional[_V]:
+        _old_value: Any = self.data.get(k, _MISSING)
+        if _old_value is _MISSING:
+            return None
+        self._store(k, v)
+        return typing.cast(_V, _old_value)
+
+
+class IndexedMap(_ValueIndexedMap[_K, _V]):
+    """
+    A [`Map`][pycommons.base.maps.Map] that maintains a reverse index from every value to the
+    set of its keys, so that `contains_value` and `keys_for_value` are O(1) instead of a scan
+    of the map. Several keys can have the same value. The values must be hashable.
+
+    The index is kept consistent by all the writes of the map: `put`, `put_all`, `replace`,
+    `replace_old_value`, the compute operations, `remove` and `clear`, as well as the
+    `dict` style item assignment and deletion.
+
+    The index costs one dict entry and one `set` per distinct value, plus one set slot per
+    key. With integer keys on 64-bit CPython 3.11 that is about 270 bytes per entry on top of
+    the map when the values are unique, and about 30 bytes per entry when 1000 keys share
+    each value (see `benchmarks/indexed_map.py`). Prefer a `BiMap` for unique values.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import IndexedMap
+
+        owners = IndexedMap({"alice": "admin", "bob": "user", "carol": "admin"})
+        owners.keys_for_value("admin")
+        # {'alice', 'carol'}
+        ```
+    """
+
+    def _init_index(self) -> None:
+        self._keys_by_value: Dict[_V, Set[_K]] = {}
+
+    def _index(self, k: _K, v: _V) -> None:
+        keys = self._keys_by_value.get(v)
+        if keys is None:
+            self._keys_by_value[v] = {k}
+        else:
+            keys.add(k)
+
+    def _unindex(self, k: _K, v: _V) -> None:
+        keys = self._keys_by_value[v]
+        keys.discard(k)
+        if not keys:
+            del self._keys_by_value[v]
+
+    def contains_value(self, v: _V) -> bool:
+        return v in self._keys_by_value
+
+    def keys_for_value(self, v: _V) -> Set[_K]:
+        return set(self._keys_by_value.get(v, ()))
+
+
+class BiMap(_ValueIndexedMap[_K, _V]):
+    """
+    A bidirectional [`Map`][pycommons.base.maps.Map] whose values are unique, similar to the
+    BiMap of Guava. `contains_value` and `keys_for_value` are O(1), and
+    [`inverse`][pycommons.base.maps.BiMap.inverse] returns a live view mapping the values to
+    their keys. The values must be hashable.
+
+    Putting a value that is already mapped to another key raises a `ValueError`, use
+    [`force_put`][pycommons.base.maps.BiMap.force_put] to replace the existing mapping.
+
+    The inverse mapping costs one extra dict entry per entry. With integer keys and values on
+    64-bit CPython 3.11 that is about 50 bytes per entry on top of the map (see
+    `benchmarks/indexed_map.py`).
+
+    Examples:
+        ```python
+        from pycommons.base.maps import BiMap
+
+        codes = BiMap({"en": 1, "fr": 2})
+        codes.inverse().get(2)
+        # 'fr'
+        ```
+
+    References:
+        https://guava.dev/releases/snapshot/api/docs/com/google/common/collect/BiMap.html
+    """
+
+    def __init__(self, m: Optional[Mapping[_K, _V]] = None, **kwargs: _V):
+        self._inverse_data: Dict[_V, _K] = {}
+        self._inverse: Optional[BiMap[_V, _K]] = None
+        super().__init__(m, **kwargs)
+
+    def _init_index(self) -> None:
+        self._inverse_data.clear()
+
+    def _check(self, k: _K, v: _V) -> None:
+        _k = self._inverse_data.get(v, _MISSING)
+        if _k is not _MISSING and _k != k:
+            raise ValueError(f"The value {v!r} is already mapped to the key {_k!r}")
+
+    def _index(self, k: _K, v: _V) -> None:
+        self._inverse_data[v] = k
+
+    def _unindex(self, k: _K, v: _V) -> None:
+        del self._inverse_data[v]
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._inverse_data.clear()
+
+    def contains_value(self, v: _V) -> bool:
+        return v in self._inverse_data
+
+    def keys_for_value(self, v: _V) -> Set[_K]:
+        _k = self._inverse_data.get(v, _MISSING)
+        return set() if _k is _MISSING else {_k}
+
+    def force_put(self, k: _K, v: _V) -> Optional[_V]:
+        """
+        Put a key value pair, removing the existing entry of the value if it is mapped to
+        another key.
+
+        Args:
+            k: key
+            v: value
+
+        Returns:
+            The previous value of the key, None if the key was not present
+        """
+        _old_value = self.data.get(k)
+        _k = self._inverse_data.get(v, _MISSING)
+        if _k is not _MISSING and _k != k:
+            self._discard(_k)
+        self._store(k, v)
+        return _old_value
+
+    def inverse(self) -> "BiMap[_V, _K]":
+        """
+        Returns the inverse view of the map, mapping the values to their keys. The view shares
+        the storage of this map: the changes of one are visible in the other.
+
+        Returns:
+            The inverse map
+        """
+        if self._inverse is None:
+            self._inverse = BiMap._view(self._inverse_data, self.data, self)
+        return self._inverse
+
+    @classmethod
+    def _view(
+        cls, data: Dict[_K, _V], inverse_data: Dict[_V, _K], inverse: "BiMap[_V, _K]"
+    ) -> "BiMap[_K, _V]":
+        """
+        Create a map on the dicts of another map, the inverse view of `inverse`
+        """
+        view: BiMap[_K, _V] = cls()
+        view.data, view._inverse_data, view._inverse = data, inverse_data, inverse
+        return view
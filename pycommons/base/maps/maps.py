@@ -1,15 +1,28 @@
+import itertools
 import typing
 from collections import UserDict
-from typing import TypeVar, Generic, Dict, Optional, Set
+from typing import (
+    TypeVar,
+    Generic,
+    Dict,
+    Optional,
+    Set,
+    AbstractSet,
+    Any,
+    Iterator,
+    KeysView,
+)
 
 from pycommons.base.function import BiConsumer
 from pycommons.base.function.consumer import BiConsumerType, ConsumerType, Consumer
-from pycommons.base.function.function import FunctionType, Function
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
 from pycommons.base.streams import Stream, IteratorStream
 
 _K = TypeVar("_K")
 _V = TypeVar("_V")
 
+_MISSING: Any = object()
+
 
 class Map(UserDict, Generic[_K, _V]):  # type: ignore
     """
@@ -22,9 +35,12 @@ class Map(UserDict, Generic[_K, _V]):  # type: ignore
 
     class Entry:
         """
-        A dataclass that holds an entry(key, value) of a map.
+        A dataclass that holds an entry(key, value) of a map. Entries are lightweight slotted
+        objects; two entries are equal when their keys and values are equal.
         """
 
+        __slots__ = ("_key", "_value")
+
         def __init__(self, key: _K, value: _V):
             self._key: _K = key
             self._value: _V = value
@@ -37,9 +53,44 @@ class Map(UserDict, Generic[_K, _V]):  # type: ignore
         def value(self) -> _V:
             return typing.cast(_V, self._value)
 
+        def __eq__(self, other: object) -> bool:
+            if not isinstance(other, Map.Entry):
+                return NotImplemented
+            return bool(self._key == other._key and self._value == other._value)
+
         def __hash__(self) -> int:
             return hash(self.key)
 
+        def __repr__(self) -> str:
+            return f"Entry({self._key!r}, {self._value!r})"
+
+    class EntriesView(AbstractSet["Map.Entry"]):
+        """
+        A live, read only set view of the entries of a map. The view does not copy the map:
+        it reflects the changes of the map and creates the `Map.Entry` objects lazily while
+        being iterated.
+        """
+
+        __slots__ = ("_data",)
+
+        def __init__(self, data: Dict[Any, Any]):
+            self._data = data
+
+        def __len__(self) -> int:
+            return len(self._data)
+
+        def __iter__(self) -> Iterator["Map.Entry"]:
+            return itertools.starmap(Map.Entry, self._data.items())
+
+        def __contains__(self, entry: object) -> bool:
+            if not isinstance(entry, Map.Entry):
+                return False
+            _v = self._data.get(entry.key, _MISSING)
+            return _v is not _MISSING and bool(_v == entry.value)
+
+        def __repr__(self) -> str:
+            return f"EntriesView({list(self)!r})"
+
     def put(self, k: _K, v: _V) -> _V:
         """
         Add a key value pair to the map
@@ -74,24 +125,73 @@ class Map(UserDict, Generic[_K, _V]):  # type: ignore
         Returns:
 
         """
-        if k not in self.data:
-            self.put(k, v)
-        return self.data[k]
+        return self.data.setdefault(k, v)
 
     def compute_if_absent(self, k: _K, function: FunctionType[_K, _V]) -> _V:
         """
         Add a key value pair by calling a function that
-        returns the value based on the key passed.
+        returns the value based on the key passed. The function is only called
+        when the key is not present.
 
         Args:
             k: key
             function: the callable that generates the value
 
         Returns:
-            the value
+            the current value if present, the computed value otherwise
         """
-        self.put_if_absent(k, Function.of(function).apply(k))
-        return self.data[k]
+        try:
+            return self.data[k]
+        except KeyError:
+            _v = self.data[k] = Function.of(function).apply(k)
+            return _v
+
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, _V, Optional[_V]]
+    ) -> Optional[_V]:
+        """
+        Compute a new value for a key that is present in the map, from the key and its current
+        value. The key is removed if the function returns None.
+
+        Args:
+            k: key
+            function: the callable that generates the new value from the key and the old value
+
+        Returns:
+            the new value, None if the key is not present or was removed
+        """
+        if k not in self.data:
+            return None
+        _v = BiFunction.of(function).apply(k, self.data[k])
+        if _v is None:
+            del self.data[k]
+        else:
+            self.data[k] = _v
+        return _v
+
+    def merge(self, k: _K, v: _V, function: BiFunctionType[_V, _V, Optional[_V]]) -> Optional[_V]:
+        """
+        Put the value if the key is not present. Otherwise, replace the value of the key with
+        the result of the function called with the old and the given value. The key is removed
+        if the function returns None.
+
+        Args:
+            k: key
+            v: value to be put or merged with the old value
+            function: the callable that merges the old value and the given value
+
+        Returns:
+            the new value, None if the key was removed
+        """
+        if k not in self.data:
+            self.data[k] = v
+            return v
+        _v = BiFunction.of(function).apply(self.data[k], v)
+        if _v is None:
+            del self.data[k]
+        else:
+            self.data[k] = _v
+        return _v
 
     def size(self) -> int:
         """
@@ -165,21 +265,42 @@ class Map(UserDict, Generic[_K, _V]):  # type: ignore
 
     def key_set(self) -> Set[_K]:
         """
-        Returns the set of keys in the map
+        Returns a copy of the set of keys in the map. Use
+        [`keys_view`][pycommons.base.maps.Map.keys_view] to avoid the copy.
 
         Returns:
             Set of keys
         """
-        return set(self.keys())
+        return set(self.data)
+
+    def keys_view(self) -> KeysView[_K]:
+        """
+        Returns a live set view of the keys in the map, without copying them.
+
+        Returns:
+            View of the keys
+        """
+        return self.data.keys()
 
     def entry_set(self) -> Set["Map.Entry"]:
         """
-        Returns the set of `Map.Entry` in the map
+        Returns a copy of the set of `Map.Entry` in the map. Use
+        [`entries_view`][pycommons.base.maps.Map.entries_view] to avoid the copy.
 
         Returns:
             Set of map entries
         """
-        return {Map.Entry(k, v) for k, v in self.data.items()}
+        return set(self.entries_view())
+
+    def entries_view(self) -> "Map.EntriesView":
+        """
+        Returns a live set view of the `Map.Entry` in the map, without copying the map.
+        The entries are created while the view is iterated.
+
+        Returns:
+            View of the map entries
+        """
+        return Map.EntriesView(self.data)
 
     def for_each(self, bi_consumer: BiConsumerType[_K, _V]) -> None:
         """
@@ -205,8 +326,8 @@ class Map(UserDict, Generic[_K, _V]):  # type: ignore
             None
         """
         _consumer: Consumer[Map.Entry] = Consumer.of(consumer)
-        for k, v in self.data.items():
-            _consumer.accept(Map.Entry(k, v))
+        for entry in self.entries_view():
+            _consumer.accept(entry)
 
     def replace_old_value(self, k: _K, old_value: _V, new_value: _V) -> bool:
         """
@@ -248,9 +369,11 @@ class Map(UserDict, Generic[_K, _V]):  # type: ignore
 
     def stream(self) -> Stream["Map.Entry"]:
         """
-        Create a stream of the map entries present in the map.
+        Create a stream of the map entries present in the map. The entries are created lazily
+        while the stream is consumed, in the insertion order of the map. The map must not be
+        modified until the stream is consumed.
 
         Returns:
             Stream of entries
         """
-        return IteratorStream(iter(self.entry_set()))
+        return IteratorStream(iter(self.entries_view()))
@@ -0,0 +1,264 @@
+import itertools
+import typing
+from typing import (
+    TypeVar,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
+from pycommons.base.maps.maps import Map
+from pycommons.base.streams import Stream, IteratorStream
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_ADD_FUNCTIONS: typing.Dict[type, Callable[[Any, Any], Any]] = {
+    list: list.append,
+    set: set.add,
+}
+
+
+class MultiMap(Map[_K, Collection[_V]]):
+    """
+    A [`Map`][pycommons.base.maps.Map] from keys to collections of values, similar to the
+    Multimap of Guava. The values of a key are stored in a `list`, or in a `set` to ignore the
+    duplicate values of a key. A key is present only while it has at least one value: the
+    values put in the map, with `put`, `m[k] = values`, `update` or `merge`, are copied to a
+    collection of the value type, and a key put with no values is removed.
+
+    [`add`][pycommons.base.maps.MultiMap.add] and
+    [`put_all_from`][pycommons.base.maps.MultiMap.put_all_from] create the collection of a
+    key only when the key is missing, unlike `compute_if_absent(k, lambda _: [])`, which
+    allocates a list on every call.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import MultiMap
+
+        by_team = MultiMap()
+        by_team.put_all_from([("core", "alice"), ("docs", "bob"), ("core", "carol")])
+        by_team.get_values("core")
+        # ['alice', 'carol']
+        ```
+
+    References:
+        https://guava.dev/releases/snapshot/api/docs/com/google/common/collect/Multimap.html
+    """
+
+    def __init__(
+        self,
+        m: Optional[Mapping[_K, Iterable[_V]]] = None,
+        value_type: Type[Collection[Any]] = list,
+    ):
+        """
+        Args:
+            m: Initial keys and their values
+            value_type: Collection of the values of a key, `list` or `set`
+        """
+        if value_type not in _ADD_FUNCTIONS:
+            raise ValueError("value_type must be list or set")
+        self._value_type: Callable[..., Collection[_V]] = value_type
+        self._add = _ADD_FUNCTIONS[value_type]
+        super().__init__()
+        if m is not None:
+            for k, values in m.items():
+                self.add_all(k, values)
+
+    def _store(self, k: _K, values: Optional[Iterable[_V]]) -> Collection[_V]:
+        """
+        Put a copy of the values as the values of a key, or remove the key if there are none
+        """
+        _values = self._value_type() if values is None else self._value_type(values)
+        if _values:
+            self.data[k] = _values
+        else:
+            self.data.pop(k, None)
+        return _values
+
+    def __setitem__(self, k: _K, values: Iterable[_V]) -> None:
+        self._store(k, values)
+
+    def put(self, k: _K, v: Iterable[_V]) -> Collection[_V]:
+        """
+        Replace the values of a key
+
+        Args:
+            k: key
+            v: values, the key is removed if there are none
+
+        Returns:
+            The values stored for the key
+        """
+        return self._store(k, v)
+
+    def put_if_absent(self, k: _K, v: Iterable[_V]) -> Collection[_V]:
+        values = self.data.get(k)
+        return self._store(k, v) if values is None else values
+
+    def put_all(self, m: Mapping[_K, Iterable[_V]]) -> None:
+        for k, values in m.items():
+            self._store(k, values)
+
+    def replace(self, k: _K, v: Iterable[_V]) -> Optional[Collection[_V]]:
+        values = self.data.get(k)
+        if values is not None:
+            self._store(k, v)
+        return values
+
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, Collection[_V], Optional[Iterable[_V]]]
+    ) -> Optional[Collection[_V]]:
+        values = self.data.get(k)
+        if values is None:
+            return None
+        return self._store(k, BiFunction.of(function).apply(k, values)) or None
+
+    def merge(
+        self,
+        k: _K,
+        v: Collection[_V],
+        function: BiFunctionType[Collection[_V], Collection[_V], Optional[Iterable[_V]]],
+    ) -> Optional[Collection[_V]]:
+        values = self.data.get(k)
+        merged = v if values is None else BiFunction.of(function).apply(values, v)
+        return self._store(k, merged) or None
+
+    def add(self, k: _K, v: _V) -> None:
+        """
+        Add a value to the values of a key
+
+        Args:
+            k: key
+            v: value
+        """
+        values = self.data.get(k)
+        if values is None:
+            values = self.data[k] = self._value_type()
+        self._add(values, v)
+
+    def add_all(self, k: _K, values: Iterable[_V]) -> None:
+        """
+        Add all the values to the values of a key
+
+        Args:
+            k: key
+            values: values
+        """
+        _values: Any = self.data.get(k)
+        if _values is None:
+            _values = self._value_type(values)
+            if _values:
+                self.data[k] = _values
+        elif isinstance(_values, list):
+            _values.extend(values)
+        else:
+            _values.update(values)
+
+    def put_all_from(self, pairs: Iterable[Tuple[_K, _V]]) -> None:
+        """
+        Add all the key value pairs. The pairs are added in a single loop that only calls
+        built-in functions.
+
+        Args:
+            pairs: key value pairs
+        """
+        data = self.data
+        get = data.get
+        value_type = self._value_type
+        add = self._add
+        for k, v in pairs:
+            values = get(k)
+            if values is None:
+                values = data[k] = value_type()
+            add(values, v)
+
+    def get_values(self, k: _K) -> Collection[_V]:
+        """
+        Returns the values of a key, an empty collection if the key is not present. The
+        returned collection is the one stored in the map when the key is present.
+
+        Args:
+            k: key
+
+        Returns:
+            The values of the key
+        """
+        values = self.data.get(k)
+        return self._value_type() if values is None else values
+
+    def remove_value(self, k: _K, v: _V) -> bool:
+        """
+        Remove a value from the values of a key. The key is removed with its last value.
+
+        Args:
+            k: key
+            v: value
+
+        Returns:
+            True if the value was present, False otherwise
+        """
+        values: Any = self.data.get(k)
+        if values is None or v not in values:
+            return False
+        values.remove(v)
+        if not values:
+            del self.data[k]
+        return True
+
+    def contains_entry(self, k: _K, v: _V) -> bool:
+        """
+        Returns True if the value is one of the values of the key
+        """
+        values = self.data.get(k)
+        return values is not None and v in values
+
+    def contains_value(self, v: Any) -> bool:
+        """
+        Returns True if the value is one of the values of any key
+        """
+        return any(v in values for values in self.data.values())
+
+    def value_count(self) -> int:
+        """
+        Returns the number of values of all the keys
+        """
+        return sum(map(len, self.data.values()))
+
+    def compute_if_absent(
+        self, k: _K, function: FunctionType[_K, Collection[_V]]
+    ) -> Collection[_V]:
+        try:
+            return self.data[k]
+        except KeyError:
+            return self._store(
+                k, (function.apply if isinstance(function, Function) else function)(k)
+            )
+
+    def copy(self) -> "MultiMap[_K, _V]":
+        """
+        Returns a copy of the map, with copies of the collections of values
+        """
+        return MultiMap(self.data, self._value_type)  # type: ignore
+
+    def flat_stream(self) -> Stream["Map.Entry"]:
+        """
+        Create a stream with one `Map.Entry` per key value pair, where
+        [`stream`][pycommons.base.maps.Map.stream] creates one entry per key with the
+        collection of its values.
+
+        Returns:
+            Stream of key value entries
+        """
+        return IteratorStream(
+            itertools.starmap(
+                Map.Entry,
+                ((k, v) for k, values in self.data.items() for v in values),
+            )
+        )
@@ -0,0 +1,512 @@
+import itertools
+import sys
+import typing
+from typing import (
+    TypeVar,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.function import BiConsumer
+from pycommons.base.function.consumer import BiConsumerType
+from pycommons.base.maps.maps import Map
+from pycommons.base.streams import Stream, IteratorStream
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+_NODE: Any = object()
+"""
+Marker stored in the key slot of a node array when the value slot holds a sub node
+"""
+
+_MISSING: Any = object()
+
+if sys.version_info >= (3, 10):
+    _bit_count = int.bit_count
+else:
+
+    def _bit_count(x: int) -> int:
+        return bin(x).count("1")
+
+
+def _hash(k: Any) -> int:
+    return hash(k) & _HASH_MASK
+
+
+class _BitmapNode:
+    """
+    Node of the trie. The bitmap has a bit set for each of the 32 slots of the node that is
+    used, and the array stores the key value pairs of the used slots next to each other.
+    A slot holds either a key and its value, or the `_NODE` marker and a sub node.
+
+    The nodes are immutable, except the nodes created by a transient map, identified by its
+    `edit` token, which the transient map updates in place.
+    """
+
+    __slots__ = ("bitmap", "array", "edit")
+
+    def __init__(self, bitmap: int, array: List[Any], edit: Optional[object]):
+        self.bitmap = bitmap
+        self.array = array
+        self.edit = edit
+
+    def _editable(self, edit: Optional[object]) -> "_BitmapNode":
+        if edit is not None and self.edit is edit:
+            return self
+        return _BitmapNode(self.bitmap, self.array.copy(), edit)
+
+    def _set(self, i: int, value: Any, edit: Optional[object]) -> "_BitmapNode":
+        """
+        Returns the node with the value or the child node of the key at `i`, this node if it
+        is unchanged
+        """
+        if self.array[i + 1] is value:
+            return self
+        editable = self._editable(edit)
+        editable.array[i + 1] = value
+        return editable
+
+    def _insert(self, bit: int, i: int, k: Any, v: Any, edit: Optional[object]) -> "_BitmapNode":
+        if edit is not None and self.edit is edit:
+            self.array[i:i] = (k, v)
+            self.bitmap |= bit
+            return self
+        return _BitmapNode(self.bitmap | bit, self.array[:i] + [k, v] + self.array[i:], edit)
+
+    def _remove(self, bit: int, i: int, edit: Optional[object]) -> Optional["_BitmapNode"]:
+        if self.bitmap == bit:
+            return None
+        if edit is not None and self.edit is edit:
+            del self.array[i : i + 2]
+            self.bitmap ^= bit
+            return self
+        return _BitmapNode(self.bitmap ^ bit, self.array[:i] + self.array[i + 2 :], edit)
+
+    def assoc(
+        self, shift: int, h: int, k: Any, v: Any, edit: Optional[object], added: List[bool]
+    ) -> "_Node":
+        bit = 1 << ((h >> shift) & _MASK)
+        i = 2 * _bit_count(self.bitmap & (bit - 1))
+        if not self.bitmap & bit:
+            added[0] = True
+            return self._insert(bit, i, k, v, edit)
+
+        key, value = self.array[i], self.array[i + 1]
+        if key is _NODE:
+            return self._set(i, value.assoc(shift + _BITS, h, k, v, edit, added), edit)
+        if key is k or key == k:
+            return self._set(i, v, edit)
+
+        added[0] = True
+        editable = self._editable(edit)
+        editable.array[i] = _NODE
+        editable.array[i + 1] = _create_node(shift + _BITS, key, value, h, k, v, edit)
+        return editable
+
+    def without(self, shift: int, h: int, k: Any, edit: Optional[object]) -> Optional["_Node"]:
+        bit = 1 << ((h >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self
+        i = 2 * _bit_count(self.bitmap & (bit - 1))
+        key, value = self.array[i], self.array[i + 1]
+        if key is _NODE:
+            node = value.without(shift + _BITS, h, k, edit)
+            if node is not None:
+                return self._set(i, node, edit)
+        elif not (key is k or key == k):
+            return self
+        return self._remove(bit, i, edit)
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        array = self.array
+        for i in range(0, len(array), 2):
+            if array[i] is _NODE:
+                yield from array[i + 1].items()
+            else:
+                yield array[i], array[i + 1]
+
+
+class _CollisionNode:
+    """
+    Node of the keys whose 64 bits hashes are equal
+    """
+
+    __slots__ = ("hash", "array", "edit")
+
+    def __init__(self, h: int, array: List[Any], edit: Optional[object]):
+        self.hash = h
+        self.array = array
+        self.edit = edit
+
+    def _index(self, k: Any) -> int:
+        array = self.array
+        for i in range(0, len(array), 2):
+            if array[i] is k or array[i] == k:
+                return i
+        return -1
+
+    def find(self, h: int, k: Any) -> Any:
+        i = self._index(k) if h == self.hash else -1
+        return _MISSING if i < 0 else self.array[i + 1]
+
+    def assoc(
+        self, shift: int, h: int, k: Any, v: Any, edit: Optional[object], added: List[bool]
+    ) -> "_Node":
+        if h != self.hash:
+            parent = _BitmapNode(1 << ((self.hash >> shift) & _MASK), [_NODE, self], edit)
+            return parent.assoc(shift, h, k, v, edit, added)
+        i = self._index(k)
+        if i >= 0 and self.array[i + 1] is v:
+            return self
+        if edit is not None and self.edit is edit:
+            node = self
+        else:
+            node = _CollisionNode(self.hash, self.array.copy(), edit)
+        if i >= 0:
+            node.array[i + 1] = v
+        else:
+            added[0] = True
+            node.array += (k, v)
+        return node
+
+    def without(self, _shift: int, h: int, k: Any, edit: Optional[object]) -> Optional["_Node"]:
+        i = self._index(k) if h == self.hash else -1
+        if i < 0:
+            return self
+        if len(self.array) == 2:
+            return None
+        if edit is not None and self.edit is edit:
+            del self.array[i : i + 2]
+            return self
+        return _CollisionNode(self.hash, self.array[:i] + self.array[i + 2 :], edit)
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        array = self.array
+        return zip(itertools.islice(array, 0, None, 2), itertools.islice(array, 1, None, 2))
+
+
+_Node = Union[_BitmapNode, _CollisionNode]
+
+
+def _create_node(
+    shift: int, k1: Any, v1: Any, h2: int, k2: Any, v2: Any, edit: Optional[object]
+) -> _Node:
+    h1 = _hash(k1)
+    if h1 == h2:
+        return _CollisionNode(h1, [k1, v1, k2, v2], edit)
+    added = [False]
+    return (
+        _BitmapNode(0, [], edit)
+        .assoc(shift, h1, k1, v1, edit, added)
+        .assoc(shift, h2, k2, v2, edit, added)
+    )
+
+
+def _find(node: _Node, k: Any) -> Any:
+    """
+    Returns the value of the key in the trie, `_MISSING` if the key is not present. The trie
+    is walked in a loop rather than by recursive calls, which are slower.
+    """
+    h = _hash(k)
+    shift = 0
+    while True:
+        if isinstance(node, _CollisionNode):
+            return node.find(h, k)
+        bitmap = node.bitmap
+        bit = 1 << ((h >> shift) & _MASK)
+        if not bitmap & bit:
+            return _MISSING
+        i = 2 * _bit_count(bitmap & (bit - 1))
+        key = node.array[i]
+        if key is _NODE:
+            node = node.array[i + 1]
+            shift += _BITS
+        elif key is k or key == k:
+            return node.array[i + 1]
+        else:
+            return _MISSING
+
+
+_EMPTY_NODE = _BitmapNode(0, [], None)
+
+
+class PersistentMap(Mapping[_K, _V]):
+    """
+    An immutable map whose updates return a new version of the map that shares most of its
+    structure with the previous one, similar to Clojure's
+    [PersistentHashMap](https://clojure.org/reference/data_structures#Maps). The versions are
+    independent: updating a version is never visible in the others. A snapshot of the map
+    is the map itself, so taking one is O(1) where `Map.copy` is O(n).
+
+    The map is a hash array mapped trie of 32-way nodes indexed by 5 bits of the hash of the
+    keys: `get`, `put` and `remove` are O(log32 n), and an update copies the at most 13
+    nodes on the path of the key. The keys must be hashable.
+
+    Use [`transient`][pycommons.base.maps.PersistentMap.transient] to apply a batch of updates
+    in place, without copying the paths of every update. Building a map from a mapping and
+    `put_all` go through a transient map.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import PersistentMap
+
+        config = PersistentMap({"retries": 3})
+        updated = config.put("timeout", 10)
+        config.contains_key("timeout"), updated.get("timeout")
+        # (False, 10)
+        ```
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, m: Optional[Mapping[_K, _V]] = None, **kwargs: _V):
+        """
+        Args:
+            m: Mappings of the map. A `PersistentMap` is shared instead of being copied
+            **kwargs: Mappings of the map
+        """
+        self._root: _Node = _EMPTY_NODE
+        self._size = 0
+        if isinstance(m, PersistentMap):
+            self._root, self._size = m._root, m._size
+            m = None
+        if m or kwargs:
+            transient = self.transient()
+            if m:
+                transient.put_all(m)
+            if kwargs:
+                transient.put_all(typing.cast(Dict[_K, _V], kwargs))
+            self._root, self._size = transient._root, transient._size
+            transient.persistent()
+
+    @classmethod
+    def _create(cls, root: Optional[_Node], size: int) -> "PersistentMap[_K, _V]":
+        persistent_map: PersistentMap[_K, _V] = cls.__new__(cls)
+        persistent_map._root = _EMPTY_NODE if root is None else root
+        persistent_map._size = size
+        return persistent_map
+
+    def __getitem__(self, k: _K) -> _V:
+        _v = _find(self._root, k)
+        if _v is _MISSING:
+            raise KeyError(k)
+        return typing.cast(_V, _v)
+
+    def __contains__(self, k: object) -> bool:
+        return _find(self._root, k) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[_K]:
+        return (k for k, _ in self._root.items())
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self._root.items())!r})"
+
+    def get(self, key: _K, default: Any = None) -> Any:
+        _v = _find(self._root, key)
+        return default if _v is _MISSING else _v
+
+    def put(self, k: _K, v: _V) -> "PersistentMap[_K, _V]":
+        """
+        Returns a new version of the map where the key is mapped to the value
+
+        Args:
+            k: key
+            v: value
+
+        Returns:
+            The new map, or this map if the key was already mapped to the value
+        """
+        added = [False]
+        root = self._root.assoc(0, _hash(k), k, v, None, added)
+        if root is self._root:
+            return self
+        return self._create(root, self._size + added[0])
+
+    def put_all(self, m: Mapping[_K, _V]) -> "PersistentMap[_K, _V]":
+        """
+        Returns a new version of the map with all the key value pairs of another mapping
+
+        Args:
+            m: mapping
+
+        Returns:
+            The new map
+        """
+        transient = self.transient()
+        transient.put_all(m)
+        return transient.persistent()
+
+    def remove(self, k: _K) -> "PersistentMap[_K, _V]":
+        """
+        Returns a new version of the map without the key
+
+        Args:
+            k: key
+
+        Returns:
+            The new map, or this map if the key is not present
+        """
+        root = self._root.without(0, _hash(k), k, None)
+        if root is self._root:
+            return self
+        return self._create(root, self._size - 1)
+
+    def size(self) -> int:
+        return self._size
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def contains_key(self, k: _K) -> bool:
+        return k in self
+
+    def contains_value(self, v: _V) -> bool:
+        return any(_v == v for _, _v in self._root.items())
+
+    def key_set(self) -> Set[_K]:
+        return set(self)
+
+    def for_each(self, bi_consumer: BiConsumerType[_K, _V]) -> None:
+        _consumer: BiConsumer[_K, _V] = BiConsumer.of(bi_consumer)
+        for k, v in self._root.items():
+            _consumer.accept(k, v)
+
+    def stream(self) -> Stream["Map.Entry"]:
+        """
+        Create a stream of the map entries. The map is immutable, so the stream can be consumed
+        at any time.
+
+        Returns:
+            Stream of entries
+        """
+        return IteratorStream(itertools.starmap(Map.Entry, self._root.items()))
+
+    def transient(self) -> "TransientMap[_K, _V]":
+        """
+        Returns a mutable copy of the map in O(1). The transient map copies the nodes of this
+        map the first time it updates them, and updates its own nodes in place afterwards.
+
+        Returns:
+            A transient map with the key value pairs of this map
+        """
+        return TransientMap(self._root, self._size)
+
+    def to_map(self) -> Map[_K, _V]:
+        """
+        Returns a [`Map`][pycommons.base.maps.Map] with the key value pairs of the map. The
+        `Map` is backed by a `dict` and cannot share the structure of the trie, so the
+        conversion is O(n).
+
+        Returns:
+            A new `Map`
+        """
+        return Map(dict(self._root.items()))
+
+
+class TransientMap(MutableMapping[_K, _V]):
+    """
+    A mutable map that applies a batch of updates to a
+    [`PersistentMap`][pycommons.base.maps.PersistentMap] in place. The nodes shared with the
+    persistent map are copied the first time they are updated, and the nodes owned by the
+    transient map are updated without copying.
+
+    [`persistent`][pycommons.base.maps.TransientMap.persistent] returns the result in O(1) and
+    ends the transient map, which must not be used anymore. A transient map must not be shared
+    between threads.
+    """
+
+    __slots__ = ("_root", "_size", "_edit")
+
+    def __init__(self, root: _Node = _EMPTY_NODE, size: int = 0):
+        self._root: _Node = root
+        self._size = size
+        self._edit: Optional[object] = object()
+
+    def _ensure_editable(self) -> object:
+        if self._edit is None:
+            raise IllegalStateException("The transient map was already made persistent")
+        return self._edit
+
+    def __getitem__(self, k: _K) -> _V:
+        _v = _find(self._root, k)
+        if _v is _MISSING:
+            raise KeyError(k)
+        return typing.cast(_V, _v)
+
+    def __contains__(self, k: object) -> bool:
+        return _find(self._root, k) is not _MISSING
+
+    def __setitem__(self, k: _K, v: _V) -> None:
+        added = [False]
+        self._root = self._root.assoc(0, _hash(k), k, v, self._ensure_editable(), added)
+        self._size += added[0]
+
+    def __delitem__(self, k: _K) -> None:
+        edit = self._ensure_editable()
+        # Nodes updated in place are returned unchanged, so look up the key to know if it is present
+        if _find(self._root, k) is _MISSING:
+            raise KeyError(k)
+        root = self._root.without(0, _hash(k), k, edit)
+        self._root = _EMPTY_NODE if root is None else root
+        self._size -= 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[_K]:
+        return (k for k, _ in self._root.items())
+
+    def put(self, k: _K, v: _V) -> _V:
+        self[k] = v
+        return v
+
+    def put_all(self, m: Mapping[_K, _V]) -> None:
+        edit = self._ensure_editable()
+        root, size, added = self._root, self._size, [False]
+        for k, v in m.items():
+            added[0] = False
+            root = root.assoc(0, _hash(k), k, v, edit, added)
+            size += added[0]
+        self._root, self._size = root, size
+
+    def remove(self, k: _K) -> Optional[_V]:
+        _v = _find(self._root, k)
+        if _v is _MISSING:
+            return None
+        del self[k]
+        return typing.cast(_V, _v)
+
+    def size(self) -> int:
+        return self._size
+
+    def persistent(self) -> PersistentMap[_K, _V]:
+        """
+        Returns a persistent map of the key value pairs of the transient map in O(1), and ends
+        the transient map.
+
+        Returns:
+            The persistent map
+
+        Raises:
+            IllegalStateException: if the transient map was already made persistent
+        """
+        self._ensure_editable()
+        self._edit = None
+        return PersistentMap._create(self._root, self._size)  # pylint: disable=W0212
@@ -0,0 +1,386 @@
+import io
+import itertools
+import os
+import pickle
+import secrets
+import struct
+import sys
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import TypeVar, Any, Iterator, List, Mapping, Optional, Tuple, cast
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.maps.maps import Map
+from pycommons.base.streams import Stream, IteratorStream
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_MAGIC = b"PCSM"
+_HEADER = struct.Struct("<4sIQQQ")
+"""
+Header of a table: magic, version, number of entries, number of slots and end of the records
+"""
+_SLOT = struct.Struct("<QQ")
+"""
+Slot of the hash table: hash of the key and offset of the record + 1, 0 for an empty slot
+"""
+_RECORD = struct.Struct("<II")
+"""
+Header of a record, followed by the serialized key and value: key and value lengths
+"""
+_CONTROL = struct.Struct("<QQ64s64s")
+"""
+Control block: generation, resource tracker of the creator, and the names of the tables of the
+even and odd generations
+"""
+_VERSION = 1
+_PROTOCOL = 4
+
+_MISSING: Any = object()
+
+
+_SCALAR_KEYS = frozenset((str, bytes, int, float, bool, type(None)))
+
+
+def _dumps(obj: Any) -> bytes:
+    return pickle.dumps(obj, _PROTOCOL)
+
+
+def _dumps_key(k: Any) -> bytes:
+    """
+    Pickle a key to the same bytes as the keys equal to it. The memo of a pickler refers to
+    the objects seen before by their identity, `(a, a)` and `(a, b)` are pickled differently
+    when `a == b` but `a is not b`, so the keys that contain other objects are pickled without
+    memo. A scalar is pickled alone, its bytes do not depend on the memo.
+    """
+    if type(k) in _SCALAR_KEYS:
+        return pickle.dumps(k, _PROTOCOL)
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, _PROTOCOL)
+    pickler.fast = True
+    pickler.dump(k)
+    return buffer.getvalue()
+
+
+def _tracker_id() -> int:
+    """
+    Identifies the resource tracker of the current process by the pipe it reads. The
+    processes started by `multiprocessing` share the resource tracker of their parent.
+    """
+    if os.name != "posix":
+        return 0
+    resource_tracker.ensure_running()
+    return int(os.fstat(cast(int, resource_tracker.getfd())).st_ino)
+
+
+def _open(name: str, size: int = 0, track: bool = True) -> shared_memory.SharedMemory:
+    """
+    Create a shared memory block of the given size, or attach the existing block if the size
+    is 0. A block that is not tracked is not destroyed by the resource tracker of the current
+    process when it exits.
+    """
+    if sys.version_info >= (3, 13):
+        # The track argument is new in 3.13
+        return shared_memory.SharedMemory(  # pylint: disable=E1123
+            name, create=size > 0, size=size, track=track
+        )
+    shm = shared_memory.SharedMemory(name, create=size > 0, size=size)
+    if not track:
+        _untrack(shm)
+    return shm
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    if os.name == "posix":
+        # The tracker registers the name of the block with its leading slash
+        resource_tracker.unregister("/" + shm.name, "shared_memory")
+
+
+def _build_table(m: Mapping[Any, Any], name: str) -> shared_memory.SharedMemory:
+    records: List[Tuple[int, bytes, bytes]] = []
+    records_size = 0
+    for k, v in m.items():
+        key, value = _dumps_key(k), _dumps(v)
+        records.append((zlib.crc32(key), key, value))
+        records_size += _RECORD.size + len(key) + len(value)
+
+    capacity = 8
+    while capacity < 2 * len(records):
+        capacity *= 2
+    records_offset = _HEADER.size + capacity * _SLOT.size
+    shm = _open(name, records_offset + records_size)
+    buf = shm.buf
+    buf[_HEADER.size : records_offset] = bytes(capacity * _SLOT.size)
+
+    mask = capacity - 1
+    offset = records_offset
+    for h, key, value in records:
+        i = h & mask
+        while _SLOT.unpack_from(buf, _HEADER.size + i * _SLOT.size)[1]:
+            i = (i + 1) & mask
+        _SLOT.pack_into(buf, _HEADER.size + i * _SLOT.size, h, offset + 1)
+        _RECORD.pack_into(buf, offset, len(key), len(value))
+        start = offset + _RECORD.size
+        buf[start : start + len(key)] = key
+        buf[start + len(key) : start + len(key) + len(value)] = value
+        offset = start + len(key) + len(value)
+    _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, len(records), capacity, offset)
+    return shm
+
+
+class SharedMap(Mapping[_K, _V]):
+    """
+    A read only map stored in shared memory, that several processes look up without holding a
+    copy of it. A process creates the map with
+    [`SharedMap.create`][pycommons.base.maps.SharedMap.create], and the other processes
+    [`attach`][pycommons.base.maps.SharedMap.attach] it by name. A `SharedMap` is pickled as
+    its name, so it can be passed to the workers of a `ProcessPoolExecutor` directly.
+
+    The keys and the values are pickled in a `multiprocessing.shared_memory` block, after an
+    open addressing hash table of 16 bytes slots at most half full. A lookup pickles the key,
+    probes the table from the CRC-32 of the pickled key and unpickles the value found, the
+    other entries are never copied. Two keys are the same key when they are pickled to the
+    same bytes, which holds for the equal keys of the types `str`, `bytes`, `int` and the
+    tuples of them, whether or not they are the same objects, but not for instance for `1`
+    and `1.0`. The keys must not contain reference cycles.
+
+    The creator of the map can [`rebuild`][pycommons.base.maps.SharedMap.rebuild] it. The new
+    table is written in a new block, and then published by a generation counter: every lookup
+    sees either the old or the new table entirely. The creator must
+    [`unlink`][pycommons.base.maps.SharedMap.unlink] the map when it is not used anymore.
+
+    Examples:
+        ```python
+        from concurrent.futures import ProcessPoolExecutor
+        from pycommons.base.maps import SharedMap
+
+        def lookup(shared_map, k):
+            return shared_map.get(k)
+
+        with SharedMap.create({"a": 1, "b": 2}) as shared_map:
+            with ProcessPoolExecutor() as executor:
+                executor.submit(lookup, shared_map, "b").result()
+                # 2
+            shared_map.unlink()
+        ```
+    """
+
+    def __init__(self, control: shared_memory.SharedMemory, owner: bool):
+        self._control = control
+        self._owner = owner
+        # The blocks are tracked only by the resource tracker of the creator, which destroys
+        # them if the creator exits without unlinking the map
+        self._track = owner or _CONTROL.unpack_from(control.buf, 0)[1] == _tracker_id()
+        if not self._track:
+            _untrack(control)
+        self._generation = -1
+        self._table: Optional[shared_memory.SharedMemory] = None
+        self._refresh()
+
+    @classmethod
+    def create(cls, m: Mapping[_K, _V], name: Optional[str] = None) -> "SharedMap[_K, _V]":
+        """
+        Create a shared map with the key value pairs of a mapping
+
+        Args:
+            m: mapping
+            name: Name of the map, used by the other processes to attach it. A unique name is
+                generated if None.
+
+        Returns:
+            The shared map, owned by the current process
+        """
+        name = name or f"pcsm_{os.getpid()}_{secrets.token_hex(4)}"
+        table_name = f"{name}_0"
+        table = _build_table(m, table_name)
+        try:
+            control = _open(name, _CONTROL.size)
+        except BaseException:
+            table.close()
+            table.unlink()
+            raise
+        _CONTROL.pack_into(control.buf, 0, 0, _tracker_id(), table_name.encode(), b"")
+        table.close()
+        return cls(control, True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMap[_K, _V]":
+        """
+        Attach a shared map created by another process
+
+        Args:
+            name: Name of the map
+
+        Returns:
+            The shared map
+        """
+        return cls(_open(name), False)
+
+    @property
+    def name(self) -> str:
+        return str(self._control.name)
+
+    def _refresh(self) -> shared_memory.SharedMemory:
+        """
+        Returns the current table, attaching the table of a new generation if the map was
+        rebuilt. The previous table is closed when it is not referenced anymore, so that the
+        streams that read it can complete.
+        """
+        generation = _CONTROL.unpack_from(self._control.buf, 0)[0]
+        if generation == self._generation and self._table is not None:
+            return self._table
+        while True:
+            generation, _, *names = _CONTROL.unpack_from(self._control.buf, 0)
+            table_name = names[generation % 2].rstrip(b"\0").decode()
+            try:
+                table = _open(table_name, track=self._track)
+            except FileNotFoundError:
+                # The table was replaced and unlinked in the meantime
+                continue
+            # The name slot is reused two generations later
+            if _CONTROL.unpack_from(self._control.buf, 0)[0] - generation < 2:
+                break
+            table.close()
+        if bytes(table.buf[:4]) != _MAGIC:
+            table.close()
+            raise ValueError(f"{table_name} is not a SharedMap table")
+        self._table, self._generation = table, generation
+        return table
+
+    def _find(self, k: Any) -> Any:
+        buf = self._refresh().buf
+        key = _dumps_key(k)
+        h = zlib.crc32(key)
+        _, _, _, capacity, _ = _HEADER.unpack_from(buf, 0)
+        mask = capacity - 1
+        i = h & mask
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(buf, _HEADER.size + i * _SLOT.size)
+            if not offset:
+                return _MISSING
+            if slot_hash == h:
+                offset -= 1
+                key_size, value_size = _RECORD.unpack_from(buf, offset)
+                start = offset + _RECORD.size
+                if key_size == len(key) and buf[start : start + key_size] == key:
+                    start += key_size
+                    return pickle.loads(buf[start : start + value_size])
+            i = (i + 1) & mask
+
+    def _records(self) -> Iterator[Tuple[bytes, bytes]]:
+        table = self._refresh()
+        buf = table.buf
+        _, _, _, capacity, end = _HEADER.unpack_from(buf, 0)
+        offset = _HEADER.size + capacity * _SLOT.size
+        while offset < end:
+            key_size, value_size = _RECORD.unpack_from(buf, offset)
+            start = offset + _RECORD.size
+            yield bytes(buf[start : start + key_size]), bytes(
+                buf[start + key_size : start + key_size + value_size]
+            )
+            offset = start + key_size + value_size
+
+    def __getitem__(self, k: _K) -> _V:
+        _v = self._find(k)
+        if _v is _MISSING:
+            raise KeyError(k)
+        return _v  # type: ignore
+
+    def __contains__(self, k: object) -> bool:
+        return self._find(k) is not _MISSING
+
+    def __len__(self) -> int:
+        return int(_HEADER.unpack_from(self._refresh().buf, 0)[2])
+
+    def __iter__(self) -> Iterator[_K]:
+        return (pickle.loads(key) for key, _ in self._records())
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        return SharedMap.attach, (self.name,)
+
+    def __enter__(self) -> "SharedMap[_K, _V]":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def get(self, key: _K, default: Any = None) -> Any:
+        _v = self._find(key)
+        return default if _v is _MISSING else _v
+
+    def contains_key(self, k: _K) -> bool:
+        return k in self
+
+    def size(self) -> int:
+        return len(self)
+
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+    def stream(self) -> Stream["Map.Entry"]:
+        """
+        Create a stream of the map entries. The entries are unpickled while the stream is
+        consumed, from the table of the generation current when the stream is created.
+
+        Returns:
+            Stream of entries
+        """
+        return IteratorStream(
+            itertools.starmap(
+                Map.Entry,
+                ((pickle.loads(key), pickle.loads(value)) for key, value in self._records()),
+            )
+        )
+
+    def table_size(self) -> int:
+        """
+        Returns the size in bytes of the shared memory block of the current table
+        """
+        return int(self._refresh().size)
+
+    def rebuild(self, m: Mapping[_K, _V]) -> None:
+        """
+        Replace the key value pairs of the map. The new table is built in a new block and
+        published atomically: the processes see either the old or the new pairs. The old
+        block is destroyed once no process uses it.
+
+        Args:
+            m: mapping
+
+        Raises:
+            IllegalStateException: if the current process did not create the map
+        """
+        if not self._owner:
+            raise IllegalStateException("Only the process that created the map can rebuild it")
+        old_table = self._refresh()
+        generation, tracker, *names = _CONTROL.unpack_from(self._control.buf, 0)
+        table_name = f"{self.name}_{generation + 1}"
+        _build_table(m, table_name).close()
+        names[(generation + 1) % 2] = table_name.encode()
+        _CONTROL.pack_into(self._control.buf, 0, generation + 1, tracker, *names)
+        self._refresh()
+        old_table.unlink()
+
+    def close(self) -> None:
+        """
+        Detach the map from the current process. The map must not be used after being closed.
+        """
+        if self._table is not None:
+            self._table.close()
+            self._table = None
+        self._control.close()
+
+    def unlink(self) -> None:
+        """
+        Destroy the shared memory blocks of the map and close the map. Only the creator of the
+        map unlinks it, the processes that attached the map can use it until they close it.
+
+        Raises:
+            IllegalStateException: if the current process did not create the map
+        """
+        if not self._owner:
+            raise IllegalStateException("Only the process that created the map can unlink it")
+        self._refresh().unlink()
+        self._control.unlink()
+        self.close()
@@ -0,0 +1,472 @@
+import bisect
+import collections.abc
+import itertools
+import typing
+from typing import TypeVar, Any, Callable, Dict, Iterator, KeysView, List, Mapping, Optional, Tuple
+
+from pycommons.base.exception import NoSuchElementError
+from pycommons.base.function import BiConsumer
+from pycommons.base.function.comparator import Comparator
+from pycommons.base.function.consumer import BiConsumerType
+from pycommons.base.function.function import FunctionType, Function, BiFunctionType, BiFunction
+from pycommons.base.maps.maps import Map
+from pycommons.base.streams import Stream, IteratorStream
+from pycommons.base.streams.sorting import sort_key
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_LOAD = 512
+"""
+Size of the sorted sublists. A sublist is split in two when it grows beyond twice the load.
+"""
+
+_BULK_RATIO = 8
+"""
+`put_all` rebuilds the sorted keys instead of inserting them one by one when it adds more than
+`1 / _BULK_RATIO` of the size of the map
+"""
+
+_Position = Tuple[int, int]
+
+
+class _Reversed:
+    """
+    Sort key of the reversed natural order of the wrapped key
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return bool(other.key < self.key)
+
+
+def _reversed_key(key: Callable[[Any], Any]) -> Callable[[Any], _Reversed]:
+    def _key(k: Any) -> _Reversed:
+        return _Reversed(key(k))
+
+    return _key
+
+
+class SortedMap(Map[_K, _V]):
+    """
+    A [`Map`][pycommons.base.maps.Map] that keeps its keys sorted, similar to Java's
+    [NavigableMap](https://docs.oracle.com/javase/8/docs/api/java/util/NavigableMap.html).
+    The map is iterated, streamed and visited by `for_each` in the order of the keys, and
+    supports navigation (`first_key`, `floor_key`, `ceiling_key`, ...) and range queries
+    (`head_map`, `tail_map`, `sub_map` and the range arguments of `stream`).
+
+    The values are stored in a `dict`, so `get` and `contains_key` stay O(1). The keys are
+    also kept in a sorted list of sorted sublists: navigation is O(log n), an insertion or a
+    removal is O(log n) plus the move of at most a thousand references, and a range query is
+    O(log n + k) for `k` keys in the range. Building the map from a mapping or a large
+    `put_all` sorts the keys at once, which is linear when they are already sorted.
+
+    The keys are ordered by their natural order, or by a
+    [`Comparator`][pycommons.base.function.comparator.Comparator]. The natural order, the
+    key based comparators of `Comparator.comparing` and their reversed comparators are
+    compared without calling `compare_to`. The ordering must be consistent with `==`.
+
+    Examples:
+        ```python
+        from pycommons.base.maps import SortedMap
+
+        prices = SortedMap({10: "a", 30: "c", 20: "b"})
+        prices.floor_key(25)
+        # 20
+        list(prices.sub_map(10, 30))
+        # [10, 20]
+        ```
+    """
+
+    def __init__(
+        self,
+        m: Optional[Mapping[_K, _V]] = None,
+        comparator: Optional[Comparator[_K, _K]] = None,
+        **kwargs: _V,
+    ):
+        """
+        Args:
+            m: Initial mappings of the map
+            comparator: Ordering of the keys, natural order if None
+            **kwargs: Initial mappings of the map
+        """
+        key, reverse = sort_key(comparator)
+        if reverse:
+            key = _Reversed if key is None else _reversed_key(key)
+        self._comparator = comparator
+        self._key: Optional[Callable[[Any], Any]] = key
+        self._load([])
+        super().__init__()
+        if m is not None:
+            self.put_all(dict(m))
+        if kwargs:
+            self.put_all(typing.cast(Dict[_K, _V], kwargs))
+
+    def _load(self, keys: List[_K]) -> None:
+        key = self._key
+        keys.sort(key=key)
+        self._lists: List[List[_K]] = [keys[i : i + _LOAD] for i in range(0, len(keys), _LOAD)]
+        self._key_lists: List[List[Any]] = (
+            self._lists if key is None else [list(map(key, chunk)) for chunk in self._lists]
+        )
+        self._maxes: List[Any] = [key_list[-1] for key_list in self._key_lists]
+
+    def _insert(self, k: _K) -> None:
+        key = self._key
+        _sk = k if key is None else key(k)
+        lists, key_lists, maxes = self._lists, self._key_lists, self._maxes
+        if not maxes:
+            lists.append([k])
+            if key is not None:
+                key_lists.append([_sk])
+            maxes.append(_sk)
+            return
+
+        i = bisect.bisect_right(maxes, _sk)
+        if i == len(maxes):
+            i -= 1
+            lists[i].append(k)
+            if key is not None:
+                key_lists[i].append(_sk)
+            maxes[i] = _sk
+        else:
+            j = bisect.bisect_right(key_lists[i], _sk)
+            lists[i].insert(j, k)
+            if key is not None:
+                key_lists[i].insert(j, _sk)
+
+        if len(lists[i]) > 2 * _LOAD:
+            lists.insert(i + 1, lists[i][_LOAD:])
+            del lists[i][_LOAD:]
+            if key is not None:
+                key_lists.insert(i + 1, key_lists[i][_LOAD:])
+                del key_lists[i][_LOAD:]
+            maxes.insert(i, key_lists[i][-1])
+
+    def _remove(self, k: _K) -> None:
+        key = self._key
+        lists, key_lists, maxes = self._lists, self._key_lists, self._maxes
+        i, j = self._bisect_left(k)
+        if key is not None:
+            # Skip the other keys that are equal to k in the order of the comparator
+            while lists[i][j] != k:
+                j += 1
+                if j == len(lists[i]):
+                    i, j = i + 1, 0
+
+        del lists[i][j]
+        if key is not None:
+            del key_lists[i][j]
+        if lists[i]:
+            maxes[i] = key_lists[i][-1]
+        else:
+            del lists[i]
+            if key is not None:
+                del key_lists[i]
+            del maxes[i]
+
+    def _bisect_left(self, k: _K) -> _Position:
+        _sk = k if self._key is None else self._key(k)
+        i = bisect.bisect_left(self._maxes, _sk)
+        if i == len(self._maxes):
+            return i, 0
+        return i, bisect.bisect_left(self._key_lists[i], _sk)
+
+    def _bisect_right(self, k: _K) -> _Position:
+        _sk = k if self._key is None else self._key(k)
+        i = bisect.bisect_right(self._maxes, _sk)
+        if i == len(self._maxes):
+            return i, 0
+        return i, bisect.bisect_right(self._key_lists[i], _sk)
+
+    def _at(self, position: _Position) -> Optional[_K]:
+        i, j = position
+        return self._lists[i][j] if i < len(self._lists) else None
+
+    def _before(self, position: _Position) -> Optional[_K]:
+        i, j = position
+        if j > 0:
+            return self._lists[i][j - 1]
+        return self._lists[i - 1][-1] if i > 0 else None
+
+    def _range(
+        self,
+        from_key: Optional[_K],
+        to_key: Optional[_K],
+        from_inclusive: bool,
+        to_inclusive: bool,
+    ) -> Iterator[List[_K]]:
+        if from_key is None:
+            i, j = 0, 0
+        else:
+            i, j = self._bisect_left(from_key) if from_inclusive else self._bisect_right(from_key)
+        if to_key is None:
+            stop_i, stop_j = len(self._lists), 0
+        else:
+            stop_i, stop_j = (
+                self._bisect_right(to_key) if to_inclusive else self._bisect_left(to_key)
+            )
+        return self._slices(i, j, stop_i, stop_j)
+
+    def _slices(self, i: int, j: int, stop_i: int, stop_j: int) -> Iterator[List[_K]]:
+        """
+        Yields the keys from the position (i, j) to the position (stop_i, stop_j) excluded, as
+        slices of the sorted sublists
+        """
+        lists = self._lists
+        if (i, j) >= (stop_i, stop_j):
+            return
+        while i < stop_i:
+            yield lists[i][j:] if j else lists[i]
+            i, j = i + 1, 0
+        if i < len(lists):
+            yield lists[i][j:stop_j]
+
+    def _entries(self, slices: Iterator[List[_K]]) -> Iterator[Map.Entry]:
+        _get = self.data.__getitem__
+        return itertools.chain.from_iterable(
+            map(Map.Entry, keys, map(_get, keys)) for keys in slices
+        )
+
+    def _sub_map(self, slices: Iterator[List[_K]]) -> "SortedMap[_K, _V]":
+        data = self.data
+        # The keys are in order, the constructor loads them in a single pass of the sort
+        return SortedMap(
+            {k: data[k] for k in itertools.chain.from_iterable(slices)},
+            comparator=self._comparator,
+        )
+
+    def comparator(self) -> Optional[Comparator[_K, _K]]:
+        """
+        Returns the comparator that orders the keys of the map, None for the natural order
+        """
+        return self._comparator
+
+    def __setitem__(self, k: _K, v: _V) -> None:
+        if k not in self.data:
+            self._insert(k)
+        self.data[k] = v
+
+    def __delitem__(self, k: _K) -> None:
+        del self.data[k]
+        self._remove(k)
+
+    def __iter__(self) -> Iterator[_K]:
+        return itertools.chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator[_K]:
+        return itertools.chain.from_iterable(map(reversed, reversed(self._lists)))
+
+    def copy(self) -> "SortedMap[_K, _V]":
+        return self._sub_map(iter(self._lists))
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._load([])
+
+    def put(self, k: _K, v: _V) -> _V:
+        self[k] = v
+        return v
+
+    def put_if_absent(self, k: _K, v: _V) -> _V:
+        if k in self.data:
+            return self.data[k]
+        self[k] = v
+        return v
+
+    def compute_if_absent(self, k: _K, function: FunctionType[_K, _V]) -> _V:
+        try:
+            return self.data[k]
+        except KeyError:
+            _v = (function.apply if isinstance(function, Function) else function)(k)
+            self[k] = _v
+            return _v
+
+    def compute_if_present(
+        self, k: _K, function: BiFunctionType[_K, _V, Optional[_V]]
+    ) -> Optional[_V]:
+        if k not in self.data:
+            return None
+        _v = (function.apply if isinstance(function, BiFunction) else function)(k, self.data[k])
+        if _v is None:
+            del self[k]
+        else:
+            self.data[k] = _v
+        return _v
+
+    def merge(self, k: _K, v: _V, function: BiFunctionType[_V, _V, Optional[_V]]) -> Optional[_V]:
+        if k not in self.data:
+            self[k] = v
+            return v
+        _v = (function.apply if isinstance(function, BiFunction) else function)(self.data[k], v)
+        if _v is None:
+            del self[k]
+        else:
+            self.data[k] = _v
+        return _v
+
+    def remove(self, k: _K) -> Optional[_V]:
+        if k not in self.data:
+            return None
+        _v = self.data.pop(k)
+        self._remove(k)
+        return _v
+
+    def put_all(self, m: Dict[_K, _V]) -> None:
+        data = self.data
+        new_keys = [k for k in m if k not in data]
+        if len(new_keys) * _BULK_RATIO > len(data):
+            self._load(list(self) + new_keys)
+        else:
+            for k in new_keys:
+                self._insert(k)
+        data.update(m)
+
+    def keys_view(self) -> KeysView[_K]:
+        return collections.abc.KeysView(self)
+
+    def entries_view(self) -> "Map.EntriesView":
+        return _SortedEntriesView(self)
+
+    def for_each(self, bi_consumer: BiConsumerType[_K, _V]) -> None:
+        _consumer: BiConsumer[_K, _V] = BiConsumer.of(bi_consumer)
+        data = self.data
+        for k in self:
+            _consumer.accept(k, data[k])
+
+    def first_key(self) -> _K:
+        """
+        Returns the lowest key of the map
+
+        Raises:
+            NoSuchElementError: if the map is empty
+        """
+        if not self._lists:
+            raise NoSuchElementError("The map is empty")
+        return self._lists[0][0]
+
+    def last_key(self) -> _K:
+        """
+        Returns the highest key of the map
+
+        Raises:
+            NoSuchElementError: if the map is empty
+        """
+        if not self._lists:
+            raise NoSuchElementError("The map is empty")
+        return self._lists[-1][-1]
+
+    def floor_key(self, k: _K) -> Optional[_K]:
+        """
+        Returns the greatest key lower than or equal to `k`, None if there is no such key
+        """
+        return self._before(self._bisect_right(k))
+
+    def ceiling_key(self, k: _K) -> Optional[_K]:
+        """
+        Returns the least key greater than or equal to `k`, None if there is no such key
+        """
+        return self._at(self._bisect_left(k))
+
+    def lower_key(self, k: _K) -> Optional[_K]:
+        """
+        Returns the greatest key strictly lower than `k`, None if there is no such key
+        """
+        return self._before(self._bisect_left(k))
+
+    def higher_key(self, k: _K) -> Optional[_K]:
+        """
+        Returns the least key strictly greater than `k`, None if there is no such key
+        """
+        return self._at(self._bisect_right(k))
+
+    def head_map(self, to_key: _K, inclusive: bool = False) -> "SortedMap[_K, _V]":
+        """
+        Returns a copy of the part of the map whose keys are lower than `to_key`
+
+        Args:
+            to_key: high end of the keys
+            inclusive: include `to_key` in the returned map
+
+        Returns:
+            A sorted map with the same comparator
+        """
+        return self._sub_map(self._range(None, to_key, True, inclusive))
+
+    def tail_map(self, from_key: _K, inclusive: bool = True) -> "SortedMap[_K, _V]":
+        """
+        Returns a copy of the part of the map whose keys are greater than `from_key`
+
+        Args:
+            from_key: low end of the keys
+            inclusive: include `from_key` in the returned map
+
+        Returns:
+            A sorted map with the same comparator
+        """
+        return self._sub_map(self._range(from_key, None, inclusive, False))
+
+    def sub_map(
+        self,
+        from_key: _K,
+        to_key: _K,
+        from_inclusive: bool = True,
+        to_inclusive: bool = False,
+    ) -> "SortedMap[_K, _V]":
+        """
+        Returns a copy of the part of the map whose keys range from `from_key` to `to_key`
+
+        Args:
+            from_key: low end of the keys
+            to_key: high end of the keys
+            from_inclusive: include `from_key` in the returned map
+            to_inclusive: include `to_key` in the returned map
+
+        Returns:
+            A sorted map with the same comparator
+        """
+        return self._sub_map(self._range(from_key, to_key, from_inclusive, to_inclusive))
+
+    def stream(
+        self,
+        from_key: Optional[_K] = None,
+        to_key: Optional[_K] = None,
+        from_inclusive: bool = True,
+        to_inclusive: bool = False,
+    ) -> Stream["Map.Entry"]:
+        """
+        Create a stream of the map entries in the order of the keys, optionally restricted to a
+        range of keys. The range is located in O(log n) and the entries are created lazily
+        while the stream is consumed. The map must not be modified until the stream is consumed.
+
+        Args:
+            from_key: low end of the keys, the first key of the map if None
+            to_key: high end of the keys, the last key of the map if None
+            from_inclusive: include `from_key` in the stream
+            to_inclusive: include `to_key` in the stream
+
+        Returns:
+            Stream of entries
+        """
+        return IteratorStream(
+            self._entries(self._range(from_key, to_key, from_inclusive, to_inclusive))
+        )
+
+
+class _SortedEntriesView(Map.EntriesView):
+    """
+    Entries view iterated in the order of the keys of a sorted map
+    """
+
+    __slots__ = ("_map",)
+
+    def __init__(self, sorted_map: SortedMap[Any, Any]):
+        super().__init__(sorted_map.data)
+        self._map = sorted_map
+
+    def __iter__(self) -> Iterator["Map.Entry"]:
+        return self._map._entries(iter(self._map._lists))  # pylint: disable=W0212
@@ -1,5 +1,16 @@
+from .collectors import Collector, Collectors
 from .stream import Stream
 from .streams import Streams
 from .iterator import IteratorStream
+from .parallel import ParallelStream
+from .asynchronous import AsyncStream
 
-__all__ = ["Streams", "Stream", "IteratorStream"]
+__all__ = [
+    "Collector",
+    "Collectors",
+    "Streams",
+    "Stream",
+    "IteratorStream",
+    "ParallelStream",
+    "AsyncStream",
+]
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import inspect
+import itertools
+from concurrent.futures import Executor
+from typing import (
+    TypeVar,
+    Generic,
+    AsyncIterator,
+    AsyncIterable,
+    Iterator,
+    Iterable,
+    Optional,
+    Callable,
+    Any,
+    Awaitable,
+    Deque,
+    Set,
+    Union,
+    List,
+)
+
+from pycommons.base.container.optional import OptionalContainer
+from pycommons.base.streams.collectors import Collector
+from pycommons.base.streams.iterator import IteratorStream
+from pycommons.base.streams.stages import as_callable
+from pycommons.base.streams.stream import Stream
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+AsyncCallable = Callable[[Any], Union[Any, Awaitable[Any]]]
+"""
+A callable or a coroutine function. The result is awaited when it is awaitable.
+"""
+
+
+async def _resolve(result: Any) -> Any:
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def _aiter(source: Union[AsyncIterable[Any], Stream[Any], Iterable[Any]]) -> AsyncIterator[Any]:
+    if isinstance(source, AsyncStream):
+        return source.iterator()
+    if isinstance(source, Stream):
+        return _from_iterator(source.iterator())
+    if isinstance(source, AsyncIterable):
+        # 3.8 and 3.9 have no aiter/anext built-ins
+        return source.__aiter__()  # pylint: disable=C2801
+    return _from_iterator(iter(source))
+
+
+async def _from_iterator(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    for _t in iterator:
+        yield _t
+
+
+class AsyncStream(Generic[_T]):
+    """
+    An asyncio native stream over an asynchronous iterator. Mirrors the
+    [`Stream`][pycommons.base.streams.Stream] API: the intermediate operations are lazy and
+    return new streams, the terminal operations are coroutines. The functions passed to the
+    operations can be plain callables, functional interfaces or coroutine functions.
+
+    [`map_concurrent`][pycommons.base.streams.AsyncStream.map_concurrent] keeps a bounded number
+    of awaits in flight, and [`from_stream`][pycommons.base.streams.AsyncStream.from_stream] /
+    [`to_stream`][pycommons.base.streams.AsyncStream.to_stream] bridge from and to the
+    synchronous streams.
+
+    Examples:
+        ```python
+        import asyncio
+
+        from pycommons.base.streams import Streams
+
+        async def fetch(t: int) -> int:
+            await asyncio.sleep(0.1)
+            return t * 2
+
+        async def numbers():
+            for t in range(3):
+                yield t
+
+        async def main() -> None:
+            stream = Streams.from_async_iterable(numbers())
+            print(await stream.map_concurrent(fetch, max_concurrency=3).collect_list())
+            # [0, 2, 4]
+
+        asyncio.run(main())
+        ```
+    """
+
+    def __init__(self, iterator: AsyncIterator[_T]):
+        self._iterator: AsyncIterator[_T] = iterator
+
+    @classmethod
+    def of(cls, source: Union[AsyncIterable[_T], Stream[_T], Iterable[_T]]) -> AsyncStream[_T]:
+        """
+        Create a stream from an asynchronous iterable, a synchronous stream or an iterable.
+        Synchronous sources are iterated on the event loop.
+
+        Args:
+            source: The source of the elements
+
+        Returns:
+            A new stream
+        """
+        return cls(_aiter(source))
+
+    @classmethod
+    def from_stream(
+        cls, stream: Stream[_T], executor: Optional[Executor] = None, chunk_size: int = 1
+    ) -> AsyncStream[_T]:
+        """
+        Create an asynchronous stream from a synchronous stream, pulling the elements on an
+        executor so that a blocking source or pipeline does not block the event loop.
+
+        Args:
+            stream: The synchronous stream
+            executor: Executor used to pull the elements, the loop's default executor if None
+            chunk_size: Number of elements pulled in a single executor call. Larger chunks
+                reduce the overhead of the thread hops but read ahead of the consumer.
+
+        Returns:
+            A new stream
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        async def _pull() -> AsyncIterator[_T]:
+            iterator = stream.iterator()
+            loop = asyncio.get_running_loop()
+            while True:
+                chunk: List[_T] = await loop.run_in_executor(
+                    executor, lambda: list(itertools.islice(iterator, chunk_size))
+                )
+                if not chunk:
+                    return
+                for _t in chunk:
+                    yield _t
+
+        return cls(_pull())
+
+    def to_stream(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> Stream[_T]:
+        """
+        Bridge back to a synchronous [`IteratorStream`][pycommons.base.streams.IteratorStream].
+        Each element is awaited on the given event loop, which must be running in another
+        thread. If no loop is passed, a private event loop is used to drive the iteration,
+        so this must not be called from a coroutine.
+
+        Args:
+            loop: A running event loop in another thread
+
+        Returns:
+            A synchronous stream
+        """
+        iterator = self._iterator
+
+        def _pull() -> Iterator[_T]:
+            _loop = loop or asyncio.new_event_loop()
+            try:
+                while True:
+                    try:
+                        # 3.8 and 3.9 have no aiter/anext built-ins
+                        # pylint: disable=C2801
+                        if loop is None:
+                            _t = _loop.run_until_complete(iterator.__anext__())
+                        else:
+                            _t = asyncio.run_coroutine_threadsafe(
+                                iterator.__anext__(), loop
+                            ).result()
+                        # pylint: enable=C2801
+                    except StopAsyncIteration:
+                        return
+                    yield _t
+            finally:
+                if loop is None:
+                    _loop.close()
+
+        return IteratorStream(_pull())
+
+    def iterator(self) -> AsyncIterator[_T]:
+        return self._iterator
+
+    def __aiter__(self) -> AsyncIterator[_T]:
+        return self._iterator
+
+    def filter(self, predicate: AsyncCallable) -> AsyncStream[_T]:
+        _test = as_callable(predicate, "test")
+
+        async def _filter() -> AsyncIterator[_T]:
+            async for _t in self._iterator:
+                if await _resolve(_test(_t)):
+                    yield _t
+
+        return AsyncStream(_filter())
+
+    def map(self, mapper: AsyncCallable) -> AsyncStream[Any]:
+        _apply = as_callable(mapper, "apply")
+
+        async def _map() -> AsyncIterator[Any]:
+            async for _t in self._iterator:
+                yield await _resolve(_apply(_t))
+
+        return AsyncStream(_map())
+
+    def map_concurrent(
+        self, mapper: AsyncCallable, max_concurrency: int, *, ordered: bool = True
+    ) -> AsyncStream[Any]:
+        """
+        Map the elements with a coroutine function, keeping up to `max_concurrency` calls in
+        flight. The results are returned in the encounter order by default; with
+        `ordered=False` they are returned as soon as they complete. The calls in flight are
+        cancelled if the downstream stops early.
+
+        Args:
+            mapper: Coroutine function (or a function returning an awaitable)
+            max_concurrency: Maximum number of concurrent calls
+            ordered: Whether the results are returned in the encounter order
+
+        Returns:
+            A stream of the results
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+
+        _apply = as_callable(mapper, "apply")
+
+        async def _ordered() -> AsyncIterator[Any]:
+            pending: Deque[asyncio.Future[Any]] = collections.deque()
+            try:
+                async for _t in self._iterator:
+                    pending.append(asyncio.ensure_future(_resolve(_apply(_t))))
+                    if len(pending) >= max_concurrency:
+                        yield await pending.popleft()
+                while pending:
+                    yield await pending.popleft()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        async def _unordered() -> AsyncIterator[Any]:
+            pending: Set[asyncio.Future[Any]] = set()
+            try:
+                async for _t in self._iterator:
+                    pending.add(asyncio.ensure_future(_resolve(_apply(_t))))
+                    if len(pending) >= max_concurrency:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            yield future.result()
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return AsyncStream(_ordered() if ordered else _unordered())
+
+    def flat_map(self, mapper: AsyncCallable) -> AsyncStream[Any]:
+        """
+        Map every element to an asynchronous stream, a synchronous stream or an iterable
+        and lazily chain them.
+
+        Args:
+            mapper: Function that returns the inner source of an element
+
+        Returns:
+            A flattened stream
+        """
+        _apply = as_callable(mapper, "apply")
+
+        async def _flat_map() -> AsyncIterator[Any]:
+            async for _t in self._iterator:
+                async for _r in _aiter(await _resolve(_apply(_t))):
+                    yield _r
+
+        return AsyncStream(_flat_map())
+
+    def limit(self, max_size: int) -> AsyncStream[_T]:
+        if max_size < 0:
+            raise ValueError("max_size cannot be negative")
+
+        async def _limit() -> AsyncIterator[_T]:
+            if max_size == 0:
+                return
+            count = 0
+            async for _t in self._iterator:
+                yield _t
+                count += 1
+                if count >= max_size:
+                    return
+
+        return AsyncStream(_limit())
+
+    def skip(self, n: int) -> AsyncStream[_T]:
+        if n < 0:
+            raise ValueError("n cannot be negative")
+
+        async def _skip() -> AsyncIterator[_T]:
+            count = 0
+            async for _t in self._iterator:
+                if count < n:
+                    count += 1
+                    continue
+                yield _t
+
+        return AsyncStream(_skip())
+
+    async def for_each(self, consumer: AsyncCallable) -> None:
+        _accept = as_callable(consumer, "accept")
+        async for _t in self._iterator:
+            await _resolve(_accept(_t))
+
+    async def count(self) -> int:
+        count = 0
+        async for _ in self._iterator:
+            count += 1
+        return count
+
+    async def any_match(self, predicate: AsyncCallable) -> bool:
+        _test = as_callable(predicate, "test")
+        async for _t in self._iterator:
+            if await _resolve(_test(_t)):
+                return True
+        return False
+
+    async def all_match(self, predicate: AsyncCallable) -> bool:
+        _test = as_callable(predicate, "test")
+        async for _t in self._iterator:
+            if not await _resolve(_test(_t)):
+                return False
+        return True
+
+    async def none_match(self, predicate: AsyncCallable) -> bool:
+        return not await self.any_match(predicate)
+
+    async def find_first(self, predicate: Optional[AsyncCallable] = None) -> OptionalContainer[Any]:
+        _test = None if predicate is None else as_callable(predicate, "test")
+        async for _t in self._iterator:
+            if _test is None or await _resolve(_test(_t)):
+                return OptionalContainer.of_nullable(_t)
+        return OptionalContainer.empty()
+
+    async def collect(self, collector: Collector[_T, Any, _R]) -> _R:
+        container = collector.supplier()
+        accumulator = collector.accumulator
+        async for _t in self._iterator:
+            accumulator(container, _t)
+        return collector.finish(container)
+
+    async def collect_list(self) -> List[_T]:
+        return [_t async for _t in self._iterator]
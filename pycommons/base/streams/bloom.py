@@ -0,0 +1,103 @@
+import math
+from typing import Any
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _mix(h: int) -> int:
+    """
+    SplitMix64 finalizer. Spreads the bits of the builtin hash, which is the identity for
+    small integers.
+    """
+    h = (h ^ (h >> 30)) * 0xBF58476D1CE4E5B9 & _MASK_64
+    h = (h ^ (h >> 27)) * 0x94D049BB133111EB & _MASK_64
+    return h ^ (h >> 31)
+
+
+class BloomFilter:
+    """
+    A space efficient probabilistic set.
+    [`might_contain`][pycommons.base.streams.bloom.BloomFilter.might_contain] never returns
+    False for an element that was put in the filter, but can return True for an element that
+    was not, with a probability close to the configured false positive rate as long as the
+    number of elements stays below the expected insertions.
+
+    The filter is sized once: `m = -n * ln(p) / ln(2)^2` bits and `k = m / n * ln(2)`
+    hash functions, e.g. ~1.2 MB for 1M elements at 1% false positives. The elements are
+    hashed with the builtin `hash`, so a filter is only meaningful within one process.
+
+    References:
+        https://guava.dev/releases/snapshot/api/docs/com/google/common/hash/BloomFilter.html
+    """
+
+    def __init__(self, expected_insertions: int, false_positive_rate: float = 0.01):
+        """
+        Initialize an empty filter
+
+        Args:
+            expected_insertions: Number of elements the filter is sized for
+            false_positive_rate: Expected probability of false positives
+        """
+        if expected_insertions < 1:
+            raise ValueError("expected_insertions must be a positive integer")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+
+        self._n_bits: int = max(
+            8,
+            int(math.ceil(-expected_insertions * math.log(false_positive_rate) / math.log(2) ** 2)),
+        )
+        self._n_hashes: int = max(1, round(self._n_bits / expected_insertions * math.log(2)))
+        self._bits: bytearray = bytearray((self._n_bits + 7) // 8)
+
+    def _indexes(self, t: Any) -> range:
+        h = _mix(hash(t) & _MASK_64)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return range(h1, h1 + self._n_hashes * h2, h2)
+
+    def put(self, t: Any) -> bool:
+        """
+        Put an element in the filter
+
+        Args:
+            t: The element
+
+        Returns:
+            True if the element was definitely not in the filter before, False if it might
+            have been.
+        """
+        bits = self._bits
+        n_bits = self._n_bits
+        changed = False
+        for index in self._indexes(t):
+            index %= n_bits
+            mask = 1 << (index & 7)
+            if not bits[index >> 3] & mask:
+                bits[index >> 3] |= mask
+                changed = True
+        return changed
+
+    def might_contain(self, t: Any) -> bool:
+        """
+        Check if an element might have been put in the filter
+
+        Args:
+            t: The element
+
+        Returns:
+            False if the element was definitely not put in the filter, True otherwise
+        """
+        bits = self._bits
+        n_bits = self._n_bits
+        for index in self._indexes(t):
+            index %= n_bits
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+        return True
+
+    def size_in_bytes(self) -> int:
+        """
+        Returns:
+            The memory used by the bit array of the filter
+        """
+        return len(self._bits)
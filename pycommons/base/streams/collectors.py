@@ -0,0 +1,586 @@
+from __future__ import annotations
+
+import collections
+import functools
+import itertools
+import operator as _operator
+from typing import TypeVar, Generic, Callable, Any, Optional, Iterator, List, Dict, Iterable
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.utils import UtilityClass
+
+_T = TypeVar("_T")
+_A = TypeVar("_A")
+_R = TypeVar("_R")
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+class Collector(Generic[_T, _A, _R]):
+    """
+    A mutable reduction operation that accumulates the elements of a stream into a
+    container and optionally transforms the container into the final result. Mirrors Java's
+    Collector with the supplier/accumulator/combiner/finisher contract. The combiner
+    merges two partial containers, which allows a stream processed in chunks (see
+    [`ParallelStream`][pycommons.base.streams.ParallelStream]) to collect each chunk
+    independently.
+
+    A collector can also provide `accumulate_all`, a function that accumulates a whole
+    iterator into the container in one call, e.g. `list.extend`. It is used instead of
+    calling the accumulator per element.
+
+    Collectors built from module level functions are picklable and can be used with
+    process pool executors.
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/stream/Collector.html
+    """
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        supplier: Callable[[], _A],
+        accumulator: Callable[[_A, _T], Any],
+        combiner: Callable[[_A, _A], _A],
+        finisher: Optional[Callable[[_A], _R]] = None,
+        accumulate_all: Optional[Callable[[_A, Iterator[_T]], Any]] = None,
+    ):
+        """
+        Initialize the collector
+
+        Args:
+            supplier: Creates a new empty container
+            accumulator: Adds an element to the container
+            combiner: Merges the second container into the first one and returns the result
+            finisher: Transforms the container into the final result. The container is
+                the result if not passed.
+            accumulate_all: Adds all the elements of an iterator to the container
+        """
+        self.supplier = supplier
+        self.accumulator = accumulator
+        self.combiner = combiner
+        self.finisher = finisher
+        self.accumulate_all = accumulate_all
+
+    @classmethod
+    def of(
+        cls,
+        supplier: Callable[[], _A],
+        accumulator: Callable[[_A, _T], Any],
+        combiner: Callable[[_A, _A], _A],
+        finisher: Optional[Callable[[_A], _R]] = None,
+    ) -> Collector[_T, _A, _R]:
+        """
+        Create a new collector from the supplier, accumulator, combiner and finisher
+        callables.
+
+        Returns:
+            A new collector
+        """
+        return cls(supplier, accumulator, combiner, finisher)
+
+    def accumulate(self, container: _A, iterator: Iterator[_T]) -> _A:
+        """
+        Accumulate all the elements of the iterator in the container
+
+        Args:
+            container: Container created by the supplier
+            iterator: Elements to be accumulated
+
+        Returns:
+            The container
+        """
+        if self.accumulate_all is not None:
+            self.accumulate_all(container, iterator)
+        else:
+            collections.deque(
+                map(functools.partial(self.accumulator, container), iterator), maxlen=0
+            )
+        return container
+
+    def finish(self, container: _A) -> _R:
+        """
+        Transform the container into the final result
+
+        Args:
+            container: Accumulated container
+
+        Returns:
+            The result of the collection
+        """
+        if self.finisher is None:
+            return container  # type: ignore
+        return self.finisher(container)
+
+    def collect(self, iterator: Iterator[_T]) -> _R:
+        """
+        Collect all the elements of the iterator in a single pass.
+
+        Args:
+            iterator: Elements to be collected
+
+        Returns:
+            The result of the collection
+        """
+        return self.finish(self.accumulate(self.supplier(), iterator))
+
+    def combine_all(self, containers: Iterable[_A]) -> _R:
+        """
+        Combine the partial containers accumulated independently (for example, one per chunk)
+        in the encounter order and finish the result.
+
+        Args:
+            containers: Partial containers in the encounter order
+
+        Returns:
+            The result of the collection
+        """
+        return self.finish(functools.reduce(self.combiner, containers, self.supplier()))
+
+
+def _extend(left: List[Any], right: List[Any]) -> List[Any]:
+    left.extend(right)
+    return left
+
+
+def _union(left: Any, right: Any) -> Any:
+    left |= right
+    return left
+
+
+def _put(
+    merge: Optional[Callable[[Any, Any], Any]], container: Dict[Any, Any], key: Any, value: Any
+) -> None:
+    if key in container:
+        if merge is None:
+            raise IllegalStateException(f"Duplicate key {key}")
+        value = merge(container[key], value)
+    container[key] = value
+
+
+def _map_accumulate(
+    key_mapper: Callable[[Any], Any],
+    value_mapper: Callable[[Any], Any],
+    merge: Optional[Callable[[Any, Any], Any]],
+    container: Dict[Any, Any],
+    t: Any,
+) -> None:
+    _put(merge, container, key_mapper(t), value_mapper(t))
+
+
+def _map_all(
+    key_mapper: Callable[[Any], Any],
+    value_mapper: Callable[[Any], Any],
+    merge: Optional[Callable[[Any, Any], Any]],
+    container: Dict[Any, Any],
+    iterator: Iterator[Any],
+) -> None:
+    for _t in iterator:
+        key = key_mapper(_t)
+        value = value_mapper(_t)
+        if key in container:
+            if merge is None:
+                raise IllegalStateException(f"Duplicate key {key}")
+            value = merge(container[key], value)
+        container[key] = value
+
+
+def _map_combine(merge: Optional[Callable[[Any, Any], Any]], left: Any, right: Any) -> Any:
+    for key, value in right.items():
+        _put(merge, left, key, value)
+    return left
+
+
+def _group_accumulate(
+    classifier: Callable[[Any], Any],
+    downstream: Collector[Any, Any, Any],
+    container: Dict[Any, Any],
+    t: Any,
+) -> None:
+    key = classifier(t)
+    _container = container.get(key)
+    if _container is None:
+        _container = container[key] = downstream.supplier()
+    downstream.accumulator(_container, t)
+
+
+def _group_all(
+    classifier: Callable[[Any], Any],
+    downstream: Collector[Any, Any, Any],
+    container: Dict[Any, Any],
+    iterator: Iterator[Any],
+) -> None:
+    supplier = downstream.supplier
+    accumulator = downstream.accumulator
+    for _t in iterator:
+        key = classifier(_t)
+        _container = container.get(key)
+        if _container is None:
+            _container = container[key] = supplier()
+        accumulator(_container, _t)
+
+
+def _group_combine(downstream: Collector[Any, Any, Any], left: Any, right: Any) -> Any:
+    for key, _container in right.items():
+        _left = left.get(key)
+        left[key] = _container if _left is None else downstream.combiner(_left, _container)
+    return left
+
+
+def _group_finish(downstream: Collector[Any, Any, Any], container: Dict[Any, Any]) -> Any:
+    return {key: downstream.finish(_container) for key, _container in container.items()}
+
+
+def _new_partition(downstream: Collector[Any, Any, Any]) -> Dict[bool, Any]:
+    return {False: downstream.supplier(), True: downstream.supplier()}
+
+
+def _partition_accumulate(
+    predicate: Callable[[Any], Any],
+    downstream: Collector[Any, Any, Any],
+    container: Dict[bool, Any],
+    t: Any,
+) -> None:
+    downstream.accumulator(container[bool(predicate(t))], t)
+
+
+def _partition_all(
+    predicate: Callable[[Any], Any],
+    downstream: Collector[Any, Any, Any],
+    container: Dict[bool, Any],
+    iterator: Iterator[Any],
+) -> None:
+    accumulator = downstream.accumulator
+    _true, _false = container[True], container[False]
+    for _t in iterator:
+        accumulator(_true if predicate(_t) else _false, _t)
+
+
+def _partition_combine(downstream: Collector[Any, Any, Any], left: Any, right: Any) -> Any:
+    for key in (False, True):
+        left[key] = downstream.combiner(left[key], right[key])
+    return left
+
+
+def _new_cell(initial: Any) -> List[Any]:
+    return [initial]
+
+
+def _first(container: List[Any]) -> Any:
+    return container[0]
+
+
+def _count_accumulate(container: List[int], _t: Any) -> None:
+    container[0] += 1
+
+
+def _count_all(container: List[int], iterator: Iterator[Any]) -> None:
+    _counter: Iterator[int] = itertools.count()
+    collections.deque(zip(iterator, _counter), maxlen=0)
+    container[0] += next(_counter)
+
+
+def _sum_cells(left: List[Any], right: List[Any]) -> List[Any]:
+    left[0] += right[0]
+    return left
+
+
+def _sum_accumulate(mapper: Optional[Callable[[Any], Any]], container: List[Any], t: Any) -> None:
+    container[0] += t if mapper is None else mapper(t)
+
+
+def _sum_all(
+    mapper: Optional[Callable[[Any], Any]], container: List[Any], iterator: Iterator[Any]
+) -> None:
+    container[0] += sum(iterator if mapper is None else map(mapper, iterator))
+
+
+def _new_average() -> List[Any]:
+    return [0, 0]
+
+
+def _average_accumulate(
+    mapper: Optional[Callable[[Any], Any]], container: List[Any], t: Any
+) -> None:
+    container[0] += t if mapper is None else mapper(t)
+    container[1] += 1
+
+
+def _average_all(
+    mapper: Optional[Callable[[Any], Any]], container: List[Any], iterator: Iterator[Any]
+) -> None:
+    _counter: Iterator[int] = itertools.count()
+    _values = iterator if mapper is None else map(mapper, iterator)
+    container[0] += sum(map(_operator.itemgetter(0), zip(_values, _counter)))
+    container[1] += next(_counter)
+
+
+def _average_combine(left: List[Any], right: List[Any]) -> List[Any]:
+    left[0] += right[0]
+    left[1] += right[1]
+    return left
+
+
+def _average_finish(container: List[Any]) -> float:
+    return 0.0 if container[1] == 0 else float(container[0] / container[1])
+
+
+def _join_all(container: List[str], iterator: Iterator[Any]) -> None:
+    container.extend(map(str, iterator))
+
+
+def _join_accumulate(container: List[str], t: Any) -> None:
+    container.append(str(t))
+
+
+def _join_finish(delimiter: str, prefix: str, suffix: str, container: List[str]) -> str:
+    return prefix + delimiter.join(container) + suffix
+
+
+def _reduce_accumulate(
+    operator: Callable[[Any, Any], Any],
+    mapper: Optional[Callable[[Any], Any]],
+    container: List[Any],
+    t: Any,
+) -> None:
+    container[0] = operator(container[0], t if mapper is None else mapper(t))
+
+
+def _reduce_all(
+    operator: Callable[[Any, Any], Any],
+    mapper: Optional[Callable[[Any], Any]],
+    container: List[Any],
+    iterator: Iterator[Any],
+) -> None:
+    container[0] = functools.reduce(
+        operator, iterator if mapper is None else map(mapper, iterator), container[0]
+    )
+
+
+def _reduce_combine(
+    operator: Callable[[Any, Any], Any], left: List[Any], right: List[Any]
+) -> List[Any]:
+    left[0] = operator(left[0], right[0])
+    return left
+
+
+class Collectors(UtilityClass):
+    """
+    Utility class with the commonly used [`Collector`][pycommons.base.streams.Collector]
+    implementations, similar to Java's Collectors. The collectors run in a single pass
+    over the stream and use the builtin bulk operations (`list.extend`, `set.update`, `sum`)
+    where possible.
+
+    Examples:
+        ```python
+        from pycommons.base.streams import Collectors, Streams
+
+        Streams.of(1, 2, 3, 4).collect(Collectors.partitioning_by(lambda t: t % 2 == 0))
+        # {False: [1, 3], True: [2, 4]}
+        ```
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/stream/Collectors.html
+    """
+
+    @classmethod
+    def to_list(cls) -> Collector[_T, List[_T], List[_T]]:
+        """
+        Collects the elements in a list
+
+        Returns:
+            A collector
+        """
+        return Collector(list, list.append, _extend, accumulate_all=list.extend)
+
+    @classmethod
+    def to_set(cls) -> Collector[_T, Any, Any]:
+        """
+        Collects the elements in a set
+
+        Returns:
+            A collector
+        """
+        return Collector(set, set.add, _union, accumulate_all=set.update)
+
+    @classmethod
+    def to_map(
+        cls,
+        key_mapper: Callable[[_T], _K],
+        value_mapper: Callable[[_T], _V],
+        merge_function: Optional[Callable[[_V, _V], _V]] = None,
+    ) -> Collector[_T, Any, Dict[_K, _V]]:
+        """
+        Collects the elements in a `dict`, that can be wrapped in a
+        [`Map`][pycommons.base.maps.Map] with `Map(result)`.
+
+        Args:
+            key_mapper: Maps an element to the key
+            value_mapper: Maps an element to the value
+            merge_function: Merges the existing and the new value of a duplicate key.
+                Duplicate keys raise `IllegalStateException` if not passed.
+
+        Returns:
+            A collector
+        """
+        return Collector(
+            dict,
+            functools.partial(_map_accumulate, key_mapper, value_mapper, merge_function),
+            functools.partial(_map_combine, merge_function),
+            accumulate_all=functools.partial(_map_all, key_mapper, value_mapper, merge_function),
+        )
+
+    @classmethod
+    def grouping_by(
+        cls,
+        classifier: Callable[[_T], _K],
+        downstream: Optional[Collector[_T, Any, Any]] = None,
+    ) -> Collector[_T, Any, Dict[_K, Any]]:
+        """
+        Groups the elements by the key returned by the classifier in a `dict`. The elements of
+        each group are collected by the downstream collector, a list by default.
+
+        Args:
+            classifier: Maps an element to its group key
+            downstream: Collector for the elements of a group
+
+        Returns:
+            A collector
+        """
+        _downstream = downstream or cls.to_list()
+        return Collector(
+            dict,
+            functools.partial(_group_accumulate, classifier, _downstream),
+            functools.partial(_group_combine, _downstream),
+            functools.partial(_group_finish, _downstream),
+            functools.partial(_group_all, classifier, _downstream),
+        )
+
+    @classmethod
+    def partitioning_by(
+        cls, predicate: Callable[[_T], bool], downstream: Optional[Collector[_T, Any, Any]] = None
+    ) -> Collector[_T, Any, Dict[bool, Any]]:
+        """
+        Partitions the elements in a `dict` with the keys `True` and `False` based on the
+        result of the predicate. Both the keys are always present.
+
+        Args:
+            predicate: Predicate that classifies the elements
+            downstream: Collector for the elements of a partition, a list by default
+
+        Returns:
+            A collector
+        """
+        _downstream = downstream or cls.to_list()
+        return Collector(
+            functools.partial(_new_partition, _downstream),
+            functools.partial(_partition_accumulate, predicate, _downstream),
+            functools.partial(_partition_combine, _downstream),
+            functools.partial(_group_finish, _downstream),
+            functools.partial(_partition_all, predicate, _downstream),
+        )
+
+    @classmethod
+    def counting(cls) -> Collector[Any, List[int], int]:
+        """
+        Counts the elements
+
+        Returns:
+            A collector
+        """
+        return Collector(
+            functools.partial(_new_cell, 0),
+            _count_accumulate,
+            _sum_cells,
+            _first,
+            _count_all,
+        )
+
+    @classmethod
+    def summing(cls, mapper: Optional[Callable[[_T], Any]] = None) -> Collector[_T, Any, Any]:
+        """
+        Sums the elements, or the values returned by the mapper
+
+        Args:
+            mapper: Maps an element to the value to be summed
+
+        Returns:
+            A collector
+        """
+        return Collector(
+            functools.partial(_new_cell, 0),
+            functools.partial(_sum_accumulate, mapper),
+            _sum_cells,
+            _first,
+            functools.partial(_sum_all, mapper),
+        )
+
+    @classmethod
+    def averaging(cls, mapper: Optional[Callable[[_T], Any]] = None) -> Collector[_T, Any, float]:
+        """
+        Arithmetic mean of the elements, or the values returned by the mapper.
+        The average of an empty stream is `0.0`.
+
+        Args:
+            mapper: Maps an element to the value to be averaged
+
+        Returns:
+            A collector
+        """
+        return Collector(
+            _new_average,
+            functools.partial(_average_accumulate, mapper),
+            _average_combine,
+            _average_finish,
+            functools.partial(_average_all, mapper),
+        )
+
+    @classmethod
+    def joining(
+        cls, delimiter: str = "", prefix: str = "", suffix: str = ""
+    ) -> Collector[Any, List[str], str]:
+        """
+        Concatenates the string representations of the elements
+
+        Args:
+            delimiter: Delimiter between the elements
+            prefix: Prefix of the result
+            suffix: Suffix of the result
+
+        Returns:
+            A collector
+        """
+        return Collector(
+            list,
+            _join_accumulate,
+            _extend,
+            functools.partial(_join_finish, delimiter, prefix, suffix),
+            _join_all,
+        )
+
+    @classmethod
+    def reducing(
+        cls,
+        identity: Any,
+        operator: Callable[[Any, Any], Any],
+        mapper: Optional[Callable[[_T], Any]] = None,
+    ) -> Collector[_T, Any, Any]:
+        """
+        Reduces the elements, or the values returned by the mapper, using the operator.
+        The identity must be the identity of the operator, since it is the initial value of
+        every partial reduction.
+
+        Args:
+            identity: Initial value of the reduction
+            operator: Associative function that combines two values
+            mapper: Maps an element to the value to be reduced
+
+        Returns:
+            A collector
+        """
+        return Collector(
+            functools.partial(_new_cell, identity),
+            functools.partial(_reduce_accumulate, operator, mapper),
+            functools.partial(_reduce_combine, operator),
+            _first,
+            functools.partial(_reduce_all, operator, mapper),
+        )
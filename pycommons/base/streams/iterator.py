@@ -1,84 +1,252 @@
+import collections
+import functools
 import itertools
-import typing
-from typing import TypeVar, Iterator, Optional
+from concurrent.futures import Executor
+from typing import TypeVar, Iterator, Optional, Tuple, Any, Sequence, Iterable, Callable
 
-from pycommons.base.container.boolean import BooleanContainer
-from pycommons.base.container.container import Container
-from pycommons.base.container.integer import IntegerContainer
 from pycommons.base.container.optional import OptionalContainer
 from pycommons.base.function import Consumer, Predicate, Function
-from pycommons.base.function.predicate import PassingPredicate
+from pycommons.base.function.comparator import Comparator
+from pycommons.base.streams.collectors import Collector
+from pycommons.base.streams.stages import (
+    Stage,
+    as_callable,
+    approximate_distinct,
+    as_optional_callable,
+    batch,
+    compose,
+    distinct,
+    flatten,
+    limit,
+    map_batches,
+    peek,
+    skip,
+    sliding_window,
+    sort,
+    top_k,
+)
+from pycommons.base.streams.parallel import ParallelStream
+from pycommons.base.streams.sorting import sort_key
 from pycommons.base.streams.stream import Stream, _R
 
 _T = TypeVar("_T")
 
+_MISSING = object()
+
 
 class IteratorStream(Stream[_T]):
-    def __init__(self, iterator: Iterator[_T]):
-        self._iterator: Iterator[_T] = iterator
+    """
+    A sequential stream backed by an iterator.
+
+    Intermediate operations like [`filter`][pycommons.base.streams.IteratorStream.filter] and
+    [`map`][pycommons.base.streams.IteratorStream.map] do not wrap the source in a new
+    generator. Instead, they are recorded as stages of a plan. When a terminal operation
+    runs (or the [`iterator`][pycommons.base.streams.IteratorStream.iterator] is requested),
+    the plan is fused onto the source using the builtin `map`/`filter` and `itertools`
+    iterators, so that the per-element cost is only the call to the user function.
+
+    A stream created with [`of_sequence`][pycommons.base.streams.IteratorStream.of_sequence]
+    knows its size until the first stage is added, so that `skip`, `limit` and `count` do not
+    iterate over the source.
+    """
+
+    def __init__(self, iterator: Iterator[_T], stages: Tuple[Stage, ...] = ()):
+        self._source: Iterator[Any] = iterator
+        self._stages: Tuple[Stage, ...] = stages
+        self._iterator: Optional[Iterator[_T]] = None if stages else iterator
+        self._sequence: Optional[Sequence[Any]] = None
+        self._window: range = range(0)
+
+    @classmethod
+    def of_sequence(
+        cls, sequence: Sequence[_T], window: Optional[range] = None
+    ) -> "IteratorStream[_T]":
+        """
+        Create a sized stream over the elements of a sequence. The size of the sequence must
+        not change while the stream is in use.
+
+        Args:
+            sequence: The source sequence
+            window: The indices of the sequence that are part of the stream. All the
+                elements are part of the stream by default.
+
+        Returns:
+            A new stream
+        """
+        if window is None:
+            stream: IteratorStream[_T] = cls(iter(sequence))
+            window = range(len(sequence))
+        else:
+            stream = cls(map(sequence.__getitem__, window))
+        stream._sequence = sequence
+        stream._window = window
+        return stream
 
-    def filter(self, predicate: Predicate[_T]) -> Stream[_T]:
-        def _filter() -> Iterator[_T]:
-            for _t in self._iterator:
-                if predicate(_t):
-                    yield _t
+    def _then(self, stage: Stage) -> "IteratorStream[Any]":
+        self._sequence = None
+        return IteratorStream(self._source, self._stages + (stage,))
 
-        return IteratorStream(_filter())
+    def filter(self, predicate: Predicate[_T]) -> Stream[_T]:
+        return self._then(functools.partial(filter, as_callable(predicate, "test")))
 
     def map(self, mapper: Function[_T, _R]) -> Stream[_R]:
-        def _map() -> Iterator[_R]:
-            for _t in self._iterator:
-                yield mapper.apply(_t)
-
-        return IteratorStream(_map())
+        return self._then(functools.partial(map, as_callable(mapper, "apply")))
 
     def flat_map(self, mapper: Function[_T, Stream[_R]]) -> Stream[_R]:
-        stream: Stream[_R] = IteratorStream(iter(()))
-
-        for _t in self._iterator:
-            stream = stream.chain(mapper.apply(_t))
-
-        return stream
+        return self._then(functools.partial(flatten, as_callable(mapper, "apply")))
 
     def iterator(self) -> Iterator[_T]:
+        self._sequence = None
+        if self._iterator is None:
+            self._iterator = compose(self._source, self._stages)
         return self._iterator
 
     def chain(self, stream: Stream[_T]) -> Stream[_T]:
-        return IteratorStream(itertools.chain(self._iterator, stream.iterator()))
+        return IteratorStream(itertools.chain(self.iterator(), stream.iterator()))
 
     def limit(self, max_size: int) -> Stream[_T]:
-        _count: IntegerContainer = IntegerContainer()
-
-        def _limiter(_c: IntegerContainer) -> bool:
-            _c.increment()
-            return _c > max_size
+        if max_size < 0:
+            raise ValueError("max_size cannot be negative")
 
-        return self.drop_while(Predicate.of(lambda t: _limiter(_count)))
+        if self._sequence is not None:
+            return IteratorStream.of_sequence(self._sequence, self._window[:max_size])
+        return self._then(functools.partial(limit, max_size))
 
     def skip(self, n: int) -> Stream[_T]:
-        _count: IntegerContainer = IntegerContainer()
-
-        def _skipper(_c: IntegerContainer) -> bool:
-            _c.increment()
-            return _c < n
+        if n < 0:
+            raise ValueError("n cannot be negative")
 
-        return self.drop_while(Predicate.of(lambda t: _skipper(_count)))
+        if self._sequence is not None:
+            return IteratorStream.of_sequence(self._sequence, self._window[n:])
+        return self._then(functools.partial(skip, n))
 
     def take_while(self, predicate: Predicate[_T]) -> Stream[_T]:
-        def _filter() -> Iterator[_T]:
-            for _t in self._iterator:
-                if predicate.test(_t):
-                    yield _t
-
-        return IteratorStream(_filter())
+        return self._then(functools.partial(filter, as_callable(predicate, "test")))
 
     def drop_while(self, predicate: Predicate[_T]) -> Stream[_T]:
-        def _filter() -> Iterator[_T]:
-            for _t in self._iterator:
-                if not predicate.test(_t):
-                    yield _t
-
-        return IteratorStream(_filter())
+        return self._then(functools.partial(itertools.filterfalse, as_callable(predicate, "test")))
+
+    def batch(self, size: int) -> Stream[Tuple[_T, ...]]:
+        """
+        Group the elements of the stream in tuples of `size` elements. The last tuple has
+        fewer elements if the number of elements is not a multiple of `size`.
+
+        Args:
+            size: Number of elements in a batch
+
+        Returns:
+            A stream of batches
+        """
+        if size < 1:
+            raise ValueError("size must be a positive integer")
+        return self._then(functools.partial(batch, size))
+
+    def sliding_window(self, size: int, step: int = 1) -> Stream[Tuple[_T, ...]]:
+        """
+        Stream of tuples of `size` consecutive elements, each window starting `step`
+        elements after the start of the previous one. Trailing elements that do not fill a
+        window are dropped.
+
+        Args:
+            size: Number of elements in a window
+            step: Distance between the starts of two consecutive windows
+
+        Returns:
+            A stream of windows
+        """
+        if size < 1 or step < 1:
+            raise ValueError("size and step must be positive integers")
+        return self._then(functools.partial(sliding_window, size, step))
+
+    def map_batches(self, mapper: Function[Tuple[_T, ...], Iterable[_R]], size: int) -> Stream[_R]:
+        """
+        Call the mapper with batches of `size` elements and flatten the returned
+        iterables back into the stream. Useful for bulk APIs that are cheaper per batch
+        than per element.
+
+        Args:
+            mapper: Function that maps a batch to an iterable of results
+            size: Number of elements in a batch
+
+        Returns:
+            A stream of the results
+        """
+        if size < 1:
+            raise ValueError("size must be a positive integer")
+        return self._then(functools.partial(map_batches, as_callable(mapper, "apply"), size))
+
+    def sorted(
+        self,
+        comparator: Optional[Comparator[_T, _T]] = None,
+        *,
+        max_in_memory: Optional[int] = None,
+    ) -> Stream[_T]:
+        """
+        Stable sort of the elements of the stream. The natural order, the comparators created
+        with [`Comparator.comparing`][pycommons.base.function.comparator.Comparator.comparing]
+        and their reversed comparators sort on the key directly; other comparators are wrapped
+        with `functools.cmp_to_key`.
+
+        Args:
+            comparator: The comparator, natural order if not passed
+            max_in_memory: Maximum number of elements held in memory while sorting. Larger
+                streams are sorted in runs that are spilled to temporary files and merged,
+                in which case the elements must be picklable. Unbounded if not passed.
+
+        Returns:
+            A sorted stream
+        """
+        if max_in_memory is not None and max_in_memory < 1:
+            raise ValueError("max_in_memory must be a positive integer")
+        key, reverse = sort_key(comparator)
+        return self._then(functools.partial(sort, key, reverse, max_in_memory))
+
+    def distinct(
+        self,
+        *,
+        approximate: bool = False,
+        expected_insertions: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+    ) -> Stream[_T]:
+        """
+        Keep the first occurrence of every element. The exact mode remembers every distinct
+        element in a set. The approximate mode uses a
+        [`BloomFilter`][pycommons.base.streams.bloom.BloomFilter] of fixed size instead, which
+        never passes a duplicate, but drops a distinct element with the probability of
+        a false positive.
+
+        Args:
+            approximate: Use the bounded memory approximate mode
+            expected_insertions: Number of distinct elements the approximate mode is sized for
+            false_positive_rate: Probability of dropping a distinct element in the
+                approximate mode
+
+        Returns:
+            A stream of distinct elements
+        """
+        if approximate:
+            return self._then(
+                functools.partial(approximate_distinct, expected_insertions, false_positive_rate)
+            )
+        return self._then(distinct)
+
+    def top_k(self, k: int, comparator: Optional[Comparator[_T, _T]] = None) -> Stream[_T]:
+        """
+        The first `k` elements in the comparator order, same as `sorted(comparator).limit(k)`,
+        but holding only `k` elements in memory. Pass a reversed comparator to get the
+        largest elements.
+
+        Args:
+            k: Number of elements
+            comparator: The comparator, natural order if not passed
+
+        Returns:
+            A stream of at most `k` elements in the comparator order
+        """
+        if k < 0:
+            raise ValueError("k cannot be negative")
+        key, reverse = sort_key(comparator)
+        return self._then(functools.partial(top_k, k, key, reverse))
 
     def for_each(
         self,
@@ -93,14 +261,23 @@ class IteratorStream(Stream[_T]):
                 "Both break_before_accept and continue_before_accept cannot be present"
             )
 
-        for _t in self._iterator:
+        _accept = as_callable(consumer, "accept")
+
+        if break_before_accept is None and break_on_accept is None:
+            _it: Iterator[Any] = self.iterator()
+            if continue_before_accept is not None:
+                _it = itertools.filterfalse(as_callable(continue_before_accept, "test"), _it)
+            collections.deque(map(_accept, _it), maxlen=0)
+            return
+
+        for _t in self.iterator():
             if break_before_accept is not None and break_before_accept.test(_t):
                 break
 
             if continue_before_accept is not None and continue_before_accept.test(_t):
                 continue
 
-            consumer.accept(_t)
+            _accept(_t)
 
             if break_on_accept is not None and break_on_accept.test(_t):
                 break
@@ -113,93 +290,114 @@ class IteratorStream(Stream[_T]):
         break_on_accept: Optional[Predicate[_T]] = None,
         continue_before_accept: Optional[Predicate[_T]] = None,
     ) -> Stream[_T]:
-        _iter_copy_container: Container[Iterator[_T]] = Container(iter(()))
-
-        def _consumer(_t: _T, _it_copy: Container[Iterator[_T]]) -> None:
-            consumer.accept(_t)
-            _it_copy.set(
-                itertools.chain(typing.cast(Iterator[_T], _iter_copy_container.get()), (_t,))
+        if break_before_accept is not None and continue_before_accept is not None:
+            raise ValueError(
+                "Both break_before_accept and continue_before_accept cannot be present"
             )
 
-        self.for_each(
-            Consumer.of(lambda _t: _consumer(_t, _iter_copy_container)),
-            break_before_accept=break_before_accept,
-            break_on_accept=break_on_accept,
-            continue_before_accept=continue_before_accept,
+        return self._then(
+            functools.partial(
+                peek,
+                as_callable(consumer, "accept"),
+                as_optional_callable(break_before_accept, "test"),
+                as_optional_callable(break_on_accept, "test"),
+                as_optional_callable(continue_before_accept, "test"),
+            )
         )
 
-        return IteratorStream(typing.cast(Iterator[_T], _iter_copy_container.get()))
+    def parallel(
+        self,
+        executor: Optional[Executor] = None,
+        *,
+        chunk_size: int = 1024,
+        ordered: bool = True,
+    ) -> Stream[_T]:
+        """
+        Returns a [`ParallelStream`][pycommons.base.streams.ParallelStream] over the elements
+        of this stream. The stages recorded so far run sequentially on the caller while the
+        source is split into chunks.
+
+        Args:
+            executor: Thread or process pool executor that processes the chunks. A fixed thread
+                pool is created for each terminal operation if not passed.
+            chunk_size: Number of elements sent to the executor in a single task
+            ordered: Whether results are returned in the encounter order
+
+        Returns:
+            A parallel stream
+        """
+        return ParallelStream(
+            self.iterator(),
+            executor=executor,
+            sequential=IteratorStream,
+            chunk_size=chunk_size,
+            ordered=ordered,
+        )
 
-    def count(self) -> int:
-        stream_count: IntegerContainer = IntegerContainer()
+    def collect(self, collector: Collector[_T, Any, _R]) -> _R:
+        """
+        Collect the elements of the stream with a
+        [`Collector`][pycommons.base.streams.Collector] in a single pass.
 
-        def _counter(_count: IntegerContainer) -> None:
-            stream_count.increment()
+        Args:
+            collector: The collector, usually one of the
+                [`Collectors`][pycommons.base.streams.Collectors]
 
-        self.for_each(Consumer.of(lambda t: _counter(stream_count)))
+        Returns:
+            The result of the collector
+        """
+        return collector.collect(self.iterator())
 
-        return stream_count.get()
+    def reduce(self, identity: _T, accumulator: Callable[[_T, _T], _T]) -> _T:
+        """
+        Reduce the elements of the stream using the accumulator, starting with the identity.
 
-    def any_match(self, predicate: Predicate[_T]) -> bool:
-        _match: BooleanContainer = BooleanContainer.with_false()
+        Args:
+            identity: Initial value of the reduction
+            accumulator: Associative function that combines two values
 
-        def _matcher(t: _T, _m: BooleanContainer) -> None:
-            if predicate.test(t):
-                _m.true()
+        Returns:
+            The result of the reduction, identity if the stream is empty
+        """
+        return functools.reduce(accumulator, self.iterator(), identity)
 
-        self.for_each(
-            Consumer.of(lambda t: _matcher(t, _match)),
-            break_on_accept=Predicate.of(lambda t: _match.get()),
-        )
+    def min(
+        self, comparator: Optional[Comparator[_T, _T]] = None
+    ) -> OptionalContainer[_T]:  # type: ignore
+        key, reverse = sort_key(comparator)
+        _extreme = max if reverse else min
+        result = _extreme(self.iterator(), key=key, default=_MISSING)  # type: ignore
+        return OptionalContainer.of_nullable(None if result is _MISSING else result)
 
-        return _match.get()
+    def max(
+        self, comparator: Optional[Comparator[_T, _T]] = None
+    ) -> OptionalContainer[_T]:  # type: ignore
+        key, reverse = sort_key(comparator)
+        _extreme = min if reverse else max
+        result = _extreme(self.iterator(), key=key, default=_MISSING)  # type: ignore
+        return OptionalContainer.of_nullable(None if result is _MISSING else result)
 
-    def all_match(self, predicate: Predicate[_T]) -> bool:
-        _match: BooleanContainer = BooleanContainer.with_true()
+    def count(self) -> int:
+        if self._sequence is not None:
+            return len(self._window)
 
-        def _matcher(t: _T, _m: BooleanContainer) -> None:
-            if not predicate.test(t):
-                _m.false()
+        _counter: Iterator[int] = itertools.count()
+        collections.deque(zip(self.iterator(), _counter), maxlen=0)
+        return next(_counter)
 
-        self.for_each(
-            Consumer.of(lambda t: _matcher(t, _match)),
-            break_on_accept=Predicate.of(lambda t: not _match.get()),
-        )
+    def any_match(self, predicate: Predicate[_T]) -> bool:
+        return any(map(as_callable(predicate, "test"), self.iterator()))
 
-        return _match.get()
+    def all_match(self, predicate: Predicate[_T]) -> bool:
+        return all(map(as_callable(predicate, "test"), self.iterator()))
 
     def none_match(self, predicate: Predicate[_T]) -> bool:
-        _match: BooleanContainer = BooleanContainer.with_true()
-
-        def _matcher(t: _T, _m: BooleanContainer) -> None:
-            if predicate.test(t):
-                _m.false()
-
-        self.for_each(
-            Consumer.of(lambda t: _matcher(t, _match)),
-            break_on_accept=Predicate.of(lambda t: not _match.get()),
-        )
-
-        return _match.get()
+        return not any(map(as_callable(predicate, "test"), self.iterator()))
 
     def find_first(
         self, predicate: Optional[Predicate[_T]] = None
     ) -> OptionalContainer[_T]:  # type: ignore
-        if predicate is None:
-            return self.find_first(PassingPredicate())
-
-        _match: BooleanContainer = BooleanContainer.with_false()
-        _found: Container[Optional[_T]] = Container.with_none()
-
-        def _matcher(t: _T, _m: BooleanContainer, _f: Container[Optional[_T]]) -> None:
-            assert predicate is not None
-            if predicate.test(t):
-                _m.true()
-                _f.set(t)
-
-        self.for_each(
-            Consumer.of(lambda t: _matcher(t, _match, _found)),
-            break_on_accept=Predicate.of(lambda t: _match.get()),
-        )
-
-        return OptionalContainer.of_nullable(_found.get())
+        _it: Iterator[_T] = self.iterator()
+        if predicate is not None:
+            _it = filter(as_callable(predicate, "test"), _it)
+        return OptionalContainer.of_nullable(next(_it, None))
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import functools
+import itertools
+import os
+import typing
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from typing import (
+    TypeVar,
+    Iterator,
+    Optional,
+    Tuple,
+    Any,
+    Callable,
+    List,
+    Deque,
+    Dict,
+    Set,
+    Generator,
+    Iterable,
+)
+
+from pycommons.base.concurrent.executor import Executors
+from pycommons.base.container.optional import OptionalContainer
+from pycommons.base.function import Consumer, Predicate, Function
+from pycommons.base.function.comparator import Comparator, NaturalOrderComparator
+from pycommons.base.streams.collectors import Collector, Collectors
+from pycommons.base.streams.stages import (
+    Stage,
+    as_callable,
+    as_optional_callable,
+    compose,
+    flatten,
+    map_batches,
+    top_k,
+)
+from pycommons.base.streams.sorting import sort_key
+from pycommons.base.streams.stream import Stream, _R
+
+_T = TypeVar("_T")
+
+_NOT_FOUND = (False, None)
+
+
+def _process_chunk(stages: Tuple[Stage, ...], chunk: List[Any]) -> List[Any]:
+    return list(compose(iter(chunk), stages))
+
+
+def _collect_chunk(
+    stages: Tuple[Stage, ...], collector: Collector[Any, Any, Any], chunk: List[Any]
+) -> Any:
+    return collector.accumulate(collector.supplier(), compose(iter(chunk), stages))
+
+
+def _top_k_chunk(
+    stages: Tuple[Stage, ...],
+    k: int,
+    key: Optional[Callable[[Any], Any]],
+    reverse: bool,
+    chunk: List[Any],
+) -> List[Any]:
+    return list(top_k(k, key, reverse, compose(iter(chunk), stages)))
+
+
+def _count_chunk(stages: Tuple[Stage, ...], chunk: List[Any]) -> int:
+    _counter: Iterator[int] = itertools.count()
+    collections.deque(zip(compose(iter(chunk), stages), _counter), maxlen=0)
+    return next(_counter)
+
+
+def _any_chunk(
+    stages: Tuple[Stage, ...], predicate: Callable[[Any], bool], chunk: List[Any]
+) -> bool:
+    return any(map(predicate, compose(iter(chunk), stages)))
+
+
+def _all_chunk(
+    stages: Tuple[Stage, ...], predicate: Callable[[Any], bool], chunk: List[Any]
+) -> bool:
+    return all(map(predicate, compose(iter(chunk), stages)))
+
+
+def _find_chunk(
+    stages: Tuple[Stage, ...], predicate: Optional[Callable[[Any], bool]], chunk: List[Any]
+) -> Tuple[bool, Any]:
+    _it: Iterator[Any] = compose(iter(chunk), stages)
+    if predicate is not None:
+        _it = filter(predicate, _it)
+    for _t in _it:
+        return True, _t
+    return _NOT_FOUND
+
+
+class ParallelStream(Stream[_T]):
+    """
+    A stream that splits its source into chunks and runs the `filter`, `map` and `flat_map`
+    stages of each chunk on an executor. Works with both
+    [`ThreadPoolExecutor`](https://docs.python.org/3/library/concurrent.futures.html) (for
+    example, the one created by
+    [`Executors.new_fixed_thread_pool_executor`][pycommons.base.concurrent.executor.Executors])
+    and `ProcessPoolExecutor`. When a process pool is used, the functions passed to the
+    stages must be picklable, i.e. module level functions or functional interface
+    instances of module level classes.
+
+    The results are returned in the encounter order by default. An unordered stream
+    (see [`unordered`][pycommons.base.streams.ParallelStream.unordered]) returns the chunks
+    as soon as they are completed. Only a bounded number of chunks are pending on the executor
+    at any time, so infinite sources are supported. The short-circuiting terminal operations
+    cancel the outstanding chunks as soon as the result is known.
+
+    The order dependent operations (`limit`, `skip`, `take_while`, `drop_while`, `batch`,
+    `sliding_window`, `sorted`, `distinct`, `peek`, `for_each`, `chain`) run sequentially on
+    the caller over the parallel results. `top_k`, `min` and `max` select the candidates of
+    each chunk on the executor (the key of a comparator must be picklable for process pools).
+    `collect` accumulates each chunk on the executor and combines the partial results in the
+    encounter order. `map_batches` runs on the executor, with the batches formed within each
+    chunk, so a batch can be smaller than `size` at the end of a chunk.
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/stream/BaseStream.html#parallel--
+    """
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        iterator: Iterator[_T],
+        executor: Optional[Executor] = None,
+        *,
+        sequential: Callable[[Iterator[Any]], Stream[Any]],
+        chunk_size: int = 1024,
+        ordered: bool = True,
+        max_pending_chunks: Optional[int] = None,
+        stages: Tuple[Stage, ...] = (),
+    ):
+        """
+        Initialize the parallel stream.
+
+        Args:
+            iterator: Source iterator
+            executor: Executor that processes the chunks. A fixed thread pool is created
+                for each terminal operation if not passed.
+            sequential: Creates the sequential streams over the results, returned by the
+                operations that run on the caller. The class of the stream that
+                [`parallel`][pycommons.base.streams.Stream.parallel] is called on.
+            chunk_size: Number of elements sent to the executor in a single task
+            ordered: Whether the results are returned in the encounter order
+            max_pending_chunks: Maximum number of chunks submitted to the executor and not yet
+                consumed. Defaults to twice the number of CPUs.
+            stages: Stages recorded on the stream
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        self._source: Iterator[Any] = iterator
+        self._sequential = sequential
+        self._executor: Optional[Executor] = executor
+        self._chunk_size: int = chunk_size
+        self._ordered: bool = ordered
+        self._max_pending_chunks: int = max_pending_chunks or 2 * (os.cpu_count() or 1)
+        self._stages: Tuple[Stage, ...] = stages
+
+    def _copy(self, **kwargs: Any) -> ParallelStream[Any]:
+        options: Dict[str, Any] = {
+            "executor": self._executor,
+            "sequential": self._sequential,
+            "chunk_size": self._chunk_size,
+            "ordered": self._ordered,
+            "max_pending_chunks": self._max_pending_chunks,
+            "stages": self._stages,
+        }
+        options.update(kwargs)
+        return ParallelStream(self._source, **options)
+
+    def _then(self, stage: Stage) -> ParallelStream[Any]:
+        return self._copy(stages=self._stages + (stage,))
+
+    def _chunks(self) -> Iterator[List[Any]]:
+        return iter(lambda: list(itertools.islice(self._source, self._chunk_size)), [])
+
+    def _results(
+        self, fn: Callable[..., Any], *args: Any, ordered: bool
+    ) -> Generator[Any, None, None]:
+        """
+        Submit the chunks of the source to the executor and yield the results of `fn`
+        for each chunk. The pending chunks are cancelled when the generator is closed.
+        """
+        executor: Executor = self._executor or Executors.new_fixed_thread_pool_executor(
+            os.cpu_count() or 1
+        )
+        pending: Deque[Future[Any]] = collections.deque()
+
+        try:
+            for chunk in self._chunks():
+                pending.append(executor.submit(fn, *args, chunk))
+                if len(pending) < self._max_pending_chunks:
+                    continue
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    yield from self._completed(pending)
+
+            while pending:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    yield from self._completed(pending)
+        finally:
+            for future in pending:
+                future.cancel()
+            if self._executor is None:
+                executor.shutdown(wait=False)
+
+    @staticmethod
+    def _completed(pending: Deque[Future[Any]]) -> Iterator[Any]:
+        done: Set[Future[Any]] = wait(pending, return_when=FIRST_COMPLETED).done
+        for future in done:
+            pending.remove(future)
+        return (future.result() for future in done)
+
+    def sequential(self) -> Stream[_T]:
+        """
+        Returns a sequential stream over the results of this stream, of the class of the
+        stream this stream was created from, such as an
+        [`IteratorStream`][pycommons.base.streams.IteratorStream].
+
+        Returns:
+            A sequential stream
+        """
+        return self._sequential(self.iterator())
+
+    def unordered(self) -> ParallelStream[_T]:
+        """
+        Returns an equivalent stream whose results are returned as soon as the chunks are
+        processed, regardless of the encounter order.
+
+        Returns:
+            An unordered parallel stream
+        """
+        return self._copy(ordered=False)
+
+    def parallel(
+        self,
+        executor: Optional[Executor] = None,
+        *,
+        chunk_size: int = 1024,
+        ordered: bool = True,
+    ) -> Stream[_T]:
+        return self._copy(executor=executor, chunk_size=chunk_size, ordered=ordered)
+
+    def iterator(self) -> Iterator[_T]:
+        return itertools.chain.from_iterable(
+            self._results(_process_chunk, self._stages, ordered=self._ordered)
+        )
+
+    def chain(self, stream: Stream[_T]) -> Stream[_T]:
+        return self._sequential(itertools.chain(self.iterator(), stream.iterator()))
+
+    def filter(self, predicate: Predicate[_T]) -> Stream[_T]:
+        return self._then(functools.partial(filter, as_callable(predicate, "test")))
+
+    def map(self, mapper: Function[_T, _R]) -> Stream[_R]:
+        return self._then(functools.partial(map, as_callable(mapper, "apply")))
+
+    def flat_map(self, mapper: Function[_T, Stream[_R]]) -> Stream[_R]:
+        return self._then(functools.partial(flatten, as_callable(mapper, "apply")))
+
+    def limit(self, max_size: int) -> Stream[_T]:
+        return self.sequential().limit(max_size)
+
+    def skip(self, n: int) -> Stream[_T]:
+        return self.sequential().skip(n)
+
+    def take_while(self, predicate: Predicate[_T]) -> Stream[_T]:
+        return self.sequential().take_while(predicate)
+
+    def drop_while(self, predicate: Predicate[_T]) -> Stream[_T]:
+        return self.sequential().drop_while(predicate)
+
+    def batch(self, size: int) -> Stream[Tuple[_T, ...]]:
+        return self.sequential().batch(size)
+
+    def sliding_window(self, size: int, step: int = 1) -> Stream[Tuple[_T, ...]]:
+        return self.sequential().sliding_window(size, step)
+
+    def map_batches(self, mapper: Function[Tuple[_T, ...], Iterable[_R]], size: int) -> Stream[_R]:
+        if size < 1:
+            raise ValueError("size must be a positive integer")
+        return self._then(functools.partial(map_batches, as_callable(mapper, "apply"), size))
+
+    def sorted(
+        self,
+        comparator: Optional[Comparator[_T, _T]] = None,
+        *,
+        max_in_memory: Optional[int] = None,
+    ) -> Stream[_T]:
+        return self.sequential().sorted(comparator, max_in_memory=max_in_memory)
+
+    def distinct(
+        self,
+        *,
+        approximate: bool = False,
+        expected_insertions: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+    ) -> Stream[_T]:
+        return self.sequential().distinct(
+            approximate=approximate,
+            expected_insertions=expected_insertions,
+            false_positive_rate=false_positive_rate,
+        )
+
+    def top_k(self, k: int, comparator: Optional[Comparator[_T, _T]] = None) -> Stream[_T]:
+        if k < 0:
+            raise ValueError("k cannot be negative")
+        key, reverse = sort_key(comparator)
+        candidates = itertools.chain.from_iterable(
+            self._results(_top_k_chunk, self._stages, k, key, reverse, ordered=True)
+        )
+        return self._sequential(top_k(k, key, reverse, candidates))
+
+    def for_each(
+        self,
+        consumer: Consumer[_T],
+        *,
+        break_before_accept: Optional[Predicate[_T]] = None,
+        break_on_accept: Optional[Predicate[_T]] = None,
+        continue_before_accept: Optional[Predicate[_T]] = None,
+    ) -> None:
+        self.sequential().for_each(
+            consumer,
+            break_before_accept=break_before_accept,
+            break_on_accept=break_on_accept,
+            continue_before_accept=continue_before_accept,
+        )
+
+    def peek(
+        self,
+        consumer: Consumer[_T],
+        *,
+        break_before_accept: Optional[Predicate[_T]] = None,
+        break_on_accept: Optional[Predicate[_T]] = None,
+        continue_before_accept: Optional[Predicate[_T]] = None,
+    ) -> Stream[_T]:
+        return self.sequential().peek(
+            consumer,
+            break_before_accept=break_before_accept,
+            break_on_accept=break_on_accept,
+            continue_before_accept=continue_before_accept,
+        )
+
+    def collect(self, collector: Collector[_T, Any, _R]) -> _R:
+        with contextlib.closing(
+            self._results(_collect_chunk, self._stages, collector, ordered=True)
+        ) as results:
+            return collector.combine_all(results)
+
+    def reduce(self, identity: _T, accumulator: Callable[[_T, _T], _T]) -> _T:
+        return typing.cast(_T, self.collect(Collectors.reducing(identity, accumulator)))
+
+    def min(
+        self, comparator: Optional[Comparator[_T, _T]] = None
+    ) -> OptionalContainer[_T]:  # type: ignore
+        return self.top_k(1, comparator).find_first()
+
+    def max(
+        self, comparator: Optional[Comparator[_T, _T]] = None
+    ) -> OptionalContainer[_T]:  # type: ignore
+        if comparator is None:
+            comparator = NaturalOrderComparator()
+        return self.top_k(1, comparator.reversed()).find_first()
+
+    def count(self) -> int:
+        with contextlib.closing(
+            self._results(_count_chunk, self._stages, ordered=False)
+        ) as results:
+            return sum(results)
+
+    def any_match(self, predicate: Predicate[_T]) -> bool:
+        with contextlib.closing(
+            self._results(_any_chunk, self._stages, as_callable(predicate, "test"), ordered=False)
+        ) as results:
+            return any(results)
+
+    def all_match(self, predicate: Predicate[_T]) -> bool:
+        with contextlib.closing(
+            self._results(_all_chunk, self._stages, as_callable(predicate, "test"), ordered=False)
+        ) as results:
+            return all(results)
+
+    def none_match(self, predicate: Predicate[_T]) -> bool:
+        return not self.any_match(predicate)
+
+    def find_first(
+        self, predicate: Optional[Predicate[_T]] = None
+    ) -> OptionalContainer[_T]:  # type: ignore
+        with contextlib.closing(
+            self._results(
+                _find_chunk, self._stages, as_optional_callable(predicate, "test"), ordered=True
+            )
+        ) as results:
+            for found, value in results:
+                if found:
+                    return OptionalContainer.of_nullable(value)
+        return OptionalContainer.empty()
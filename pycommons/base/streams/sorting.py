@@ -0,0 +1,97 @@
+import functools
+import heapq
+import itertools
+import pickle
+import tempfile
+from typing import Any, Callable, Optional, Tuple, Iterator, List, IO
+
+from pycommons.base.function.comparator import (
+    Comparator,
+    NaturalOrderComparator,
+    ReverseOrderComparator,
+    KeyComparator,
+)
+
+SortKey = Tuple[Optional[Callable[[Any], Any]], bool]
+"""
+The `key` and `reverse` arguments of `sorted` that are equivalent to a comparator
+"""
+
+_SPILL_BLOCK_SIZE = 1024
+
+
+def sort_key(comparator: Optional[Comparator[Any, Any]]) -> SortKey:
+    """
+    Resolve the `key` and `reverse` arguments equivalent to the comparator. The natural order,
+    key based comparators and their reversed comparators are sorted without calling
+    `compare_to`. Other comparators go through `functools.cmp_to_key`.
+
+    Args:
+        comparator: The comparator, natural order if None
+
+    Returns:
+        The tuple of the key function (None for the natural order) and the reverse flag
+    """
+    if comparator is None or isinstance(comparator, NaturalOrderComparator):
+        return None, False
+    if isinstance(comparator, KeyComparator):
+        return comparator.key, False
+    if isinstance(comparator, ReverseOrderComparator):
+        key, reverse = sort_key(comparator.comparator)
+        return key, not reverse
+    return functools.cmp_to_key(comparator.compare_to), False
+
+
+def _spill(elements: List[Any]) -> IO[bytes]:
+    run: IO[bytes] = tempfile.TemporaryFile()
+    for start in range(0, len(elements), _SPILL_BLOCK_SIZE):
+        pickle.dump(elements[start : start + _SPILL_BLOCK_SIZE], run, pickle.HIGHEST_PROTOCOL)
+    run.seek(0)
+    return run
+
+
+def _read(run: IO[bytes]) -> Iterator[Any]:
+    while True:
+        try:
+            block = pickle.load(run)
+        except EOFError:
+            return
+        yield from block
+
+
+def external_sort(
+    iterator: Iterator[Any],
+    key: Optional[Callable[[Any], Any]],
+    reverse: bool,
+    max_in_memory: int,
+) -> Iterator[Any]:
+    """
+    Stable sort that holds at most `max_in_memory` elements in memory while reading the input.
+    The input is split in sorted runs that are spilled to temporary files and merged lazily.
+    Inputs that fit in memory are sorted without spilling.
+
+    Args:
+        iterator: Elements to be sorted. Spilled elements must be picklable.
+        key: Sort key, natural order if None
+        reverse: Sort in descending order
+        max_in_memory: Maximum number of elements in a sorted run
+
+    Returns:
+        Iterator of the sorted elements
+    """
+    runs: List[IO[bytes]] = []
+    try:
+        while True:
+            run = sorted(itertools.islice(iterator, max_in_memory), key=key, reverse=reverse)
+            if not runs and len(run) < max_in_memory:
+                yield from run
+                return
+            if not run:
+                break
+            runs.append(_spill(run))
+            del run
+
+        yield from heapq.merge(*map(_read, runs), key=key, reverse=reverse)
+    finally:
+        for run_file in runs:
+            run_file.close()
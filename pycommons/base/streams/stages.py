@@ -0,0 +1,294 @@
+import collections
+import heapq
+import itertools
+import operator
+import typing
+from typing import Iterator, Callable, Any, Tuple, Optional, Deque, Iterable, Set
+
+from pycommons.base.function import Consumer, Predicate, Function
+from pycommons.base.streams.bloom import BloomFilter
+from pycommons.base.streams.sorting import external_sort
+
+Stage = Callable[[Iterator[Any]], Iterator[Any]]
+"""
+A single step of a stream pipeline. Takes the upstream iterator and returns
+the downstream iterator. Stages are composed only once, at the terminal operation.
+Stages built from module level callables (and `functools.partial` over them) are picklable,
+which allows the same plan to be shipped to process pool workers.
+"""
+
+
+def as_callable(function: Any, method: str) -> Callable[[Any], Any]:
+    """
+    Resolve the bound interface method (`apply`, `test`, `accept`) of a functional interface
+    so that the pipeline calls it directly instead of going through `__call__`. Plain callables
+    are returned as is.
+
+    Args:
+        function: A functional interface instance or a plain callable
+        method: Name of the interface method
+
+    Returns:
+        The callable to be invoked for each element
+    """
+    if isinstance(function, (Function, Predicate, Consumer)):
+        return typing.cast(Callable[[Any], Any], getattr(function, method))
+    return typing.cast(Callable[[Any], Any], function)
+
+
+def as_optional_callable(function: Any, method: str) -> Optional[Callable[[Any], Any]]:
+    """
+    Same as [`as_callable`][pycommons.base.streams.stages.as_callable], but passes `None`
+    through.
+    """
+    return None if function is None else as_callable(function, method)
+
+
+_stream_iterator = operator.methodcaller("iterator")
+
+
+def flatten(mapper: Callable[[Any], Any], iterator: Iterator[Any]) -> Iterator[Any]:
+    """
+    Flat map stage. Maps every element to a stream and lazily chains the iterators of the
+    resulting streams.
+
+    Args:
+        mapper: Callable that maps an element to a stream
+        iterator: Upstream iterator
+
+    Returns:
+        The flattened iterator
+    """
+    return itertools.chain.from_iterable(map(_stream_iterator, map(mapper, iterator)))
+
+
+def limit(max_size: int, iterator: Iterator[Any]) -> Iterator[Any]:
+    """
+    Limit stage. Stops pulling from the upstream iterator after `max_size` elements.
+
+    Args:
+        max_size: Maximum number of elements
+        iterator: Upstream iterator
+
+    Returns:
+        The truncated iterator
+    """
+    return itertools.islice(iterator, max_size)
+
+
+def skip(n: int, iterator: Iterator[Any]) -> Iterator[Any]:
+    """
+    Skip stage. Discards the first `n` elements of the upstream iterator.
+
+    Args:
+        n: Number of elements to be discarded
+        iterator: Upstream iterator
+
+    Returns:
+        The iterator without the first `n` elements
+    """
+    return itertools.islice(iterator, n, None)
+
+
+def batch(size: int, iterator: Iterator[Any]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Batch stage. Groups the upstream elements in tuples of `size` elements. The last tuple
+    has fewer elements if the upstream does not divide evenly.
+
+    Args:
+        size: Number of elements in a batch
+        iterator: Upstream iterator
+
+    Returns:
+        The iterator of batches
+    """
+    return iter(lambda: tuple(itertools.islice(iterator, size)), ())
+
+
+def sliding_window(size: int, step: int, iterator: Iterator[Any]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Sliding window stage. Yields tuples of `size` consecutive elements, each window starting
+    `step` elements after the start of the previous one. Only full windows are yielded.
+
+    Args:
+        size: Number of elements in a window
+        step: Distance between the starts of two consecutive windows
+        iterator: Upstream iterator
+
+    Returns:
+        The iterator of windows
+    """
+    window: Deque[Any] = collections.deque(itertools.islice(iterator, size), maxlen=size)
+    if len(window) < size:
+        return
+
+    yield tuple(window)
+
+    while True:
+        if step < size:
+            _next = tuple(itertools.islice(iterator, step))
+            if len(_next) < step:
+                return
+            window.extend(_next)
+        else:
+            window.clear()
+            window.extend(itertools.islice(iterator, step - size, step))
+            if len(window) < size:
+                return
+        yield tuple(window)
+
+
+def map_batches(
+    mapper: Callable[[Tuple[Any, ...]], Iterable[Any]], size: int, iterator: Iterator[Any]
+) -> Iterator[Any]:
+    """
+    Batch mapping stage. Calls the mapper with batches of `size` elements and flattens
+    the iterables returned by the mapper.
+
+    Args:
+        mapper: Callable that maps a batch to an iterable of results
+        size: Number of elements in a batch
+        iterator: Upstream iterator
+
+    Returns:
+        The flattened iterator of results
+    """
+    return itertools.chain.from_iterable(map(mapper, batch(size, iterator)))
+
+
+def sort(
+    key: Optional[Callable[[Any], Any]],
+    reverse: bool,
+    max_in_memory: Optional[int],
+    iterator: Iterator[Any],
+) -> Iterator[Any]:
+    """
+    Sort stage. Reads the whole upstream on the first pull. Spills sorted runs to temporary
+    files when `max_in_memory` is set and the upstream has more elements.
+
+    Args:
+        key: Sort key, natural order if None
+        reverse: Sort in descending order
+        max_in_memory: Maximum number of elements held in memory, unbounded if None
+        iterator: Upstream iterator
+
+    Returns:
+        The sorted iterator
+    """
+    if max_in_memory is None:
+        yield from sorted(iterator, key=key, reverse=reverse)
+    else:
+        yield from external_sort(iterator, key, reverse, max_in_memory)
+
+
+def top_k(
+    k: int, key: Optional[Callable[[Any], Any]], reverse: bool, iterator: Iterator[Any]
+) -> Iterator[Any]:
+    """
+    Top K stage. Equivalent to sorting and keeping the first `k` elements, using a bounded
+    heap of `k` elements.
+
+    Args:
+        k: Number of elements
+        key: Sort key, natural order if None
+        reverse: Sort in descending order
+        iterator: Upstream iterator
+
+    Returns:
+        Iterator of the first `k` elements in the sort order
+    """
+    yield from (heapq.nlargest if reverse else heapq.nsmallest)(k, iterator, key=key)
+
+
+def distinct(iterator: Iterator[Any]) -> Iterator[Any]:
+    """
+    Distinct stage. Keeps the first occurrence of every element, remembering all the
+    elements seen so far in a set.
+
+    Args:
+        iterator: Upstream iterator
+
+    Returns:
+        Iterator of the distinct elements
+    """
+    seen: Set[Any] = set()
+    seen_add = seen.add
+    for _t in iterator:
+        if _t not in seen:
+            seen_add(_t)
+            yield _t
+
+
+def approximate_distinct(
+    expected_insertions: int, false_positive_rate: float, iterator: Iterator[Any]
+) -> Iterator[Any]:
+    """
+    Approximate distinct stage backed by a [`BloomFilter`][pycommons.base.streams.bloom.BloomFilter]
+    with bounded memory. A duplicate is never passed downstream, but a distinct element can be
+    dropped with the probability of a false positive of the filter.
+
+    Args:
+        expected_insertions: Number of distinct elements the filter is sized for
+        false_positive_rate: Probability of dropping a distinct element
+        iterator: Upstream iterator
+
+    Returns:
+        Iterator of the distinct elements
+    """
+    return filter(BloomFilter(expected_insertions, false_positive_rate).put, iterator)
+
+
+def peek(  # pylint: disable=R0913
+    consumer: Callable[[Any], Any],
+    break_before_accept: Optional[Callable[[Any], bool]],
+    break_on_accept: Optional[Callable[[Any], bool]],
+    continue_before_accept: Optional[Callable[[Any], bool]],
+    iterator: Iterator[Any],
+) -> Iterator[Any]:
+    """
+    Peek stage. Passes the elements through while calling the consumer on each of them.
+    The predicates have the same meaning as in `Stream.for_each`, the elements that are skipped
+    or not reached are not part of the downstream iterator.
+
+    Args:
+        consumer: Callable that is called with every element that flows through the stage
+        break_before_accept: Stop before the element that passes this predicate
+        break_on_accept: Stop after the element that passes this predicate
+        continue_before_accept: Skip the elements that pass this predicate
+        iterator: Upstream iterator
+
+    Returns:
+        The pass-through iterator
+    """
+    if continue_before_accept is not None:
+        iterator = itertools.filterfalse(continue_before_accept, iterator)
+
+    if break_before_accept is None and break_on_accept is None:
+        for _t in iterator:
+            consumer(_t)
+            yield _t
+        return
+
+    for _t in iterator:
+        if break_before_accept is not None and break_before_accept(_t):
+            return
+        consumer(_t)
+        yield _t
+        if break_on_accept is not None and break_on_accept(_t):
+            return
+
+
+def compose(iterator: Iterator[Any], stages: Tuple[Stage, ...]) -> Iterator[Any]:
+    """
+    Apply the stages in order on the source iterator.
+
+    Args:
+        iterator: Source iterator
+        stages: Stages of the pipeline
+
+    Returns:
+        The iterator of the last stage
+    """
+    for stage in stages:
+        iterator = stage(iterator)
+    return iterator
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Generic, TypeVar, Iterator, Any, Optional
+from concurrent.futures import Executor
+from typing import Generic, TypeVar, Iterator, Any, Optional, Tuple, Iterable, Callable
 
 from pycommons.base.container.optional import OptionalContainer
+from pycommons.base.streams.collectors import Collector
 from pycommons.base.function import Predicate, Function, Consumer
+from pycommons.base.function.comparator import Comparator
 
 _T = TypeVar("_T", bound=Any)
 _R = TypeVar("_R", bound=Any)
@@ -47,6 +50,41 @@ class Stream(Generic[_T]):
     def drop_while(self, predicate: Predicate[_T]) -> Stream[_T]:
         ...
 
+    @abstractmethod
+    def batch(self, size: int) -> Stream[Tuple[_T, ...]]:
+        ...
+
+    @abstractmethod
+    def sliding_window(self, size: int, step: int = 1) -> Stream[Tuple[_T, ...]]:
+        ...
+
+    @abstractmethod
+    def map_batches(self, mapper: Function[Tuple[_T, ...], Iterable[_R]], size: int) -> Stream[_R]:
+        ...
+
+    @abstractmethod
+    def sorted(
+        self,
+        comparator: Optional[Comparator[_T, _T]] = None,
+        *,
+        max_in_memory: Optional[int] = None,
+    ) -> Stream[_T]:
+        ...
+
+    @abstractmethod
+    def distinct(
+        self,
+        *,
+        approximate: bool = False,
+        expected_insertions: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+    ) -> Stream[_T]:
+        ...
+
+    @abstractmethod
+    def top_k(self, k: int, comparator: Optional[Comparator[_T, _T]] = None) -> Stream[_T]:
+        ...
+
     @abstractmethod
     def for_each(
         self,
@@ -69,6 +107,36 @@ class Stream(Generic[_T]):
     ) -> Stream[_T]:
         ...
 
+    @abstractmethod
+    def parallel(
+        self,
+        executor: Optional[Executor] = None,
+        *,
+        chunk_size: int = 1024,
+        ordered: bool = True,
+    ) -> Stream[_T]:
+        ...
+
+    @abstractmethod
+    def collect(self, collector: Collector[_T, Any, _R]) -> _R:
+        ...
+
+    @abstractmethod
+    def reduce(self, identity: _T, accumulator: Callable[[_T, _T], _T]) -> _T:
+        ...
+
+    @abstractmethod
+    def min(
+        self, comparator: Optional[Comparator[_T, _T]] = None
+    ) -> OptionalContainer[_T]:  # type: ignore
+        ...
+
+    @abstractmethod
+    def max(
+        self, comparator: Optional[Comparator[_T, _T]] = None
+    ) -> OptionalContainer[_T]:  # type: ignore
+        ...
+
     @abstractmethod
     def count(self) -> int:
         ...
@@ -1,5 +1,6 @@
-from typing import TypeVar, Iterable
+from typing import TypeVar, Iterable, AsyncIterable
 
+from pycommons.base.streams.asynchronous import AsyncStream
 from pycommons.base.streams.iterator import IteratorStream
 from pycommons.base.streams.stream import Stream
 
@@ -9,20 +10,27 @@ _T = TypeVar("_T")
 class Streams:
     @classmethod
     def of(cls, *args: _T) -> Stream[_T]:
-        return IteratorStream(iter(args))
+        return IteratorStream.of_sequence(args)
 
     @classmethod
     def flat(cls, iterable: Iterable[_T]) -> Stream[_T]:
+        if isinstance(iterable, (tuple, range)):
+            return IteratorStream.of_sequence(iterable)
         return IteratorStream(iter(iterable))
 
     @classmethod
     def empty(cls) -> Stream[_T]:
-        return IteratorStream(iter(()))
+        return IteratorStream.of_sequence(())
 
     @classmethod
     def of_one(cls, element: _T) -> Stream[_T]:
-        return IteratorStream(iter({element}))
+        return IteratorStream.of_sequence((element,))
 
     @classmethod
     def of_two(cls, e1: _T, e2: _T) -> Stream[_T]:
-        return IteratorStream(iter((e1, e2)))
+        return IteratorStream.of_sequence((e1, e2))
+
+    @classmethod
+    def from_async_iterable(cls, iterable: AsyncIterable[_T]) -> AsyncStream[_T]:
+        # 3.8 and 3.9 have no aiter/anext built-ins
+        return AsyncStream(iterable.__aiter__())  # pylint: disable=C2801
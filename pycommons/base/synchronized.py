@@ -1,14 +1,17 @@
 import functools
+import threading
 from abc import abstractmethod, ABC
-from threading import Lock, RLock
-from typing import Union, TypeVar, Callable, Any
+from threading import Condition, Lock, RLock, get_ident
+from typing import Union, TypeVar, Callable, Any, ContextManager, Optional
+
+from pycommons.base.exception import IllegalStateException
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 
 class Synchronized(ABC):
     @abstractmethod
-    def _sync_lock(self) -> Union[Lock, RLock]:
+    def _sync_lock(self) -> ContextManager[Any]:
         ...
 
     @staticmethod
@@ -38,3 +41,425 @@ class RLockSynchronized(Synchronized):
 
     def __init__(self) -> None:
         self._lock = RLock()
+
+
+# The counters of the lock are attributes of the lock rather than of a state object, they are
+# read and written under the mutex on every acquire and release
+class ReadWriteLock:  # pylint: disable=R0902
+    """
+    A lock held either by any number of readers or by a single writer. The read and the write
+    locks are reentrant, and a writer can acquire the read lock. A reader cannot acquire the
+    write lock, which would deadlock with another reader doing the same, but it can
+    [`try_upgrade`][pycommons.base.synchronized.ReadWriteLock.try_upgrade] when it is the only
+    reader, and a writer can [`downgrade`][pycommons.base.synchronized.ReadWriteLock.downgrade]
+    to a reader.
+
+    By default the writers are preferred: a new reader waits while a writer is waiting, so the
+    writers are not starved by a continuous flow of readers, but the readers can be starved by
+    a continuous flow of writers. With `fair=True`, the readers waiting when a writer releases
+    the lock are admitted before the next writer: the readers and the writers alternate, which
+    costs throughput when the lock is contended.
+
+    A version counter, odd while the write lock is held, provides the optimistic reads of
+    Java's `StampedLock`: a read takes a stamp with
+    [`try_optimistic_read`][pycommons.base.synchronized.ReadWriteLock.try_optimistic_read],
+    reads without holding the lock, and then
+    [`validate`][pycommons.base.synchronized.ReadWriteLock.validate]s that no writer acquired
+    the lock in the meantime, or reads again under the read lock.
+
+    Examples:
+        ```python
+        from pycommons.base.synchronized import ReadWriteLock
+
+        lock = ReadWriteLock()
+        point = [0, 0]
+
+        stamp = lock.try_optimistic_read()
+        x, y = point
+        if not lock.validate(stamp):
+            with lock.read_lock():
+                x, y = point
+
+        with lock.write_lock():
+            point[:] = [1, 2]
+        ```
+
+    References:
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/locks/ReentrantReadWriteLock.html
+        https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/locks/StampedLock.html
+    """
+
+    class _ReadLock:
+        __slots__ = ("_lock",)
+
+        def __init__(self, lock: "ReadWriteLock"):
+            self._lock = lock
+
+        def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+            return self._lock.acquire_read(blocking, timeout)
+
+        def release(self) -> None:
+            self._lock.release_read()
+
+        def __enter__(self) -> bool:
+            return self._lock.acquire_read()
+
+        def __exit__(self, *args: Any) -> None:
+            self._lock.release_read()
+
+    class _WriteLock:
+        __slots__ = ("_lock",)
+
+        def __init__(self, lock: "ReadWriteLock"):
+            self._lock = lock
+
+        def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+            return self._lock.acquire_write(blocking, timeout)
+
+        def release(self) -> None:
+            self._lock.release_write()
+
+        def __enter__(self) -> bool:
+            return self._lock.acquire_write()
+
+        def __exit__(self, *args: Any) -> None:
+            self._lock.release_write()
+
+    def __init__(self, fair: bool = False) -> None:
+        """
+        Args:
+            fair: Admit the readers waiting when a writer releases the lock before the next
+                writer, instead of preferring the writers
+        """
+        self._fair = fair
+        self._mutex = Lock()
+        self._condition = Condition(self._mutex)
+        self._local = threading.local()
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writes = 0
+        self._waiting_readers = 0
+        self._waiting_writers = 0
+        # The readers that were waiting at the last write release, admitted before the next
+        # writer in the fair mode
+        self._admitted_readers = 0
+        self._write_releases = 0
+        # Even while the write lock is not held, 0 is never a valid stamp
+        self._version = 2
+        self._read_lock = ReadWriteLock._ReadLock(self)
+        self._write_lock = ReadWriteLock._WriteLock(self)
+
+    def read_lock(self) -> "ReadWriteLock._ReadLock":
+        """
+        Returns:
+            The read lock, with the `acquire`, `release` and context manager methods of a
+            `threading.Lock`
+        """
+        return self._read_lock
+
+    def write_lock(self) -> "ReadWriteLock._WriteLock":
+        """
+        Returns:
+            The write lock, with the `acquire`, `release` and context manager methods of a
+            `threading.Lock`
+        """
+        return self._write_lock
+
+    def _wait(self, predicate: Callable[[], bool], blocking: bool, timeout: float) -> bool:
+        if not blocking:
+            return False
+        return self._condition.wait_for(predicate, None if timeout < 0 else timeout)
+
+    def acquire_read(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """
+        Acquire the read lock. A thread holding the read or the write lock acquires the read
+        lock without waiting.
+
+        Args:
+            blocking: Wait for the lock if it cannot be acquired immediately
+            timeout: Maximum time to wait in seconds, -1 to wait without limit
+
+        Returns:
+            True if the lock was acquired
+        """
+        local = self._local
+        reads = getattr(local, "reads", 0)
+        with self._mutex:
+            if (
+                not reads
+                and (self._writer is not None or self._waiting_writers)
+                and self._writer != get_ident()
+            ):
+                self._waiting_readers += 1
+                releases = self._write_releases
+                try:
+                    if self._fair:
+                        acquired = self._wait(
+                            lambda: self._writer is None
+                            and (not self._waiting_writers or self._write_releases != releases),
+                            blocking,
+                            timeout,
+                        )
+                        if self._write_releases != releases:
+                            self._admitted_readers -= 1
+                    else:
+                        acquired = self._wait(
+                            lambda: self._writer is None and not self._waiting_writers,
+                            blocking,
+                            timeout,
+                        )
+                finally:
+                    self._waiting_readers -= 1
+                if not acquired:
+                    return False
+            self._readers += 1
+        local.reads = reads + 1
+        return True
+
+    def release_read(self) -> None:
+        """
+        Release a hold of the read lock by the current thread
+
+        Raises:
+            RuntimeError: if the current thread does not hold the read lock
+        """
+        local = self._local
+        reads = getattr(local, "reads", 0)
+        if not reads:
+            raise RuntimeError("release of a read lock not held by the thread")
+        local.reads = reads - 1
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers and self._waiting_writers:
+                self._condition.notify_all()
+
+    def _can_write(self) -> bool:
+        return self._writer is None and not self._readers and not self._admitted_readers
+
+    def acquire_write(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """
+        Acquire the write lock. A thread holding the write lock acquires it again without
+        waiting.
+
+        Args:
+            blocking: Wait for the lock if it cannot be acquired immediately
+            timeout: Maximum time to wait in seconds, -1 to wait without limit
+
+        Returns:
+            True if the lock was acquired
+
+        Raises:
+            IllegalStateException: if the current thread holds the read lock, see
+                [`try_upgrade`][pycommons.base.synchronized.ReadWriteLock.try_upgrade]
+        """
+        me = get_ident()
+        with self._mutex:
+            if self._writer == me:
+                self._writes += 1
+                return True
+            if getattr(self._local, "reads", 0):
+                raise IllegalStateException(
+                    "A reader cannot acquire the write lock, release the read lock or upgrade it"
+                )
+            if not self._can_write():
+                self._waiting_writers += 1
+                try:
+                    acquired = self._wait(self._can_write, blocking, timeout)
+                finally:
+                    self._waiting_writers -= 1
+                if not acquired:
+                    # The readers waiting for this writer can proceed
+                    self._condition.notify_all()
+                    return False
+            self._writer = me
+            self._writes = 1
+            self._version += 1
+            return True
+
+    def release_write(self) -> None:
+        """
+        Release a hold of the write lock by the current thread
+
+        Raises:
+            RuntimeError: if the current thread does not hold the write lock
+        """
+        with self._mutex:
+            if self._writer != get_ident():
+                raise RuntimeError("release of a write lock not held by the thread")
+            self._writes -= 1
+            if self._writes:
+                return
+            self._writer = None
+            self._version += 1
+            self._write_releases += 1
+            if self._fair:
+                self._admitted_readers = self._waiting_readers
+            self._condition.notify_all()
+
+    def try_upgrade(self) -> bool:
+        """
+        Acquire the write lock while holding the read lock, if the current thread is the only
+        reader. The thread keeps its holds of the read lock, and releases the write lock with
+        [`release_write`][pycommons.base.synchronized.ReadWriteLock.release_write].
+
+        Returns:
+            True if the write lock was acquired, False if other threads hold the read lock, in
+            which case the thread must release the read lock before acquiring the write lock
+
+        Raises:
+            RuntimeError: if the current thread does not hold the read lock
+        """
+        reads = getattr(self._local, "reads", 0)
+        if not reads:
+            raise RuntimeError("upgrade of a read lock not held by the thread")
+        me = get_ident()
+        with self._mutex:
+            if self._writer == me:
+                self._writes += 1
+                return True
+            if self._writer is not None or self._readers != reads:
+                return False
+            self._writer = me
+            self._writes = 1
+            self._version += 1
+            return True
+
+    def downgrade(self) -> None:
+        """
+        Acquire the read lock and release a hold of the write lock, without letting another
+        writer acquire the lock in between
+
+        Raises:
+            RuntimeError: if the current thread does not hold the write lock
+        """
+        if self._writer != get_ident():
+            raise RuntimeError("downgrade of a write lock not held by the thread")
+        self.acquire_read()
+        self.release_write()
+
+    def try_optimistic_read(self) -> int:
+        """
+        Returns:
+            A stamp to [`validate`][pycommons.base.synchronized.ReadWriteLock.validate] after
+            reading without the lock, or 0 if the write lock is held
+        """
+        version = self._version
+        return 0 if version & 1 else version
+
+    def validate(self, stamp: int) -> bool:
+        """
+        Args:
+            stamp: Stamp returned by `try_optimistic_read`
+
+        Returns:
+            True if the write lock was not acquired since the stamp was taken, in which case
+            the values read in between are consistent
+        """
+        return stamp != 0 and self._version == stamp
+
+
+class ReadWriteLockSynchronized(Synchronized):
+    """
+    Synchronizes the methods of an object with a
+    [`ReadWriteLock`][pycommons.base.synchronized.ReadWriteLock]: the methods decorated with
+    `@read_synchronized` run concurrently with each other, the methods decorated with
+    `@write_synchronized` or `@synchronized` run alone. The methods decorated with
+    `@optimistic_read_synchronized` run without a lock and run again with the read lock if a
+    writer ran concurrently; they must not have side effects.
+
+    Readers only run in parallel while they release the GIL, e.g. on I/O or on the functions
+    of extensions such as `hashlib` and `zlib`, or on a free-threaded Python: for short reads
+    of Python objects, the optimistic reads avoid the cost of the lock.
+
+    Examples:
+        ```python
+        from pycommons.base.synchronized import (
+            ReadWriteLockSynchronized,
+            optimistic_read_synchronized,
+            read_synchronized,
+            write_synchronized,
+        )
+
+        class Registry(ReadWriteLockSynchronized):
+            def __init__(self):
+                super().__init__()
+                self._entries = {}
+
+            @optimistic_read_synchronized
+            def get(self, key):
+                return self._entries.get(key)
+
+            @read_synchronized
+            def keys(self):
+                return list(self._entries)
+
+            @write_synchronized
+            def put(self, key, value):
+                self._entries[key] = value
+        ```
+    """
+
+    def _sync_lock(self) -> ContextManager[Any]:
+        return self._lock.write_lock()
+
+    def __init__(self, fair: bool = False) -> None:
+        """
+        Args:
+            fair: Alternate the readers and the writers instead of preferring the writers
+        """
+        self._lock = ReadWriteLock(fair)
+
+    @staticmethod
+    def read_synchronized(f: F) -> Callable[..., Any]:
+        @functools.wraps(f)
+        def wrapped(self: ReadWriteLockSynchronized, *args: Any, **kwargs: Any) -> Any:
+            lock = self._lock  # pylint: disable=W0212
+            lock.acquire_read()
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                lock.release_read()
+
+        return wrapped
+
+    @staticmethod
+    def write_synchronized(f: F) -> Callable[..., Any]:
+        @functools.wraps(f)
+        def wrapped(self: ReadWriteLockSynchronized, *args: Any, **kwargs: Any) -> Any:
+            lock = self._lock  # pylint: disable=W0212
+            lock.acquire_write()
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                lock.release_write()
+
+        return wrapped
+
+    @staticmethod
+    def optimistic_read_synchronized(f: F) -> Callable[..., Any]:
+        @functools.wraps(f)
+        def wrapped(self: ReadWriteLockSynchronized, *args: Any, **kwargs: Any) -> Any:
+            lock = self._lock  # pylint: disable=W0212
+            stamp = lock.try_optimistic_read()
+            if stamp:
+                try:
+                    result = f(self, *args, **kwargs)
+                except Exception:  # pylint: disable=W0703
+                    # An inconsistent state can raise, e.g. a dict changed during iteration
+                    if lock.validate(stamp):
+                        raise
+                else:
+                    if lock.validate(stamp):
+                        return result
+            lock.acquire_read()
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                lock.release_read()
+
+        return wrapped
+
+
+read_synchronized = ReadWriteLockSynchronized.read_synchronized
+write_synchronized = ReadWriteLockSynchronized.write_synchronized
+optimistic_read_synchronized = ReadWriteLockSynchronized.optimistic_read_synchronized
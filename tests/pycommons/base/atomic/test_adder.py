@@ -0,0 +1,67 @@
+import threading
+from unittest import TestCase
+
+from pycommons.base.atomic import LongAdder
+
+
+class TestLongAdder(TestCase):
+    def test_sum_and_reset(self):
+        adder = LongAdder(10)
+        adder.increment()
+        adder.add(5)
+        adder.decrement()
+        self.assertEqual(15, adder.sum())
+        self.assertEqual(15, adder.get())
+        self.assertEqual(15, int(adder))
+        self.assertEqual(adder, 15)
+        self.assertTrue(adder > 14)
+        self.assertTrue(adder >= 15)
+        self.assertTrue(adder < 16)
+        self.assertTrue(adder <= 15)
+        self.assertEqual("LongAdder(15)", repr(adder))
+
+        self.assertEqual(15, adder.sum_then_reset())
+        self.assertEqual(0, adder.sum())
+        adder.add(3)
+        adder.reset()
+        self.assertEqual(0, adder())
+        adder.increment()
+        self.assertEqual(1, adder.sum())
+
+    def test_threads(self):
+        adder = LongAdder()
+        sums = []
+
+        def work():
+            for _ in range(10000):
+                adder.increment()
+
+        def reset():
+            for _ in range(100):
+                sums.append(adder.sum_then_reset())
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        threads.append(threading.Thread(target=reset))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # No increment is lost across the concurrent resets
+        self.assertEqual(80000, sum(sums) + adder.sum())
+
+    def test_thread_churn(self):
+        adder = LongAdder()
+
+        def work():
+            adder.add(2)
+            adder.decrement()
+
+        for _ in range(2000):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        # The counts of the threads that exited are kept
+        self.assertEqual(2000, adder.sum())
+        adder.increment()
+        self.assertEqual(2001, adder.sum_then_reset())
+        self.assertEqual(0, adder.sum())
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from pycommons.base.atomic import AtomicFieldUpdater, AtomicIntegerArray, AtomicReferenceArray
+
+
+class TestAtomicIntegerArray(TestCase):
+    def test_operations(self):
+        integers = AtomicIntegerArray(5)
+        self.assertEqual(5, len(integers))
+        self.assertEqual([0] * 5, integers.snapshot())
+        integers.set(1, 10)
+        self.assertEqual(10, integers.get(1))
+        self.assertEqual(15, integers.add_and_get(1, 5))
+        self.assertEqual(15, integers.get_and_add(1, 1))
+        self.assertEqual(1, integers.increment_and_get(-1))
+        self.assertEqual(0, integers.decrement_and_get(4))
+        self.assertEqual(16, integers.get_and_set(1, 2**40))
+        self.assertFalse(integers.compare_and_set(1, 3, 4))
+        self.assertTrue(integers.compare_and_set(1, 2**40, 4))
+        self.assertEqual(12, integers.update_and_get(1, lambda v: v * 3))
+        self.assertEqual(20, integers.accumulate_and_get(1, 8, lambda v, x: v + x))
+        self.assertEqual([0, 20, 0, 0, 0], list(integers))
+        self.assertEqual("AtomicIntegerArray([0, 20, 0, 0, 0])", repr(integers))
+
+        with self.assertRaises(IndexError):
+            integers.get(5)
+        with self.assertRaises(OverflowError):
+            integers.set(0, 2**63)
+        with self.assertRaises(ValueError):
+            AtomicIntegerArray(1, stripes=0)
+        self.assertEqual([1, 2], AtomicIntegerArray([1, 2]).snapshot())
+
+    def test_concurrent_updates(self):
+        integers = AtomicIntegerArray(4, stripes=2)
+
+        def work():
+            for i in range(1000):
+                integers.increment_and_get(i % 4)
+                integers.update_and_get(i % 4, lambda v: v + 1)
+
+        with ThreadPoolExecutor(8) as executor:
+            for future in [executor.submit(work) for _ in range(8)]:
+                future.result()
+        self.assertEqual([4000] * 4, integers.snapshot())
+
+
+class TestAtomicReferenceArray(TestCase):
+    def test_operations(self):
+        first, second = [1], [1]
+        references = AtomicReferenceArray(3)
+        self.assertEqual([None] * 3, references.snapshot())
+        references.set(0, first)
+        self.assertFalse(references.compare_and_set(0, second, None))
+        self.assertTrue(references.compare_and_set(0, first, second))
+        self.assertIs(second, references.get(0))
+        self.assertIs(second, references.get_and_set(0, "a"))
+        self.assertEqual("ab", references.update_and_get(0, lambda v: v + "b"))
+        self.assertEqual(["ab", "c"], AtomicReferenceArray(["ab", "c"]).snapshot())
+
+
+class _Shard:
+    __slots__ = ("hits",)
+
+    def __init__(self):
+        self.hits = 0
+
+
+class TestAtomicFieldUpdater(TestCase):
+    def test_operations(self):
+        hits = AtomicFieldUpdater("hits", stripes=4)
+        shards = [_Shard() for _ in range(4)]
+
+        def work():
+            for i in range(1000):
+                hits.add_and_get(shards[i % 4], 1)
+                hits.update_and_get(shards[i % 4], lambda v: v + 1)
+
+        with ThreadPoolExecutor(4) as executor:
+            for future in [executor.submit(work) for _ in range(4)]:
+                future.result()
+        self.assertEqual([2000] * 4, [hits.get(shard) for shard in shards])
+
+        shard = shards[0]
+        hits.set(shard, 1)
+        self.assertEqual(1, hits.get_and_set(shard, 2))
+        self.assertFalse(hits.compare_and_set(shard, 1, 3))
+        self.assertTrue(hits.compare_and_set(shard, 2, 3))
+        self.assertEqual(3, shard.hits)
@@ -20,3 +20,32 @@ class TestAtomic(TestCase):
         mock_object3 = object()
         self.assertEqual(mock_object3, container.set_and_get(mock_object3))
         self.assertTrue(mock_object3 in container)
+
+    def test_compare_and_set(self):
+        first, second = [1], [1]
+        container = Atomic(first)
+        self.assertFalse(container.compare_and_set(second, None))
+        self.assertIs(first, container.get())
+        self.assertTrue(container.compare_and_set(first, second))
+        self.assertIs(second, container.get())
+
+    def test_update_and_accumulate(self):
+        container = Atomic((1,))
+        self.assertEqual((1, 2), container.update_and_get(lambda t: t + (2,)))
+        self.assertEqual((1, 2), container.get_and_update(lambda t: t + (3,)))
+        self.assertEqual((1, 2, 3, 4), container.accumulate_and_get((4,), lambda t, x: t + x))
+        self.assertEqual((1, 2, 3, 4), container.get_and_accumulate((5,), lambda t, x: t + x))
+        self.assertEqual((1, 2, 3, 4, 5), container.get())
+
+    def test_update_is_retried_on_concurrent_write(self):
+        container = Atomic("a")
+        calls = []
+
+        def function(t):
+            calls.append(t)
+            if len(calls) == 1:
+                container.set("b")
+            return t * 2
+
+        self.assertEqual("bb", container.update_and_get(function))
+        self.assertEqual(["a", "b"], calls)
@@ -20,3 +20,10 @@ class TestAtomicBoolean(TestCase):
     def test_container_initialized_with_false(self):
         boolean_container = AtomicBoolean.with_false()
         self.assertFalse(boolean_container)
+
+    def test_compare_and_set(self):
+        boolean_container = AtomicBoolean()
+        self.assertFalse(boolean_container.compare_and_set(True, False))
+        self.assertTrue(boolean_container.compare_and_set(False, True))
+        self.assertTrue(boolean_container.get())
+        self.assertFalse(boolean_container.compliment())
@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from pycommons.base.atomic import AtomicInteger
+
+
+class TestAtomicInteger(TestCase):
+    def test_container(self):
+        integer = AtomicInteger(5)
+        integer.add(2)
+        self.assertEqual(9, integer.add_and_get(2))
+        self.assertEqual(9, integer.get_and_add(1))
+        self.assertEqual(11, integer.increment_and_get())
+        self.assertEqual(11, integer.get_and_increment())
+        integer.increment()
+        integer.subtract(3)
+        self.assertEqual(8, integer.subtract_and_get(2))
+        self.assertEqual(8, integer.get_and_subtract(8))
+        self.assertEqual(0, integer.get())
+        self.assertEqual(0, int(integer))
+        self.assertTrue(integer < 1)
+        self.assertTrue(integer <= 0)
+        self.assertTrue(integer >= 0)
+        self.assertFalse(integer > 0)
+        self.assertEqual(integer, 0)
+
+    def test_compare_and_set(self):
+        integer = AtomicInteger(10**20)
+        self.assertFalse(integer.compare_and_set(1, 2))
+        self.assertTrue(integer.compare_and_set(10**20, 3))
+        self.assertEqual(3, integer.get())
+        self.assertEqual(30, integer.accumulate_and_get(10, lambda a, b: a * b))
+        self.assertEqual(30, integer.get_and_update(lambda a: a + 1))
+        self.assertEqual(31, integer.get())
+
+    def test_concurrent_updates(self):
+        integer = AtomicInteger()
+
+        def work():
+            for _ in range(1000):
+                integer.increment()
+                integer.update_and_get(lambda a: a + 1)
+
+        with ThreadPoolExecutor(8) as executor:
+            for future in [executor.submit(work) for _ in range(8)]:
+                future.result()
+        self.assertEqual(16000, integer.get())
@@ -0,0 +1,174 @@
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import textwrap
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import TestCase
+
+import pycommons
+from pycommons.base.atomic import SharedAtomicBoolean, SharedAtomicInteger
+from pycommons.base.exception import IllegalStateException
+
+
+def _increment(counter, n, batch_size):
+    if batch_size:
+        with counter.batch(batch_size) as batch:
+            for _ in range(n):
+                batch.increment()
+    else:
+        for _ in range(n):
+            counter.increment_and_get()
+
+
+def _take_tokens(tokens, n):
+    taken = 0
+    for _ in range(n):
+        while True:
+            current = tokens.get()
+            if current == 0:
+                return taken
+            if tokens.compare_and_set(current, current - 1):
+                taken += 1
+                break
+    return taken
+
+
+def _stop(flag):
+    flag.true()
+
+
+class TestSharedAtomicInteger(TestCase):
+    def setUp(self):
+        self.counter = SharedAtomicInteger.create(5)
+
+    def tearDown(self):
+        self.counter.unlink()
+
+    def test_operations(self):
+        counter = self.counter
+        self.assertEqual(5, counter.get())
+        self.assertEqual(6, counter.increment_and_get())
+        self.assertEqual(6, counter.get_and_add(4))
+        self.assertEqual(8, counter.subtract_and_get(2))
+        self.assertFalse(counter.compare_and_set(7, 0))
+        self.assertTrue(counter.compare_and_set(8, 1))
+        self.assertEqual(1, counter.get_and_set(3))
+        self.assertEqual(4, counter.set_and_get(4))
+        self.assertTrue(counter < 5)
+        self.assertEqual(4, int(counter))
+        self.assertIn(4, counter)
+        self.assertEqual("SharedAtomicInteger(4)", repr(counter))
+        with self.assertRaises(ValueError):
+            counter.set(1 << 64)
+
+        with self.assertRaises(ValueError):
+            counter.batch(0)
+        with counter.batch(3) as batch:
+            for _ in range(5):
+                batch.increment()
+            self.assertEqual(7, counter.get())
+            self.assertEqual(2, batch.pending())
+            batch.add(-5)
+            self.assertEqual(4, counter.get())
+        self.assertEqual(0, batch.pending())
+        self.assertEqual(4, counter.get())
+
+    def test_attach_and_unlink(self):
+        attached = SharedAtomicInteger.attach(self.counter.name)
+        restored = pickle.loads(pickle.dumps(self.counter))
+        attached.add(1)
+        restored.add(1)
+        self.assertEqual(7, self.counter.get())
+        with self.assertRaises(IllegalStateException):
+            attached.unlink()
+        attached.close()
+        restored.close()
+
+    def test_threads_and_processes(self):
+        self.counter.set(0)
+        with ThreadPoolExecutor(4) as executor:
+            for future in [executor.submit(_increment, self.counter, 1000, 0) for _ in range(4)]:
+                future.result()
+        self.assertEqual(4000, self.counter.get())
+
+        for method in ("fork", "spawn"):
+            with ProcessPoolExecutor(4, multiprocessing.get_context(method)) as executor:
+                futures = [
+                    executor.submit(_increment, self.counter, 1000, batch_size)
+                    for batch_size in (0, 0, 7, 100)
+                ]
+                for future in futures:
+                    future.result()
+        self.assertEqual(12000, self.counter.get())
+
+        self.counter.set(1000)
+        with ProcessPoolExecutor(4) as executor:
+            taken = sum(executor.map(_take_tokens, [self.counter] * 4, [400] * 4))
+        self.assertEqual(1000, taken)
+        self.assertEqual(0, self.counter.get())
+
+    def test_inherited_by_forked_processes(self):
+        self.counter.set(0)
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=_increment, args=(self.counter, 1000, 0)) for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        _increment(self.counter, 1000, 0)
+        for process in processes:
+            process.join()
+        self.assertEqual(5000, self.counter.get())
+
+    def test_dropped_without_close(self):
+        # The copies unpickled by the workers are dropped without being closed
+        script = textwrap.dedent(
+            """
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import shared_memory
+            from pycommons.base.atomic import SharedAtomicInteger
+
+            if __name__ == "__main__":
+                counter = SharedAtomicInteger.create()
+                for method in ("fork", "spawn"):
+                    context = multiprocessing.get_context(method)
+                    with ProcessPoolExecutor(2, context) as executor:
+                        for _ in range(4):
+                            executor.submit(counter.increment).result()
+                print(counter.get())
+                name = counter.name
+                del counter
+                try:
+                    shared_memory.SharedMemory(name)
+                except FileNotFoundError:
+                    print("unlinked")
+            """
+        )
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(pycommons.__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True
+        )
+        self.assertEqual("8\nunlinked\n", result.stdout)
+        self.assertEqual("", result.stderr)
+
+
+class TestSharedAtomicBoolean(TestCase):
+    def test_operations(self):
+        with SharedAtomicBoolean.with_false() as flag:
+            self.assertFalse(flag.get())
+            self.assertTrue(flag.true())
+            self.assertFalse(flag.compliment())
+            self.assertFalse(flag.compare_and_set(True, False))
+            self.assertTrue(flag.compare_and_set(False, True))
+            self.assertTrue(flag)
+            self.assertTrue(flag.get_and_set(False))
+            self.assertFalse(flag.false())
+            self.assertEqual("SharedAtomicBoolean(False)", repr(flag))
+
+            with ProcessPoolExecutor(1) as executor:
+                executor.submit(_stop, flag).result()
+            self.assertTrue(flag.get())
+            flag.unlink()
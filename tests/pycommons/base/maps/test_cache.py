@@ -0,0 +1,240 @@
+import gc
+import threading
+import time
+from unittest import TestCase
+
+from pycommons.base.function import BiConsumer
+from pycommons.base.maps import (
+    LRUCacheMap,
+    LFUCacheMap,
+    TTLCacheMap,
+    SynchronizedCacheMap,
+    Map,
+)
+
+
+class _Ticker:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCacheMap(TestCase):
+    def test_evicts_least_recently_used(self):
+        evicted = []
+        cache = LRUCacheMap(
+            maximum_size=2, eviction_listener=BiConsumer.of(lambda k, v: evicted.append((k, v)))
+        )
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.put("c", 3)
+        self.assertEqual([("b", 2)], evicted)
+        self.assertSetEqual({"a", "c"}, cache.key_set())
+
+        self.assertTrue(cache.contains_key("a"))
+        cache.put("d", 4)
+        self.assertEqual([("b", 2), ("a", 1)], evicted)
+
+        self.assertEqual(4, cache.remove("d"))
+        self.assertEqual([("b", 2), ("a", 1)], evicted)
+        self.assertEqual(1, cache.size())
+
+    def test_stats(self):
+        cache = LRUCacheMap(maximum_size=10)
+        calls = []
+        for k in [1, 2, 1, 1, 3]:
+            cache.compute_if_absent(k, lambda _k: calls.append(_k) or _k * 10)
+        self.assertEqual([1, 2, 3], calls)
+        self.assertIsNone(cache.get(4))
+        with self.assertRaises(KeyError):
+            _ = cache[4]
+        self.assertEqual(10, cache[1])
+
+        self.assertEqual(3, cache.stats.hits)
+        self.assertEqual(5, cache.stats.misses)
+        self.assertAlmostEqual(3 / 8, cache.stats.hit_rate())
+        self.assertEqual(0, cache.stats.evictions)
+
+    def test_weight_based_eviction(self):
+        cache = LRUCacheMap(maximum_weight=10, weigher=lambda k, v: len(v))
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        self.assertEqual(8, cache.weight())
+        cache.put("c", "cccc")
+        self.assertSetEqual({"b", "c"}, cache.key_set())
+        self.assertEqual(8, cache.weight())
+        self.assertEqual(4, cache.stats.eviction_weight)
+
+        cache.put("b", "b")
+        self.assertEqual(5, cache.weight())
+        cache.put("d", "d" * 11)
+        self.assertTrue(cache.is_empty())
+        self.assertEqual(0, cache.weight())
+
+    def test_map_methods(self):
+        cache = LRUCacheMap(maximum_size=3)
+        self.assertEqual(1, cache.put_if_absent("a", 1))
+        self.assertEqual(1, cache.put_if_absent("a", 2))
+        self.assertEqual(2, cache.compute_if_present("a", lambda k, v: v + 1))
+        self.assertIsNone(cache.compute_if_present("a", lambda k, v: None))
+        self.assertEqual(5, cache.merge("b", 5, lambda a, b: a + b))
+        self.assertEqual(10, cache.merge("b", 5, lambda a, b: a + b))
+        self.assertTrue(cache.replace_old_value("b", 10, 11))
+        self.assertEqual(11, cache.replace("b", 12))
+        cache["c"] = 3
+        del cache["c"]
+        self.assertNotIn("c", cache)
+        self.assertIsInstance(cache.copy(), Map)
+        self.assertEqual({"b": 12}, dict(cache.copy()))
+        self.assertEqual(1, cache.stream().count())
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+        with self.assertRaises(ValueError):
+            LRUCacheMap(maximum_size=0)
+        with self.assertRaises(ValueError):
+            LRUCacheMap(maximum_weight=10)
+
+
+class TestLFUCacheMap(TestCase):
+    def test_keeps_frequent_entries(self):
+        cache = LFUCacheMap(maximum_size=100)
+        for _ in range(5):
+            for k in range(50):
+                cache.compute_if_absent(k, str)
+        for k in range(1000, 2000):
+            cache.compute_if_absent(k, str)
+
+        self.assertEqual(100, cache.size())
+        self.assertTrue(all(cache.contains_key(k) for k in range(50)))
+
+        lru = LRUCacheMap(maximum_size=100)
+        for _ in range(5):
+            for k in range(50):
+                lru.compute_if_absent(k, str)
+        for k in range(1000, 2000):
+            lru.compute_if_absent(k, str)
+        self.assertFalse(any(lru.contains_key(k) for k in range(50)))
+
+    def test_admits_new_frequent_entries(self):
+        cache = LFUCacheMap(maximum_size=10)
+        for k in range(10):
+            cache.put(k, k)
+        for _ in range(5):
+            cache.compute_if_absent("hot", str)
+        self.assertTrue(cache.contains_key("hot"))
+        self.assertEqual(10, cache.size())
+
+        with self.assertRaises(ValueError):
+            LFUCacheMap(maximum_size=10, window_ratio=1)
+
+
+class TestTTLCacheMap(TestCase):
+    def test_expiry(self):
+        ticker = _Ticker()
+        evicted = []
+        cache = TTLCacheMap(
+            expire_after_write=10,
+            ticker=ticker,
+            eviction_listener=lambda k, v: evicted.append(k),
+        )
+        cache.put("a", 1)
+        ticker.now = 5
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+
+        ticker.now = 10
+        self.assertFalse(cache.contains_key("a"))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(["a"], evicted)
+        self.assertEqual(2, cache.get("b"))
+
+        cache.put("b", 3)
+        ticker.now = 16
+        self.assertEqual(1, cache.size())
+        ticker.now = 25
+        cache.clean_up()
+        self.assertTrue(cache.is_empty())
+        self.assertEqual(["a", "b"], evicted)
+        self.assertEqual(2, cache.stats.evictions)
+
+    def test_expired_entries_are_purged_on_write(self):
+        ticker = _Ticker()
+        cache = TTLCacheMap(expire_after_write=1, maximum_size=100, ticker=ticker)
+        for k in range(50):
+            cache.put(k, k)
+        ticker.now = 2
+        cache.put("new", 0)
+        self.assertEqual(1, len(cache.data))
+
+        with self.assertRaises(ValueError):
+            TTLCacheMap(expire_after_write=0)
+
+
+class TestSynchronizedCacheMap(TestCase):
+    def test_concurrent_compute_if_absent(self):
+        cache = SynchronizedCacheMap(LRUCacheMap(maximum_size=50))
+        calls = []
+
+        def _compute(k):
+            calls.append(k)
+            return k
+
+        def _run():
+            for i in range(2000):
+                cache.compute_if_absent(i % 100, _compute)
+
+        threads = [threading.Thread(target=_run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(50, cache.size())
+        self.assertEqual(16000, cache.stats.request_count())
+        self.assertEqual(len(calls), cache.stats.misses)
+        self.assertEqual(len(calls) - 50, cache.stats.evictions)
+
+    def test_map_methods(self):
+        cache = SynchronizedCacheMap(LRUCacheMap(maximum_size=2))
+        cache.put("a", 1)
+        cache["b"] = 2
+        cache.put("c", 3)
+        self.assertSetEqual({"b", "c"}, cache.key_set())
+        self.assertIn("c", cache)
+        self.assertEqual(2, cache["b"])
+        self.assertEqual(["c", "b"], list(cache))
+        self.assertEqual(2, cache.stream().count())
+        self.assertEqual(3, cache.remove("c"))
+        self.assertEqual(1, len(cache))
+
+    def test_periodic_clean_up(self):
+        ticker = _Ticker()
+        ttl = TTLCacheMap(expire_after_write=1, ticker=ticker)
+        cache = SynchronizedCacheMap(ttl, clean_up_interval=0.01)
+        for k in range(10):
+            cache.put(k, k)
+        ticker.now = 2
+        deadline = time.monotonic() + 5
+        while ttl.data and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(0, len(ttl.data))
+        self.assertEqual(10, cache.stats.evictions)
+
+        (thread,) = [t for t in threading.enumerate() if t.name == "cache-clean-up"]
+        del cache
+        gc.collect()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+        cache = SynchronizedCacheMap(ttl, clean_up_interval=0.01)
+        (thread,) = [t for t in threading.enumerate() if t.name == "cache-clean-up"]
+        cache.close()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+        with self.assertRaises(ValueError):
+            SynchronizedCacheMap(ttl, clean_up_interval=0)
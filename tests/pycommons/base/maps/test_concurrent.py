@@ -0,0 +1,170 @@
+import threading
+import time
+from unittest import TestCase
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.function import BiFunction
+from pycommons.base.maps import ConcurrentMap, Map
+
+
+def _run_threads(target, n_threads=8):
+    barrier = threading.Barrier(n_threads)
+
+    def _target(i):
+        barrier.wait()
+        target(i)
+
+    threads = [threading.Thread(target=_target, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrentMap(TestCase):
+    def test_map_methods(self):
+        concurrent_map = ConcurrentMap({"a": 1}, concurrency_level=4, b=2)
+        self.assertIsInstance(concurrent_map, Map)
+        self.assertEqual({"a": 1, "b": 2}, dict(concurrent_map))
+
+        self.assertEqual(1, concurrent_map.put_if_absent("a", 10))
+        self.assertEqual(3, concurrent_map.put_if_absent("c", 3))
+        self.assertEqual(1, concurrent_map.compute_if_absent("a", lambda k: 10))
+        self.assertEqual(4, concurrent_map.compute_if_absent("d", lambda k: 4))
+
+        self.assertEqual(11, concurrent_map.compute_if_present("a", lambda k, v: v + 10))
+        self.assertIsNone(concurrent_map.compute_if_present("x", lambda k, v: v + 10))
+        self.assertIsNone(concurrent_map.compute_if_present("d", lambda k, v: None))
+        self.assertFalse(concurrent_map.contains_key("d"))
+
+        self.assertEqual(5, concurrent_map.merge("e", 5, BiFunction.of(lambda a, b: a + b)))
+        self.assertEqual(10, concurrent_map.merge("e", 5, BiFunction.of(lambda a, b: a + b)))
+        self.assertIsNone(concurrent_map.merge("e", 5, lambda a, b: None))
+        self.assertNotIn("e", concurrent_map)
+
+        self.assertTrue(concurrent_map.replace_old_value("b", 2, 20))
+        self.assertFalse(concurrent_map.replace_old_value("b", 2, 30))
+        self.assertEqual(20, concurrent_map.replace("b", 2))
+        self.assertIsNone(concurrent_map.replace("x", 2))
+        self.assertNotIn("x", concurrent_map)
+
+        self.assertEqual(2, concurrent_map.remove("b"))
+        self.assertIsNone(concurrent_map.remove("b"))
+        self.assertEqual(3, concurrent_map.pop("c"))
+        self.assertEqual(0, concurrent_map.pop("c", 0))
+        self.assertEqual(7, concurrent_map.setdefault("f", 7))
+
+        self.assertSetEqual({"a", "f"}, concurrent_map.key_set())
+        self.assertEqual(2, concurrent_map.stream().count())
+        copy = concurrent_map.copy()
+        self.assertIsInstance(copy, ConcurrentMap)
+        self.assertEqual(dict(concurrent_map), dict(copy))
+
+        with self.assertRaises(ValueError):
+            ConcurrentMap(concurrency_level=0)
+
+    def test_iteration_during_modification(self):
+        concurrent_map = ConcurrentMap({i: i for i in range(10)})
+        for k in concurrent_map:
+            concurrent_map.remove(k)
+            concurrent_map.put(k + 100, k)
+        self.assertEqual(10, concurrent_map.size())
+
+        def _add_all(k, v):
+            concurrent_map.put(-k, v)
+
+        concurrent_map.for_each(_add_all)
+        self.assertEqual(20, concurrent_map.size())
+
+    def test_merge_is_atomic(self):
+        concurrent_map = ConcurrentMap()
+
+        def _count(_):
+            for i in range(2000):
+                concurrent_map.merge(i % 10, 1, lambda a, b: a + b)
+
+        _run_threads(_count)
+        self.assertEqual({i: 1600 for i in range(10)}, dict(concurrent_map))
+
+    def test_compute_if_absent_calls_function_once(self):
+        concurrent_map = ConcurrentMap()
+        calls = []
+
+        def _compute(k):
+            calls.append(k)
+            time.sleep(0.01)
+            return object()
+
+        results = []
+        _run_threads(lambda _: results.append(concurrent_map.compute_if_absent("k", _compute)))
+        self.assertEqual(["k"], calls)
+        self.assertEqual(1, len({id(result) for result in results}))
+
+    def test_compute_if_present_is_atomic(self):
+        concurrent_map = ConcurrentMap({"k": 0})
+
+        def _increment(_):
+            for _ in range(1000):
+                concurrent_map.compute_if_present("k", lambda k, v: v + 1)
+
+        _run_threads(_increment)
+        self.assertEqual(8000, concurrent_map.get("k"))
+
+    def test_compute_if_absent_does_not_block_other_keys(self):
+        concurrent_map = ConcurrentMap(concurrency_level=1)
+        started, release = threading.Event(), threading.Event()
+
+        def _slow(k):
+            started.set()
+            release.wait(5)
+            return k
+
+        thread = threading.Thread(target=concurrent_map.compute_if_absent, args=("slow", _slow))
+        thread.start()
+        started.wait(5)
+        self.assertEqual("fast", concurrent_map.compute_if_absent("fast", lambda k: k))
+        self.assertEqual(1, concurrent_map.merge("other", 1, lambda a, b: a + b))
+        self.assertNotIn("slow", concurrent_map)
+        release.set()
+        thread.join()
+        self.assertEqual("slow", concurrent_map.get("slow"))
+
+    def test_compute_if_absent_failure_is_shared_and_retried(self):
+        concurrent_map = ConcurrentMap()
+        calls = []
+
+        def _fail(k):
+            calls.append(k)
+            time.sleep(0.01)
+            raise KeyError(k)
+
+        errors = []
+
+        def _compute(_):
+            try:
+                concurrent_map.compute_if_absent("k", _fail)
+            except KeyError as exc:
+                errors.append(exc)
+
+        _run_threads(_compute, n_threads=4)
+        self.assertEqual(["k"], calls)
+        self.assertEqual(4, len(errors))
+        self.assertEqual(1, concurrent_map.compute_if_absent("k", lambda k: 1))
+
+    def test_compute_if_absent_recursive(self):
+        concurrent_map = ConcurrentMap()
+        with self.assertRaises(IllegalStateException):
+            concurrent_map.compute_if_absent(
+                "k", lambda k: concurrent_map.compute_if_absent(k, lambda _k: 1)
+            )
+        self.assertNotIn("k", concurrent_map)
+        self.assertEqual(2, concurrent_map.compute_if_absent("k", lambda k: 2))
+
+    def test_views_iterate_over_snapshot(self):
+        concurrent_map = ConcurrentMap({i: i for i in range(10)})
+        for entry in concurrent_map.entries_view():
+            concurrent_map.put(entry.key + 100, entry.value)
+        for k in concurrent_map.keys_view():
+            concurrent_map.remove(k)
+        self.assertTrue(concurrent_map.is_empty())
+        self.assertEqual(0, len(concurrent_map.keys_view()))
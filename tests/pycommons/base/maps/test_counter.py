@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from pycommons.base.maps import CounterMap, Map
+
+
+class TestCounterMap(TestCase):
+    def test_counts(self):
+        counter = CounterMap("abracadabra")
+        self.assertIsInstance(counter, Map)
+        self.assertEqual(5, counter.count("a"))
+        self.assertEqual(0, counter.count("z"))
+        self.assertIsNone(counter.get("z"))
+        self.assertNotIn("z", counter)
+        with self.assertRaises(KeyError):
+            _ = counter["z"]
+
+        self.assertEqual(1, counter.increment("z"))
+        self.assertEqual(-1, counter.increment("z", -2))
+        counter.increment_all(["a", "b", "e"])
+        counter.increment_all({"e": 10})
+        self.assertEqual(6, counter.get("a"))
+        self.assertEqual(11, counter.count("e"))
+        self.assertEqual(6 + 3 + 1 + 1 + 2 - 1 + 11, counter.total())
+
+        self.assertEqual([("e", 11), ("a", 6)], counter.most_common(2))
+        self.assertEqual(
+            ["e", "a", "b"],
+            list(counter.most_common_stream(3).map(lambda e: e.key).iterator()),
+        )
+        self.assertEqual(7, counter.stream().count())
+
+    def test_map_methods(self):
+        counter = CounterMap({"a": 2})
+        counter.put_all({"a": 5, "b": 1})
+        self.assertEqual({"a": 5, "b": 1}, dict(counter))
+        self.assertEqual(5, counter.compute_if_absent("a", lambda k: 0))
+        self.assertEqual(3, counter.compute_if_absent("c", lambda k: 3))
+        self.assertEqual(4, counter.merge("c", 1, lambda a, b: a + b))
+
+        copy = counter.copy()
+        copy.increment("a")
+        self.assertIsInstance(copy, CounterMap)
+        self.assertEqual(5, counter.count("a"))
+        self.assertEqual(6, copy.count("a"))
@@ -0,0 +1,172 @@
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import TestCase
+
+from pycommons.base.maps import DiskMap, Map
+
+
+class TestDiskMap(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_map_api(self):
+        with DiskMap(self.path, cache_size=10) as disk_map:
+            disk_map.put_all({f"key{i}": {"id": i} for i in range(3000)})
+            self.assertEqual({"id": 1}, disk_map.put("key1", {"id": 1}))
+            disk_map[("tuple", 1)] = None
+            self.assertEqual(3001, disk_map.size())
+            self.assertFalse(disk_map.is_empty())
+
+            self.assertEqual({"id": 7}, disk_map.get("key7"))
+            self.assertEqual({"id": 7}, disk_map["key7"])
+            self.assertEqual(1, disk_map.cache_stats().hits)
+            self.assertIsNone(disk_map.get(("tuple", 1), 0))
+            self.assertEqual(0, disk_map.get("missing", 0))
+            with self.assertRaises(KeyError):
+                _ = disk_map["missing"]
+            self.assertTrue(disk_map.contains_key("key2999"))
+            self.assertNotIn("missing", disk_map)
+
+            disk_map["key7"] = "new"
+            self.assertEqual("new", disk_map.get("key7"))
+            self.assertEqual({"id": 8}, disk_map.remove("key8"))
+            self.assertIsNone(disk_map.remove("key8"))
+            del disk_map["key9"]
+            with self.assertRaises(KeyError):
+                del disk_map["key9"]
+            self.assertEqual(2999, len(disk_map))
+
+            entries = list(disk_map.stream().iterator())
+            self.assertEqual(Map.Entry("key0", {"id": 0}), entries[0])
+            self.assertEqual(2999, len(entries))
+            self.assertEqual(set(disk_map), {e.key for e in entries})
+            self.assertEqual("new", dict(disk_map.items())["key7"])
+            visited = []
+            disk_map.for_each(lambda k, v: visited.append(k))
+            self.assertEqual([e.key for e in entries], visited)
+
+    def test_map_contract(self):
+        with DiskMap(self.path) as disk_map:
+            self.assertEqual(1, disk_map.put_if_absent("a", 1))
+            self.assertEqual(1, disk_map.put_if_absent("a", 2))
+            calls = []
+            self.assertEqual(1, disk_map.compute_if_absent("a", calls.append))
+            self.assertEqual(3, disk_map.compute_if_absent("b", lambda k: calls.append(k) or 3))
+            self.assertEqual(["b"], calls)
+            self.assertEqual(4, disk_map.compute_if_present("b", lambda k, v: v + 1))
+            self.assertIsNone(disk_map.compute_if_present("c", lambda k, v: v + 1))
+            self.assertEqual(5, disk_map.merge("c", 5, lambda old, v: old + v))
+            self.assertEqual(10, disk_map.merge("c", 5, lambda old, v: old + v))
+            self.assertIsNone(disk_map.merge("c", 5, lambda old, v: None))
+            self.assertNotIn("c", disk_map)
+
+            self.assertEqual(4, disk_map.replace("b", 6))
+            self.assertIsNone(disk_map.replace("c", 6))
+            self.assertNotIn("c", disk_map)
+            self.assertTrue(disk_map.replace_old_value("b", 6, 7))
+            self.assertFalse(disk_map.replace_old_value("b", 6, 8))
+            self.assertTrue(disk_map.contains_value(7))
+            self.assertFalse(disk_map.contains_value(6))
+            self.assertEqual({"a", "b"}, disk_map.key_set())
+            self.assertEqual({Map.Entry("a", 1), Map.Entry("b", 7)}, disk_map.entry_set())
+
+    def test_keys_are_pickled_keys(self):
+        a, b = "a" * 10, "".join(["a"] * 10)
+        self.assertIsNot(a, b)
+        for cache_size in (0, 10):
+            with DiskMap(os.path.join(self.path, str(cache_size)), cache_size=cache_size) as m:
+                # The same results with and without the cache
+                m.put(1, "int")
+                self.assertEqual("int", m.get(1))
+                self.assertIsNone(m.get(1.0))
+                self.assertNotIn(1.0, m)
+
+                # Equal keys with distinct objects are the same key
+                m.put((a, a), "tuple")
+                self.assertEqual("tuple", m.get((a, b)))
+                self.assertIn((b, a), m)
+                m.put((a, b), "other")
+                self.assertEqual(2, len(m))
+                self.assertEqual("other", m[(a, a)])
+
+    def test_upgrade_version_1(self):
+        # A log of version 1, with the keys pickled with the memo of the pickler
+        a = "a" * 10
+        with open(os.path.join(self.path, "data.log"), "wb") as f:
+            f.write(b"PCDL" + (1).to_bytes(4, "little") + bytes(8))
+            for k, v in (((a, a), 1), ("b", 2), ("b", 3)):
+                key, value = pickle.dumps(k, 4), pickle.dumps(v, 4)
+                f.write(len(key).to_bytes(4, "little") + len(value).to_bytes(4, "little"))
+                f.write(key + value)
+        with DiskMap(self.path) as disk_map:
+            self.assertEqual(2, len(disk_map))
+            self.assertEqual(1, disk_map[(a, "".join(["a"] * 10))])
+            self.assertEqual(3, disk_map["b"])
+        with open(os.path.join(self.path, "data.log"), "rb") as f:
+            self.assertEqual(2, int.from_bytes(f.read(8)[4:], "little"))
+        with DiskMap(self.path) as disk_map:
+            self.assertEqual(1, disk_map[(a, a)])
+
+    def test_reopen(self):
+        with DiskMap(self.path) as disk_map:
+            disk_map.put_all({i: str(i) for i in range(100)})
+            disk_map.remove(5)
+        with DiskMap(self.path) as disk_map:
+            self.assertEqual(99, len(disk_map))
+            self.assertEqual("6", disk_map[6])
+            self.assertNotIn(5, disk_map)
+            disk_map.put(100, "100")
+
+        # A record truncated by a crash is dropped, and a missing index is rebuilt
+        with open(os.path.join(self.path, "data.log"), "ab") as f:
+            f.write(b"\x05\x00\x00")
+        os.remove(os.path.join(self.path, "index"))
+        with DiskMap(self.path) as disk_map:
+            self.assertEqual(100, len(disk_map))
+            self.assertEqual("100", disk_map[100])
+            disk_map.put(101, "101")
+            self.assertEqual("101", disk_map[101])
+
+    def test_compact(self):
+        with DiskMap(self.path, cache_size=0, compaction_ratio=None) as disk_map:
+            disk_map.put_all({i: i for i in range(2000)})
+            for i in range(0, 2000, 2):
+                disk_map.remove(i)
+            disk_map.put(1, "one")
+            self.assertGreater(disk_map.garbage_size(), 0)
+            disk_size = disk_map.disk_size()
+
+            keys = iter(disk_map)
+            self.assertEqual(3, next(keys))
+            disk_map.compact().result()
+            self.assertEqual(0, disk_map.garbage_size())
+            self.assertLess(disk_map.disk_size(), disk_size / 2)
+            self.assertEqual(1000, len(disk_map))
+            self.assertEqual("one", disk_map[1])
+            self.assertNotIn(2, disk_map)
+            # A scan started before the compaction continues on the previous log
+            self.assertEqual(999, sum(1 for _ in keys))
+            disk_map.put(2, 2)
+
+        self.assertEqual(["data.log", "index"], sorted(os.listdir(self.path)))
+        with DiskMap(self.path) as disk_map:
+            self.assertEqual(1001, len(disk_map))
+            self.assertEqual("one", disk_map[1])
+
+    def test_automatic_compaction(self):
+        disk_sizes = []
+        for compaction_ratio in (None, 0.5):
+            path = os.path.join(self.path, str(compaction_ratio))
+            with DiskMap(
+                path, compaction_ratio=compaction_ratio, compaction_threshold=1 << 10
+            ) as disk_map:
+                for i in range(200):
+                    disk_map.put("key", i)
+            # Closing the map waits for the compaction in progress
+            with DiskMap(path) as disk_map:
+                self.assertEqual(199, disk_map["key"])
+                disk_sizes.append(disk_map.disk_size())
+        self.assertLess(disk_sizes[1], disk_sizes[0])
@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from pycommons.base.maps import BiMap, IndexedMap, Map
+
+
+class TestIndexedMap(TestCase):
+    def test_index_follows_writes(self):
+        indexed_map = IndexedMap({"a": 1, "b": 1}, c=2)
+        self.assertIsInstance(indexed_map, Map)
+        self.assertSetEqual({"a", "b"}, indexed_map.keys_for_value(1))
+        self.assertTrue(indexed_map.contains_value(2))
+
+        indexed_map.put("a", 3)
+        self.assertSetEqual({"b"}, indexed_map.keys_for_value(1))
+        indexed_map.put_all({"b": 3, "d": 4})
+        self.assertFalse(indexed_map.contains_value(1))
+        self.assertSetEqual({"a", "b"}, indexed_map.keys_for_value(3))
+
+        self.assertEqual(2, indexed_map.replace("c", 5))
+        self.assertFalse(indexed_map.contains_value(2))
+        self.assertTrue(indexed_map.replace_old_value("c", 5, 6))
+        self.assertSetEqual({"c"}, indexed_map.keys_for_value(6))
+
+        self.assertEqual(6, indexed_map.remove("c"))
+        self.assertFalse(indexed_map.contains_value(6))
+        indexed_map["e"] = 7
+        del indexed_map["e"]
+        self.assertEqual(4, indexed_map.pop("d"))
+        self.assertFalse(indexed_map.contains_value(4))
+
+        self.assertEqual(8, indexed_map.compute_if_absent("f", lambda k: 8))
+        self.assertEqual(9, indexed_map.compute_if_present("f", lambda k, v: v + 1))
+        self.assertIsNone(indexed_map.merge("f", 1, lambda a, b: None))
+        self.assertFalse(indexed_map.contains_value(9))
+
+        copy = indexed_map.copy()
+        indexed_map.clear()
+        self.assertFalse(indexed_map.contains_value(3))
+        self.assertSetEqual(set(), indexed_map.keys_for_value(3))
+        self.assertSetEqual({"a", "b"}, copy.keys_for_value(3))
+
+
+class TestBiMap(TestCase):
+    def test_unique_values(self):
+        bimap = BiMap({"a": 1, "b": 2})
+        self.assertSetEqual({"a"}, bimap.keys_for_value(1))
+        self.assertSetEqual(set(), bimap.keys_for_value(3))
+        with self.assertRaises(ValueError):
+            bimap.put("c", 1)
+        self.assertNotIn("c", bimap)
+
+        bimap.put("a", 1)
+        self.assertIsNone(bimap.force_put("c", 1))
+        self.assertEqual(1, bimap.force_put("c", 1))
+        self.assertEqual({"b": 2, "c": 1}, dict(bimap))
+
+        bimap.put("b", 3)
+        self.assertFalse(bimap.contains_value(2))
+        self.assertEqual(3, bimap.remove("b"))
+        self.assertFalse(bimap.contains_value(3))
+
+    def test_inverse_view(self):
+        bimap = BiMap({"a": 1, "b": 2})
+        inverse = bimap.inverse()
+        self.assertIs(inverse, bimap.inverse())
+        self.assertIs(bimap, inverse.inverse())
+        self.assertEqual("b", inverse.get(2))
+
+        bimap.put("c", 3)
+        self.assertEqual("c", inverse.get(3))
+        inverse.put(4, "d")
+        self.assertEqual(4, bimap.get("d"))
+        inverse.remove(1)
+        self.assertNotIn("a", bimap)
+        with self.assertRaises(ValueError):
+            inverse.put(5, "b")
+
+        bimap.clear()
+        self.assertTrue(inverse.is_empty())
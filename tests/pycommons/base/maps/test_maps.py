@@ -34,3 +34,44 @@ class TestMap(TestCase):
         commons_map.put_all({"testKey5": "testValue5"})
         self.assertEqual("testValue5", commons_map.remove("testKey5"))
         self.assertEqual(4, commons_map.size())
+
+    def test_compute_if_absent_only_computes_on_miss(self):
+        commons_map: Map[str, Any] = Map()
+        calls = []
+
+        def _compute(k):
+            calls.append(k)
+            return len(k)
+
+        self.assertEqual(3, commons_map.compute_if_absent("key", _compute))
+        self.assertEqual(3, commons_map.compute_if_absent("key", _compute))
+        self.assertEqual(["key"], calls)
+
+    def test_views(self):
+        commons_map: Map[str, int] = Map({"a": 1, "b": 2})
+        keys, entries = commons_map.keys_view(), commons_map.entries_view()
+
+        commons_map.put("c", 3)
+        self.assertEqual(3, len(keys))
+        self.assertIn("c", keys)
+        self.assertEqual(3, len(entries))
+        self.assertIn(Map.Entry("c", 3), entries)
+        self.assertNotIn(Map.Entry("c", 4), entries)
+        self.assertNotIn(("c", 3), entries)
+        self.assertEqual([Map.Entry("a", 1), Map.Entry("b", 2), Map.Entry("c", 3)], list(entries))
+        self.assertSetEqual(set(entries), commons_map.entry_set())
+
+        key_set = commons_map.key_set()
+        commons_map.remove("a")
+        self.assertSetEqual({"a", "b", "c"}, key_set)
+        self.assertSetEqual({"b", "c"}, set(keys))
+
+    def test_stream_is_lazy(self):
+        commons_map: Map[int, int] = Map({i: i * i for i in range(1000)})
+        stream = commons_map.stream().map(lambda entry: entry.value)
+        self.assertEqual([0, 1, 4], list(stream.limit(3).iterator()))
+        self.assertEqual(1000, commons_map.stream().count())
+
+        entry = Map.Entry("k", "v")
+        self.assertFalse(hasattr(entry, "__dict__"))
+        self.assertEqual("Entry('k', 'v')", repr(entry))
@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from pycommons.base.maps import Map, MultiMap
+
+
+class TestMultiMap(TestCase):
+    def test_list_values(self):
+        multi_map = MultiMap({"a": [1]})
+        self.assertIsInstance(multi_map, Map)
+        multi_map.add("a", 2)
+        multi_map.add("b", 3)
+        multi_map.put_all_from([("a", 1), ("c", 4), ("b", 5)])
+        multi_map.add_all("c", [6, 7])
+        multi_map.add_all("d", [])
+
+        self.assertEqual({"a": [1, 2, 1], "b": [3, 5], "c": [4, 6, 7]}, dict(multi_map))
+        self.assertEqual([3, 5], multi_map.get_values("b"))
+        self.assertEqual([], multi_map.get_values("d"))
+        self.assertNotIn("d", multi_map)
+        self.assertEqual(8, multi_map.value_count())
+        self.assertEqual(3, multi_map.size())
+        self.assertTrue(multi_map.contains_entry("a", 2))
+        self.assertFalse(multi_map.contains_entry("b", 2))
+        self.assertTrue(multi_map.contains_value(7))
+        self.assertFalse(multi_map.contains_value(8))
+
+        self.assertTrue(multi_map.remove_value("b", 3))
+        self.assertFalse(multi_map.remove_value("b", 3))
+        self.assertTrue(multi_map.remove_value("b", 5))
+        self.assertNotIn("b", multi_map)
+
+        self.assertEqual([0], multi_map.compute_if_absent("e", lambda k: [0]))
+        self.assertEqual([0], multi_map.compute_if_absent("e", lambda k: [1]))
+
+        self.assertEqual(
+            [("a", 1), ("a", 2), ("a", 1), ("c", 4), ("c", 6), ("c", 7), ("e", 0)],
+            list(multi_map.flat_stream().map(lambda e: (e.key, e.value)).iterator()),
+        )
+        self.assertEqual(3, multi_map.stream().count())
+
+        copy = multi_map.copy()
+        copy.add("a", 9)
+        self.assertEqual([1, 2, 1], multi_map.get_values("a"))
+
+    def test_writes_keep_keys_with_values(self):
+        multi_map = MultiMap()
+        self.assertEqual([1, 2], multi_map.put("a", (1, 2)))
+        multi_map["b"] = []
+        multi_map.update({"c": iter([3]), "d": set()})
+        self.assertEqual([], multi_map.compute_if_absent("e", lambda k: []))
+        self.assertEqual([4], multi_map.put_if_absent("f", [4]))
+        self.assertEqual([1, 2], multi_map.put_if_absent("a", [5]))
+        with self.assertRaises(TypeError):
+            multi_map.put("g", 5)
+        self.assertEqual({"a": [1, 2], "c": [3], "f": [4]}, dict(multi_map))
+        self.assertEqual(4, multi_map.value_count())
+
+        self.assertEqual([1, 2, 6], multi_map.merge("a", [6], lambda old, v: [*old, *v]))
+        self.assertEqual([7], multi_map.merge("h", [7], lambda old, v: [*old, *v]))
+        self.assertIsNone(multi_map.merge("h", [7], lambda old, v: []))
+        self.assertIsNone(multi_map.compute_if_present("c", lambda k, v: None))
+        self.assertEqual([4], multi_map.replace("f", {8}))
+        self.assertIsNone(multi_map.replace("i", [9]))
+        multi_map.put_all({"a": [], "j": (10,)})
+        self.assertEqual({"f": [8], "j": [10]}, dict(multi_map))
+
+    def test_set_values(self):
+        multi_map = MultiMap(value_type=set)
+        multi_map.put_all_from([("a", 1), ("a", 1), ("a", 2)])
+        multi_map.add_all("a", [2, 3])
+        self.assertEqual({1, 2, 3}, multi_map.get_values("a"))
+        self.assertEqual(set(), multi_map.get_values("b"))
+        self.assertEqual({1, 2, 3}, multi_map.copy().get_values("a"))
+
+        with self.assertRaises(ValueError):
+            MultiMap(value_type=tuple)
@@ -0,0 +1,145 @@
+import random
+import tracemalloc
+from unittest import TestCase
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.maps import Map, PersistentMap
+
+
+class _Key:
+    def __init__(self, name, h):
+        self.name = name
+        self.h = h
+
+    def __hash__(self):
+        return self.h
+
+    def __eq__(self, other):
+        return isinstance(other, _Key) and self.name == other.name
+
+    def __repr__(self):
+        return f"_Key({self.name!r})"
+
+
+class TestPersistentMap(TestCase):
+    def test_versions_are_independent(self):
+        empty = PersistentMap()
+        first = empty.put("a", 1)
+        second = first.put("b", 2).put("a", 10)
+        third = second.remove("a")
+
+        self.assertTrue(empty.is_empty())
+        self.assertEqual({"a": 1}, dict(first))
+        self.assertEqual({"a": 10, "b": 2}, dict(second))
+        self.assertEqual({"b": 2}, dict(third))
+        self.assertEqual(2, second.size())
+        self.assertIs(second, second.put("a", 10))
+        self.assertIs(third, third.remove("a"))
+
+        self.assertEqual(10, second["a"])
+        self.assertIsNone(third.get("a"))
+        self.assertEqual(0, third.get("a", 0))
+        with self.assertRaises(KeyError):
+            _ = third["a"]
+        self.assertTrue(second.contains_key("b"))
+        self.assertTrue(second.contains_value(10))
+        self.assertFalse(first.contains_value(10))
+        self.assertEqual({"a", "b"}, second.key_set())
+        self.assertEqual(PersistentMap({"b": 2}), third)
+        self.assertEqual({"a": 10, "b": 2}, second)
+
+    def test_matches_dict(self):
+        rnd = random.Random(3)
+        expected = {}
+        persistent_map = PersistentMap()
+        versions = []
+        for i in range(20000):
+            k = rnd.randrange(5000)
+            if rnd.random() < 0.3:
+                expected.pop(k, None)
+                persistent_map = persistent_map.remove(k)
+            else:
+                expected[k] = i
+                persistent_map = persistent_map.put(k, i)
+            if i % 5000 == 0:
+                versions.append((dict(expected), persistent_map))
+
+        self.assertEqual(len(expected), len(persistent_map))
+        self.assertEqual(expected, dict(persistent_map.items()))
+        for snapshot, version in versions:
+            self.assertEqual(snapshot, dict(version))
+
+    def test_hash_collisions(self):
+        keys = [_Key(str(i), i % 3) for i in range(10)] + [_Key("negative", -1)]
+        persistent_map = PersistentMap({k: k.name for k in keys})
+        self.assertEqual(11, persistent_map.size())
+        for k in keys:
+            self.assertEqual(k.name, persistent_map[_Key(k.name, k.h)])
+
+        smaller = persistent_map.remove(_Key("0", 0)).remove(_Key("3", 0))
+        self.assertNotIn(_Key("0", 0), smaller)
+        self.assertIn(_Key("0", 0), persistent_map)
+        self.assertEqual(9, len(list(smaller)))
+        self.assertIs(smaller, smaller.remove(_Key("12", 0)))
+        self.assertEqual("x", smaller.put(_Key("6", 0), "x")[_Key("6", 0)])
+        self.assertEqual("6", smaller[_Key("6", 0)])
+
+    def test_transient(self):
+        base = PersistentMap({k: k for k in range(100)})
+        transient = base.transient()
+        for k in range(100, 1100):
+            transient[k] = k
+        transient.put_all({k: -k for k in range(50)})
+        for k in range(50, 100):
+            del transient[k]
+        self.assertEqual(-1, transient.remove(1))
+        self.assertIsNone(transient.remove(1))
+        with self.assertRaises(KeyError):
+            del transient[1]
+        self.assertEqual(1049, transient.size())
+
+        result = transient.persistent()
+        self.assertEqual(1049, len(result))
+        self.assertEqual(-2, result[2])
+        self.assertEqual(dict(base), {k: k for k in range(100)})
+        with self.assertRaises(IllegalStateException):
+            transient.put(1, 1)
+        with self.assertRaises(IllegalStateException):
+            transient.persistent()
+
+        updated = result.put_all({2: 2, 5000: 5000})
+        self.assertEqual(1050, len(updated))
+        self.assertEqual(-2, result[2])
+
+    def test_conversions(self):
+        persistent_map = PersistentMap(Map({"a": 1}), b=2)
+        self.assertEqual({"a": 1, "b": 2}, dict(persistent_map))
+        copy = PersistentMap(persistent_map)
+        self.assertEqual(persistent_map, copy)
+        self.assertIsNot(copy, copy.put("c", 3))
+        self.assertNotIn("c", persistent_map)
+
+        # A copy and an update share the nodes of the map instead of copying them
+        large = PersistentMap({i: i for i in range(100_000)})
+        tracemalloc.start()
+        try:
+            copies = [PersistentMap(large), large.put(-1, -1), large.remove(0)]
+            allocated = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual([100_000, 100_001, 99_999], [len(m) for m in copies])
+        self.assertLess(allocated, 50_000)
+
+        _map = persistent_map.to_map()
+        self.assertIsInstance(_map, Map)
+        _map.put("c", 3)
+        self.assertNotIn("c", persistent_map)
+
+        entries = []
+        persistent_map.for_each(lambda k, v: entries.append((k, v)))
+        self.assertEqual([("a", 1), ("b", 2)], sorted(entries))
+        self.assertEqual(
+            [Map.Entry("a", 1), Map.Entry("b", 2)],
+            sorted(persistent_map.stream().iterator(), key=lambda e: e.key),
+        )
+        self.assertEqual("PersistentMap({'a': 1})", repr(PersistentMap(a=1)))
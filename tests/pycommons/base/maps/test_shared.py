@@ -0,0 +1,87 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.maps import Map, SharedMap
+
+
+def _lookup(shared_map, keys):
+    return [shared_map.get(k) for k in keys], shared_map.size()
+
+
+class TestSharedMap(TestCase):
+    def setUp(self):
+        self.data = {f"key{i}": {"id": i} for i in range(1000)}
+        self.data[("tuple", 1)] = None
+        self.shared_map = SharedMap.create(self.data)
+
+    def tearDown(self):
+        self.shared_map.unlink()
+
+    def test_read_api(self):
+        shared_map = self.shared_map
+        self.assertEqual(1001, shared_map.size())
+        self.assertEqual(1001, len(shared_map))
+        self.assertFalse(shared_map.is_empty())
+        self.assertEqual({"id": 7}, shared_map.get("key7"))
+        self.assertEqual({"id": 7}, shared_map["key7"])
+        self.assertIsNone(shared_map.get(("tuple", 1), 0))
+        self.assertEqual(0, shared_map.get("missing", 0))
+        with self.assertRaises(KeyError):
+            _ = shared_map["missing"]
+        self.assertTrue(shared_map.contains_key(("tuple", 1)))
+        self.assertNotIn("missing", shared_map)
+
+        self.assertEqual(set(self.data), set(shared_map))
+        self.assertEqual(self.data, dict(shared_map.items()))
+        self.assertEqual(
+            Map.Entry("key0", {"id": 0}),
+            shared_map.stream().find_first().get(),
+        )
+        self.assertGreater(shared_map.table_size(), 1001 * 16)
+
+        with SharedMap.create({}) as empty:
+            self.assertTrue(empty.is_empty())
+            self.assertIsNone(empty.get("a"))
+            empty.unlink()
+
+    def test_equal_keys_are_the_same_key(self):
+        a, b = "".join(["key", "1"]), "".join(["ke", "y1"])
+        self.assertIsNot(a, b)
+        with SharedMap.create({(a, a): 1, ("t", (a, a)): 2, a: 3}) as shared_map:
+            self.assertEqual(1, shared_map.get((a, b)))
+            self.assertEqual(2, shared_map.get(("t", (b, a))))
+            self.assertEqual(3, shared_map.get(b))
+            self.assertEqual({"id": 1}, self.shared_map.get(b))
+            shared_map.unlink()
+
+    def test_attach_and_rebuild(self):
+        attached = SharedMap.attach(self.shared_map.name)
+        restored = pickle.loads(pickle.dumps(self.shared_map))
+        self.assertEqual({"id": 1}, attached.get("key1"))
+
+        entries = attached.stream().iterator()
+        self.assertEqual("key0", next(entries).key)
+        self.shared_map.rebuild({"key1": "new", "other": 2})
+        self.assertEqual("new", attached.get("key1"))
+        self.assertEqual(2, restored.size())
+        self.assertEqual(["key1", "other"], list(self.shared_map))
+        # A stream started before the rebuild completes on the previous table
+        self.assertEqual(1000, sum(1 for _ in entries))
+
+        with self.assertRaises(IllegalStateException):
+            attached.rebuild({})
+        with self.assertRaises(IllegalStateException):
+            attached.unlink()
+        attached.close()
+        restored.close()
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            futures = [
+                executor.submit(_lookup, self.shared_map, ["key1", "key999", "missing"])
+                for _ in range(4)
+            ]
+            for future in futures:
+                self.assertEqual(([{"id": 1}, {"id": 999}, None], 1001), future.result())
@@ -0,0 +1,128 @@
+import random
+from unittest import TestCase
+
+from pycommons.base.exception import NoSuchElementError
+from pycommons.base.function.comparator import Comparator
+from pycommons.base.maps import Map, SortedMap
+
+
+class TestSortedMap(TestCase):
+    def test_navigation(self):
+        sorted_map = SortedMap({30: "c", 10: "a"})
+        sorted_map[20] = "b"
+        self.assertIsInstance(sorted_map, Map)
+        self.assertEqual([10, 20, 30], list(sorted_map))
+        self.assertEqual([30, 20, 10], list(reversed(sorted_map)))
+        self.assertEqual(10, sorted_map.first_key())
+        self.assertEqual(30, sorted_map.last_key())
+
+        self.assertEqual(20, sorted_map.floor_key(25))
+        self.assertEqual(20, sorted_map.floor_key(20))
+        self.assertIsNone(sorted_map.floor_key(5))
+        self.assertEqual(30, sorted_map.ceiling_key(25))
+        self.assertIsNone(sorted_map.ceiling_key(31))
+        self.assertEqual(10, sorted_map.lower_key(20))
+        self.assertIsNone(sorted_map.lower_key(10))
+        self.assertEqual(30, sorted_map.higher_key(20))
+        self.assertIsNone(sorted_map.higher_key(30))
+
+        sorted_map.clear()
+        with self.assertRaises(NoSuchElementError):
+            sorted_map.first_key()
+        with self.assertRaises(NoSuchElementError):
+            sorted_map.last_key()
+        self.assertIsNone(sorted_map.floor_key(1))
+
+    def test_ranges(self):
+        sorted_map = SortedMap({k: str(k) for k in range(0, 100, 10)})
+        self.assertEqual([0, 10, 20], list(sorted_map.head_map(30)))
+        self.assertEqual([0, 10, 20, 30], list(sorted_map.head_map(30, inclusive=True)))
+        self.assertEqual([80, 90], list(sorted_map.tail_map(80)))
+        self.assertEqual([90], list(sorted_map.tail_map(80, inclusive=False)))
+        self.assertEqual([20, 30, 40], list(sorted_map.sub_map(15, 45)))
+        self.assertEqual([30, 40], list(sorted_map.sub_map(20, 40, False, True)))
+        self.assertEqual([], list(sorted_map.sub_map(45, 15)))
+
+        sub_map = sorted_map.sub_map(20, 40)
+        sub_map.put(25, "25")
+        self.assertEqual([20, 25, 30], list(sub_map))
+        self.assertNotIn(25, sorted_map)
+
+        self.assertEqual(
+            [("20", 20), ("30", 30)],
+            list(sorted_map.stream(20, 40).map(lambda e: (e.value, e.key)).iterator()),
+        )
+        self.assertEqual(10, sorted_map.stream().count())
+        self.assertEqual(2, sorted_map.stream(from_key=80).count())
+        self.assertEqual(
+            [0, 10],
+            list(sorted_map.stream(to_key=10, to_inclusive=True).map(lambda e: e.key).iterator()),
+        )
+
+    def test_writes_keep_the_order(self):
+        keys = list(range(5000))
+        random.Random(7).shuffle(keys)
+        sorted_map = SortedMap()
+        expected = {}
+        for k in keys:
+            sorted_map.put(k, k)
+            expected[k] = k
+        for k in keys[:2500]:
+            self.assertEqual(k, sorted_map.remove(k))
+            del expected[k]
+        sorted_map.put_all({k: -k for k in range(-100, 0)})
+        expected.update({k: -k for k in range(-100, 0)})
+        sorted_map.put_all({k: 0 for k in range(10000, 14000)})
+        expected.update({k: 0 for k in range(10000, 14000)})
+
+        self.assertEqual(sorted(expected), list(sorted_map))
+        self.assertEqual(sorted(expected.items()), list(sorted_map.items()))
+        self.assertEqual(sorted(expected), list(sorted_map.keys_view()))
+        self.assertEqual(-100, sorted_map.first_key())
+
+        self.assertEqual(1, sorted_map.put_if_absent(-1, 5))
+        self.assertEqual(5, sorted_map.compute_if_absent(20000, lambda k: 5))
+        self.assertIsNone(sorted_map.compute_if_present(20000, lambda k, v: None))
+        self.assertEqual(5, sorted_map.merge(20001, 5, lambda a, b: a + b))
+        self.assertIsNone(sorted_map.merge(20001, 5, lambda a, b: None))
+        del sorted_map[-100]
+        self.assertEqual(99, sorted_map.pop(-99))
+        self.assertIsNone(sorted_map.remove(-99))
+        self.assertEqual(-98, sorted_map.first_key())
+        self.assertEqual(13999, sorted_map.last_key())
+        self.assertEqual(len(expected) - 2, sorted_map.size())
+
+        entries = []
+        sorted_map.head_map(-96).for_each(lambda k, v: entries.append((k, v)))
+        self.assertEqual([(-98, 98), (-97, 97)], entries)
+        self.assertEqual(
+            [Map.Entry(-98, 98), Map.Entry(-97, 97)],
+            list(sorted_map.head_map(-96).entries_view()),
+        )
+
+    def test_comparators(self):
+        reverse = SortedMap(
+            {1: "a", 3: "c", 2: "b"}, comparator=Comparator.comparing(lambda k: k).reversed()
+        )
+        self.assertEqual([3, 2, 1], list(reverse))
+        self.assertEqual(2, reverse.floor_key(2))
+        self.assertEqual(1, reverse.higher_key(2))
+        self.assertEqual([3, 2], list(reverse.head_map(1)))
+
+        by_length = SortedMap(comparator=Comparator.comparing(len))
+        for word in ["ccc", "a", "bb", "dd"]:
+            by_length.put(word, len(word))
+        self.assertEqual("a", by_length.first_key())
+        self.assertEqual("ccc", by_length.last_key())
+        by_length.remove("bb")
+        self.assertEqual(["a", "dd", "ccc"], list(by_length))
+
+        descending = SortedMap(comparator=Comparator.of(lambda a, b: b - a))
+        descending.put_all({k: k for k in range(10)})
+        self.assertEqual(9, descending.first_key())
+        self.assertEqual(4, descending.ceiling_key(4))
+        copy = descending.copy()
+        copy.put(20, 20)
+        self.assertIs(descending.comparator(), copy.comparator())
+        self.assertEqual(20, copy.first_key())
+        self.assertEqual(9, descending.first_key())
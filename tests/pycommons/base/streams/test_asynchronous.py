@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from pycommons.base.function import Function, Predicate
+from pycommons.base.streams import AsyncStream, Collectors, Streams
+
+
+async def _numbers(n):
+    for t in range(n):
+        await asyncio.sleep(0)
+        yield t
+
+
+async def _double(t):
+    await asyncio.sleep(0)
+    return t * 2
+
+
+class TestAsyncStream(IsolatedAsyncioTestCase):
+    async def test_sync_and_async_functions(self):
+        async def _is_even(t):
+            return t % 2 == 0
+
+        stream = (
+            Streams.from_async_iterable(_numbers(10))
+            .filter(_is_even)
+            .map(_double)
+            .map(Function.of(lambda t: t + 1))
+        )
+        self.assertEqual([1, 5, 9, 13, 17], await stream.collect_list())
+
+    async def test_flat_map(self):
+        async def _inner(t):
+            return _numbers(t)
+
+        stream = AsyncStream.of(range(4)).flat_map(_inner)
+        self.assertEqual([0, 0, 1, 0, 1, 2], await stream.collect_list())
+        stream = AsyncStream.of([1, 2]).flat_map(lambda t: Streams.of(t, t))
+        self.assertEqual([1, 1, 2, 2], await stream.collect_list())
+
+    async def test_limit_and_skip(self):
+        self.assertEqual(
+            [2, 3, 4], await AsyncStream.of(_numbers(10)).skip(2).limit(3).collect_list()
+        )
+        self.assertEqual([], await AsyncStream.of(_numbers(10)).limit(0).collect_list())
+        with self.assertRaises(ValueError):
+            AsyncStream.of(_numbers(10)).limit(-1)
+
+    async def test_terminal_operations(self):
+        self.assertEqual(10, await AsyncStream.of(_numbers(10)).count())
+        self.assertTrue(await AsyncStream.of(_numbers(10)).any_match(Predicate.of(lambda t: t > 8)))
+        self.assertFalse(await AsyncStream.of(_numbers(10)).all_match(lambda t: t > 0))
+        self.assertTrue(await AsyncStream.of(_numbers(10)).none_match(lambda t: t > 9))
+        self.assertEqual(3, (await AsyncStream.of(_numbers(10)).find_first(lambda t: t > 2)).get())
+        self.assertTrue((await AsyncStream.of(_numbers(0)).find_first()).is_empty())
+        self.assertEqual(45, await AsyncStream.of(_numbers(10)).collect(Collectors.summing()))
+
+        elements = []
+
+        async def _append(t):
+            elements.append(t)
+
+        await AsyncStream.of(_numbers(3)).for_each(_append)
+        self.assertEqual([0, 1, 2], elements)
+
+    async def test_map_concurrent_bounds_in_flight(self):
+        in_flight, peak = 0, 0
+        gate = asyncio.Event()
+
+        async def _slow(t):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            if in_flight == 4:
+                gate.set()
+            await asyncio.wait_for(gate.wait(), 5)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return t
+
+        result = await AsyncStream.of(_numbers(50)).map_concurrent(_slow, 4).collect_list()
+        self.assertEqual(list(range(50)), result)
+        self.assertEqual(4, peak)
+
+        result = (
+            await AsyncStream.of(_numbers(50))
+            .map_concurrent(_slow, 4, ordered=False)
+            .collect_list()
+        )
+        self.assertEqual(list(range(50)), sorted(result))
+        self.assertEqual(4, peak)
+
+        with self.assertRaises(ValueError):
+            AsyncStream.of(_numbers(10)).map_concurrent(_slow, 0)
+
+    async def test_map_concurrent_unordered_yields_completed_first(self):
+        async def _wait(t):
+            await asyncio.sleep(t)
+            return t
+
+        stream = AsyncStream.of([0.05, 0.0]).map_concurrent(_wait, 2, ordered=False)
+        self.assertEqual([0.0, 0.05], await stream.collect_list())
+
+    async def test_map_concurrent_cancels_pending_on_early_exit(self):
+        cancelled = []
+
+        async def _slow(t):
+            try:
+                await asyncio.sleep(0 if t == 0 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(t)
+                raise
+            return t
+
+        stream = AsyncStream.of(range(5)).map_concurrent(_slow, 3, ordered=False)
+        iterator = stream.iterator()
+        # 3.8 and 3.9 have no aiter/anext built-ins
+        self.assertEqual(0, await iterator.__anext__())  # pylint: disable=C2801
+        await iterator.aclose()
+        await asyncio.sleep(0)
+        self.assertEqual([1, 2], sorted(cancelled))
+
+    async def test_from_stream_offloads_to_executor(self):
+        threads = set()
+
+        def _record(t):
+            threads.add(threading.get_ident())
+            return t
+
+        with ThreadPoolExecutor(1) as executor:
+            stream = AsyncStream.from_stream(
+                Streams.flat(range(10)).map(Function.of(_record)), executor, chunk_size=3
+            )
+            self.assertEqual(list(range(0, 20, 2)), await stream.map(_double).collect_list())
+        self.assertNotIn(threading.get_ident(), threads)
+
+
+class TestAsyncStreamToStream(TestCase):
+    def test_private_loop(self):
+        stream = Streams.from_async_iterable(_numbers(5)).map(_double).to_stream()
+        self.assertEqual([0, 2, 4, 6, 8], list(stream.iterator()))
+
+    def test_running_loop_in_thread(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            stream = Streams.from_async_iterable(_numbers(5)).to_stream(loop)
+            self.assertEqual(10, stream.reduce(0, lambda a, b: a + b))
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
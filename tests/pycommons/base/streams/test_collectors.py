@@ -0,0 +1,107 @@
+import operator
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from pycommons.base.concurrent.executor import Executors
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.streams import Collector, Collectors, Streams
+
+
+def _parity(t):
+    return t % 2
+
+
+class TestCollectors(TestCase):
+    def test_to_list_and_set(self):
+        self.assertListEqual([1, 2, 2], Streams.of(1, 2, 2).collect(Collectors.to_list()))
+        self.assertSetEqual({1, 2}, Streams.of(1, 2, 2).collect(Collectors.to_set()))
+
+    def test_to_map(self):
+        result = Streams.of("a", "bb", "cc").collect(
+            Collectors.to_map(len, str.upper, lambda old, new: old + new)
+        )
+        self.assertIsInstance(result, dict)
+        self.assertDictEqual({1: "A", 2: "BBCC"}, dict(result))
+
+        with self.assertRaises(IllegalStateException):
+            Streams.of("a", "b").collect(Collectors.to_map(len, str.upper))
+
+    def test_grouping_by(self):
+        result = Streams.flat(range(7)).collect(Collectors.grouping_by(lambda t: t % 3))
+        self.assertIsInstance(result, dict)
+        self.assertDictEqual({0: [0, 3, 6], 1: [1, 4], 2: [2, 5]}, dict(result))
+
+        result = Streams.flat(range(7)).collect(
+            Collectors.grouping_by(lambda t: t % 3, Collectors.counting())
+        )
+        self.assertDictEqual({0: 3, 1: 2, 2: 2}, dict(result))
+
+    def test_partitioning_by(self):
+        result = Streams.of(1, 2, 3).collect(Collectors.partitioning_by(lambda t: t > 1))
+        self.assertDictEqual({False: [1], True: [2, 3]}, dict(result))
+
+        result = Streams.empty().collect(
+            Collectors.partitioning_by(lambda t: t > 1, Collectors.summing())
+        )
+        self.assertDictEqual({False: 0, True: 0}, dict(result))
+
+    def test_aggregations(self):
+        self.assertEqual(5, Streams.flat(range(5)).collect(Collectors.counting()))
+        self.assertEqual(10, Streams.flat(range(5)).collect(Collectors.summing()))
+        self.assertEqual(20, Streams.flat(range(5)).collect(Collectors.summing(lambda t: t * 2)))
+        self.assertEqual(2.0, Streams.flat(range(5)).collect(Collectors.averaging()))
+        self.assertEqual(4.0, Streams.flat(range(5)).collect(Collectors.averaging(lambda t: t * 2)))
+        self.assertEqual(0.0, Streams.empty().collect(Collectors.averaging()))
+        self.assertEqual(
+            "[1, 2, 3]", Streams.of(1, 2, 3).collect(Collectors.joining(", ", "[", "]"))
+        )
+        self.assertEqual(24, Streams.of(1, 2, 3, 4).collect(Collectors.reducing(1, operator.mul)))
+        self.assertEqual(
+            30,
+            Streams.of(1, 2, 3, 4).collect(Collectors.reducing(0, operator.add, lambda t: t * t)),
+        )
+
+    def test_collector_without_bulk_accumulation(self):
+        collector = Collector.of(list, list.append, lambda a, b: a + b, tuple)
+        self.assertTupleEqual((1, 2), Streams.of(1, 2).collect(collector))
+        self.assertTupleEqual((1, 2, 3), collector.combine_all([[1], [2, 3]]))
+
+    def test_reduce(self):
+        self.assertEqual(10, Streams.of(1, 2, 3, 4).reduce(0, operator.add))
+        self.assertEqual(7, Streams.empty().reduce(7, operator.add))
+
+    def test_parallel_collect(self):
+        with Executors.new_fixed_thread_pool_executor(4) as executor:
+            self.assertListEqual(
+                list(range(100)),
+                Streams.flat(range(100))
+                .parallel(executor, chunk_size=7)
+                .collect(Collectors.to_list()),
+            )
+            self.assertDictEqual(
+                {0: 3, 1: 2, 2: 2},
+                dict(
+                    Streams.flat(range(7))
+                    .parallel(executor, chunk_size=2)
+                    .collect(Collectors.grouping_by(lambda t: t % 3, Collectors.counting()))
+                ),
+            )
+            self.assertEqual(
+                4950,
+                Streams.flat(range(100)).parallel(executor, chunk_size=7).reduce(0, operator.add),
+            )
+            self.assertEqual(
+                "0123",
+                Streams.flat(range(4))
+                .parallel(executor, chunk_size=1)
+                .collect(Collectors.joining()),
+            )
+
+    def test_process_pool_collect(self):
+        with ProcessPoolExecutor(2) as executor:
+            result = (
+                Streams.flat(range(10))
+                .parallel(executor, chunk_size=3)
+                .collect(Collectors.grouping_by(_parity))
+            )
+            self.assertDictEqual({0: [0, 2, 4, 6, 8], 1: [1, 3, 5, 7, 9]}, dict(result))
@@ -0,0 +1,258 @@
+import itertools
+from unittest import TestCase
+
+from pycommons.base.function import Consumer, Function, Predicate
+from pycommons.base.streams import IteratorStream, Streams
+
+
+class TestIteratorStream(TestCase):
+    def test_pipeline_is_lazy(self):
+        calls = []
+
+        def _mapper(t):
+            calls.append(t)
+            return t * 2
+
+        stream = (
+            Streams.of(1, 2, 3, 4, 5, 6)
+            .filter(Predicate.of(lambda t: t % 2 == 0))
+            .map(Function.of(_mapper))
+        )
+        self.assertListEqual([], calls)
+
+        self.assertListEqual([4, 8, 12], list(stream.iterator()))
+        self.assertListEqual([2, 4, 6], calls)
+
+    def test_fused_stages(self):
+        stream = (
+            Streams.flat(range(20))
+            .map(Function.of(lambda t: t + 1))
+            .filter(Predicate.of(lambda t: t % 3 == 0))
+            .map(Function.of(lambda t: t * 10))
+            .drop_while(Predicate.of(lambda t: t == 30))
+            .take_while(Predicate.of(lambda t: t < 150))
+        )
+        self.assertListEqual([60, 90, 120], list(stream.iterator()))
+
+    def test_iterator_is_compiled_once(self):
+        stream = Streams.of(1, 2, 3).map(Function.of(lambda t: t))
+        self.assertIs(stream.iterator(), stream.iterator())
+
+    def test_plain_callables(self):
+        stream = IteratorStream(iter(range(5))).filter(lambda t: t > 1).map(lambda t: -t)
+        self.assertListEqual([-2, -3, -4], list(stream.iterator()))
+
+    def test_count(self):
+        self.assertEqual(0, Streams.empty().count())
+        self.assertEqual(
+            50, Streams.flat(range(100)).filter(Predicate.of(lambda t: t % 2 == 0)).count()
+        )
+
+    def test_matchers(self):
+        self.assertTrue(Streams.of(1, 2, 3).any_match(Predicate.of(lambda t: t == 2)))
+        self.assertFalse(Streams.of(1, 2, 3).any_match(Predicate.of(lambda t: t == 4)))
+        self.assertTrue(Streams.of(1, 2, 3).all_match(Predicate.of(lambda t: t > 0)))
+        self.assertFalse(Streams.of(1, 2, 3).all_match(Predicate.of(lambda t: t > 1)))
+        self.assertTrue(Streams.of(1, 2, 3).none_match(Predicate.of(lambda t: t > 3)))
+        self.assertFalse(Streams.of(1, 2, 3).none_match(Predicate.of(lambda t: t > 2)))
+
+    def test_any_match_short_circuits(self):
+        source = iter(range(10))
+        self.assertTrue(IteratorStream(source).any_match(Predicate.of(lambda t: t == 3)))
+        self.assertEqual(4, next(source))
+
+    def test_find_first(self):
+        self.assertEqual(1, Streams.of(1, 2, 3).find_first().get())
+        self.assertEqual(
+            2, Streams.of(1, 2, 3).find_first(Predicate.of(lambda t: t % 2 == 0)).get()
+        )
+        self.assertTrue(Streams.empty().find_first().is_empty())
+        self.assertTrue(Streams.of(1, 3).find_first(Predicate.of(lambda t: t > 3)).is_empty())
+
+    def test_for_each(self):
+        consumed = []
+        Streams.of(1, 2, 3, 4).for_each(Consumer.of(consumed.append))
+        self.assertListEqual([1, 2, 3, 4], consumed)
+
+        consumed.clear()
+        Streams.of(1, 2, 3, 4).for_each(
+            Consumer.of(consumed.append), continue_before_accept=Predicate.of(lambda t: t == 2)
+        )
+        self.assertListEqual([1, 3, 4], consumed)
+
+        consumed.clear()
+        Streams.of(1, 2, 3, 4).for_each(
+            Consumer.of(consumed.append), break_before_accept=Predicate.of(lambda t: t == 3)
+        )
+        self.assertListEqual([1, 2], consumed)
+
+        consumed.clear()
+        Streams.of(1, 2, 3, 4).for_each(
+            Consumer.of(consumed.append), break_on_accept=Predicate.of(lambda t: t == 3)
+        )
+        self.assertListEqual([1, 2, 3], consumed)
+
+        with self.assertRaises(ValueError):
+            Streams.of(1).for_each(
+                Consumer.of(consumed.append),
+                break_before_accept=Predicate.of(lambda t: True),
+                continue_before_accept=Predicate.of(lambda t: True),
+            )
+
+    def test_limit(self):
+        self.assertListEqual([0, 1, 2], list(Streams.flat(range(10)).limit(3).iterator()))
+        self.assertListEqual([1, 2], list(Streams.of(1, 2).limit(5).iterator()))
+        self.assertListEqual([], list(Streams.of(1, 2).limit(0).iterator()))
+        with self.assertRaises(ValueError):
+            Streams.of(1, 2).limit(-1)
+
+    def test_limit_stops_pulling_from_source(self):
+        source = itertools.count()
+        stream = IteratorStream(source).map(Function.of(lambda t: t * 2)).limit(3)
+        self.assertListEqual([0, 2, 4], list(stream.iterator()))
+        self.assertEqual(3, next(source))
+
+    def test_skip(self):
+        self.assertListEqual([3, 4], list(IteratorStream(iter(range(5))).skip(3).iterator()))
+        self.assertListEqual([], list(IteratorStream(iter(range(5))).skip(10).iterator()))
+        self.assertListEqual([0, 1], list(IteratorStream(iter(range(2))).skip(0).iterator()))
+        with self.assertRaises(ValueError):
+            Streams.of(1, 2).skip(-1)
+
+    def test_sized_stream(self):
+        stream = Streams.of(*range(100)).skip(10).limit(20).skip(5)
+        self.assertEqual(15, stream.count())
+        self.assertListEqual(
+            list(range(15, 30)), list(Streams.of(*range(100)).skip(10).limit(20).skip(5).iterator())
+        )
+        self.assertListEqual(
+            [30, 32],
+            list(
+                Streams.flat(range(100))
+                .skip(15)
+                .map(Function.of(lambda t: t * 2))
+                .limit(2)
+                .iterator()
+            ),
+        )
+        self.assertEqual(1, Streams.of_one([1]).count())
+        self.assertEqual(0, Streams.empty().skip(3).count())
+
+    def test_sized_stream_after_iteration(self):
+        stream = Streams.of(1, 2, 3, 4)
+        next(stream.iterator())
+        self.assertListEqual([3, 4], list(stream.skip(1).iterator()))
+
+    def test_chain(self):
+        stream = Streams.of(1, 2).map(Function.of(lambda t: t * 2)).chain(Streams.of(5))
+        self.assertListEqual([2, 4, 5], list(stream.iterator()))
+
+    def test_flat_map(self):
+        stream = Streams.of(1, 2, 3).flat_map(Function.of(lambda t: Streams.flat(range(t))))
+        self.assertListEqual([0, 0, 1, 0, 1, 2], list(stream.iterator()))
+
+    def test_flat_map_is_lazy(self):
+        source = itertools.count()
+        stream = IteratorStream(source).flat_map(Function.of(lambda t: Streams.of(t, -t)))
+        self.assertEqual(0, next(source))
+
+        self.assertEqual(-3, stream.find_first(Predicate.of(lambda t: t < -2)).get())
+        self.assertEqual(4, next(source))
+
+    def test_flat_map_empty_inner_streams(self):
+        stream = Streams.flat(range(10)).flat_map(
+            Function.of(lambda t: Streams.of(t) if t % 5 == 0 else Streams.empty())
+        )
+        self.assertListEqual([0, 5], list(stream.iterator()))
+
+    def test_peek_is_lazy(self):
+        peeked = []
+        source = itertools.count()
+        stream = IteratorStream(source).peek(Consumer.of(peeked.append))
+        self.assertListEqual([], peeked)
+
+        self.assertEqual(2, stream.find_first(Predicate.of(lambda t: t == 2)).get())
+        self.assertListEqual([0, 1, 2], peeked)
+        self.assertEqual(3, next(source))
+
+    def test_peek_predicates(self):
+        peeked = []
+        stream = Streams.flat(range(6)).peek(
+            Consumer.of(peeked.append), continue_before_accept=Predicate.of(lambda t: t % 2 == 0)
+        )
+        self.assertListEqual([1, 3, 5], list(stream.iterator()))
+        self.assertListEqual([1, 3, 5], peeked)
+
+        peeked.clear()
+        stream = Streams.flat(range(6)).peek(
+            Consumer.of(peeked.append), break_before_accept=Predicate.of(lambda t: t == 3)
+        )
+        self.assertListEqual([0, 1, 2], list(stream.iterator()))
+        self.assertListEqual([0, 1, 2], peeked)
+
+        peeked.clear()
+        stream = Streams.flat(range(6)).peek(
+            Consumer.of(peeked.append), break_on_accept=Predicate.of(lambda t: t == 3)
+        )
+        self.assertListEqual([0, 1, 2, 3], list(stream.iterator()))
+        self.assertListEqual([0, 1, 2, 3], peeked)
+
+        with self.assertRaises(ValueError):
+            Streams.of(1).peek(
+                Consumer.of(peeked.append),
+                break_before_accept=Predicate.of(lambda t: True),
+                continue_before_accept=Predicate.of(lambda t: True),
+            )
+
+    def test_peek_large_stream(self):
+        peeked = []
+        self.assertEqual(
+            100_000, Streams.flat(range(100_000)).peek(Consumer.of(peeked.append)).count()
+        )
+        self.assertEqual(100_000, len(peeked))
+
+    def test_batch(self):
+        self.assertListEqual(
+            [(0, 1, 2), (3, 4, 5), (6,)], list(Streams.flat(range(7)).batch(3).iterator())
+        )
+        self.assertListEqual([], list(Streams.empty().batch(3).iterator()))
+        with self.assertRaises(ValueError):
+            Streams.of(1).batch(0)
+
+    def test_batch_is_lazy(self):
+        source = itertools.count()
+        self.assertListEqual(
+            [(0, 1), (2, 3)], list(IteratorStream(source).batch(2).limit(2).iterator())
+        )
+        self.assertEqual(4, next(source))
+
+    def test_sliding_window(self):
+        self.assertListEqual(
+            [(0, 1, 2), (1, 2, 3), (2, 3, 4)],
+            list(Streams.flat(range(5)).sliding_window(3).iterator()),
+        )
+        self.assertListEqual(
+            [(0, 1, 2), (2, 3, 4)], list(Streams.flat(range(6)).sliding_window(3, 2).iterator())
+        )
+        self.assertListEqual(
+            [(0, 1), (3, 4), (6, 7)], list(Streams.flat(range(9)).sliding_window(2, 3).iterator())
+        )
+        self.assertListEqual(
+            [(0, 1), (2, 3)], list(Streams.flat(range(5)).sliding_window(2, 2).iterator())
+        )
+        self.assertListEqual([], list(Streams.of(1, 2).sliding_window(3).iterator()))
+        with self.assertRaises(ValueError):
+            Streams.of(1).sliding_window(2, 0)
+
+    def test_map_batches(self):
+        batches = []
+
+        def _mapper(_batch):
+            batches.append(_batch)
+            return [sum(_batch)] * len(_batch)
+
+        stream = Streams.flat(range(5)).map_batches(Function.of(_mapper), 2)
+        self.assertListEqual([1, 1, 5, 5, 4], list(stream.iterator()))
+        self.assertListEqual([(0, 1), (2, 3), (4,)], batches)
+        with self.assertRaises(ValueError):
+            Streams.of(1).map_batches(Function.of(_mapper), 0)
@@ -0,0 +1,147 @@
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from pycommons.base.concurrent.executor import Executors
+from pycommons.base.function import Function, Predicate
+from pycommons.base.streams import ParallelStream, Streams
+
+
+def _square(t):
+    return t * t
+
+
+def _is_even(t):
+    return t % 2 == 0
+
+
+class TestParallelStream(TestCase):
+    def setUp(self) -> None:
+        self.executor = Executors.new_fixed_thread_pool_executor(4)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+
+    def test_ordered_results(self):
+        stream = (
+            Streams.flat(range(1000))
+            .parallel(self.executor, chunk_size=7)
+            .filter(Predicate.of(lambda t: t % 3 == 0))
+            .map(Function.of(lambda t: t + 1))
+        )
+        self.assertIsInstance(stream, ParallelStream)
+        self.assertListEqual([t + 1 for t in range(0, 1000, 3)], list(stream.iterator()))
+
+    def test_unordered_results(self):
+        stream = Streams.flat(range(1000)).parallel(self.executor, chunk_size=10, ordered=False)
+        self.assertListEqual(list(range(1000)), sorted(stream.iterator()))
+        self.assertListEqual(
+            list(range(100)),
+            sorted(Streams.flat(range(100)).parallel(self.executor).unordered().iterator()),
+        )
+
+    def test_stages_run_on_executor(self):
+        threads = set()
+
+        def _mapper(t):
+            threads.add(threading.current_thread().name)
+            return t
+
+        Streams.flat(range(100)).parallel(self.executor, chunk_size=10).map(
+            Function.of(_mapper)
+        ).count()
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    def test_flat_map(self):
+        stream = (
+            Streams.of(1, 2, 3)
+            .parallel(self.executor, chunk_size=1)
+            .flat_map(Function.of(lambda t: Streams.flat(range(t))))
+        )
+        self.assertListEqual([0, 0, 1, 0, 1, 2], list(stream.iterator()))
+
+    def test_terminal_operations(self):
+        self.assertEqual(
+            500,
+            Streams.flat(range(1000))
+            .parallel(self.executor, chunk_size=64)
+            .filter(Predicate.of(_is_even))
+            .count(),
+        )
+        self.assertTrue(
+            Streams.flat(range(1000))
+            .parallel(self.executor)
+            .any_match(Predicate.of(lambda t: t == 999))
+        )
+        self.assertTrue(
+            Streams.flat(range(1000))
+            .parallel(self.executor)
+            .all_match(Predicate.of(lambda t: t >= 0))
+        )
+        self.assertFalse(
+            Streams.flat(range(1000))
+            .parallel(self.executor)
+            .all_match(Predicate.of(lambda t: t > 0))
+        )
+        self.assertTrue(
+            Streams.flat(range(1000))
+            .parallel(self.executor)
+            .none_match(Predicate.of(lambda t: t < 0))
+        )
+        self.assertEqual(
+            101,
+            Streams.flat(range(1000))
+            .parallel(self.executor, chunk_size=8)
+            .find_first(Predicate.of(lambda t: t > 100))
+            .get(),
+        )
+        self.assertTrue(
+            Streams.flat(range(10))
+            .parallel(self.executor)
+            .find_first(Predicate.of(lambda t: t > 10))
+            .is_empty()
+        )
+
+    def test_short_circuit_on_infinite_source(self):
+        stream = Streams.flat(itertools.count()).parallel(self.executor, chunk_size=16)
+        self.assertTrue(stream.any_match(Predicate.of(lambda t: t == 100)))
+
+        stream = Streams.flat(itertools.count()).parallel(self.executor, chunk_size=16)
+        self.assertEqual(500, stream.find_first(Predicate.of(lambda t: t >= 500)).get())
+
+        stream = Streams.flat(itertools.count()).parallel(self.executor, chunk_size=16)
+        self.assertListEqual([0, 1, 2], list(stream.limit(3).iterator()))
+
+    def test_default_executor(self):
+        self.assertEqual(100, Streams.flat(range(100)).parallel(chunk_size=10).count())
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            Streams.of(1).parallel(chunk_size=0)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            stream = (
+                Streams.flat(range(100))
+                .parallel(executor, chunk_size=10)
+                .filter(_is_even)
+                .map(_square)
+            )
+            self.assertListEqual([t * t for t in range(0, 100, 2)], list(stream.iterator()))
+
+    def test_batches(self):
+        stream = Streams.flat(range(10)).parallel(self.executor, chunk_size=4)
+        self.assertListEqual(
+            [(0, 1, 2), (3, 4, 5), (6, 7, 8), (9,)], list(stream.batch(3).iterator())
+        )
+
+        stream = Streams.flat(range(10)).parallel(self.executor, chunk_size=4)
+        self.assertListEqual([(0, 1), (1, 2)], list(stream.sliding_window(2).limit(2).iterator()))
+
+        stream = (
+            Streams.flat(range(10))
+            .parallel(self.executor, chunk_size=4)
+            .map_batches(Function.of(lambda b: [len(b)]), 3)
+        )
+        self.assertListEqual([3, 1, 3, 1, 2], list(stream.iterator()))
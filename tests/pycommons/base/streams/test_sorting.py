@@ -0,0 +1,128 @@
+from unittest import TestCase
+
+from pycommons.base.concurrent.executor import Executors
+from pycommons.base.function.comparator import Comparator
+from pycommons.base.streams import Streams
+from pycommons.base.streams.bloom import BloomFilter
+from pycommons.base.streams.sorting import external_sort, sort_key
+
+
+class TestSorting(TestCase):
+    def test_sort_key(self):
+        self.assertEqual((None, False), sort_key(None))
+        self.assertEqual((len, False), sort_key(Comparator.comparing(len)))
+        self.assertEqual((len, True), sort_key(Comparator.comparing(len).reversed()))
+
+        key, reverse = sort_key(Comparator.of(lambda t, u: t - u))
+        self.assertIsNotNone(key)
+        self.assertFalse(reverse)
+
+    def test_sorted(self):
+        self.assertListEqual([1, 2, 3], list(Streams.of(3, 1, 2).sorted().iterator()))
+        self.assertListEqual(
+            [3, 2, 1],
+            list(Streams.of(3, 1, 2).sorted(Comparator.of(lambda t, u: u - t)).iterator()),
+        )
+        self.assertListEqual(
+            ["b", "aa", "ccc"],
+            list(Streams.of("ccc", "b", "aa").sorted(Comparator.comparing(len)).iterator()),
+        )
+        self.assertListEqual(
+            ["ccc", "aa", "b"],
+            list(
+                Streams.of("ccc", "b", "aa").sorted(Comparator.comparing(len).reversed()).iterator()
+            ),
+        )
+
+    def test_sorted_is_lazy(self):
+        source = iter([3, 1, 2])
+        iterator = Streams.flat(source).sorted().iterator()
+        self.assertEqual(3, next(source))
+        self.assertListEqual([1, 2], list(iterator))
+
+    def test_external_sort(self):
+        data = [(i * 7919) % 1000 for i in range(1000)]
+        self.assertListEqual(sorted(data), list(external_sort(iter(data), None, False, 64)))
+        self.assertListEqual(
+            sorted(data, reverse=True), list(external_sort(iter(data), None, True, 100))
+        )
+        self.assertListEqual([1, 2], list(external_sort(iter([2, 1]), None, False, 64)))
+        self.assertListEqual([], list(external_sort(iter([]), None, False, 64)))
+        self.assertListEqual(
+            sorted(data[:128]), list(external_sort(iter(data[:128]), None, False, 64))
+        )
+
+    def test_external_sort_is_stable(self):
+        data = [(i % 3, i) for i in range(200)]
+        self.assertListEqual(
+            sorted(data, key=lambda t: t[0]),
+            list(
+                Streams.flat(data)
+                .sorted(Comparator.comparing(lambda t: t[0]), max_in_memory=16)
+                .iterator()
+            ),
+        )
+        with self.assertRaises(ValueError):
+            Streams.of(1).sorted(max_in_memory=0)
+
+    def test_top_k(self):
+        data = [(i * 7919) % 1000 for i in range(1000)]
+        self.assertListEqual([0, 1, 2], list(Streams.flat(data).top_k(3).iterator()))
+        self.assertListEqual(
+            [999, 998],
+            list(Streams.flat(data).top_k(2, Comparator.comparing(abs).reversed()).iterator()),
+        )
+        self.assertListEqual([1, 2], list(Streams.of(2, 1).top_k(5).iterator()))
+        with self.assertRaises(ValueError):
+            Streams.of(1).top_k(-1)
+
+    def test_min_max(self):
+        self.assertEqual(1, Streams.of(3, 1, 2).min().get())
+        self.assertEqual(3, Streams.of(3, 1, 2).max().get())
+        self.assertEqual(3, Streams.of(3, 1, 2).min(Comparator.comparing(lambda t: -t)).get())
+        self.assertEqual(
+            "ccc", Streams.of("ccc", "b").max(Comparator.of(lambda t, u: len(t) - len(u))).get()
+        )
+        self.assertTrue(Streams.empty().min().is_empty())
+        self.assertTrue(Streams.empty().max().is_empty())
+
+    def test_distinct(self):
+        self.assertListEqual([3, 1, 2], list(Streams.of(3, 1, 3, 2, 1).distinct().iterator()))
+        self.assertListEqual(
+            list(range(100)),
+            list(
+                Streams.flat(list(range(100)) * 3)
+                .distinct(approximate=True, expected_insertions=1000, false_positive_rate=0.001)
+                .iterator()
+            ),
+        )
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(10_000, 0.01)
+        self.assertTrue(all(bloom.put(t) or True for t in range(10_000)))
+        self.assertTrue(all(bloom.might_contain(t) for t in range(10_000)))
+        self.assertFalse(bloom.put(5))
+        false_positives = sum(bloom.might_contain(t) for t in range(10_000, 20_000))
+        self.assertLess(false_positives, 300)
+        self.assertLess(bloom.size_in_bytes(), 13_000)
+
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+    def test_parallel(self):
+        data = [(i * 7919) % 1000 for i in range(1000)]
+        with Executors.new_fixed_thread_pool_executor(4) as executor:
+            self.assertListEqual(
+                sorted(data), list(Streams.flat(data).parallel(executor).sorted().iterator())
+            )
+            self.assertListEqual(
+                [0, 1, 2],
+                list(Streams.flat(data).parallel(executor, chunk_size=50).top_k(3).iterator()),
+            )
+            self.assertEqual(0, Streams.flat(data).parallel(executor, chunk_size=50).min().get())
+            self.assertEqual(999, Streams.flat(data).parallel(executor, chunk_size=50).max().get())
+            self.assertListEqual(
+                [1, 2], list(Streams.of(1, 2, 1).parallel(executor).distinct().iterator())
+            )
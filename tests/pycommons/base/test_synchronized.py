@@ -0,0 +1,158 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from pycommons.base.exception import IllegalStateException
+from pycommons.base.synchronized import (
+    ReadWriteLock,
+    ReadWriteLockSynchronized,
+    optimistic_read_synchronized,
+    read_synchronized,
+    synchronized,
+    write_synchronized,
+)
+
+
+class _Point(ReadWriteLockSynchronized):
+    def __init__(self, fair=False):
+        super().__init__(fair)
+        self.x = 0
+        self.y = 0
+
+    @write_synchronized
+    def move(self):
+        self.x += 1
+        time.sleep(0)
+        self.y += 1
+
+    @synchronized
+    def reset(self):
+        self.x = self.y = 0
+
+    @read_synchronized
+    def read(self):
+        x = self.x
+        time.sleep(0)
+        return x, self.read_nested()
+
+    @read_synchronized
+    def read_nested(self):
+        return self.y
+
+    @optimistic_read_synchronized
+    def read_optimistic(self):
+        x = self.x
+        time.sleep(0)
+        return x, self.y
+
+
+class TestReadWriteLock(TestCase):
+    def test_readers_share_and_writers_exclude(self):
+        lock = ReadWriteLock()
+        with lock.read_lock():
+            self.assertTrue(lock.read_lock().acquire())
+            lock.read_lock().release()
+            with ThreadPoolExecutor(1) as executor:
+                self.assertTrue(executor.submit(lock.read_lock().acquire, False).result())
+                with ThreadPoolExecutor(1) as writer:
+                    self.assertFalse(writer.submit(lock.write_lock().acquire, False).result())
+                with self.assertRaises(IllegalStateException):
+                    lock.acquire_write()
+                self.assertFalse(lock.try_upgrade())
+                executor.submit(lock.release_read).result()
+            self.assertTrue(lock.try_upgrade())
+            lock.release_write()
+        with self.assertRaises(RuntimeError):
+            lock.release_read()
+        with self.assertRaises(RuntimeError):
+            lock.release_write()
+
+        with lock.write_lock():
+            with lock.write_lock(), lock.read_lock():
+                pass
+            with ThreadPoolExecutor(1) as executor:
+                self.assertFalse(executor.submit(lock.acquire_read, True, 0.01).result())
+        lock.acquire_write()
+        lock.acquire_write()
+        lock.downgrade()
+        with ThreadPoolExecutor(1) as executor:
+            self.assertFalse(executor.submit(lock.acquire_read, False).result())
+            lock.downgrade()
+            self.assertTrue(executor.submit(lock.acquire_read, False).result())
+            executor.submit(lock.release_read).result()
+        with self.assertRaises(RuntimeError):
+            lock.downgrade()
+        lock.release_read()
+        lock.release_read()
+        self.assertTrue(lock.acquire_write(False))
+        lock.release_write()
+
+    def test_optimistic_read(self):
+        lock = ReadWriteLock()
+        stamp = lock.try_optimistic_read()
+        self.assertTrue(lock.validate(stamp))
+        with lock.read_lock():
+            self.assertTrue(lock.validate(stamp))
+        with lock.write_lock():
+            self.assertEqual(0, lock.try_optimistic_read())
+            self.assertFalse(lock.validate(stamp))
+        self.assertFalse(lock.validate(stamp))
+        self.assertFalse(lock.validate(0))
+        self.assertTrue(lock.validate(lock.try_optimistic_read()))
+
+    def _order(self, fair):
+        lock = ReadWriteLock(fair)
+        order = []
+
+        def read():
+            with lock.read_lock():
+                order.append("read")
+
+        def write():
+            with lock.write_lock():
+                order.append("write")
+                time.sleep(0.05)
+
+        lock.acquire_write()
+        threads = [threading.Thread(target=write)]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=read))
+        threads[1].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=write))
+        threads[2].start()
+        time.sleep(0.05)
+        lock.release_write()
+        for thread in threads:
+            thread.join()
+        return order
+
+    def test_writer_preference_and_fairness(self):
+        self.assertEqual(["write", "write", "read"], self._order(False))
+        # The reader waiting when the lock is released goes before the next writer
+        self.assertEqual(["read", "write", "write"], self._order(True))
+
+
+class TestReadWriteLockSynchronized(TestCase):
+    def test_consistent_reads(self):
+        for fair in (False, True):
+            point = _Point(fair)
+
+            def work(i, point=point):
+                for _ in range(200):
+                    if i % 4 == 0:
+                        point.move()
+                    else:
+                        x, y = point.read()
+                        self.assertEqual(x, y)
+                        x, y = point.read_optimistic()
+                        self.assertEqual(x, y)
+
+            with ThreadPoolExecutor(8) as executor:
+                for future in [executor.submit(work, i) for i in range(8)]:
+                    future.result()
+            self.assertEqual((400, 400), point.read())
+            point.reset()
+            self.assertEqual((0, 0), point.read_optimistic())